@@ -0,0 +1,20 @@
+-- ============================================================================
+-- SCREENING-ANSWER BANK
+-- Reuse answers from application_questions across applications
+-- ============================================================================
+
+-- Profile the answer was written for (hash of the user profile used)
+ALTER TABLE application_questions ADD COLUMN IF NOT EXISTS profile_version TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_application_questions_answer_bank
+  ON application_questions (profile_version, effort_level_at_time, field_label_normalized, updated_at DESC)
+  WHERE field_label_normalized IS NOT NULL;
+
+-- One embedding per normalized question text, shared across profiles
+CREATE TABLE IF NOT EXISTS question_embeddings (
+  field_label_normalized TEXT PRIMARY KEY,
+  embedding_model TEXT NOT NULL,
+  embedding REAL[] NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+COMMENT ON TABLE question_embeddings IS 'Embedding index for semantic screening-answer lookup';
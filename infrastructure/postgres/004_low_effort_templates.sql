@@ -0,0 +1,11 @@
+-- ============================================================================
+-- LOW EFFORT TEMPLATES
+-- Allow cover letter templates for the zero-LLM LOW effort path
+-- ============================================================================
+
+ALTER TABLE cover_letter_templates
+  DROP CONSTRAINT IF EXISTS cover_letter_templates_intended_effort_level_check;
+
+ALTER TABLE cover_letter_templates
+  ADD CONSTRAINT cover_letter_templates_intended_effort_level_check
+  CHECK (intended_effort_level IN ('low', 'medium', 'high'));
@@ -0,0 +1,10 @@
+-- ============================================================================
+-- MODEL USAGE TOKENS
+-- Cached prompt tokens and the pipeline stage of each recorded LLM call
+-- ============================================================================
+
+ALTER TABLE model_usage
+  ADD COLUMN IF NOT EXISTS tokens_cached INT DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS stage TEXT;  -- 'match', 'generation', 'browser'
+
+CREATE INDEX IF NOT EXISTS idx_model_usage_app_stage ON model_usage(application_id, stage);
@@ -774,7 +774,7 @@ GROUP BY c.id, c.name, c.tier;
 -- Insert default model providers
 INSERT INTO model_providers (name, base_url, pricing_json) VALUES
   ('OpenAI', 'https://api.openai.com/v1', '{"text-embedding-3-small": {"input": 0.00002}}'),
-  ('xAI', 'https://api.x.ai/v1', '{"grok-beta": {"input": 0.000005, "output": 0.000015}}')
+  ('xAI', 'https://api.x.ai/v1', '{"grok-beta": {"input": 0.000005, "output": 0.000015}, "grok-4-1-fast-reasoning": {"input": 0.0000002, "output": 0.0000005}}')
 ON CONFLICT (name) DO NOTHING;
 
 -- Insert default job sources
@@ -0,0 +1,24 @@
+-- ============================================================================
+-- FORM SCHEMA CACHE
+-- Normalized application-form structure learned per (domain, form fingerprint)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS form_schemas (
+  domain TEXT NOT NULL,
+  fingerprint TEXT NOT NULL,  -- hash of the first page's field labels and types
+  ats TEXT,
+
+  -- {"steps": 2, "fields": [{"label", "type", "required", "selector", "step"}, ...]}
+  schema JSONB NOT NULL,
+
+  -- Agent steps of the visit that learned the schema, the baseline for steps saved
+  baseline_agent_steps INT,
+  last_agent_steps INT,
+  visits INT NOT NULL DEFAULT 1,
+  hits INT NOT NULL DEFAULT 0,
+
+  created_at TIMESTAMPTZ DEFAULT now(),
+  updated_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (domain, fingerprint)
+);
+COMMENT ON TABLE form_schemas IS 'Application form layouts reused to pre-plan answers and skip exploratory agent steps';
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag benchmark for repository writes
+Usage: python scripts/benchmark_event_loop_lag.py [--apps 5] [--writes 6] [--db-latency-ms 40]
+
+Simulates several concurrent applications that each perform a handful of
+repository writes against a slow database, once calling the repositories
+directly from the coroutine (old behaviour) and once through AsyncRepository.
+A probe coroutine measures how late the event loop wakes it up.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add services to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'services')))
+
+from persistence.src.async_repository import AsyncRepository, shutdown_db_executor
+
+PROBE_INTERVAL_SEC = 0.005
+
+
+class SlowRepository:
+    """Stands in for a psycopg2 repository with a fixed round-trip latency"""
+
+    def __init__(self, latency_sec: float):
+        self.latency_sec = latency_sec
+
+    def append_event(self, event_type: str, **kwargs):
+        time.sleep(self.latency_sec)
+
+
+async def probe_lag(samples: list, stop: asyncio.Event):
+    """Record how far past its deadline each probe wakeup lands"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL_SEC
+        await asyncio.sleep(PROBE_INTERVAL_SEC)
+        samples.append(max(loop.time() - expected, 0.0))
+
+
+async def simulate_application(repo, writes: int, use_async: bool):
+    for i in range(writes):
+        if use_async:
+            await repo.append_event('benchmark_event', payload={'i': i})
+        else:
+            repo.append_event('benchmark_event', payload={'i': i})
+        # Yield between writes like the runner does between stages
+        await asyncio.sleep(0)
+
+
+async def run_scenario(apps: int, writes: int, latency_sec: float, use_async: bool) -> dict:
+    repo = SlowRepository(latency_sec)
+    if use_async:
+        repo = AsyncRepository(repo)
+
+    samples: list = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(samples, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(simulate_application(repo, writes, use_async) for _ in range(apps)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+
+    samples_ms = sorted(s * 1000 for s in samples) or [0.0]
+    p95_index = max(int(len(samples_ms) * 0.95) - 1, 0)
+    return {
+        'wall_sec': elapsed,
+        'lag_max_ms': samples_ms[-1],
+        'lag_p95_ms': samples_ms[p95_index],
+        'lag_mean_ms': statistics.mean(samples_ms),
+        'probe_samples': len(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure event-loop lag caused by repository writes")
+    parser.add_argument('--apps', type=int, default=5, help="Concurrent applications")
+    parser.add_argument('--writes', type=int, default=6, help="Repository writes per application")
+    parser.add_argument('--db-latency-ms', type=float, default=40.0, help="Simulated DB round trip")
+    args = parser.parse_args()
+
+    latency_sec = args.db_latency_ms / 1000.0
+
+    print(f"⏱️  {args.apps} applications x {args.writes} writes @ {args.db_latency_ms:.0f}ms per write\n")
+    for label, use_async in (("sync repository", False), ("AsyncRepository", True)):
+        result = asyncio.run(run_scenario(args.apps, args.writes, latency_sec, use_async))
+        print(
+            f"{label:18s} wall={result['wall_sec']:.2f}s  "
+            f"lag max={result['lag_max_ms']:.1f}ms  "
+            f"p95={result['lag_p95_ms']:.1f}ms  "
+            f"mean={result['lag_mean_ms']:.1f}ms  "
+            f"(samples={result['probe_samples']})"
+        )
+
+    shutdown_db_executor()
+
+
+if __name__ == '__main__':
+    main()
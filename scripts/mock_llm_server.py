@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Offline OpenAI-compatible mock LLM server
+Usage: python scripts/mock_llm_server.py [--port 8100] [--config config/mock_llm.yml]
+                                         [--rate-limit-rate 0.05] [--server-error-rate 0.01]
+                                         [--latency-scale 0.5]
+
+Serves /v1/chat/completions, /v1/embeddings and /v1/models with the latency,
+fault and fixture settings of config/mock_llm.yml. Start the agent with
+USE_MOCK_LLM=true (and MOCK_LLM_URL if not on localhost:8100) to run load
+and capacity tests without provider API keys.
+"""
+import argparse
+import os
+import sys
+
+# Add services to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'services')))
+
+import uvicorn
+
+from agent.src.mock_llm.engine import MockLLM
+from agent.src.mock_llm.server import create_app
+
+
+def scaled_latency(spec: dict, scale: float) -> dict:
+    """Latency spec with every millisecond value multiplied by ``scale``"""
+    return {key: value * scale if key not in ('distribution', 'sigma') else value for key, value in spec.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline OpenAI-compatible mock LLM server')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--config', default=None, help='Settings file (default: config/mock_llm.yml)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--rate-limit-rate', type=float, default=None, help='Fraction of requests answered with 429')
+    parser.add_argument('--server-error-rate', type=float, default=None, help='Fraction of requests answered with 500')
+    parser.add_argument('--latency-scale', type=float, default=None, help='Multiply every configured latency')
+    args = parser.parse_args()
+
+    engine = MockLLM.from_file(args.config)
+
+    patch = {}
+    if args.seed is not None:
+        patch['seed'] = args.seed
+    errors = {}
+    if args.rate_limit_rate is not None:
+        errors['rate_limit_rate'] = args.rate_limit_rate
+    if args.server_error_rate is not None:
+        errors['server_error_rate'] = args.server_error_rate
+    if errors:
+        patch['errors'] = errors
+    if args.latency_scale is not None:
+        config = engine.config
+        for endpoint in ('chat', 'embeddings'):
+            patch[endpoint] = {'latency_ms': scaled_latency(config[endpoint]['latency_ms'], args.latency_scale)}
+        patch['models'] = {
+            model: {
+                endpoint: {'latency_ms': scaled_latency(settings[endpoint]['latency_ms'], args.latency_scale)}
+                for endpoint in ('chat', 'embeddings')
+                if 'latency_ms' in (settings.get(endpoint) or {})
+            }
+            for model, settings in (config.get('models') or {}).items()
+        }
+    if patch:
+        engine.configure(patch)
+
+    print(f"Mock LLM listening on http://{args.host}:{args.port}/v1")
+    uvicorn.run(create_app(engine), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
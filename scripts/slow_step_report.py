@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Slow-step report for browser agent runs
+Usage: python scripts/slow_step_report.py [--dir timelines] [--by ats|domain] [--hours 168] [--top 20]
+
+Reads the step timelines the application runner stores under TIMELINE_DIR
+and ranks step types (navigation, input, upload, extraction, planning, ...)
+per ATS or domain by the total time they took, with their count, median,
+p90, slowest step and tokens.
+"""
+import argparse
+import os
+import statistics
+import sys
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Add services to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'services')))
+
+from persistence.src.timelines import TimelineStore
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def aggregate(timelines: Iterable[Dict[str, Any]], by: str) -> List[Dict[str, Any]]:
+    """One row per (ATS or domain, step type), slowest total first"""
+    groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for timeline in timelines:
+        key = timeline.get(by) or 'other'
+        for step in timeline.get('steps') or []:
+            group = groups.setdefault((key, step.get('type', 'other')), {'seconds': [], 'tokens': 0, 'errors': 0})
+            group['seconds'].append(float(step.get('s') or 0.0))
+            group['tokens'] += int(step.get('tokens') or 0)
+            group['errors'] += int(bool(step.get('error')))
+
+    rows = []
+    for (key, step_type), group in groups.items():
+        seconds = group['seconds']
+        rows.append({
+            by: key,
+            'step_type': step_type,
+            'steps': len(seconds),
+            'total_s': sum(seconds),
+            'p50_s': statistics.median(seconds),
+            'p90_s': percentile(seconds, 90),
+            'max_s': max(seconds),
+            'tokens': group['tokens'],
+            'errors': group['errors'],
+        })
+    return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank the slowest browser agent step types per ATS or domain')
+    parser.add_argument('--dir', default=None, help='Timeline directory (default: TIMELINE_DIR or ./timelines)')
+    parser.add_argument('--by', choices=('ats', 'domain'), default='ats', help='Group steps by ATS or domain')
+    parser.add_argument('--hours', type=float, default=None, help='Only timelines written in the last N hours')
+    parser.add_argument('--top', type=int, default=20, help='Rows to print')
+    args = parser.parse_args()
+
+    timelines = list(TimelineStore(args.dir).iter_timelines(args.hours))
+    if not timelines:
+        print("No step timelines found")
+        return
+
+    rows = aggregate(timelines, args.by)
+    total = sum(row['total_s'] for row in rows) or 1.0
+    print(f"{len(timelines)} runs, {sum(row['steps'] for row in rows)} steps, {total / 60:.1f} agent minutes\n")
+    print(f"{args.by:<28}{'step type':<12}{'steps':>7}{'total_s':>10}{'share':>7}"
+          f"{'p50_s':>8}{'p90_s':>8}{'max_s':>8}{'tokens':>10}{'errors':>8}")
+    for row in rows[:args.top]:
+        print(
+            f"{row[args.by][:27]:<28}{row['step_type']:<12}{row['steps']:>7}{row['total_s']:>10.1f}"
+            f"{row['total_s'] / total:>7.0%}{row['p50_s']:>8.1f}{row['p90_s']:>8.1f}{row['max_s']:>8.1f}"
+            f"{row['tokens']:>10}{row['errors']:>8}"
+        )
+
+
+if __name__ == '__main__':
+    main()
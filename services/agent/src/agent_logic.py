@@ -3,20 +3,31 @@ from browser_use import Agent
 from langchain_openai import ChatOpenAI
 from .rag_engine import KnowledgeBase
 from .agent_prompts import SYSTEM_PROMPT_TEMPLATE
+from .utils.llm_clients import get_client_registry
 
 class NyxVenatrixAgent:
     def __init__(self, kb: KnowledgeBase = None):
         self.kb = kb
-        # Initialize LLM
-        # Using Grok as configured in the environment
-        self.llm = ChatOpenAI(
-            base_url='https://api.grok.x.ai/v1',
-            api_key=os.getenv('GROK_API_KEY'),
-            model=os.getenv('AGENT_MODEL', 'grok-beta'),
-            max_tokens=int(os.getenv('MAX_TOKENS_PER_QUESTION', 512)) # Limit output tokens per question
-        )
+        self._llm = None
+        self._llm_async_client = None
         self.max_app_tokens = int(os.getenv('MAX_TOKENS_PER_APP', 7000))
 
+    @property
+    def llm(self) -> ChatOpenAI:
+        """Grok LLM on the shared xAI pools, rebuilt when run on another event loop"""
+        clients = get_client_registry()
+        async_client = clients.async_http_client('xai')
+        if self._llm is None or async_client is not self._llm_async_client:
+            self._llm = ChatOpenAI(
+                http_client=clients.http_client('xai'),
+                http_async_client=async_client,
+                **clients.credentials('xai'),
+                model=os.getenv('AGENT_MODEL', 'grok-beta'),
+                max_tokens=int(os.getenv('MAX_TOKENS_PER_QUESTION', 512)) # Limit output tokens per question
+            )
+            self._llm_async_client = async_client
+        return self._llm
+
     async def run(self, url: str):
         print(f"Starting application process for: {url}")
 
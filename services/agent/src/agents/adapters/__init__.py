@@ -0,0 +1,46 @@
+"""ATS adapters: per-board prompt hints, field maps, deterministic filling and URL dispatch"""
+
+import threading
+from typing import Optional
+
+from .base import ATSAdapter, FieldSpec
+from .field_filler import FieldFiller, FillReport, connect_page, match_option, profile_values
+from .greenhouse import GreenhouseAdapter
+from .registry import AdapterRegistry, HostTrie, KNOWN_BOARDS, UNKNOWN_ATS
+from .workday import WorkdayAdapter
+
+_registry: Optional[AdapterRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_adapter_registry() -> AdapterRegistry:
+    """Process-wide registry of the built-in adapters"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = AdapterRegistry([GreenhouseAdapter(), WorkdayAdapter()], boards=KNOWN_BOARDS)
+        return _registry
+
+
+def adapter_for(url: str) -> Optional[ATSAdapter]:
+    """The adapter for ``url``'s ATS, or None for unknown boards"""
+    return get_adapter_registry().resolve(url)
+
+
+__all__ = [
+    'ATSAdapter',
+    'AdapterRegistry',
+    'FieldFiller',
+    'FieldSpec',
+    'FillReport',
+    'GreenhouseAdapter',
+    'HostTrie',
+    'KNOWN_BOARDS',
+    'UNKNOWN_ATS',
+    'WorkdayAdapter',
+    'adapter_for',
+    'connect_page',
+    'get_adapter_registry',
+    'match_option',
+    'profile_values',
+]
@@ -1,5 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+import re
+
+
+@dataclass
+class FieldSpec:
+    """
+    A form input an adapter knows how to fill without the LLM.
+
+    ``key`` names the profile value (see field_filler.profile_values);
+    ``selectors`` are CSS selectors tried in order, the first match wins.
+    ``kind`` is one of text, select, file or checkbox. ``default`` is used
+    when the profile has no value (e.g. declining EEO questions).
+    """
+
+    key: str
+    selectors: List[str]
+    label: str
+    kind: str = 'text'
+    default: Optional[str] = None
+
 
 class ATSAdapter(ABC):
     """
@@ -7,10 +29,21 @@ class ATSAdapter(ABC):
     Adapters handle the nuances of different job boards (Workday, Greenhouse, etc.)
     """
 
-    @abstractmethod
+    # Short ATS name, used in logs and metric labels
+    name: str = 'other'
+    # Hosts served by this ATS, matched as suffixes ('greenhouse.io' covers boards.greenhouse.io)
+    host_suffixes: Tuple[str, ...] = ()
+    # Regexes on path and query for boards embedded on company domains
+    path_patterns: Tuple[str, ...] = ()
+
     def can_handle(self, url: str) -> bool:
         """Check if this adapter can handle the given URL."""
-        pass
+        parsed = urlparse(url or '')
+        host = (parsed.hostname or '').lower()
+        if any(host == suffix or host.endswith('.' + suffix) for suffix in self.host_suffixes):
+            return True
+        target = f"{parsed.path}?{parsed.query}"
+        return any(re.search(pattern, target, re.IGNORECASE) for pattern in self.path_patterns)
 
     @abstractmethod
     def get_instructions(self, effort_level: str) -> str:
@@ -21,3 +54,15 @@ class ATSAdapter(ABC):
     def get_stealth_config(self) -> Dict[str, Any]:
         """Get stealth configuration specific to this ATS."""
         pass
+
+    def get_field_specs(self) -> List[FieldSpec]:
+        """Inputs filled directly before the browser agent runs (none by default)."""
+        return []
+
+    def get_form_openers(self) -> List[str]:
+        """Selectors of buttons that reveal the application form, clicked if present."""
+        return []
+
+    def auth_tenant(self, url: str) -> Optional[str]:
+        """Tenant whose sign-in state is kept between applications, or None if the board has no accounts."""
+        return None
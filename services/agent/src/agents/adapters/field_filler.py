@@ -0,0 +1,247 @@
+"""
+Deterministic Field Filler
+Fills the inputs an ATS adapter maps (name, email, phone, resume upload,
+standard dropdowns) directly with Playwright before the browser agent runs,
+so the LLM only handles unmapped and free-text fields
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .base import ATSAdapter, FieldSpec
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Dropdown entries that are prompts rather than answers
+PLACEHOLDER_OPTIONS = {'', 'select', 'select...', 'please select', '--', '- select -', 'choose one'}
+
+if PROMETHEUS_AVAILABLE:
+    FORM_FIELDS_PREFILLED = Counter(
+        'form_fields_prefilled_total',
+        'Adapter-mapped form fields by outcome of the deterministic fill',
+        ['ats', 'outcome']
+    )
+else:
+    FORM_FIELDS_PREFILLED = None
+
+
+def profile_values(user_profile: Dict[str, Any], resume_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Flatten a user profile into the values FieldSpec keys refer to.
+
+    Args:
+        user_profile: User profile dict (config/profile.json layout)
+        resume_path: Resume file for upload fields
+
+    Returns:
+        Non-empty values keyed by first_name, last_name, full_name, email,
+        phone, city, country, postal_code, location, linkedin, github,
+        website and resume
+    """
+    name = str(user_profile.get('name') or '').strip()
+    parts = name.split()
+    location = user_profile.get('location') or {}
+    if isinstance(location, dict):
+        city = location.get('city')
+        country = location.get('country')
+        postal_code = location.get('postal_code')
+    else:
+        city, country, postal_code = str(location), None, None
+    links = user_profile.get('links') or {}
+
+    values = {
+        'first_name': user_profile.get('first_name') or (parts[0] if parts else None),
+        'last_name': user_profile.get('last_name') or ' '.join(parts[1:]),
+        'full_name': name,
+        'email': user_profile.get('email'),
+        'phone': user_profile.get('phone'),
+        'city': city,
+        'country': country,
+        'postal_code': postal_code,
+        'location': ', '.join(part for part in (city, country) if part),
+        'linkedin': user_profile.get('linkedin') or links.get('linkedin'),
+        'github': user_profile.get('github') or links.get('github'),
+        'website': user_profile.get('website') or links.get('website'),
+        'resume': resume_path,
+    }
+    return {key: str(value) for key, value in values.items() if value}
+
+
+def match_option(options: List[str], wanted: str) -> Optional[str]:
+    """
+    The dropdown option that best matches ``wanted``.
+
+    Exact (case-insensitive) matches win, then prefix matches either way,
+    then substring matches. Placeholder options never match.
+    """
+    target = wanted.strip().lower()
+    candidates = [(option, option.strip().lower()) for option in options]
+    candidates = [(option, text) for option, text in candidates if text not in PLACEHOLDER_OPTIONS]
+    for matches in (
+        lambda text: text == target,
+        lambda text: text.startswith(target) or target.startswith(text),
+        lambda text: target in text or text in target,
+    ):
+        for option, text in candidates:
+            if matches(text):
+                return option
+    return None
+
+
+@asynccontextmanager
+async def connect_page(session: Any, url: str) -> AsyncIterator[Any]:
+    """
+    Playwright page for the tab a browser-use session has open on ``url``.
+
+    Attaches over the session's CDP endpoint and detaches on exit; the
+    browser itself is never closed.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.connect_over_cdp(session.cdp_url)
+        pages = [page for context in browser.contexts for page in context.pages]
+        if not pages:
+            raise RuntimeError("Browser has no open page")
+        opened = [page for page in pages if page.url.startswith(url)]
+        yield (opened or [page for page in pages if page.url != 'about:blank'] or pages)[-1]
+
+
+@dataclass
+class FillReport:
+    """Outcome of the deterministic fill of one form"""
+
+    ats: str
+    filled: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class FieldFiller:
+    """
+    Fills adapter-mapped fields on an open page without the LLM.
+
+    Fills every FieldSpec whose input is on the page (see connect_page)
+    and whose value is known, and reports the labels it filled so the
+    agent's task can leave them alone.
+    Typing and pauses between fields follow the stealth randomization
+    settings. Anything it cannot fill is left to the browser agent.
+    """
+
+    def __init__(self, randomization: Optional[Dict[str, Any]] = None, action_timeout_ms: int = 3000):
+        """
+        Initialize field filler.
+
+        Args:
+            randomization: ``randomization`` section of stealth.yml
+            action_timeout_ms: Playwright timeout per field action
+        """
+        self.randomization = randomization or {}
+        self.action_timeout_ms = action_timeout_ms
+
+    async def fill_page(self, page: Any, adapter: ATSAdapter, values: Dict[str, str]) -> FillReport:
+        """Fill the adapter's fields on a Playwright page"""
+        started = time.perf_counter()
+        report = FillReport(ats=adapter.name)
+
+        await self._open_form(page, adapter)
+        for spec in adapter.get_field_specs():
+            value = values.get(spec.key) or spec.default
+            locator = await self._locate(page, spec) if value else None
+            if locator is None:
+                report.missing.append(spec.label)
+                continue
+            try:
+                await self._pause()
+                await self._fill(locator, spec, value)
+                report.filled.append(spec.label)
+            except Exception as e:
+                report.failed[spec.label] = str(e)
+
+        report.seconds = time.perf_counter() - started
+        self._export(report)
+        logger.info(
+            f"Prefilled {len(report.filled)} {adapter.name} fields in {report.seconds:.2f}s "
+            f"({len(report.missing)} not on page, {len(report.failed)} failed)"
+        )
+        if report.failed:
+            logger.debug(f"Fields left to the agent after errors: {report.failed}")
+        return report
+
+    async def _open_form(self, page: Any, adapter: ATSAdapter) -> None:
+        for selector in adapter.get_form_openers():
+            button = page.locator(selector).first
+            try:
+                if await button.count() and await button.is_visible():
+                    await button.click(timeout=self.action_timeout_ms)
+                    return
+            except Exception as e:
+                logger.debug(f"Form opener {selector} not clickable: {e}")
+
+    async def _locate(self, page: Any, spec: FieldSpec) -> Optional[Any]:
+        """First selector matching an input that can be filled"""
+        for selector in spec.selectors:
+            locator = page.locator(selector).first
+            if not await locator.count():
+                continue
+            # File inputs are usually hidden behind a styled button
+            if spec.kind == 'file' or await locator.is_visible():
+                return locator
+        return None
+
+    async def _fill(self, locator: Any, spec: FieldSpec, value: str) -> None:
+        timeout = self.action_timeout_ms
+        if spec.kind == 'file':
+            if not os.path.exists(value):
+                raise FileNotFoundError(value)
+            await locator.set_input_files(value, timeout=timeout)
+        elif spec.kind == 'select':
+            options = await locator.evaluate("el => Array.from(el.options).map(o => o.label || o.text)")
+            option = match_option(options, value)
+            if option is None:
+                raise ValueError(f"No option matching {value!r}")
+            await locator.select_option(label=option, timeout=timeout)
+        elif spec.kind == 'checkbox':
+            if value.strip().lower() in ('true', 'yes', '1'):
+                await locator.check(timeout=timeout)
+        else:
+            await locator.fill('', timeout=timeout)
+            delay = self._keystroke_delay_ms()
+            if delay:
+                await locator.press_sequentially(value, delay=delay, timeout=timeout + delay * len(value))
+            else:
+                await locator.fill(value, timeout=timeout)
+
+    def _keystroke_delay_ms(self) -> float:
+        config = self.randomization.get('keystroke_delay_ms')
+        if not config:
+            return 0
+        delay = random.gauss(config.get('mean', 120), config.get('stddev', 40))
+        return max(config.get('min', 50), min(config.get('max', 300), delay))
+
+    async def _pause(self) -> None:
+        config = self.randomization.get('inter_field_pause_sec')
+        if config:
+            await asyncio.sleep(random.uniform(config.get('min', 0.3), config.get('max', 2.0)))
+
+    @staticmethod
+    def _export(report: FillReport) -> None:
+        if FORM_FIELDS_PREFILLED is None:
+            return
+        for outcome, count in (('filled', len(report.filled)), ('missing', len(report.missing)),
+                               ('failed', len(report.failed))):
+            if count:
+                FORM_FIELDS_PREFILLED.labels(ats=report.ats, outcome=outcome).inc(count)
@@ -1,13 +1,19 @@
-from typing import Dict, Any
-from .base import ATSAdapter
+from typing import Dict, Any, List
+from .base import ATSAdapter, FieldSpec
+
+# Answer for the voluntary self-identification (EEO) dropdowns
+DECLINE = "Decline To Self Identify"
 
 class GreenhouseAdapter(ATSAdapter):
     """
     Adapter for Greenhouse ATS.
+    Covers the classic boards.greenhouse.io form and the newer job-boards layout.
     """
 
-    def can_handle(self, url: str) -> bool:
-        return "greenhouse.io" in url or "gh_jid" in url
+    name = 'greenhouse'
+    host_suffixes = ('greenhouse.io',)
+    # Company career pages embedding the Greenhouse form
+    path_patterns = (r'[?&]gh_jid=',)
 
     def get_instructions(self, effort_level: str) -> str:
         base_instructions = """
@@ -28,3 +34,26 @@ class GreenhouseAdapter(ATSAdapter):
             "inter_action_delay": 1.5,
             "typing_delay_multiplier": 1.2
         }
+
+    def get_field_specs(self) -> List[FieldSpec]:
+        return [
+            FieldSpec('first_name', ['#first_name', 'input[name="job_application[first_name]"]'], 'First Name'),
+            FieldSpec('last_name', ['#last_name', 'input[name="job_application[last_name]"]'], 'Last Name'),
+            FieldSpec('email', ['#email', 'input[name="job_application[email]"]'], 'Email'),
+            FieldSpec('phone', ['#phone', 'input[name="job_application[phone]"]'], 'Phone'),
+            FieldSpec('location', ['#candidate-location', '#job_application_location'], 'Location (City)'),
+            FieldSpec('linkedin', ['input[autocomplete="custom-question-linkedin-profile"]',
+                                   'input[aria-label*="LinkedIn" i]'], 'LinkedIn Profile'),
+            FieldSpec('website', ['input[aria-label*="Website" i]'], 'Website'),
+            FieldSpec('resume', ['#resume', 'input[type="file"][name="resume"]',
+                                 '#resume_fieldset input[type="file"]'], 'Resume/CV', kind='file'),
+            FieldSpec('gender', ['#job_application_gender', 'select#gender'], 'Gender', kind='select', default=DECLINE),
+            FieldSpec('race', ['#job_application_race', 'select#race'], 'Race', kind='select', default=DECLINE),
+            FieldSpec('veteran_status', ['#job_application_veteran_status', 'select#veteran_status'],
+                      'Veteran Status', kind='select', default="I don't wish to answer"),
+            FieldSpec('disability_status', ['#job_application_disability_status', 'select#disability_status'],
+                      'Disability Status', kind='select', default="I do not want to answer"),
+        ]
+
+    def get_form_openers(self) -> List[str]:
+        return ['a[href="#app"]', 'button:has-text("Apply for this Job")']
@@ -0,0 +1,223 @@
+"""
+ATS Adapter Registry
+Dispatches URLs to their ATS adapter through a reversed-label host trie and
+path patterns, and keeps per-adapter throughput and success statistics
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+
+from .base import ATSAdapter
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Label for URLs no adapter handles
+UNKNOWN_ATS = 'other'
+
+# Job boards without an adapter: host suffix -> ATS label. They get a metrics
+# label and a shared rate-limit domain (de.indeed.com counts as indeed.com),
+# but no form-filling hints
+KNOWN_BOARDS = {
+    'lever.co': 'lever',
+    'ashbyhq.com': 'ashby',
+    'smartrecruiters.com': 'smartrecruiters',
+    'recruitee.com': 'recruitee',
+    'personio.de': 'personio',
+    'personio.com': 'personio',
+    'linkedin.com': 'linkedin',
+    'indeed.com': 'indeed',
+    'indeed.de': 'indeed',
+    'stepstone.de': 'stepstone',
+    'glassdoor.com': 'glassdoor',
+}
+
+if PROMETHEUS_AVAILABLE:
+    ATS_APPLICATIONS = Counter(
+        'ats_adapter_applications_total',
+        'Form-filling runs per ATS adapter by outcome',
+        ['ats', 'outcome']
+    )
+else:
+    ATS_APPLICATIONS = None
+
+
+class HostTrie:
+    """
+    Host suffixes stored label by label from the right.
+
+    ``boards.greenhouse.io`` lives under io -> greenhouse -> boards, so a
+    lookup walks the host's labels once and returns the longest registered
+    suffix: O(label count), independent of how many suffixes exist.
+    """
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, suffix: str, value: Any) -> None:
+        node = self._root
+        for label in reversed(suffix.lower().strip('.').split('.')):
+            node = node.setdefault(label, {})
+        node[None] = (suffix, value)
+
+    def longest_match(self, host: str) -> Optional[Tuple[str, Any]]:
+        """(suffix, value) of the longest registered suffix of ``host``"""
+        node = self._root
+        match = None
+        for label in reversed((host or '').lower().split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(None, match)
+        return match
+
+
+@dataclass
+class AdapterStats:
+    """Form-filling outcomes of one adapter in this worker"""
+
+    applications: int = 0
+    succeeded: int = 0
+    seconds: float = 0.0
+    first_at: Optional[float] = None
+
+    def row(self, ats: str, now: float) -> Dict[str, Any]:
+        window_hours = (now - self.first_at) / 3600 if self.first_at else 0.0
+        return {
+            'ats': ats,
+            'applications': self.applications,
+            'succeeded': self.succeeded,
+            'failed': self.applications - self.succeeded,
+            'success_rate': round(self.succeeded / self.applications, 3) if self.applications else 0.0,
+            'avg_seconds': round(self.seconds / self.applications, 2) if self.applications else 0.0,
+            # Runs per hour since this adapter's first run in the worker
+            'per_hour': round(self.applications / window_hours, 2) if window_hours else 0.0,
+        }
+
+
+class AdapterRegistry:
+    """
+    Maps URLs to ATS adapters for ingestion, rate limiting and form filling.
+
+    Adapters are indexed by their ``host_suffixes`` (a HostTrie, longest
+    suffix wins) and, for boards embedded on company domains, by their
+    ``path_patterns`` matched against the URL's path and query. Boards
+    without an adapter are indexed by host suffix with their label only.
+    This is the one host table for ATS labels and rate-limit domains.
+    """
+
+    def __init__(self, adapters: Optional[List[ATSAdapter]] = None, boards: Optional[Dict[str, str]] = None):
+        """
+        Initialize adapter registry.
+
+        Args:
+            adapters: ATS adapters to dispatch to
+            boards: Host suffix -> ATS label of boards without an adapter
+        """
+        self._hosts = HostTrie()
+        self._patterns: List[Tuple[Pattern, ATSAdapter]] = []
+        self._adapters: Dict[str, ATSAdapter] = {}
+        self._stats: Dict[str, AdapterStats] = {}
+        self._lock = threading.Lock()
+        for suffix, name in (boards or {}).items():
+            self.register_board(suffix, name)
+        for adapter in adapters or []:
+            self.register(adapter)
+
+    @property
+    def adapters(self) -> List[ATSAdapter]:
+        return list(self._adapters.values())
+
+    def register(self, adapter: ATSAdapter) -> None:
+        """Index an adapter by its host suffixes and path patterns"""
+        self._adapters[adapter.name] = adapter
+        for suffix in adapter.host_suffixes:
+            self._hosts.insert(suffix, (adapter.name, adapter))
+        for pattern in adapter.path_patterns:
+            self._patterns.append((re.compile(pattern, re.IGNORECASE), adapter))
+
+    def register_board(self, suffix: str, name: str) -> None:
+        """Index a board without an adapter by host suffix, for its label and rate-limit domain"""
+        self._hosts.insert(suffix, (name, None))
+
+    def lookup(self, url: str) -> Tuple[str, Optional[ATSAdapter]]:
+        """
+        ATS label and adapter of ``url``.
+
+        Returns:
+            (name, adapter): the adapter is None for boards without one,
+            and the name is 'other' for unknown boards
+        """
+        parsed = urlparse(url or '')
+        match = self._hosts.longest_match(parsed.hostname or '')
+        if match is not None:
+            return match[1]
+        target = f"{parsed.path}?{parsed.query}" if parsed.query else parsed.path
+        for pattern, adapter in self._patterns:
+            if pattern.search(target):
+                return adapter.name, adapter
+        return UNKNOWN_ATS, None
+
+    def resolve(self, url: str) -> Optional[ATSAdapter]:
+        """The adapter for ``url``, or None for boards without one"""
+        return self.lookup(url)[1]
+
+    def ats_name(self, url: str) -> str:
+        """ATS label for ``url`` ('other' when unknown)"""
+        return self.lookup(url)[0]
+
+    def rate_limit_domain(self, url: str) -> str:
+        """
+        Domain whose rate-limit policy covers ``url``.
+
+        Hosts under a registered suffix share it (every
+        boards.greenhouse.io company counts against greenhouse.io,
+        de.indeed.com against indeed.com); other URLs use their host
+        without ``www.``.
+        """
+        host = (urlparse(url or '').hostname or '').lower()
+        match = self._hosts.longest_match(host)
+        if match is not None:
+            return match[0]
+        return host[4:] if host.startswith('www.') else host
+
+    def record(self, url: str, success: bool, seconds: float) -> None:
+        """Count one form-filling run against the URL's adapter"""
+        ats = self.ats_name(url)
+        now = time.time()
+        with self._lock:
+            stats = self._stats.setdefault(ats, AdapterStats())
+            stats.applications += 1
+            stats.succeeded += int(success)
+            stats.seconds += max(seconds, 0.0)
+            stats.first_at = stats.first_at or now
+        if ATS_APPLICATIONS is not None:
+            ATS_APPLICATIONS.labels(ats=ats, outcome='success' if success else 'failure').inc()
+
+    def stats_table(self) -> List[Dict[str, Any]]:
+        """Per-adapter throughput and success rows, busiest first"""
+        now = time.time()
+        with self._lock:
+            rows = [stats.row(ats, now) for ats, stats in self._stats.items()]
+        return sorted(rows, key=lambda row: row['applications'], reverse=True)
+
+    def format_stats(self) -> str:
+        """stats_table() as a fixed-width text table"""
+        header = f"{'ATS':<16}{'apps':>6}{'ok':>6}{'failed':>8}{'success':>9}{'avg_s':>8}{'per_h':>8}"
+        lines = [header]
+        for row in self.stats_table():
+            lines.append(
+                f"{row['ats']:<16}{row['applications']:>6}{row['succeeded']:>6}{row['failed']:>8}"
+                f"{row['success_rate']:>9.1%}{row['avg_seconds']:>8.1f}{row['per_hour']:>8.1f}"
+            )
+        return '\n'.join(lines)
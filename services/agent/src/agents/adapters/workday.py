@@ -1,14 +1,19 @@
-from typing import Dict, Any
-from .base import ATSAdapter
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+from .base import ATSAdapter, FieldSpec
 
 class WorkdayAdapter(ATSAdapter):
     """
     Adapter for Workday ATS.
     Workday is complex, often requiring account creation/login and multi-step wizards.
+    Field specs cover the "My Information" step, addressed by data-automation-id.
+    Accounts are per company tenant (acme.wd5.myworkdayjobs.com), so the
+    sign-in state is kept per tenant host.
     """
 
-    def can_handle(self, url: str) -> bool:
-        return "myworkdayjobs.com" in url or "workday" in url
+    name = 'workday'
+    host_suffixes = ('myworkdayjobs.com', 'myworkdaysite.com', 'workday.com')
+    path_patterns = (r'/wday/cxs/',)
 
     def get_instructions(self, effort_level: str) -> str:
         return """
@@ -25,3 +30,17 @@ class WorkdayAdapter(ATSAdapter):
             "inter_action_delay": 2.5, # Workday is slower and more sensitive
             "typing_delay_multiplier": 1.5
         }
+
+    def get_field_specs(self) -> List[FieldSpec]:
+        return [
+            FieldSpec('first_name', ['input[data-automation-id="legalNameSection_firstName"]'], 'Given Name(s)'),
+            FieldSpec('last_name', ['input[data-automation-id="legalNameSection_lastName"]'], 'Family Name'),
+            FieldSpec('email', ['input[data-automation-id="email"]'], 'Email Address'),
+            FieldSpec('phone', ['input[data-automation-id="phone-number"]'], 'Phone Number'),
+            FieldSpec('city', ['input[data-automation-id="addressSection_city"]'], 'City'),
+            FieldSpec('postal_code', ['input[data-automation-id="addressSection_postalCode"]'], 'Postal Code'),
+            FieldSpec('resume', ['input[data-automation-id="file-upload-input-ref"]'], 'Resume/CV', kind='file'),
+        ]
+
+    def auth_tenant(self, url: str) -> Optional[str]:
+        return (urlparse(url or '').hostname or '').lower() or None
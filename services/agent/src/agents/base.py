@@ -3,18 +3,48 @@ from typing import Any, Dict, Optional
 from browser_use.llm.openai.chat import ChatOpenAI
 import os
 
+from ..utils.llm_clients import get_client_registry
+
 class BaseAgent:
     def __init__(self, model_name: str = "grok-4-1-fast-reasoning"):
-        api_key = os.getenv('GROK_API_KEY')
-        if not api_key:
+        credentials = get_client_registry().credentials('xai')
+        if not credentials['api_key']:
             raise RuntimeError("GROK_API_KEY must be set to initialize the agent LLM")
 
-        self.llm = ChatOpenAI(
-            base_url='https://api.x.ai/v1',
-            api_key=api_key,
-            model=os.getenv('AGENT_MODEL', model_name),
-            temperature=float(os.getenv('AGENT_MODEL_TEMPERATURE', '0.7'))
-        )
+        self.model_name = os.getenv('AGENT_MODEL', model_name)
+        self.temperature = float(os.getenv('AGENT_MODEL_TEMPERATURE', '0.7'))
+        self._llm: Optional[ChatOpenAI] = None
+        self._llm_http_client = None
+
+    @property
+    def llm(self) -> ChatOpenAI:
+        """
+        Agent LLM on the shared xAI pool of the running event loop.
+
+        Agents are built outside the worker loops that run them, and a pooled
+        async client only works on the loop that created it, so the LLM is
+        built on first use and rebuilt when the registry hands out another
+        loop's client.
+        """
+        if self._llm is not None and self._llm_http_client is None:
+            return self._llm
+        clients = get_client_registry()
+        http_client = clients.async_http_client('xai')
+        if self._llm is None or http_client is not self._llm_http_client:
+            self._llm = ChatOpenAI(
+                model=self.model_name,
+                temperature=self.temperature,
+                http_client=http_client,
+                **clients.credentials('xai')
+            )
+            self._llm_http_client = http_client
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm: ChatOpenAI) -> None:
+        """Use ``llm`` as is, on whatever loop runs the agent"""
+        self._llm = llm
+        self._llm_http_client = None
 
     async def run(self, inputs: Dict[str, Any]) -> Any:
         raise NotImplementedError("Subclasses must implement run()")
@@ -1,11 +1,26 @@
 """Enhanced Form Filler with Answer Generation and Stealth"""
 
 from .base import BaseAgent
-from typing import Dict, Any, Optional
+from .adapters import FieldFiller, connect_page, get_adapter_registry, profile_values
+from ..browser.auth_state import count_auth_event, restore_state, scope_state
+from ..browser.form_schema import FormField, FormSchema, read_form_fields
+from ..browser.pool import BROWSER_ARGS, get_browser_pool
+from ..browser.progress_guard import ProgressGuard
+from ..browser.resource_blocking import BlockingPolicy, PageLoad, RequestBlocker, measure_page, record_page_load
+from ..observability.stage_metrics import StageTimer, ats_label
+from ..observability.step_timeline import StepTimeline
+from ..generation.answer_bank import profile_version
+from ..generation.generation_planner import GenerationPlanner
+from ..planning.budget import AgentLimits, current_meter, usage_tokens
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional
 from browser_use import Agent as BrowserAgent
+from persistence.src.async_repository import AsyncRepository
 from uuid import UUID
 import asyncio
 import random
+import time
 import yaml
 import os
 import logging
@@ -13,6 +28,23 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PagePrep:
+    """What was learned and done on the open form before the agent started"""
+
+    prefilled: List[str] = field(default_factory=list)
+    fingerprint: Optional[str] = None
+    first_page: List[FormField] = field(default_factory=list)
+    schema: Optional[FormSchema] = None
+    page_loads: List[PageLoad] = field(default_factory=list)
+    blocked_requests: int = 0
+    # Sign-in state of the ATS tenant (see AuthStateStore)
+    auth_tenant: Optional[str] = None
+    account: Optional[str] = None
+    auth_restored: bool = False
+    auth_state: Optional[Dict[str, Any]] = None
+
+
 class EnhancedFormFiller(BaseAgent):
     """
     Enhanced form filler with:
@@ -21,6 +53,13 @@ class EnhancedFormFiller(BaseAgent):
     - CAPTCHA handling via 2captcha
     - 2FA notifications via Telegram
     - Multi-step form navigation
+    - Warm browsers leased from the worker's BrowserPool
+    - Adapter-mapped fields filled directly, before the LLM agent runs
+    - Form layouts learned per domain, reused to pre-plan answers
+    - Media, fonts and third-party trackers blocked on pooled browsers
+    - Sign-in state kept per ATS tenant, so repeat applications skip login
+    - Step and token caps per effort level and ATS, with early stops on
+      stalls, repeated actions and the review page
     """
 
     def __init__(
@@ -28,7 +67,14 @@ class EnhancedFormFiller(BaseAgent):
         answer_generator,
         stealth_config_path: Optional[str] = None,
         captcha_solver=None,
-        telegram_notifier=None
+        telegram_notifier=None,
+        answer_bank=None,
+        template_engine=None,
+        browser_pool=None,
+        field_filler=None,
+        form_schemas=None,
+        auth_states=None,
+        effort_policy_path: Optional[str] = None
     ):
         """
         Initialize enhanced form filler.
@@ -38,22 +84,49 @@ class EnhancedFormFiller(BaseAgent):
             stealth_config_path: Path to stealth.yml config
             captcha_solver: Optional CaptchaSolver instance
             telegram_notifier: Optional TelegramNotifier instance
+            answer_bank: Optional AnswerBank consulted before generating answers
+            template_engine: Optional TemplateEngine for zero-LLM LOW effort content
+            browser_pool: BrowserPool to lease browsers from (default: the
+                worker's pool; BROWSER_POOL_SIZE=0 launches one per application)
+            field_filler: FieldFiller for adapter-mapped fields (default: one
+                using the stealth timings; DETERMINISTIC_FILL=false disables it)
+            form_schemas: Optional FormSchemaCache of previously seen forms
+            auth_states: Optional AuthStateStore of ATS tenant sign-ins
+            effort_policy_path: Path to effort_policy.yml, for the browser
+                agent's step caps and early-termination rules
         """
         super().__init__()
         self.answer_gen = answer_generator
         self.captcha_solver = captcha_solver
         self.telegram_notifier = telegram_notifier
-
-        # Load stealth config
+        self.answer_bank = answer_bank
+        self.generation = GenerationPlanner(answer_generator, answer_bank, template_engine)
+        self.browser_pool = browser_pool if browser_pool is not None else get_browser_pool()
+        self.form_schemas = form_schemas
+        self.auth_states = AsyncRepository.wrap(auth_states)
+        self.adapters = get_adapter_registry()
+
+        # Load stealth config and effort policy
+        from pathlib import Path
+        project_root = Path(__file__).parents[4]
         if stealth_config_path is None:
-            from pathlib import Path
-            project_root = Path(__file__).parents[4]
             stealth_config_path = project_root / 'config' / 'stealth.yml'
+        if effort_policy_path is None:
+            effort_policy_path = project_root / 'config' / 'effort_policy.yml'
 
         with open(stealth_config_path, 'r') as f:
             self.stealth_config = yaml.safe_load(f)
+        with open(effort_policy_path, 'r') as f:
+            self.effort_policy = yaml.safe_load(f) or {}
 
         self.randomization = self.stealth_config.get('randomization', {})
+        self.blocking = BlockingPolicy(self.stealth_config.get('resource_blocking'))
+        if os.getenv('RESOURCE_BLOCKING', 'true').lower() != 'true':
+            self.blocking.enabled = False
+
+        if field_filler is None and os.getenv('DETERMINISTIC_FILL', 'true').lower() == 'true':
+            field_filler = FieldFiller(self.randomization)
+        self.field_filler = field_filler
 
         captcha_status = "enabled" if captcha_solver else "disabled"
         telegram_status = "enabled" if telegram_notifier else "disabled"
@@ -67,7 +140,11 @@ class EnhancedFormFiller(BaseAgent):
         job_description: str,
         user_profile: Dict,
         effort_level: str = "medium",
-        resume_path: Optional[str] = None
+        resume_path: Optional[str] = None,
+        cover_letter: Optional[str] = None,
+        screening_answers: Optional[Dict[str, str]] = None,
+        known_questions: Optional[List[str]] = None,
+        on_timeline: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Fill job application form with stealth and answer generation.
@@ -80,69 +157,163 @@ class EnhancedFormFiller(BaseAgent):
             user_profile: User profile dict
             effort_level: low/medium/high
             resume_path: Path to resume file
+            cover_letter: Pre-generated cover letter (skips generation)
+            screening_answers: Pre-drafted answers keyed by question text
+            known_questions: Questions to draft up front when no answers were
+                prepared; generated concurrently with the cover letter
+            on_timeline: Called with the step timeline (StepTimeline.to_dict)
+                of the steps taken so far when the run is cancelled, e.g. by
+                the browser's wall-clock budget
 
         Returns:
-            Result dict with status, summary, answers_generated
+            Result dict with status, summary, answers_generated,
+            stage_timings (seconds per stage), token_usage (the browser
+            agent's own LLM tokens, once it has run) and step_timeline
+            (its steps, see StepTimeline.to_dict; a failed run has the steps
+            taken before it failed). A run the progress guard
+            ended early has a stop_reason; at the review page its status is
+            'filled', otherwise 'partial'
         """
         logger.info(f"Filling application: {job_title} at {company_name} (effort: {effort_level})")
-
-        # Generate cover letter if medium or high effort
-        cover_letter = None
-        if effort_level.lower() in ['medium', 'high']:
-            logger.info("Generating cover letter...")
-            cover_letter = self.answer_gen.generate_cover_letter(
+        timer = StageTimer(ats=ats_label(url))
+
+        # Generate whatever was not prepared: cover letter (medium/high effort,
+        # or a LOW template) and known screening questions, all in one concurrent
+        # fan-out that runs while the browser waits out the stealth delay,
+        # launches and opens the form; the task awaits it at the point of use
+        needs_cover_letter = cover_letter is None and self.generation.wants_cover_letter(effort_level)
+        questions = [] if screening_answers is not None else list(known_questions or [])
+        generation = None
+        if needs_cover_letter or questions:
+            logger.info(f"Generating {'cover letter and ' if needs_cover_letter else ''}{len(questions)} answers...")
+            generation = asyncio.ensure_future(self.generation.generate(
                 job_title=job_title,
                 company_name=company_name,
                 job_description=job_description,
                 user_profile=user_profile,
-                effort_level=effort_level
-            )
-
-        # Add pre-fill delay (stealth)
-        await self._random_delay('inter_application_pause_sec')
+                effort_level=effort_level,
+                questions=questions,
+                include_cover_letter=needs_cover_letter
+            ))
+
+        page_prep = PagePrep()
+
+        async def browser_task(prep: PagePrep) -> str:
+            """Task text, once the generated content it embeds is ready"""
+            nonlocal cover_letter, screening_answers, page_prep
+            page_prep = prep
+
+            # A known form's free-text questions are drafted before the agent
+            # reaches them, alongside the rest of the content
+            known = set(questions) | set(screening_answers or {})
+            planned_questions = [q for q in (prep.schema.questions() if prep.schema else []) if q not in known]
+            planned = None
+            if planned_questions:
+                logger.info(f"Pre-planning {len(planned_questions)} answers from the cached form schema")
+                planned = asyncio.ensure_future(self.generation.generate(
+                    job_title=job_title,
+                    company_name=company_name,
+                    job_description=job_description,
+                    user_profile=user_profile,
+                    effort_level=effort_level,
+                    questions=planned_questions,
+                    include_cover_letter=False
+                ))
 
-        # Build browser task
-        task = self._build_browser_task(
-            url=url,
-            user_profile=user_profile,
-            cover_letter=cover_letter,
-            effort_level=effort_level,
-            resume_path=resume_path
-        )
+            try:
+                if generation is not None or planned is not None:
+                    # Only the generation time not hidden behind the browser
+                    # stages is on the critical path
+                    with timer.stage('cover_letter' if needs_cover_letter else 'screening_answers'):
+                        generated = await generation if generation is not None else None
+                        pre_planned = await planned if planned is not None else None
+                    if generated is not None:
+                        logger.info(f"Content ready after {generated.wall_seconds:.2f}s of generation")
+                        if needs_cover_letter:
+                            cover_letter = generated.cover_letter
+                        if questions:
+                            screening_answers = generated.answers
+                    if pre_planned is not None:
+                        screening_answers = {**pre_planned.answers, **(screening_answers or {})}
+            finally:
+                if planned is not None and not planned.done():
+                    planned.cancel()
+
+            return self._build_browser_task(
+                url=url,
+                user_profile=user_profile,
+                cover_letter=cover_letter,
+                effort_level=effort_level,
+                resume_path=resume_path,
+                screening_answers=screening_answers,
+                prefilled=prep.prefilled,
+                form_schema=prep.schema,
+                signed_in=prep.auth_restored
+            )
 
         # Prepare tools
         tools = []
         if self.captcha_solver:
             tools.append(self._solve_captcha)
 
+        # The run's token cap is bounded by what the application has left
+        meter = current_meter()
+        limits = AgentLimits.from_policy(
+            self.effort_policy, effort_level, timer.ats,
+            remaining_tokens=meter.remaining_tokens if meter is not None else None
+        )
+        guard = ProgressGuard(limits, timer.ats)
+        run_started = time.time()
+        status = "error"
         try:
-            # Execute with browser-use
-            # Note: browser-use will use headless mode by default in WSL
-            browser_agent = BrowserAgent(
-                task=task,
-                llm=self.llm,
-                # tools=tools, # Uncomment when browser_use supports tools list directly
-                browser_kwargs={
-                    'headless': True,  # Force headless in WSL
-                    'args': [
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                    ]
-                }
-            )
+            # Add pre-fill delay (stealth)
+            with timer.stage('stealth_delay'):
+                await self._random_delay('inter_application_pause_sec')
+            run_started = time.time()
 
+            # Execute with browser-use on a pooled browser when available
+            # Note: browser-use will use headless mode by default in WSL
             logger.info("Starting browser automation (headless mode)...")
-            history = await browser_agent.run()
+            history = await self._run_browser_agent(
+                url, browser_task, timer, profile_values(user_profile, resume_path), guard
+            )
+            timeline = StepTimeline.from_history(history, url, timer.ats)
+            timeline.export()
             result = history.final_result()
+            run_info = {
+                "cover_letter_generated": cover_letter is not None,
+                "effort_level": effort_level,
+                "stage_timings": timer.as_dict(),
+                "token_usage": self._browser_usage(history, getattr(self.llm, 'model', None)),
+                "prefilled_fields": page_prep.prefilled,
+                "blocked_requests": page_prep.blocked_requests,
+                "page_bytes": sum(load.bytes for load in page_prep.page_loads),
+                "form_schema_hit": page_prep.schema is not None,
+                "step_timeline": timeline.to_dict()
+            }
+
+            if result is None and guard.stop_reason is not None:
+                # Stopped by the guard before the agent reported back: the
+                # review page is the task's goal, anything else is partial
+                status = 'filled' if guard.stop_reason == 'review_reached' else 'partial'
+                if status == 'filled' and page_prep.fingerprint and self.form_schemas is not None:
+                    await self.form_schemas.learn(url, page_prep.fingerprint, page_prep.first_page, history, timer.ats)
+                await self._store_auth(page_prep, timer.ats, succeeded=status == 'filled')
+                return {
+                    "status": status,
+                    "summary": self._stop_summary(guard),
+                    "stop_reason": guard.stop_reason,
+                    "details": guard.to_dict(),
+                    **run_info
+                }
 
             if result is None:
                 logger.error("Browser agent returned None result")
+                await self._store_auth(page_prep, timer.ats, succeeded=False)
                 return {
                     "status": "error",
                     "summary": "Browser agent failed to return a result (possible connection error)",
-                    "cover_letter_generated": cover_letter is not None,
-                    "effort_level": effort_level
+                    **run_info
                 }
 
             logger.info(f"Browser automation completed: {result[:100]}")
@@ -167,23 +338,294 @@ class EnhancedFormFiller(BaseAgent):
                 logger.warning(f"Failed to parse browser result as JSON: {e}")
                 parsed_result = {"summary": result}
 
+            if status in ('filled', 'success') and page_prep.fingerprint and self.form_schemas is not None:
+                await self.form_schemas.learn(url, page_prep.fingerprint, page_prep.first_page, history, timer.ats)
+            await self._store_auth(page_prep, timer.ats, succeeded=status in ('filled', 'success'))
+
             # Parse result
             return {
                 "status": status,
                 "summary": parsed_result.get('summary', result),
                 "details": parsed_result,
-                "cover_letter_generated": cover_letter is not None,
-                "effort_level": effort_level
+                **run_info
             }
 
+        except asyncio.CancelledError:
+            if on_timeline is not None:
+                timeline = StepTimeline.from_steps(guard.history, url, timer.ats)
+                timeline.export()
+                on_timeline(timeline.to_dict())
+            raise
         except Exception as e:
             logger.error(f"Form filling failed: {e}")
+            if 'form_fill' not in timer.durations:
+                timer.record('form_fill', time.time() - run_started)
+            # The agent's history is lost with the exception; the guard saw
+            # every step it finished
+            timeline = StepTimeline.from_steps(guard.history, url, timer.ats)
+            timeline.export()
             return {
                 "status": "error",
                 "summary": str(e),
                 "cover_letter_generated": cover_letter is not None,
-                "effort_level": effort_level
+                "effort_level": effort_level,
+                "stage_timings": timer.as_dict(),
+                "step_timeline": timeline.to_dict()
             }
+        finally:
+            if generation is not None and not generation.done():
+                # The browser failed before it needed the content
+                generation.cancel()
+            self.adapters.record(url, status in ('filled', 'success'), time.time() - run_started)
+
+    async def _run_browser_agent(
+        self,
+        url: str,
+        task: Callable[[PagePrep], Awaitable[str]],
+        timer: StageTimer,
+        field_values: Optional[Dict[str, str]] = None,
+        guard: Optional[ProgressGuard] = None
+    ):
+        """
+        Run a browser-use agent and return its history.
+
+        ``task`` resolves to the task text, given what was done on the page
+        beforehand, once the content it embeds is ready. With a pool, a warm
+        browser is leased, opened on ``url`` and prepared (form schema
+        looked up, adapter-mapped fields filled from ``field_values``)
+        before that, so launch, first navigation and preparation overlap
+        generation; a cancelled run discards the browser. Pooled browsers
+        also get the ATS's resource blocking profile and page-load metrics.
+        Without a pool the agent launches and owns its own browser once the
+        task is ready. ``guard`` caps the run's steps and ends it early when
+        it stops making progress; on a pooled browser it also watches the page.
+        """
+        run_kwargs = {}
+        if guard is not None:
+            run_kwargs['on_step_end'] = guard
+            if guard.limits.max_steps:
+                run_kwargs['max_steps'] = guard.limits.max_steps
+
+        if self.browser_pool is None:
+            browser_agent = BrowserAgent(
+                task=await task(PagePrep()),
+                llm=self.llm,
+                # tools=tools, # Uncomment when browser_use supports tools list directly
+                browser_kwargs={
+                    'headless': True,  # Force headless in WSL
+                    'args': list(BROWSER_ARGS)
+                }
+            )
+            run_started = time.time()
+            try:
+                history = await browser_agent.run(**run_kwargs)
+            except asyncio.CancelledError:
+                # Budget timeout: release the browser before propagating
+                logger.warning("Browser automation cancelled, closing browser")
+                await self._close_browser(browser_agent)
+                raise
+            self._record_browser_stages(timer, history, run_started, time.time())
+            return history
+
+        async with self.browser_pool.lease(url) as lease:
+            if lease.reused:
+                logger.info(f"Reusing warm browser {lease.browser.id} (waited {lease.wait_seconds:.2f}s)")
+            timer.record('browser_launch', lease.wait_seconds)
+            prep = PagePrep()
+            async with self._attach_page(lease.session, url, timer.ats, prep) as page:
+                if page is not None:
+                    await self._restore_auth(page, url, timer.ats, (field_values or {}).get('email'), prep)
+                with timer.stage('navigation'):
+                    opened = await self._open_page(lease.session, url)
+                if opened and page is not None:
+                    with timer.stage('prefill'):
+                        await self._measure(page, timer.ats, prep)
+                        await self._prepare_page(page, url, field_values or {}, prep)
+                browser_agent = BrowserAgent(
+                    task=await task(prep),
+                    llm=self.llm,
+                    browser_session=lease.session,
+                    # The job URL in the task is already open
+                    directly_open_url=not opened
+                )
+                if guard is not None:
+                    guard.page = page
+                # Cancellation discards the leased browser; the pool closes it
+                with timer.stage('form_fill'):
+                    history = await browser_agent.run(**run_kwargs)
+                if page is not None:
+                    await self._measure(page, timer.ats, prep)
+                    await self._capture_auth(page, prep)
+                return history
+
+    @asynccontextmanager
+    async def _attach_page(self, session, url: str, ats: str, prep: PagePrep) -> AsyncIterator[Optional[Any]]:
+        """
+        Playwright page of a leased browser, held for the whole run so the
+        ATS's resource blocking profile stays installed on its context.
+        Yields None when the browser cannot be attached; the agent then runs
+        without blocking or preparation.
+        """
+        async with AsyncExitStack() as stack:
+            page = blocker = None
+            try:
+                page = await stack.enter_async_context(connect_page(session, url))
+                profile = self.blocking.profile_for(ats)
+                if profile is not None:
+                    blocker = RequestBlocker(profile)
+                    await blocker.install(page.context)
+            except Exception as e:
+                logger.warning(f"Could not attach to the browser for {url}: {e}")
+            try:
+                yield page
+            finally:
+                if blocker is not None:
+                    prep.blocked_requests = blocker.total_blocked
+                    logger.info(f"Blocked {blocker.total_blocked} requests on {url} ({blocker.blocked})")
+
+    async def _restore_auth(self, page, url: str, ats: str, account: Optional[str], prep: PagePrep) -> None:
+        """Sign the browser in to the URL's ATS tenant from a stored state, if there is one"""
+        adapter = self.adapters.resolve(url)
+        tenant = adapter.auth_tenant(url) if adapter is not None else None
+        if self.auth_states is None or tenant is None or not account:
+            return
+        prep.auth_tenant, prep.account = tenant, account
+        try:
+            state = await self.auth_states.load(tenant, account)
+            if state is None:
+                count_auth_event(ats, 'missing')
+                return
+            await restore_state(page.context, state)
+            prep.auth_restored = True
+            count_auth_event(ats, 'restored')
+            logger.info(f"Restored sign-in state for {tenant} ({len(state.get('cookies', []))} cookies)")
+        except Exception as e:
+            logger.warning(f"Could not restore sign-in state for {tenant}: {e}")
+
+    @staticmethod
+    async def _capture_auth(page, prep: PagePrep) -> None:
+        """Read the tenant's cookies and storage after the run"""
+        if prep.auth_tenant is None:
+            return
+        try:
+            prep.auth_state = scope_state(await page.context.storage_state(), prep.auth_tenant)
+        except Exception as e:
+            logger.warning(f"Could not read sign-in state for {prep.auth_tenant}: {e}")
+
+    async def _store_auth(self, prep: PagePrep, ats: str, succeeded: bool) -> None:
+        """
+        Refresh the stored sign-in after a successful run; drop a restored
+        one after a failed run, so the next attempt signs in from scratch.
+        """
+        if prep.auth_tenant is None:
+            return
+        try:
+            if succeeded and prep.auth_state and prep.auth_state.get('cookies'):
+                await self.auth_states.save(prep.auth_tenant, prep.account, prep.auth_state)
+                count_auth_event(ats, 'saved')
+            elif not succeeded and prep.auth_restored:
+                await self.auth_states.invalidate(prep.auth_tenant, prep.account)
+                count_auth_event(ats, 'invalidated')
+        except Exception as e:
+            logger.warning(f"Failed to store sign-in state for {prep.auth_tenant}: {e}")
+
+    async def _measure(self, page, ats: str, prep: PagePrep) -> None:
+        """Record load time and transfer size of the page currently open"""
+        load = await measure_page(page)
+        if load is not None:
+            prep.page_loads.append(load)
+            record_page_load(load, ats, blocking=self.blocking.profile_for(ats) is not None)
+
+    @staticmethod
+    async def _open_page(session, url: str) -> bool:
+        """Navigate a leased browser to ``url``; on failure the agent opens it itself"""
+        try:
+            await session.navigate_to(url)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to open {url} ahead of the agent: {e}")
+            return False
+
+    async def _prepare_page(self, page, url: str, field_values: Dict[str, str], prep: PagePrep) -> None:
+        """
+        Work done on the open form before the agent starts: look up its
+        schema from earlier visits and fill the ATS adapter's mapped fields
+        directly. Failures leave everything to the agent.
+        """
+        adapter = self.adapters.resolve(url)
+        fill = self.field_filler is not None and adapter is not None and bool(adapter.get_field_specs())
+        try:
+            if self.form_schemas is not None:
+                prep.first_page = await read_form_fields(page)
+                prep.fingerprint, prep.schema = await self.form_schemas.lookup(url, prep.first_page)
+            if fill:
+                report = await self.field_filler.fill_page(page, adapter, field_values)
+                prep.prefilled = report.filled
+        except Exception as e:
+            logger.warning(f"Could not prepare {url} ahead of the agent: {e}")
+
+    @staticmethod
+    async def _close_browser(browser_agent) -> None:
+        """Close a browser-use agent's browser, ignoring teardown errors"""
+        try:
+            await asyncio.wait_for(browser_agent.close(), timeout=10)
+        except Exception as e:
+            logger.error(f"Failed to close browser after cancellation: {e}")
+
+    @staticmethod
+    def _stop_summary(guard: ProgressGuard) -> str:
+        """Summary of a run the progress guard ended"""
+        if guard.stop_reason == 'review_reached':
+            return f"Reached the review page after {guard.steps} steps (not submitted)"
+        reasons = {
+            'max_steps': f"hit the {guard.limits.max_steps}-step cap",
+            'max_tokens': f"used {guard.tokens} of {guard.limits.max_tokens} tokens",
+            'repeated_action': f"repeated the same action {guard.limits.repeat_actions} times",
+            'stalled': f"page unchanged for {guard.limits.stall_steps} steps",
+        }
+        where = f" on {guard.last_url}" if guard.last_url else ""
+        return f"Browser agent stopped after {guard.steps} steps{where}: {reasons.get(guard.stop_reason, guard.stop_reason)}"
+
+    @staticmethod
+    def _browser_usage(history, model: Optional[str]) -> Dict[str, Any]:
+        """
+        Token usage of a browser-use run.
+
+        browser-use tracks every call its LLM makes and attaches a summary
+        (total prompt, cached prompt and completion tokens) to the history.
+        """
+        tokens_in, tokens_out, tokens_cached = usage_tokens(getattr(history, 'usage', None))
+        return {
+            'prompt_tokens': tokens_in,
+            'completion_tokens': tokens_out,
+            'cached_tokens': tokens_cached,
+            'model': model,
+        }
+
+    @staticmethod
+    def _record_browser_stages(timer: StageTimer, history, started: float, finished: float) -> None:
+        """
+        Split a browser-use run into launch, navigation and form-fill time.
+
+        Launch is the time before the first agent step, navigation is the
+        first step (the task always opens the job URL first) and form fill
+        is everything after. Without step metadata the whole run counts as
+        form fill.
+        """
+        total = finished - started
+        try:
+            steps = [item.metadata for item in history.history if item.metadata is not None]
+            first_start = float(steps[0].step_start_time)
+            first_end = float(steps[0].step_end_time)
+        except (AttributeError, IndexError, TypeError, ValueError):
+            timer.record('form_fill', total)
+            return
+
+        launch = max(first_start - started, 0.0)
+        navigation = max(first_end - first_start, 0.0)
+        timer.record('browser_launch', launch)
+        timer.record('navigation', navigation)
+        timer.record('form_fill', total - launch - navigation)
 
     async def answer_question_dynamically(
         self,
@@ -199,15 +641,31 @@ class EnhancedFormFiller(BaseAgent):
         This is called by the browser agent when it encounters
         open-ended questions.
         """
-        logger.info(f"Generating dynamic answer for: {question[:50]}...")
-
-        answer = self.answer_gen.answer_screening_question(
-            question=question,
-            job_context=job_context,
-            user_profile=user_profile,
-            effort_level=effort_level,
-            is_required=is_required
-        )
+        templates = self.generation.templates if self.generation.uses_templates(effort_level) else None
+        answer = templates.answer(question, user_profile) if templates else None
+        if answer is not None:
+            logger.info(f"Answered from template: {question[:50]}...")
+        elif templates and not is_required:
+            # LOW effort only spends tokens on questions that block submission
+            logger.info(f"Leaving optional unmapped question blank: {question[:50]}...")
+            return ""
+        else:
+            hit = None
+            if self.answer_bank is not None:
+                hit = await self.answer_bank.lookup(question, effort_level, profile_version(user_profile))
+
+            if hit:
+                logger.info(f"Reusing banked answer ({hit.match_type}) for: {question[:50]}...")
+                answer = hit.answer
+            else:
+                logger.info(f"Generating dynamic answer for: {question[:50]}...")
+                answer = await self.answer_gen.answer_screening_question_async(
+                    question=question,
+                    job_context=job_context,
+                    user_profile=user_profile,
+                    effort_level=effort_level,
+                    is_required=is_required
+                )
 
         # Add typing delay (stealth)
         await self._simulate_typing_delay(answer)
@@ -220,7 +678,11 @@ class EnhancedFormFiller(BaseAgent):
         user_profile: Dict,
         cover_letter: Optional[str],
         effort_level: str,
-        resume_path: Optional[str]
+        resume_path: Optional[str],
+        screening_answers: Optional[Dict[str, str]] = None,
+        prefilled: Optional[List[str]] = None,
+        form_schema: Optional[FormSchema] = None,
+        signed_in: bool = False
     ) -> str:
         """Build task instructions for browser agent"""
 
@@ -243,6 +705,29 @@ class EnhancedFormFiller(BaseAgent):
             "",
         ]
 
+        if signed_in:
+            task_parts.extend([
+                "SIGN-IN:",
+                f"The browser is already signed in to this portal as {email}. Do not sign in or create an",
+                "account unless the page asks for it.",
+                "",
+            ])
+
+        if prefilled:
+            task_parts.append("ALREADY FILLED:")
+            task_parts.append("These fields were filled in automatically. Do not retype them; only fill empty fields:")
+            task_parts.extend(f"- {label}" for label in prefilled)
+            task_parts.append("")
+
+        if form_schema is not None and form_schema.fields:
+            task_parts.extend([
+                "KNOWN FORM LAYOUT:",
+                "This form was filled before. Its fields per step are listed below; go straight to them",
+                "instead of exploring the page:",
+                form_schema.describe(),
+                "",
+            ])
+
         if cover_letter:
             task_parts.extend([
                 "COVER LETTER:",
@@ -258,6 +743,14 @@ class EnhancedFormFiller(BaseAgent):
                 "",
             ])
 
+        if screening_answers:
+            task_parts.append("PREPARED ANSWERS:")
+            task_parts.append("If the form asks any of these questions, use the prepared answer:")
+            for question, answer in screening_answers.items():
+                task_parts.append(f"- Q: {question}")
+                task_parts.append(f"  A: {answer}")
+            task_parts.append("")
+
         # Add instructions based on effort level
         if effort_level.lower() == "low":
             task_parts.extend([
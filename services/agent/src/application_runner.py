@@ -4,27 +4,43 @@ Combines matching, planning, generation, and form filling
 """
 
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple, TypeVar
 from uuid import UUID
 import sys
 import os
 import asyncio
+import time
+from collections import Counter
 
 
 
 from .matching import ProfileMatcher
-from .planning import EffortPlanner
+from .planning import EffortPlanner, ApplicationPlan
+from .planning.budget import BudgetExceeded, metering, usage_stage, usage_tokens
 from .generation import AnswerGenerator
+from .generation.answer_bank import AnswerBank, profile_version
+from .generation.generation_planner import GenerationPlanner
+from .generation.templates import TemplateEngine
 from .agents.enhanced_form_filler import EnhancedFormFiller
+from .concurrency.retry_scheduler import RetryPolicy
+from .observability.stage_metrics import StageTimer, ats_label
+from .observability.token_usage import export_usage
 from .session_manager import SessionManager
 
 # Import persistence
 from persistence.src.applications import ApplicationRepository
 from persistence.src.events import EventRepository
+from persistence.src.model_usage import ModelUsageRepository
 from persistence.src.sessions import SessionRepository
+from persistence.src.async_repository import AsyncRepository
+from persistence.src.event_sink import EventSink
+from persistence.src.checkpoints import CheckpointStore, fingerprint
+from persistence.src.timelines import TimelineStore
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 class ApplicationRunner:
     """
@@ -33,9 +49,22 @@ class ApplicationRunner:
     Pipeline:
     1. Match job to profile → match_score
     2. Plan effort level → final_effort, requires_qa
-    3. Generate cover letter (if medium/high effort)
+    3. Generate cover letter (if medium/high effort) and answer drafts
     4. Fill form with browser automation
     5. Log all events and metrics
+
+    Steps 1-3 (prepare_application) and step 4 (execute_plan) can run on
+    separate concurrency pools; see concurrency.pipeline.PipelinedRunner.
+
+    Stage outputs are checkpointed per application, so a re-run after a
+    failure or restart resumes from the last completed stage.
+
+    Every stage runs under the application's budget (planning.budget):
+    stages are cancelled on wall-clock timeouts, LLM calls are charged to a
+    token meter, and an exceeded budget is recorded as ``budget_exceeded``.
+    The meter's per-call records (including the browser agent's tokens) are
+    written to model_usage, session totals and Prometheus when the
+    application finishes.
     """
 
     MAX_RETRIES = 3
@@ -51,6 +80,12 @@ class ApplicationRunner:
         event_repo: EventRepository,
         session_repo: Optional[SessionRepository] = None,
         session_manager: Optional[SessionManager] = None,
+        event_sink: Optional[EventSink] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        answer_bank: Optional[AnswerBank] = None,
+        template_engine: Optional[TemplateEngine] = None,
+        usage_repo: Optional[ModelUsageRepository] = None,
+        timeline_store: Optional[TimelineStore] = None,
     ):
         """
         Initialize application runner.
@@ -63,16 +98,35 @@ class ApplicationRunner:
             application_repo: Application persistence
             event_repo: Event logging
             session_repo: Session tracking (optional)
+            session_manager: Session runtime tracking (optional)
+            event_sink: Write-behind event buffer (optional, built from the repos)
+            checkpoint_store: Stage checkpoint store (optional, CHECKPOINT_DIR)
+            answer_bank: Reusable screening answers (optional, in-memory only by default)
+            template_engine: LOW effort template renderer (optional, config/answer_templates.yml)
+            usage_repo: model_usage persistence (optional; written through the event sink)
+            timeline_store: Browser step timeline artifacts (optional, TIMELINE_DIR)
+
+        Repositories are synchronous; they are wrapped in AsyncRepository so
+        every write runs on the bounded database executor instead of the
+        event loop.
         """
         self.matcher = profile_matcher
         self.planner = effort_planner
         self.answer_gen = answer_generator
         self.form_filler = form_filler
 
-        self.app_repo = application_repo
-        self.event_repo = event_repo
-        self.session_repo = session_repo
+        self.app_repo = AsyncRepository.wrap(application_repo)
+        self.event_repo = AsyncRepository.wrap(event_repo)
+        self.session_repo = AsyncRepository.wrap(session_repo)
         self.session_manager = session_manager
+        self.event_sink = event_sink or EventSink(
+            event_repo=event_repo, session_repo=session_repo, usage_repo=usage_repo
+        )
+        self.checkpoints = AsyncRepository.wrap(checkpoint_store or CheckpointStore())
+        self.timelines = AsyncRepository.wrap(timeline_store or TimelineStore())
+        self.answer_bank = answer_bank or AnswerBank()
+        self.generation = GenerationPlanner(answer_generator, self.answer_bank, template_engine or TemplateEngine())
+        self.retry_policy = RetryPolicy(max_attempts=self.MAX_RETRIES, base_delay=self.RETRY_BASE_DELAY)
 
         logger.info("ApplicationRunner initialized")
 
@@ -90,7 +144,8 @@ class ApplicationRunner:
         user_effort_hint: str = "medium",
         company_tier: str = "normal",
         session_id: Optional[UUID] = None,
-        resume_path: Optional[str] = None
+        resume_path: Optional[str] = None,
+        known_questions: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Run full application for a single job.
@@ -106,17 +161,78 @@ class ApplicationRunner:
             company_tier: Company tier (top/normal/avoid)
             session_id: Session ID if part of batch
             resume_path: Path to resume file
+            known_questions: Screening questions known ahead of time
 
         Returns:
             Result dict with status, metrics, etc.
         """
-        logger.info(f"Starting application {application_id} for {job_title} at {company_name}")
-        effort_level: Optional[str] = None
+        try:
+            plan = await self.prepare_application(
+                application_id=application_id,
+                job_url=job_url,
+                job_title=job_title,
+                company_name=company_name,
+                job_description=job_description,
+                user_profile=user_profile,
+                user_effort_hint=user_effort_hint,
+                company_tier=company_tier,
+                session_id=session_id,
+                resume_path=resume_path,
+                known_questions=known_questions
+            )
+            return await self.execute_plan(plan)
+        finally:
+            # Application completion: make its buffered events durable
+            await self.event_sink.flush()
+
+    async def prepare_application(
+        self,
+        application_id: UUID,
+        job_url: str,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        user_profile: Dict,
+        user_effort_hint: str = "medium",
+        company_tier: str = "normal",
+        session_id: Optional[UUID] = None,
+        resume_path: Optional[str] = None,
+        known_questions: Optional[List[str]] = None
+    ) -> ApplicationPlan:
+        """
+        Run the preparation stages that do not need a browser.
+
+        Match scoring, effort planning, cover letter and screening-answer
+        drafts are CPU/API bound; embedding calls run in worker threads and
+        generations use the async LLM path, so several applications can
+        prepare while a browser is busy.
+        A stage failure is stored on ``plan.error`` and recorded by
+        execute_plan.
 
+        Returns:
+            ApplicationPlan ready for execute_plan
+        """
+        plan = ApplicationPlan(
+            application_id=application_id,
+            job_url=job_url,
+            job_title=job_title,
+            company_name=company_name,
+            job_description=job_description,
+            user_profile=user_profile,
+            user_effort_hint=user_effort_hint,
+            company_tier=company_tier,
+            session_id=session_id,
+            resume_path=resume_path,
+            known_questions=list(known_questions or []),
+            stage_timer=StageTimer(ats=ats_label(job_url)),
+            budget=self.planner.get_budget(user_effort_hint)
+        )
+        plan.token_meter.budget = plan.budget
+        logger.info(f"Starting application {application_id} for {job_title} at {company_name}")
 
         # Mark application as started
-        self.app_repo.mark_started(application_id)
-        self.event_repo.append_event(
+        await self.app_repo.mark_started(application_id)
+        await self.event_sink.append_event(
             'application_started',
             application_id=application_id,
             session_id=session_id,
@@ -124,194 +240,566 @@ class ApplicationRunner:
         )
 
         try:
-            # Step 1: Compute match score
+            with metering(plan.token_meter):
+                await self._prepare_stages(plan)
+        except BudgetExceeded as e:
+            logger.warning(f"Application {application_id} over budget during preparation: {e}")
+            plan.error = str(e)
+            plan.failure_code = 'budget_exceeded'
+        except Exception as e:
+            logger.error(f"Application preparation error: {e}", exc_info=True)
+            plan.error = str(e)
+
+        return plan
+
+    async def _prepare_stages(self, plan: ApplicationPlan) -> None:
+        """Match, plan and generate; budget and stage failures propagate"""
+        application_id = plan.application_id
+        session_id = plan.session_id
+        timer = plan.stage_timer
+
+        plan.input_fingerprint = fingerprint(
+            plan.job_url, plan.job_description, plan.user_profile, plan.user_effort_hint, plan.company_tier
+        )
+        checkpoint = await self._load_checkpoint(plan)
+
+        # Step 1: Compute match score
+        if 'match' in checkpoint:
+            plan.match_score = checkpoint['match']['match_score']
+            plan.resumed_stages.append('match')
+        else:
             logger.info("Step 1: Computing match score...")
-            match_score = self.matcher.compute_match_score(job_description)
+            with timer.stage('match'):
+                plan.match_score = await self._within_budget(
+                    plan, 'match', asyncio.to_thread(self.matcher.compute_match_score, plan.job_description)
+                )
+            await self._save_checkpoint(plan, 'match', {'match_score': plan.match_score})
 
-            self.event_repo.append_event(
+            await self.event_sink.append_event(
                 'match_computed',
                 application_id=application_id,
                 session_id=session_id,
-                payload={'match_score': match_score}
+                payload={'match_score': plan.match_score}
             )
 
-            # Step 2: Decide effort level
+        # Step 2: Decide effort level
+        if 'effort' in checkpoint:
+            effort = checkpoint['effort']
+            plan.effort_level = effort['effort_level']
+            plan.effort_reason = effort['effort_reason']
+            plan.should_skip = effort['should_skip']
+            plan.resumed_stages.append('effort')
+            decided = False
+        else:
             logger.info("Step 2: Planning effort level...")
-            effort_level, reason, should_skip = self.planner.decide_effort_level(
-                user_effort_hint,
-                match_score,
-                company_tier
+            with timer.stage('plan'):
+                plan.effort_level, plan.effort_reason, plan.should_skip = self.planner.decide_effort_level(
+                    plan.user_effort_hint,
+                    plan.match_score,
+                    plan.company_tier
+                )
+            await self._save_checkpoint(plan, 'effort', {
+                'effort_level': plan.effort_level,
+                'effort_reason': plan.effort_reason,
+                'should_skip': plan.should_skip
+            })
+            decided = True
+
+        if plan.should_skip:
+            return
+
+        # Budgets follow the final effort level
+        plan.budget = self.planner.get_budget(plan.effort_level)
+        plan.token_meter.budget = plan.budget
+
+        if decided:
+            await self.event_sink.append_event(
+                'effort_decided',
+                application_id=application_id,
+                session_id=session_id,
+                payload={
+                    'effort_level': plan.effort_level,
+                    'reason': plan.effort_reason,
+                    'match_score': plan.match_score
+                }
+            )
+
+        # Step 3: Generate cover letter and screening-answer drafts
+        await self._generate_content(plan, checkpoint)
+
+        if plan.resumed_stages:
+            logger.info(f"Application {application_id} resumed stages from checkpoint: {plan.resumed_stages}")
+            await self.event_sink.append_event(
+                'checkpoint_resumed',
+                application_id=application_id,
+                session_id=session_id,
+                payload={'stages': plan.resumed_stages}
+            )
+
+    async def _generate_content(self, plan: ApplicationPlan, checkpoint: Dict[str, Dict[str, Any]]) -> None:
+        """Generate the cover letter and drafts for known screening questions concurrently"""
+        timer = plan.stage_timer
+        needs_cover_letter = self.generation.wants_cover_letter(plan.effort_level)
+        if needs_cover_letter and 'cover_letter' in checkpoint:
+            plan.cover_letter = checkpoint['cover_letter']['cover_letter']
+            plan.resumed_stages.append('cover_letter')
+            needs_cover_letter = False
+
+        stored = checkpoint.get('screening_answers', {})
+        drafted = dict(stored.get('answers', {}))
+        sources = dict(stored.get('sources', {}))
+        if drafted:
+            plan.resumed_stages.append('screening_answers')
+        pending = []
+        for question in plan.known_questions:
+            # Fallback boilerplate from a failed call is generated again
+            if question in drafted and sources.get(question) != 'fallback':
+                plan.screening_answers[question] = drafted[question]
+                plan.answer_sources[question] = sources.get(question, 'llm')
+            else:
+                pending.append(question)
+
+        if not needs_cover_letter and not pending:
+            return
+
+        # Completed pieces are checkpointed as they land, so a budget cut
+        # keeps them; the lock serializes the checkpoint file's read-modify-write
+        checkpoint_lock = asyncio.Lock()
+        cover_letter_seconds = 0.0
+
+        async def on_cover_letter(cover_letter: str) -> None:
+            nonlocal cover_letter_seconds
+            cover_letter_seconds = time.perf_counter() - started
+            async with checkpoint_lock:
+                await self._save_checkpoint(plan, 'cover_letter', {'cover_letter': cover_letter})
+
+        async def on_answer(question: str, answer: str, source: str) -> None:
+            plan.screening_answers[question] = answer
+            plan.answer_sources[question] = source
+            async with checkpoint_lock:
+                drafted[question] = answer
+                sources[question] = source
+                await self._save_checkpoint(
+                    plan, 'screening_answers', {'answers': dict(drafted), 'sources': dict(sources)}
+                )
+
+        logger.info(
+            f"Step 3: Generating {'cover letter and ' if needs_cover_letter else ''}{len(pending)} screening answers..."
+        )
+        started = time.perf_counter()
+        try:
+            generated = await self._within_budget(plan, 'generation', self.generation.generate(
+                job_title=plan.job_title,
+                company_name=plan.company_name,
+                job_description=plan.job_description,
+                user_profile=plan.user_profile,
+                effort_level=plan.effort_level,
+                questions=pending,
+                include_cover_letter=needs_cover_letter,
+                on_answer=on_answer,
+                on_cover_letter=on_cover_letter
+            ))
+        finally:
+            # The calls overlap: cover_letter is its own call time, and
+            # screening_answers the rest of the fan-out's wall time, so the
+            # stage sum still equals the time actually spent
+            wall = time.perf_counter() - started
+            if needs_cover_letter:
+                # Unfinished on a budget cut: the whole fan-out waited on it
+                cover_letter_seconds = cover_letter_seconds or wall
+                timer.record('cover_letter', cover_letter_seconds)
+            if pending:
+                timer.record('screening_answers', wall - cover_letter_seconds)
+
+        if needs_cover_letter:
+            plan.cover_letter = generated.cover_letter
+
+        if plan.answer_sources:
+            counts = dict(Counter(plan.answer_sources.values()))
+            logger.info(f"Screening answer sources for application {plan.application_id}: {counts}")
+
+    async def _remember_answers(self, plan: ApplicationPlan) -> None:
+        """Bank freshly generated answers once the application went through (never fallbacks)"""
+        version = profile_version(plan.user_profile)
+        for index, (question, source) in enumerate(plan.answer_sources.items()):
+            if source != 'llm':
+                continue
+            await self.answer_bank.remember(
+                plan.application_id, question, plan.screening_answers.get(question),
+                plan.effort_level, version, step_index=index
             )
 
-            if should_skip:
-                logger.info(f"Application skipped: {reason}")
-                self.app_repo.mark_failed(
+    async def _load_checkpoint(self, plan: ApplicationPlan) -> Dict[str, Dict[str, Any]]:
+        try:
+            return await self.checkpoints.load(plan.application_id, plan.input_fingerprint)
+        except Exception as e:
+            logger.warning(f"Failed to load checkpoint for application {plan.application_id}: {e}")
+            return {}
+
+    async def _save_checkpoint(self, plan: ApplicationPlan, stage: str, output: Dict[str, Any]) -> None:
+        # Checkpoints are an optimisation; never fail the application over one
+        try:
+            await self.checkpoints.save_stage(plan.application_id, stage, output, plan.input_fingerprint)
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint stage {stage} for application {plan.application_id}: {e}")
+
+    async def _clear_checkpoint(self, plan: ApplicationPlan) -> None:
+        try:
+            await self.checkpoints.clear(plan.application_id)
+        except Exception as e:
+            logger.warning(f"Failed to clear checkpoint for application {plan.application_id}: {e}")
+
+    async def _save_timeline(self, plan: ApplicationPlan, attempt: int, form_result: Dict[str, Any]) -> None:
+        """Keep the browser agent's step timeline of an attempt for the slow-step report"""
+        timeline = form_result.get('step_timeline')
+        if not timeline or not timeline.get('steps'):
+            return
+        try:
+            await self.timelines.save(plan.application_id, attempt, timeline, status=form_result.get('status'))
+        except Exception as e:
+            logger.warning(f"Failed to store step timeline for application {plan.application_id}: {e}")
+
+    async def _within_budget(self, plan: ApplicationPlan, stage: str, awaitable: Awaitable[T]) -> T:
+        """
+        Await ``awaitable`` under the plan's wall-clock budget for ``stage``.
+
+        On timeout the awaitable is cancelled (a worker thread started by
+        asyncio.to_thread finishes in the background; its result is dropped).
+        LLM usage recorded while it runs is attributed to ``stage``.
+
+        Raises:
+            BudgetExceeded: Stage or overall time budget exhausted
+        """
+        with usage_stage(stage):
+            if plan.budget is None:
+                return await awaitable
+            try:
+                timeout = plan.budget.timeout_for(stage, plan.stage_timer.elapsed)
+            except BudgetExceeded:
+                # Not started; close it to avoid a never-awaited warning
+                if asyncio.iscoroutine(awaitable):
+                    awaitable.close()
+                raise
+            try:
+                return await asyncio.wait_for(awaitable, timeout)
+            except asyncio.TimeoutError:
+                raise BudgetExceeded('time', timeout, timeout, stage=stage) from None
+
+    async def execute_plan(self, plan: ApplicationPlan) -> Dict[str, Any]:
+        """
+        Drive the browser for a prepared application and record the outcome.
+
+        Retries back off in-line, holding the caller; PipelinedRunner instead
+        uses attempt_plan/plan_retry/finalize_plan with a RetryScheduler so
+        the browser slot serves other applications during the backoff.
+
+        Args:
+            plan: Output of prepare_application
+
+        Returns:
+            Result dict with status, metrics, etc.
+        """
+        application_id = plan.application_id
+        session_id = plan.session_id
+        effort_level = plan.effort_level
+
+        if plan.error:
+            return await self._record_runner_exception(plan, plan.error, failure_code=plan.failure_code)
+
+        if plan.should_skip:
+            logger.info(f"Application skipped: {plan.effort_reason}")
+            with plan.stage_timer.stage('persistence'):
+                await self.app_repo.mark_failed(
                     application_id,
                     failure_reason_code='policy_skip',
-                    failure_reason_detail=reason
+                    failure_reason_detail=plan.effort_reason
                 )
-                self._record_session_metrics(
+                await self._record_usage(plan)
+                await self._record_session_metrics(
                     session_id=session_id,
                     effort_level=effort_level,
                     status='skipped',
-                    error_message=reason,
+                    error_message=plan.effort_reason,
+                    tokens_input=plan.token_meter.tokens_input,
+                    tokens_output=plan.token_meter.tokens_output,
                 )
-                return {
-                    'status': 'skipped',
-                    'reason': reason,
-                    'match_score': match_score
-                }
+                await self._clear_checkpoint(plan)
+            return self._with_stage_timings(plan, {
+                'status': 'skipped',
+                'reason': plan.effort_reason,
+                'match_score': plan.match_score
+            })
 
-            self.event_repo.append_event(
-                'effort_decided',
-                application_id=application_id,
-                session_id=session_id,
-                payload={
-                    'effort_level': effort_level,
-                    'reason': reason,
-                    'match_score': match_score
-                }
+        try:
+            # Step 4: Fill application form with retries
+            attempt = 0
+            while True:
+                form_result = await self.attempt_plan(plan, attempt)
+                delay = await self.plan_retry(plan, attempt, form_result)
+                if delay is None:
+                    break
+                with plan.stage_timer.stage('retry_wait'):
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+            return await self.finalize_plan(plan, form_result)
+
+        except BudgetExceeded as e:
+            return await self.record_budget_exceeded(plan, e)
+        except Exception as e:
+            logger.error(f"Application runner error: {e}", exc_info=True)
+            return await self._record_runner_exception(plan, str(e))
+
+    async def attempt_plan(self, plan: ApplicationPlan, attempt: int) -> Dict[str, Any]:
+        """
+        Run a single browser attempt (0-based ``attempt``).
+
+        Exceptions are converted into a failed result so callers can apply
+        the retry policy uniformly.
+
+        Raises:
+            BudgetExceeded: The browser stage hit its wall-clock budget; the
+                browser-use run is cancelled and its browser closed, and the
+                steps it took are kept as the attempt's timeline
+        """
+        # Filled in by the form filler when the budget cancels it
+        cancelled: Dict[str, Any] = {'status': 'budget_exceeded'}
+
+        def on_timeline(timeline: Dict[str, Any]) -> None:
+            cancelled['step_timeline'] = timeline
+
+        try:
+            logger.info(
+                f"Step 4: Filling form (effort: {plan.effort_level}, "
+                f"attempt: {attempt + 1}/{self.retry_policy.max_attempts})..."
+            )
+            with metering(plan.token_meter):
+                form_result = await self._within_budget(plan, 'browser', self._fill_form(plan, on_timeline))
+        except BudgetExceeded as e:
+            # The cancelled form filler could not report its stage timings
+            plan.stage_timer.record('form_fill', e.used if e.kind == 'time' else 0.0)
+            await self._save_timeline(plan, attempt, cancelled)
+            raise
+        except Exception as e:
+            logger.error(f"Attempt {attempt + 1} exception: {e}")
+            form_result = {'status': 'failed', 'summary': str(e)}
+
+        # Browser stages are timed by the form filler
+        plan.stage_timer.merge(form_result.get('stage_timings'))
+        await self._save_timeline(plan, attempt, form_result)
+
+        # Browser agent tokens count against the budget; enforced before a retry
+        tokens_in, tokens_out, tokens_cached = self._extract_token_usage(form_result)
+        if tokens_in or tokens_out:
+            plan.token_meter.add(
+                tokens_in, tokens_out, (form_result.get('token_usage') or {}).get('model'),
+                enforce=False,
+                tokens_cached=tokens_cached,
+                purpose='form_fill',
+                stage='browser'
             )
+        return form_result
+
+    async def plan_retry(self, plan: ApplicationPlan, attempt: int, form_result: Dict[str, Any]) -> Optional[float]:
+        """
+        Decide whether a finished attempt should be retried.
+
+        Returns:
+            Backoff delay in seconds, or None when the result is final
 
-            # Step 3: Fill application form with retries
-            form_result = {'status': 'failed', 'summary': 'Max retries exceeded'}
-
-            for attempt in range(self.MAX_RETRIES):
-                try:
-                    logger.info(f"Step 3: Filling form (effort: {effort_level}, attempt: {attempt + 1}/{self.MAX_RETRIES})...")
-                    form_result = await self.form_filler.fill_application(
-                        url=job_url,
-                        job_title=job_title,
-                        company_name=company_name,
-                        job_description=job_description,
-                        user_profile=user_profile,
-                        effort_level=effort_level,
-                        resume_path=resume_path
-                    )
-
-                    if form_result['status'] == 'filled':
-                        break  # Success
-
-                    # If failed, check if we should retry
-                    if attempt < self.MAX_RETRIES - 1:
-                        delay = self.RETRY_BASE_DELAY * (2 ** attempt)
-                        logger.warning(f"Attempt {attempt + 1} failed: {form_result.get('summary')}. Retrying in {delay}s...")
-
-                        # Log retry event
-                        self.event_repo.append_event(
-                            'application_retry',
-                            application_id=application_id,
-                            session_id=session_id,
-                            payload={'attempt': attempt + 1, 'delay': delay, 'reason': form_result.get('summary')}
-                        )
-
-                        await asyncio.sleep(delay)
-
-                except Exception as e:
-                    logger.error(f"Attempt {attempt + 1} exception: {e}")
-                    if attempt < self.MAX_RETRIES - 1:
-                        delay = self.RETRY_BASE_DELAY * (2 ** attempt)
-                        logger.warning(f"Retrying in {delay}s...")
-                        await asyncio.sleep(delay)
-                    else:
-                        # If final attempt failed with exception, create a failure result
-                        form_result = {'status': 'failed', 'summary': str(e)}
-
-            # Log form filling result
-            if form_result['status'] == 'filled':
-                logger.info("✅ Form filled successfully")
-
-                self.app_repo.mark_submitted(
+        Raises:
+            BudgetExceeded: A retry would exceed the token, cost or time budget
+        """
+        if form_result.get('status') == 'filled' or not self.retry_policy.should_retry(attempt):
+            return None
+        if form_result.get('stop_reason'):
+            # The agent was stopped for looping or overspending; another
+            # attempt would most likely spend the same again
+            return None
+
+        delay = self.retry_policy.delay_for(attempt)
+        plan.token_meter.check()
+        if plan.budget is not None:
+            # No point waiting for an attempt that has no time left to run
+            plan.budget.timeout_for('browser', plan.stage_timer.elapsed + delay)
+        logger.warning(f"Attempt {attempt + 1} failed: {form_result.get('summary')}. Retrying in {delay}s...")
+
+        # Log retry event
+        await self.event_sink.append_event(
+            'application_retry',
+            application_id=plan.application_id,
+            session_id=plan.session_id,
+            payload={'attempt': attempt + 1, 'delay': delay, 'reason': form_result.get('summary')}
+        )
+        return delay
+
+    async def _fill_form(
+        self,
+        plan: ApplicationPlan,
+        on_timeline: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Run one browser attempt with the prepared content"""
+        return await self.form_filler.fill_application(
+            url=plan.job_url,
+            job_title=plan.job_title,
+            company_name=plan.company_name,
+            job_description=plan.job_description,
+            user_profile=plan.user_profile,
+            effort_level=plan.effort_level,
+            resume_path=plan.resume_path,
+            cover_letter=plan.cover_letter,
+            screening_answers=plan.screening_answers,
+            on_timeline=on_timeline
+        )
+
+    async def finalize_plan(self, plan: ApplicationPlan, form_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist the final form-filling outcome and build the result dict"""
+        application_id = plan.application_id
+        session_id = plan.session_id
+        effort_level = plan.effort_level
+        timer = plan.stage_timer
+
+        # Log form filling result
+        if form_result['status'] == 'filled':
+            logger.info("✅ Form filled successfully")
+
+            with timer.stage('persistence'):
+                await self.app_repo.mark_submitted(
                     application_id,
                     success_flag=True,
                     confirmation_type='form_completed'
                 )
 
-                self.event_repo.append_event(
+                await self.event_sink.append_event(
                     'form_filled',
                     application_id=application_id,
                     session_id=session_id,
                     payload={
                         'effort_level': effort_level,
-                        'cover_letter_generated': form_result.get('cover_letter_generated', False)
+                        'cover_letter_generated': form_result.get('cover_letter_generated', False),
+                        'stage_timings': timer.as_dict()
                     }
                 )
 
-                tokens_in, tokens_out = self._extract_token_usage(form_result)
-                self._record_session_metrics(
+                await self._record_usage(plan)
+                await self._record_session_metrics(
                     session_id=session_id,
                     effort_level=effort_level,
                     status='submitted',
-                    tokens_input=tokens_in,
-                    tokens_output=tokens_out,
-                )
-
-                return {
-                    'status': 'success',
-                    'match_score': match_score,
-                    'effort_level': effort_level,
-                    'effort_reason': reason,
-                    'form_result': form_result
-                }
-
-            else:
-                logger.error(f"Form filling failed: {form_result.get('summary', 'Unknown error')}")
-
-                self.app_repo.mark_failed(
-                    application_id,
-                    failure_reason_code='form_filling_error',
-                    failure_reason_detail=form_result.get('summary', 'Unknown error')
-                )
-
-                self.event_repo.append_event(
-                    'form_filling_failed',
-                    application_id=application_id,
-                    session_id=session_id,
-                    payload={'error': form_result.get('summary')}
+                    tokens_input=plan.token_meter.tokens_input,
+                    tokens_output=plan.token_meter.tokens_output,
                 )
+                await self._clear_checkpoint(plan)
+                await self._remember_answers(plan)
 
-                fail_tokens_in, fail_tokens_out = self._extract_token_usage(form_result)
-                self._record_session_metrics(
-                    session_id=session_id,
-                    effort_level=effort_level,
-                    status='failed',
-                    error_message=form_result.get('summary'),
-                    tokens_input=fail_tokens_in,
-                    tokens_output=fail_tokens_out,
-                )
-
-                return {
-                    'status': 'failed',
-                    'match_score': match_score,
-                    'effort_level': effort_level,
-                    'error': form_result.get('summary')
-                }
+            return self._with_stage_timings(plan, {
+                'status': 'success',
+                'match_score': plan.match_score,
+                'effort_level': effort_level,
+                'effort_reason': plan.effort_reason,
+                'form_result': form_result
+            })
 
-        except Exception as e:
-            logger.error(f"Application runner error: {e}", exc_info=True)
+        logger.error(f"Form filling failed: {form_result.get('summary', 'Unknown error')}")
 
-            self.app_repo.mark_failed(
+        with timer.stage('persistence'):
+            await self.app_repo.mark_failed(
                 application_id,
-                failure_reason_code='runner_exception',
-                failure_reason_detail=str(e)
+                failure_reason_code='agent_stopped' if form_result.get('stop_reason') else 'form_filling_error',
+                failure_reason_detail=form_result.get('summary', 'Unknown error')
             )
 
-            self.event_repo.append_event(
-                'runner_exception',
+            await self.event_sink.append_event(
+                'form_filling_failed',
                 application_id=application_id,
                 session_id=session_id,
-                payload={'exception': str(e)}
+                payload={
+                    'error': form_result.get('summary'),
+                    'stop_reason': form_result.get('stop_reason'),
+                    'stage_timings': timer.as_dict()
+                }
             )
 
-            self._record_session_metrics(
+            await self._record_usage(plan)
+            await self._record_session_metrics(
                 session_id=session_id,
                 effort_level=effort_level,
                 status='failed',
-                error_message=str(e),
+                error_message=form_result.get('summary'),
+                tokens_input=plan.token_meter.tokens_input,
+                tokens_output=plan.token_meter.tokens_output,
+            )
+
+        return self._with_stage_timings(plan, {
+            'status': 'failed',
+            'match_score': plan.match_score,
+            'effort_level': effort_level,
+            'error': form_result.get('summary')
+        })
+
+    async def record_budget_exceeded(self, plan: ApplicationPlan, exc: BudgetExceeded) -> Dict[str, Any]:
+        """Persist an application cancelled for exceeding its budget"""
+        logger.warning(f"Application {plan.application_id} cancelled: {exc}")
+        return await self._record_runner_exception(
+            plan,
+            str(exc),
+            failure_code='budget_exceeded',
+            payload={'budget': exc.to_payload()}
+        )
+
+    async def _record_runner_exception(
+        self,
+        plan: ApplicationPlan,
+        error: str,
+        failure_code: str = 'runner_exception',
+        payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Persist an unexpected runner failure (or a budget cancellation)"""
+        with plan.stage_timer.stage('persistence'):
+            await self.app_repo.mark_failed(
+                plan.application_id,
+                failure_reason_code=failure_code,
+                failure_reason_detail=error
+            )
+
+            await self.event_sink.append_event(
+                failure_code,
+                application_id=plan.application_id,
+                session_id=plan.session_id,
+                payload={
+                    'exception': error,
+                    'stage_timings': plan.stage_timer.as_dict(),
+                    'tokens_used': plan.token_meter.total_tokens,
+                    **(payload or {})
+                }
+            )
+
+            await self._record_usage(plan)
+            await self._record_session_metrics(
+                session_id=plan.session_id,
+                effort_level=plan.effort_level,
+                status='failed',
+                error_message=error,
+                tokens_input=plan.token_meter.tokens_input,
+                tokens_output=plan.token_meter.tokens_output,
             )
 
+        return self._with_stage_timings(plan, {
+            'status': 'error' if failure_code == 'runner_exception' else 'failed',
+            'failure_code': failure_code,
+            'match_score': plan.match_score,
+            'effort_level': plan.effort_level,
+            'error': error
+        })
 
-    def _record_session_metrics(
+    @staticmethod
+    def _with_stage_timings(plan: ApplicationPlan, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach stage timings to a final result and export them to Prometheus"""
+        plan.stage_timer.observe(plan.effort_level)
+        result['stage_timings'] = plan.stage_timer.as_dict()
+        return result
+
+    async def _record_session_metrics(
         self,
         session_id: Optional[UUID],
         effort_level: Optional[str],
@@ -327,7 +815,7 @@ class ApplicationRunner:
         level = (effort_level or 'medium').lower() if effort_level else 'medium'
 
         if self.session_manager:
-            self.session_manager.register_application(
+            await self.session_manager.register_application_async(
                 session_id=session_id,
                 effort_level=level,
                 status=normalized_status,
@@ -341,12 +829,12 @@ class ApplicationRunner:
             return
 
         try:
-            self.session_repo.increment_session_counts(session_id, level)
+            await self.session_repo.increment_session_counts(session_id, level)
             if normalized_status == 'submitted':
-                self.session_repo.mark_application_successful(session_id)
-            self.session_repo.add_token_usage(session_id, tokens_input, tokens_output)
+                await self.session_repo.mark_application_successful(session_id)
+            await self.session_repo.add_token_usage(session_id, tokens_input, tokens_output)
             if normalized_status == 'failed' and error_message:
-                self.session_repo.add_session_event(
+                await self.event_sink.add_session_event(
                     session_id,
                     'application_failed',
                     error_message[:240],
@@ -355,22 +843,40 @@ class ApplicationRunner:
         except Exception as exc:
             logger.error("Failed to persist session fallback metrics: %s", exc)
 
+    async def _record_usage(self, plan: ApplicationPlan) -> None:
+        """Queue the application's unrecorded LLM calls for model_usage and export them to Prometheus"""
+        records = plan.token_meter.drain()
+        if not records:
+            return
+        export_usage(records)
+        for record in records:
+            await self.event_sink.log_model_usage(
+                record.model,
+                record.call_type,
+                record.tokens_input,
+                record.tokens_output,
+                tokens_cached=record.tokens_cached,
+                cost_estimated=record.cost_usd,
+                purpose=record.purpose,
+                stage=record.stage,
+                application_id=plan.application_id,
+                session_id=plan.session_id,
+                started_at=record.recorded_at,
+                ended_at=record.recorded_at
+            )
+        logger.info(
+            f"Application {plan.application_id} used {plan.token_meter.tokens_input} input "
+            f"({plan.token_meter.tokens_cached} cached) and {plan.token_meter.tokens_output} output tokens: "
+            f"{plan.token_meter.by_stage()}"
+        )
+
     @staticmethod
-    def _extract_token_usage(result: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    def _extract_token_usage(result: Optional[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """(input, output, cached) tokens the form filler reported for its browser agent"""
         if not isinstance(result, dict):
-            return 0, 0
+            return 0, 0, 0
         usage: Any = result.get('token_usage') or result.get('usage')
         if not isinstance(usage, dict):
-            return 0, 0
-        tokens_in = usage.get('prompt_tokens') or usage.get('input_tokens') or usage.get('tokens_in') or 0
-        tokens_out = usage.get('completion_tokens') or usage.get('output_tokens') or usage.get('tokens_out') or 0
-        try:
-            tokens_in = int(tokens_in)
-        except (TypeError, ValueError):
-            tokens_in = 0
-        try:
-            tokens_out = int(tokens_out)
-        except (TypeError, ValueError):
-            tokens_out = 0
-        return max(tokens_in, 0), max(tokens_out, 0)
+            return 0, 0, 0
+        return usage_tokens(usage)
 
@@ -0,0 +1,23 @@
+"""Browser lifecycle: warm per-worker browser pool on local or farmed CDP browsers, request blocking, stored sign-ins and agent progress guard"""
+
+from .auth_state import AuthStateStore
+from .farm import BrowserFarm, FarmEndpoint
+from .pool import BrowserLease, BrowserPool, BrowserUseLauncher, get_browser_pool
+from .progress_guard import ProgressGuard
+from .resource_blocking import BlockingPolicy, BlockingProfile, PageLoad, RequestBlocker, measure_page
+
+__all__ = [
+    'AuthStateStore',
+    'BlockingPolicy',
+    'BlockingProfile',
+    'BrowserFarm',
+    'BrowserLease',
+    'BrowserPool',
+    'BrowserUseLauncher',
+    'FarmEndpoint',
+    'PageLoad',
+    'ProgressGuard',
+    'RequestBlocker',
+    'get_browser_pool',
+    'measure_page',
+]
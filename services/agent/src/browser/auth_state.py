@@ -0,0 +1,192 @@
+"""
+Authenticated Browser State
+Encrypted local store of browser storage state (cookies, localStorage) per
+(ATS tenant, account), restored into the leased browser's context before the
+agent starts so repeat applications to a tenant skip signing in
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+try:
+    from cryptography.fernet import Fernet
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Seeds an origin's localStorage on every document load, without overwriting newer values
+RESTORE_STORAGE_JS = """
+(() => {
+    if (location.origin !== %s) return;
+    const items = %s;
+    for (const [name, value] of Object.entries(items)) {
+        if (localStorage.getItem(name) === null) localStorage.setItem(name, value);
+    }
+})();
+"""
+
+if PROMETHEUS_AVAILABLE:
+    AUTH_STATE_EVENTS = Counter(
+        'browser_auth_state_total',
+        'Stored sign-in state per ATS tenant by outcome',
+        ['ats', 'result']
+    )
+else:
+    AUTH_STATE_EVENTS = None
+
+
+def count_auth_event(ats: str, result: str) -> None:
+    if AUTH_STATE_EVENTS is not None:
+        AUTH_STATE_EVENTS.labels(ats=ats, result=result).inc()
+
+
+def scope_state(state: Dict[str, Any], host: str) -> Dict[str, Any]:
+    """
+    The part of a Playwright storage state that belongs to ``host``.
+
+    Keeps cookies set for the host or a parent domain and the host's own
+    origins, so third-party trackers are never persisted.
+    """
+    host = host.lower()
+    cookies = [
+        cookie for cookie in state.get('cookies') or []
+        if host == cookie.get('domain', '').lstrip('.').lower()
+        or host.endswith('.' + cookie.get('domain', '').lstrip('.').lower())
+    ]
+    origins = [
+        origin for origin in state.get('origins') or []
+        if origin.get('origin', '').lower().split('://')[-1].split(':')[0] == host
+    ]
+    return {'cookies': cookies, 'origins': origins}
+
+
+def drop_expired(state: Dict[str, Any], now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    A storage state without expired cookies.
+
+    Returns:
+        The state, or None when no cookie is left (signing in again is needed)
+    """
+    now = now or time.time()
+    cookies = [
+        cookie for cookie in state.get('cookies') or []
+        if cookie.get('expires', -1) in (-1, None) or cookie['expires'] > now
+    ]
+    if not cookies:
+        return None
+    return {**state, 'cookies': cookies}
+
+
+async def restore_state(context: Any, state: Dict[str, Any]) -> None:
+    """Load a storage state into a Playwright browser context"""
+    if state.get('cookies'):
+        await context.add_cookies(state['cookies'])
+    for origin in state.get('origins') or []:
+        items = {item['name']: item['value'] for item in origin.get('localStorage') or []}
+        if items:
+            await context.add_init_script(RESTORE_STORAGE_JS % (json.dumps(origin['origin']), json.dumps(items)))
+
+
+class AuthStateStore:
+    """
+    Encrypted storage states under ``AUTH_STATE_DIR``, one file per
+    (tenant, account).
+
+    File names are hashes of tenant and account, and contents are Fernet
+    tokens, so neither accounts nor session cookies are readable on disk
+    without ``AUTH_STATE_KEY``. States older than ``ttl_hours`` or without
+    an unexpired cookie are not returned. Methods are synchronous; wrap the
+    store in AsyncRepository to keep file I/O off the event loop.
+    """
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        base_dir: Optional[str] = None,
+        ttl_hours: Optional[float] = None,
+        cipher: Any = None
+    ):
+        """
+        Initialize auth state store.
+
+        Args:
+            key: Fernet key (default: AUTH_STATE_KEY)
+            base_dir: Directory for state files (default: AUTH_STATE_DIR or ./auth_state)
+            ttl_hours: Max age of a stored state (default: AUTH_STATE_TTL_HOURS or 72)
+            cipher: Object with encrypt/decrypt (default: Fernet(key))
+
+        Raises:
+            RuntimeError: No cipher could be built (cryptography missing or no key)
+        """
+        if cipher is None:
+            key = key or os.getenv('AUTH_STATE_KEY')
+            if not CRYPTOGRAPHY_AVAILABLE:
+                raise RuntimeError("cryptography is not installed")
+            if not key:
+                raise RuntimeError("AUTH_STATE_KEY is not set")
+            cipher = Fernet(key.encode('utf-8') if isinstance(key, str) else key)
+        self.cipher = cipher
+        self.base_dir = base_dir or os.getenv('AUTH_STATE_DIR', os.path.join(os.getcwd(), 'auth_state'))
+        self.ttl_hours = float(ttl_hours if ttl_hours is not None else os.getenv('AUTH_STATE_TTL_HOURS', 72))
+
+    def load(self, tenant: str, account: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored storage state of an account on a tenant.
+
+        Returns:
+            Playwright storage state (cookies, origins), or None when missing,
+            expired or unreadable
+        """
+        try:
+            with open(self._path(tenant, account), 'rb') as f:
+                document = json.loads(self.cipher.decrypt(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Wrong key, truncated file, ...: sign in again and overwrite it
+            logger.warning(f"Unreadable auth state for {tenant}: {type(e).__name__}")
+            return None
+
+        if time.time() - document.get('saved_at', 0) > self.ttl_hours * 3600:
+            logger.info(f"Auth state for {tenant} is older than {self.ttl_hours:.0f}h")
+            return None
+        return drop_expired(document.get('state') or {})
+
+    def save(self, tenant: str, account: str, state: Dict[str, Any]) -> None:
+        """Store (or refresh) the storage state of an account on a tenant"""
+        document = {'tenant': tenant, 'account': account, 'saved_at': time.time(), 'state': state}
+        token = self.cipher.encrypt(json.dumps(document).encode('utf-8'))
+        os.makedirs(self.base_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(token)
+            os.replace(tmp_path, self._path(tenant, account))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def invalidate(self, tenant: str, account: str) -> None:
+        """Forget a state that no longer signs in"""
+        try:
+            os.remove(self._path(tenant, account))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, tenant: str, account: str) -> str:
+        digest = hashlib.sha256(f"{tenant.lower()}\n{account.lower()}".encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.base_dir, f"{digest}.state")
@@ -0,0 +1,405 @@
+"""
+Browser Farm
+Spreads a worker's pooled browsers across several CDP endpoints (remote
+Chrome hosts or browser services) and local headless instances, with
+least-loaded assignment, per-endpoint session limits, health probing and
+ejection of dead endpoints
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .pool import BrowserUseLauncher
+
+try:
+    from prometheus_client import Counter, Gauge
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+LOCAL = 'local'
+
+if PROMETHEUS_AVAILABLE:
+    BROWSER_FARM_SESSIONS = Gauge('browser_farm_sessions', 'Browser sessions held on a farm endpoint', ['endpoint'])
+    BROWSER_FARM_UP = Gauge('browser_farm_endpoint_up', 'Whether a farm endpoint takes new sessions', ['endpoint'])
+    BROWSER_FARM_EJECTIONS = Counter('browser_farm_ejections_total', 'Farm endpoints ejected as dead', ['endpoint'])
+else:
+    BROWSER_FARM_SESSIONS = None
+    BROWSER_FARM_UP = None
+    BROWSER_FARM_EJECTIONS = None
+
+
+@dataclass
+class FarmEndpoint:
+    """
+    One CDP endpoint (or the local launcher) and its sessions.
+
+    A CDP endpoint takes a single session: sessions attached to the same
+    remote browser share its default context, so cookies, cache, tabs,
+    request routes and restored sign-ins would leak between concurrent
+    applications and be wiped by each other's cleanup. Scale remote
+    capacity by listing more browsers (one port each); ``local`` launches
+    a separate browser per session and may take several.
+    """
+
+    url: str
+    launcher: Any
+    max_sessions: int = 1
+    sessions: int = 0
+    failures: int = 0
+    up: bool = True
+    ejected_until: float = 0.0
+    probed_at: float = 0.0
+
+    def __post_init__(self):
+        if self.url != LOCAL and self.max_sessions > 1:
+            raise ValueError(
+                f"CDP endpoint {self.label} cannot take {self.max_sessions} sessions: concurrent sessions "
+                f"would share one browser context; list one endpoint per browser instead"
+            )
+        self.max_sessions = max(int(self.max_sessions), 1)
+
+    @property
+    def label(self) -> str:
+        """The endpoint without credentials or path, for logs and metrics"""
+        if self.url == LOCAL:
+            return LOCAL
+        parsed = urlparse(self.url)
+        return f"{parsed.scheme}://{parsed.hostname}{f':{parsed.port}' if parsed.port else ''}"
+
+    @property
+    def load(self) -> float:
+        return self.sessions / self.max_sessions
+
+    def available(self, now: float) -> bool:
+        return self.up and self.ejected_until <= now and self.sessions < self.max_sessions
+
+
+async def probe_endpoint(endpoint: FarmEndpoint, timeout: float = 3.0) -> bool:
+    """
+    Whether a CDP endpoint answers.
+
+    HTTP endpoints must serve ``/json/version``; WebSocket endpoints must
+    accept a TCP connection. The local launcher is always reachable.
+    """
+    if endpoint.url == LOCAL:
+        return True
+    parsed = urlparse(endpoint.url)
+    try:
+        if parsed.scheme in ('http', 'https'):
+            import httpx
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.get(f"{parsed.scheme}://{parsed.netloc}/json/version")
+                return response.status_code == 200
+        port = parsed.port or (443 if parsed.scheme == 'wss' else 80)
+        _, writer = await asyncio.wait_for(asyncio.open_connection(parsed.hostname, port), timeout=timeout)
+        writer.close()
+        return True
+    except Exception as e:
+        logger.warning(f"Browser farm endpoint {endpoint.label} did not answer: {e}")
+        return False
+
+
+class BrowserFarm:
+    """
+    Launcher for BrowserPool that places each new browser on the least
+    loaded farm endpoint.
+
+    - an endpoint holds at most ``max_sessions`` of this worker's sessions
+      (idle ones included; one on a CDP endpoint, see FarmEndpoint); when
+      every live endpoint is full, a launch waits up to ``wait_timeout`` for
+      a session to close, and fails right away when all of them are ejected
+    - endpoints are probed before a launch when their last probe is older
+      than ``probe_interval``
+    - ``eject_after`` consecutive failures (probes, launches, or failed pool
+      health checks of its sessions) eject an endpoint for ``eject_seconds``;
+      it is probed again afterwards and readmitted when it answers
+
+    Limits are per process. Ray actors each get a disjoint share of the CDP
+    endpoints (see partition_endpoints), so no remote browser is attached
+    by two workers.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[FarmEndpoint],
+        probe: Optional[Callable[[FarmEndpoint], Awaitable[bool]]] = None,
+        probe_interval: float = 30.0,
+        eject_after: int = 2,
+        eject_seconds: float = 60.0,
+        wait_timeout: float = 60.0
+    ):
+        """
+        Initialize browser farm.
+
+        Args:
+            endpoints: Farm endpoints, each with the launcher of its sessions
+            probe: Async health probe of an endpoint (default: probe_endpoint)
+            probe_interval: Seconds between probes of an endpoint
+            eject_after: Consecutive failures that eject an endpoint
+            eject_seconds: How long an ejected endpoint gets no sessions
+            wait_timeout: Max seconds a launch waits for free capacity
+        """
+        if not endpoints:
+            raise ValueError("A browser farm needs at least one endpoint")
+        self.endpoints = endpoints
+        self.probe = probe or probe_endpoint
+        self.probe_interval = probe_interval
+        self.eject_after = max(int(eject_after), 1)
+        self.eject_seconds = eject_seconds
+        self.wait_timeout = wait_timeout
+        self._owners: Dict[int, FarmEndpoint] = {}
+        for endpoint in endpoints:
+            self._export(endpoint)
+
+    @property
+    def capacity(self) -> int:
+        return sum(endpoint.max_sessions for endpoint in self.endpoints)
+
+    async def launch(self) -> Any:
+        """
+        Start a browser session on the least loaded available endpoint.
+
+        Raises:
+            RuntimeError: Every endpoint is ejected, or none had capacity
+                within ``wait_timeout``
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            await self._probe_due()
+            endpoint = self._pick()
+            if endpoint is None:
+                if not any(candidate.up for candidate in self.endpoints) or time.monotonic() >= deadline:
+                    raise RuntimeError(f"No browser farm endpoint available ({self._describe()})")
+                # Sessions close from other tasks on this loop; poll for the freed slot
+                await asyncio.sleep(min(0.25, max(deadline - time.monotonic(), 0.0)))
+                continue
+
+            endpoint.sessions += 1
+            try:
+                session = await endpoint.launcher.launch()
+            except Exception as e:
+                endpoint.sessions -= 1
+                logger.warning(f"Failed to start a browser on {endpoint.label}: {e}")
+                self._failed(endpoint)
+                continue
+            endpoint.failures = 0
+            self._owners[id(session)] = endpoint
+            self._export(endpoint)
+            logger.info(f"Browser started on {endpoint.label} ({endpoint.sessions}/{endpoint.max_sessions})")
+            return session
+
+    async def healthy(self, session: Any) -> bool:
+        endpoint = self._owners.get(id(session))
+        if endpoint is None:
+            return False
+        if not endpoint.up:
+            # Its endpoint was ejected: let the pool retire it
+            return False
+        if await endpoint.launcher.healthy(session):
+            endpoint.failures = 0
+            return True
+        self._failed(endpoint)
+        return False
+
+    async def clean(self, session: Any, origins: List[str]) -> None:
+        await self._owners[id(session)].launcher.clean(session, origins)
+
+    async def close(self, session: Any) -> None:
+        endpoint = self._owners.pop(id(session), None)
+        if endpoint is None:
+            return
+        endpoint.sessions -= 1
+        self._export(endpoint)
+        await endpoint.launcher.close(session)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Sessions, limits and state per endpoint"""
+        now = time.monotonic()
+        return [
+            {
+                'endpoint': endpoint.label,
+                'sessions': endpoint.sessions,
+                'max_sessions': endpoint.max_sessions,
+                'up': endpoint.up,
+                'failures': endpoint.failures,
+                'ejected_seconds_left': round(max(endpoint.ejected_until - now, 0.0), 1),
+            }
+            for endpoint in self.endpoints
+        ]
+
+    def _pick(self) -> Optional[FarmEndpoint]:
+        now = time.monotonic()
+        candidates = [endpoint for endpoint in self.endpoints if endpoint.available(now)]
+        if not candidates:
+            return None
+        # Least loaded relative to its limit; ties go to the larger endpoint
+        return min(candidates, key=lambda endpoint: (endpoint.load, -endpoint.max_sessions))
+
+    async def _probe_due(self) -> None:
+        now = time.monotonic()
+        due = [
+            endpoint for endpoint in self.endpoints
+            if endpoint.ejected_until <= now and now - endpoint.probed_at >= self.probe_interval
+        ]
+        if not due:
+            return
+        results = await asyncio.gather(*(self.probe(endpoint) for endpoint in due), return_exceptions=True)
+        for endpoint, ok in zip(due, results):
+            endpoint.probed_at = time.monotonic()
+            if ok is True:
+                # Answering readmits an ejected endpoint, but does not clear
+                # the launch or session failures of a live one
+                if not endpoint.up:
+                    logger.info(f"Browser farm endpoint {endpoint.label} is back")
+                    endpoint.up, endpoint.failures = True, 0
+                    self._export(endpoint)
+            else:
+                self._failed(endpoint)
+
+    def _failed(self, endpoint: FarmEndpoint) -> None:
+        endpoint.failures += 1
+        if endpoint.failures >= self.eject_after and endpoint.up:
+            endpoint.up = False
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            # Probe again as soon as the ejection ends
+            endpoint.probed_at = 0.0
+            logger.error(
+                f"Ejecting browser farm endpoint {endpoint.label} for {self.eject_seconds:.0f}s "
+                f"after {endpoint.failures} failures"
+            )
+            if BROWSER_FARM_EJECTIONS is not None:
+                BROWSER_FARM_EJECTIONS.labels(endpoint=endpoint.label).inc()
+        elif not endpoint.up:
+            # Still dead after its ejection: keep it out for another round
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            endpoint.probed_at = 0.0
+        self._export(endpoint)
+
+    def _describe(self) -> str:
+        return ', '.join(
+            f"{endpoint.label} {endpoint.sessions}/{endpoint.max_sessions}{'' if endpoint.up else ' ejected'}"
+            for endpoint in self.endpoints
+        )
+
+    @staticmethod
+    def _export(endpoint: FarmEndpoint) -> None:
+        if BROWSER_FARM_SESSIONS is None:
+            return
+        BROWSER_FARM_SESSIONS.labels(endpoint=endpoint.label).set(endpoint.sessions)
+        BROWSER_FARM_UP.labels(endpoint=endpoint.label).set(1 if endpoint.up else 0)
+
+
+def parse_endpoints(urls: List[str]) -> List[Tuple[str, int]]:
+    """
+    Endpoint specs as ``(url, max_sessions)``.
+
+    A spec is a CDP URL (``http://host:9222``, ``ws://...``), which takes
+    one session, or ``local`` optionally followed by ``*N`` for N local
+    headless browsers.
+
+    Raises:
+        ValueError: ``*N`` with N > 1 on a CDP URL
+    """
+    parsed = []
+    for spec in urls:
+        spec = spec.strip()
+        if not spec:
+            continue
+        url, _, limit = spec.partition('*')
+        url, max_sessions = url.strip(), max(int(limit), 1) if limit.strip() else 1
+        if url != LOCAL and max_sessions > 1:
+            raise ValueError(f"{spec}: a CDP endpoint takes one session; list one endpoint per browser")
+        parsed.append((url, max_sessions))
+    return parsed
+
+
+def partition_endpoints(specs: List[Tuple[str, int]], worker_index: int, worker_count: int) -> List[Tuple[str, int]]:
+    """
+    The endpoint specs of one of ``worker_count`` workers.
+
+    CDP endpoints are dealt round-robin (endpoint i goes to worker
+    i % worker_count), so each remote browser has a single worker. ``local``
+    specs launch browsers inside the worker and are kept by every worker.
+
+    Raises:
+        ValueError: Fewer CDP endpoints than workers
+    """
+    if worker_count <= 1:
+        return list(specs)
+    if not 0 <= worker_index < worker_count:
+        raise ValueError(f"Worker index {worker_index} is not within {worker_count} workers")
+    remote = [spec for spec in specs if spec[0] != LOCAL]
+    if remote and len(remote) < worker_count:
+        raise ValueError(
+            f"{len(remote)} CDP endpoints cannot be split between {worker_count} workers; "
+            f"list at least one browser per worker"
+        )
+    return [spec for spec in specs if spec[0] == LOCAL] + remote[worker_index::worker_count]
+
+
+def assign_worker(worker_index: int, worker_count: int) -> None:
+    """
+    Make this process worker ``worker_index`` of ``worker_count`` for
+    farm_from_env. Ray actors call it before building their browser pool.
+    """
+    os.environ['BROWSER_FARM_WORKER_INDEX'] = str(worker_index)
+    os.environ['BROWSER_FARM_WORKER_COUNT'] = str(worker_count)
+
+
+def farm_specs(worker_index: Optional[int] = None, worker_count: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    This worker's endpoint specs from the environment.
+
+    Endpoints come from CHROME_CDP_URLS (comma-separated specs, see
+    parse_endpoints; falls back to CHROME_CDP_URL) and are partitioned by
+    BROWSER_FARM_WORKER_INDEX / BROWSER_FARM_WORKER_COUNT (see assign_worker;
+    default: one worker gets them all).
+
+    Raises:
+        ValueError: Invalid specs, or fewer CDP endpoints than workers
+    """
+    from ..utils.browser_config import get_browser_config
+
+    if worker_index is None:
+        worker_index = int(os.getenv('BROWSER_FARM_WORKER_INDEX', 0))
+    if worker_count is None:
+        worker_count = int(os.getenv('BROWSER_FARM_WORKER_COUNT', 1))
+    return partition_endpoints(parse_endpoints(get_browser_config().get_cdp_urls()), worker_index, worker_count)
+
+
+def farm_from_env(headless: bool = True) -> Optional[BrowserFarm]:
+    """
+    The worker's browser farm, or None when no endpoints are configured.
+
+    Endpoints are this worker's share of CHROME_CDP_URLS (see farm_specs,
+    e.g. ``http://chrome-1:9222,http://chrome-1:9223,local*2``).
+    BROWSER_FARM_PROBE_SECONDS and BROWSER_FARM_EJECT_SECONDS tune probing
+    and ejection.
+    """
+    specs = farm_specs()
+    if not specs:
+        return None
+
+    endpoints = [
+        FarmEndpoint(
+            url=url,
+            launcher=BrowserUseLauncher(headless=headless, cdp_url=None if url == LOCAL else url),
+            max_sessions=max_sessions
+        )
+        for url, max_sessions in specs
+    ]
+    farm = BrowserFarm(
+        endpoints,
+        probe_interval=float(os.getenv('BROWSER_FARM_PROBE_SECONDS', 30)),
+        eject_seconds=float(os.getenv('BROWSER_FARM_EJECT_SECONDS', 60))
+    )
+    logger.info(f"Browser farm: {farm._describe()}")
+    return farm
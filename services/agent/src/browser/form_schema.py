@@ -0,0 +1,331 @@
+"""
+Form Schema Cache
+Normalized application-form layouts (field labels, types, required flags,
+step boundaries, selectors) learned per (domain, form fingerprint), so later
+applications to the same form pre-plan answers and skip exploration
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..generation.answer_bank import normalize_question
+from persistence.src.async_repository import AsyncRepository
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Visible form controls of the open page with their labels
+READ_FIELDS_JS = """
+() => Array.from(document.querySelectorAll('input, select, textarea')).filter(el => {
+    const type = (el.getAttribute('type') || '').toLowerCase();
+    if (['hidden', 'submit', 'button', 'reset', 'image'].includes(type)) return false;
+    return type === 'file' || el.offsetParent !== null;
+}).map(el => {
+    const tag = el.tagName.toLowerCase();
+    const type = tag === 'input' ? (el.getAttribute('type') || 'text').toLowerCase() : tag;
+    let label = '';
+    if (type === 'radio') {
+        const legend = el.closest('fieldset') && el.closest('fieldset').querySelector('legend');
+        label = legend ? legend.innerText : '';
+    } else if (el.id) {
+        const tag_label = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+        label = tag_label ? tag_label.innerText : '';
+    }
+    if (!label && type !== 'radio' && el.closest('label')) label = el.closest('label').innerText;
+    label = (label || el.getAttribute('aria-label') || el.getAttribute('placeholder') || el.name || el.id || '').trim();
+    return {
+        label: label,
+        type: type,
+        required: el.required || el.getAttribute('aria-required') === 'true' || /\\*\\s*$/.test(label),
+        selector: type === 'radio' ? (el.name ? `input[name="${el.name}"]` : null)
+            : el.id ? `#${CSS.escape(el.id)}` : el.name ? `${tag}[name="${el.name}"]` : null
+    };
+})
+"""
+
+# HTML input types -> application_questions.field_type
+FIELD_TYPES = {
+    'text': 'text', 'email': 'text', 'tel': 'text', 'url': 'text', 'number': 'text', 'search': 'text',
+    'textarea': 'textarea', 'select': 'select', 'checkbox': 'checkbox', 'radio': 'radio',
+    'file': 'upload', 'date': 'date',
+}
+
+if PROMETHEUS_AVAILABLE:
+    FORM_SCHEMA_LOOKUPS = Counter('form_schema_lookups_total', 'Form schema cache lookups', ['result'])
+    FORM_SCHEMA_STEPS_SAVED = Counter(
+        'form_schema_agent_steps_saved_total',
+        'Agent steps saved on cached forms, relative to the visit that learned them'
+    )
+else:
+    FORM_SCHEMA_LOOKUPS = None
+    FORM_SCHEMA_STEPS_SAVED = None
+
+
+@dataclass
+class FormField:
+    """One control of an application form"""
+
+    label: str
+    type: str
+    required: bool = False
+    selector: Optional[str] = None
+    step: int = 0
+
+
+@dataclass
+class FormSchema:
+    """Learned layout of one application form"""
+
+    domain: str
+    fingerprint: str
+    fields: List[FormField] = field(default_factory=list)
+    steps: int = 1
+    ats: Optional[str] = None
+    baseline_agent_steps: Optional[int] = None
+
+    def questions(self) -> List[str]:
+        """Free-text questions worth drafting before the agent reaches them"""
+        return [f.label for f in self.fields if f.type == 'textarea']
+
+    def describe(self) -> str:
+        """Form layout for the browser agent's task"""
+        lines = []
+        for step in range(self.steps):
+            fields = [f for f in self.fields if f.step == step]
+            if not fields:
+                continue
+            lines.append(f"Step {step + 1}:")
+            for f in fields:
+                flags = f"{f.type}, required" if f.required else f.type
+                target = f" [{f.selector}]" if f.selector else ''
+                lines.append(f"- {f.label} ({flags}){target}")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'steps': self.steps, 'fields': [asdict(f) for f in self.fields]}
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'FormSchema':
+        schema = row.get('schema') or {}
+        return cls(
+            domain=row['domain'],
+            fingerprint=row['fingerprint'],
+            fields=[FormField(**f) for f in schema.get('fields', [])],
+            steps=int(schema.get('steps', 1)),
+            ats=row.get('ats'),
+            baseline_agent_steps=row.get('baseline_agent_steps')
+        )
+
+
+def form_domain(url: str) -> str:
+    host = (urlparse(url or '').hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def normalize_fields(raw: List[Dict[str, Any]], step: int = 0) -> List[FormField]:
+    """Labelled controls with schema types, one per normalized label and type"""
+    fields: List[FormField] = []
+    seen = set()
+    for item in raw or []:
+        label = ' '.join(str(item.get('label') or '').split())
+        kind = FIELD_TYPES.get(str(item.get('type') or '').lower(), 'unknown')
+        key = (normalize_question(label), kind)
+        if not key[0] or key in seen:
+            continue
+        seen.add(key)
+        fields.append(FormField(label, kind, bool(item.get('required')), item.get('selector'), step))
+    return fields
+
+
+def form_fingerprint(fields: List[FormField]) -> str:
+    """Stable hash of a page's field labels and types (order-independent)"""
+    keys = sorted({f"{normalize_question(f.label)}|{f.type}" for f in fields})
+    return hashlib.sha256('\n'.join(keys).encode('utf-8')).hexdigest()[:16]
+
+
+async def read_form_fields(page: Any) -> List[FormField]:
+    """Fields of the form open on a Playwright page"""
+    return normalize_fields(await page.evaluate(READ_FIELDS_JS))
+
+
+def history_fields(history: Any) -> Tuple[List[FormField], int, int]:
+    """
+    What a browser-use run learned about the form.
+
+    Step boundaries are URL changes; fields are the elements the agent
+    interacted with on each step.
+
+    Returns:
+        (fields, form steps, agent steps)
+    """
+    items = list(getattr(history, 'history', None) or [])
+    urls: List[str] = []
+    raw_steps: Dict[int, List[Dict[str, Any]]] = {}
+    for item in items:
+        state = getattr(item, 'state', None)
+        url = getattr(state, 'url', None)
+        if url and url != 'about:blank' and (not urls or urls[-1] != url):
+            urls.append(url)
+        step = max(len(urls) - 1, 0)
+        for element in getattr(state, 'interacted_element', None) or []:
+            attributes = getattr(element, 'attributes', None) or {}
+            tag = str(getattr(element, 'node_name', '') or '').lower()
+            if tag not in ('input', 'select', 'textarea'):
+                continue
+            element_id = attributes.get('id')
+            name = attributes.get('name')
+            raw_steps.setdefault(step, []).append({
+                'label': attributes.get('aria-label') or attributes.get('placeholder') or name or element_id,
+                'type': attributes.get('type', 'text') if tag == 'input' else tag,
+                'required': 'required' in attributes or attributes.get('aria-required') == 'true',
+                'selector': f"#{element_id}" if element_id else (f'{tag}[name="{name}"]' if name else None),
+            })
+
+    fields = [f for step, raw in sorted(raw_steps.items()) for f in normalize_fields(raw, step)]
+    return fields, max(len(urls), 1), len(items)
+
+
+class FormSchemaCache:
+    """
+    Per-worker index of learned form schemas, backed by form_schemas.
+
+    A lookup fingerprints the fields of the form's first page and returns
+    the schema learned for that (domain, fingerprint), if any. After a
+    successful run the schema is learned, or refreshed: fields seen on the
+    first page plus the fields the agent filled on each later step. A
+    domain's schemas load lazily on its first lookup.
+    """
+
+    def __init__(self, repository=None):
+        """
+        Initialize form schema cache.
+
+        Args:
+            repository: FormSchemaRepository (None keeps schemas in memory only)
+        """
+        self.repository = AsyncRepository.wrap(repository)
+        self._schemas: Dict[Tuple[str, str], FormSchema] = {}
+        self._loaded: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.steps_saved = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    async def lookup(self, url: str, fields: List[FormField]) -> Tuple[str, Optional[FormSchema]]:
+        """
+        Find the schema of the form whose first page shows ``fields``.
+
+        Returns:
+            (fingerprint, schema or None)
+        """
+        domain = form_domain(url)
+        fingerprint = form_fingerprint(fields)
+        schema = None
+        try:
+            await self._ensure_loaded(domain)
+            schema = self._schemas.get((domain, fingerprint))
+        except Exception as e:
+            logger.warning(f"Form schema lookup failed: {e}")
+
+        if schema is not None:
+            self.hits += 1
+            logger.info(f"Form schema hit for {domain} ({len(schema.fields)} fields, {schema.steps} steps)")
+        else:
+            self.misses += 1
+        if FORM_SCHEMA_LOOKUPS is not None:
+            FORM_SCHEMA_LOOKUPS.labels(result='hit' if schema is not None else 'miss').inc()
+        return fingerprint, schema
+
+    async def learn(
+        self,
+        url: str,
+        fingerprint: str,
+        first_page: List[FormField],
+        history: Any,
+        ats: Optional[str] = None
+    ) -> FormSchema:
+        """
+        Record what a successful run saw of the form.
+
+        Args:
+            url: Application URL
+            fingerprint: Fingerprint returned by lookup()
+            first_page: Fields read from the first page before the agent ran
+            history: browser-use history of the run
+            ats: ATS label
+
+        Returns:
+            The stored schema
+        """
+        domain = form_domain(url)
+        agent_fields, steps, agent_steps = history_fields(history)
+        known = self._schemas.get((domain, fingerprint))
+
+        fields: List[FormField] = []
+        seen = set()
+        for f in list(first_page) + agent_fields + (known.fields if known else []):
+            key = (normalize_question(f.label), f.type)
+            if key not in seen:
+                seen.add(key)
+                fields.append(f)
+
+        schema = FormSchema(
+            domain=domain,
+            fingerprint=fingerprint,
+            fields=fields,
+            steps=max(steps, known.steps if known else 1),
+            ats=ats,
+            baseline_agent_steps=known.baseline_agent_steps if known else agent_steps
+        )
+        self._schemas[(domain, fingerprint)] = schema
+
+        if known is not None and known.baseline_agent_steps:
+            saved = max(known.baseline_agent_steps - agent_steps, 0)
+            self.steps_saved += saved
+            if FORM_SCHEMA_STEPS_SAVED is not None and saved:
+                FORM_SCHEMA_STEPS_SAVED.inc(saved)
+            logger.info(f"Cached form of {domain} took {agent_steps} agent steps ({saved} saved)")
+
+        try:
+            if self.repository is not None:
+                await self.repository.save_schema(
+                    domain, fingerprint, schema.to_dict(), ats=ats, agent_steps=agent_steps, hit=known is not None
+                )
+        except Exception as e:
+            logger.warning(f"Failed to store form schema: {e}")
+        return schema
+
+    async def _ensure_loaded(self, domain: str) -> None:
+        """Load a domain's schemas once"""
+        if self.repository is None:
+            return
+        pending = self._loaded.get(domain)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(domain))
+            self._loaded[domain] = pending
+        try:
+            await asyncio.shield(pending)
+        except Exception:
+            # Retry on the next lookup
+            self._loaded.pop(domain, None)
+            raise
+
+    async def _load(self, domain: str) -> None:
+        rows = await self.repository.load_schemas(domain)
+        for row in rows:
+            self._schemas.setdefault((row['domain'], row['fingerprint']), FormSchema.from_row(row))
+        logger.info(f"Form schema cache loaded {len(rows)} schemas for {domain}")
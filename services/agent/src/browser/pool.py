@@ -0,0 +1,388 @@
+"""
+Browser Pool
+Warm browser processes reused across applications in a worker, with
+per-application cleanup, health checks, max-uses recycling and pool metrics
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Chromium flags for containers and WSL
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+]
+
+if PROMETHEUS_AVAILABLE:
+    BROWSER_POOL_WAIT = Histogram(
+        'browser_pool_wait_seconds',
+        'Time an application waited for a browser (including any launch)',
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+    )
+    BROWSER_POOL_LAUNCHES = Counter('browser_pool_launches_total', 'Browsers launched by the pool')
+    BROWSER_POOL_REUSES = Counter('browser_pool_launches_avoided_total', 'Leases served by an already warm browser')
+    BROWSER_POOL_RETIRED = Counter('browser_pool_retired_total', 'Browsers shut down by the pool', ['reason'])
+    BROWSER_POOL_BROWSERS = Gauge('browser_pool_browsers', 'Browsers held by the pool', ['state'])
+else:
+    BROWSER_POOL_WAIT = None
+    BROWSER_POOL_LAUNCHES = None
+    BROWSER_POOL_REUSES = None
+    BROWSER_POOL_RETIRED = None
+    BROWSER_POOL_BROWSERS = None
+
+
+class BrowserUseLauncher:
+    """
+    Launches and maintains browser-use BrowserSessions.
+
+    Sessions are created with keep_alive so a finished Agent leaves the
+    browser running for the next lease; cleanup and health checks talk CDP
+    to the browser directly. With ``cdp_url`` sessions connect to a browser
+    running elsewhere (see BrowserFarm) instead of launching one.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        args: Optional[List[str]] = None,
+        health_timeout: float = 5.0,
+        cdp_url: Optional[str] = None
+    ):
+        self.headless = headless
+        self.args = list(args or BROWSER_ARGS)
+        self.health_timeout = health_timeout
+        self.cdp_url = cdp_url
+
+    async def launch(self) -> Any:
+        from browser_use import BrowserProfile, BrowserSession
+
+        if self.cdp_url:
+            session = BrowserSession(cdp_url=self.cdp_url, browser_profile=BrowserProfile(keep_alive=True))
+        else:
+            session = BrowserSession(browser_profile=BrowserProfile(
+                headless=self.headless,
+                args=self.args,
+                keep_alive=True
+            ))
+        await session.start()
+        return session
+
+    async def healthy(self, session: Any) -> bool:
+        try:
+            await asyncio.wait_for(session.cdp_client.send.Browser.getVersion(), timeout=self.health_timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled browser failed its health check: {e}")
+            return False
+
+    async def clean(self, session: Any, origins: List[str]) -> None:
+        """
+        Leave nothing of the previous application behind: cookies, cache,
+        storage of every origin it touched, and all but one blank tab.
+        """
+        cdp = session.cdp_client.send
+        tabs = await session.get_tabs()
+        for url in [tab.url for tab in tabs] + list(origins):
+            origin = _origin(url)
+            if origin and origin not in origins:
+                origins.append(origin)
+        for origin in origins:
+            await cdp.Storage.clearDataForOrigin(params={'origin': origin, 'storageTypes': 'all'})
+        await cdp.Storage.clearCookies(params={})
+        await cdp.Network.clearBrowserCache()
+
+        for tab in tabs[1:]:
+            await cdp.Target.closeTarget(params={'targetId': tab.target_id})
+        await session.navigate_to('about:blank')
+
+    async def close(self, session: Any) -> None:
+        if self.cdp_url:
+            # The remote browser outlives the connection: drop what a
+            # discarded run may have left, then disconnect
+            try:
+                await session.cdp_client.send.Storage.clearCookies(params={})
+            except Exception as e:
+                logger.warning(f"Failed to clear cookies on {self.cdp_url}: {e}")
+            await asyncio.wait_for(session.stop(), timeout=10)
+            return
+        await asyncio.wait_for(session.kill(), timeout=10)
+
+
+class PooledBrowser:
+    """A warm browser and its usage count"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, session: Any):
+        self.id = next(self._ids)
+        self.session = session
+        self.uses = 0
+        self.launched_at = time.monotonic()
+
+
+class BrowserLease:
+    """Handle yielded by BrowserPool.lease for one application"""
+
+    def __init__(self, browser: PooledBrowser, origin: Optional[str], reused: bool, wait_seconds: float):
+        self.browser = browser
+        self.session = browser.session
+        self.reused = reused
+        self.wait_seconds = wait_seconds
+        self.origins: List[str] = [origin] if origin else []
+        self.discarded = False
+
+    def discard(self) -> None:
+        """Do not return the browser to the pool (crashed, cancelled mid-run, ...)"""
+        self.discarded = True
+
+
+class BrowserPool:
+    """
+    Per-worker pool of warm browsers.
+
+    - at most ``size`` browsers exist; further applications wait for a lease
+    - an idle browser is health-checked before it is handed out and replaced
+      if it does not answer
+    - on release the browser is cleaned (cookies, storage, cache, extra
+      tabs); after ``max_uses`` leases, a failed cleanup or a discarded
+      lease it is shut down instead of reused
+
+    Leases are bound to the event loop that first used the pool; a different
+    loop (tests, scripts) retires the previous loop's idle browsers and
+    starts with an empty pool.
+
+    Usage::
+
+        async with pool.lease(job_url) as lease:
+            agent = Agent(task=task, llm=llm, browser_session=lease.session)
+            await agent.run()
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 20, launcher: Any = None):
+        """
+        Initialize browser pool.
+
+        Args:
+            size: Max browsers (and concurrent leases) in this worker
+            max_uses: Leases before a browser is recycled
+            launcher: Launches, checks, cleans and closes browsers
+                (default: BrowserUseLauncher)
+        """
+        self.size = max(int(size), 1)
+        self.max_uses = max(int(max_uses), 1)
+        self.launcher = launcher or BrowserUseLauncher()
+
+        self._idle: Deque[PooledBrowser] = deque()
+        self._busy = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        self._closed = False
+
+        self.launches = 0
+        self.reuses = 0
+        self.retired: Dict[str, int] = {}
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    @property
+    def busy(self) -> int:
+        return self._busy
+
+    async def start(self, warm: int = 1) -> None:
+        """Launch ``warm`` browsers ahead of the first application"""
+        await self._bind_loop()
+        for _ in range(min(warm, self.size) - len(self._idle)):
+            try:
+                self._idle.append(await self._launch())
+            except Exception as e:
+                logger.error(f"Failed to pre-launch pooled browser: {e}")
+                break
+        self._export_gauges()
+
+    @asynccontextmanager
+    async def lease(self, url: Optional[str] = None) -> AsyncIterator[BrowserLease]:
+        """
+        Borrow a clean browser for one application.
+
+        Args:
+            url: Application URL; its origin's storage is cleared on release
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        semaphore = await self._bind_loop()
+        queued_at = time.perf_counter()
+        async with semaphore:
+            browser, reused = await self._checkout()
+            wait = time.perf_counter() - queued_at
+            if BROWSER_POOL_WAIT is not None:
+                BROWSER_POOL_WAIT.observe(wait)
+
+            lease = BrowserLease(browser, _origin(url), reused, wait)
+            self._busy += 1
+            self._export_gauges()
+            try:
+                yield lease
+            except BaseException:
+                # The run may have left the browser in any state
+                lease.discard()
+                raise
+            finally:
+                self._busy -= 1
+                await self._checkin(lease)
+
+    async def close(self) -> None:
+        """Shut down idle browsers; leased ones are closed as they come back"""
+        self._closed = True
+        while self._idle:
+            await self._retire(self._idle.popleft(), 'shutdown')
+        logger.info(
+            f"BrowserPool closed ({self.launches} launches, {self.reuses} reuses, retired: {self.retired})"
+        )
+
+    async def _checkout(self):
+        while self._idle:
+            browser = self._idle.popleft()
+            if await self.launcher.healthy(browser.session):
+                self.reuses += 1
+                if BROWSER_POOL_REUSES is not None:
+                    BROWSER_POOL_REUSES.inc()
+                return browser, True
+            await self._retire(browser, 'unhealthy')
+        return await self._launch(), False
+
+    async def _checkin(self, lease: BrowserLease) -> None:
+        browser = lease.browser
+        browser.uses += 1
+        if self._closed:
+            reason = 'shutdown'
+        elif lease.discarded:
+            reason = 'discarded'
+        elif browser.uses >= self.max_uses:
+            reason = 'max_uses'
+        else:
+            try:
+                await self.launcher.clean(browser.session, lease.origins)
+                self._idle.append(browser)
+                self._export_gauges()
+                return
+            except Exception as e:
+                logger.warning(f"Failed to clean pooled browser {browser.id}: {e}")
+                reason = 'cleanup_failed'
+        await self._retire(browser, reason)
+
+    async def _launch(self) -> PooledBrowser:
+        session = await self.launcher.launch()
+        self.launches += 1
+        if BROWSER_POOL_LAUNCHES is not None:
+            BROWSER_POOL_LAUNCHES.inc()
+        browser = PooledBrowser(session)
+        logger.info(f"Launched pooled browser {browser.id}")
+        return browser
+
+    async def _retire(self, browser: PooledBrowser, reason: str) -> None:
+        self.retired[reason] = self.retired.get(reason, 0) + 1
+        if BROWSER_POOL_RETIRED is not None:
+            BROWSER_POOL_RETIRED.labels(reason=reason).inc()
+        logger.info(f"Retiring pooled browser {browser.id} after {browser.uses} uses ({reason})")
+        try:
+            await self.launcher.close(browser.session)
+        except Exception as e:
+            logger.error(f"Failed to close pooled browser {browser.id}: {e}")
+        self._export_gauges()
+
+    async def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            # Browsers launched on another loop cannot be leased from this
+            # one, but keep_alive leaves their processes running: shut them
+            # down before forgetting them
+            stale, previous = list(self._idle), self._loop
+            self._idle.clear()
+            self._busy = 0
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._loop = loop
+            await self._retire_stale(stale, previous)
+        return self._semaphore
+
+    async def _retire_stale(self, browsers: List[PooledBrowser], loop: Any) -> None:
+        """Retire another loop's idle browsers, on that loop while it still runs (another thread)"""
+        async def retire_all() -> None:
+            for browser in browsers:
+                await self._retire(browser, 'loop_changed')
+
+        if not browsers:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(retire_all(), loop))
+        else:
+            await retire_all()
+
+    def _export_gauges(self) -> None:
+        if BROWSER_POOL_BROWSERS is None:
+            return
+        BROWSER_POOL_BROWSERS.labels(state='idle').set(len(self._idle))
+        BROWSER_POOL_BROWSERS.labels(state='busy').set(self._busy)
+
+
+def _origin(url: Optional[str]) -> Optional[str]:
+    parsed = urlparse(url or '')
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """
+    This worker's browser pool, configured from the environment.
+
+    BROWSER_POOL_SIZE (default 2; 0 disables pooling) and
+    BROWSER_POOL_MAX_USES (default 20). Browsers are launched locally, or
+    on a BrowserFarm when CDP endpoints are configured (CHROME_CDP_URLS);
+    the pool is then no larger than the farm's capacity, so a lease never
+    waits on a farm slot that cannot exist. Returns None when disabled.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            size = int(os.getenv('BROWSER_POOL_SIZE', 2))
+            if size <= 0:
+                return None
+            from .farm import farm_from_env
+
+            headless = os.getenv('HEADLESS', 'true').lower() == 'true'
+            farm = farm_from_env(headless)
+            if farm is not None and size > farm.capacity:
+                logger.warning(
+                    f"BROWSER_POOL_SIZE={size} exceeds the browser farm's capacity; using {farm.capacity}"
+                )
+                size = farm.capacity
+            _pool = BrowserPool(
+                size=size,
+                max_uses=int(os.getenv('BROWSER_POOL_MAX_USES', 20)),
+                launcher=farm or BrowserUseLauncher(headless=headless)
+            )
+            logger.info(f"Browser pool: size={_pool.size}, max_uses={_pool.max_uses}")
+        return _pool
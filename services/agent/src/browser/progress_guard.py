@@ -0,0 +1,217 @@
+"""
+Browser Agent Progress Guard
+Ends a browser-use run early when it hits its step or token cap, stops
+changing the page, repeats the same action, or reaches the review page the
+task ends at, so a confused agent cannot loop through expensive steps
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from ..planning.budget import AgentLimits
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Progress signature of the open page (URL, element count, form values) and
+# whether one of its headings names the review step
+PROGRESS_JS = """
+(patterns) => {
+    const values = Array.from(document.querySelectorAll('input, select, textarea')).map(el =>
+        (el.type === 'checkbox' || el.type === 'radio') ? (el.checked ? '1' : '0') : String(el.value || '')
+    ).join('\\u0001');
+    const headings = Array.from(document.querySelectorAll('h1, h2, h3, legend, [role="heading"]'))
+        .map(el => (el.innerText || '').toLowerCase());
+    headings.push((document.title || '').toLowerCase());
+    return {
+        signature: [location.href, document.getElementsByTagName('*').length, values].join('|'),
+        review: headings.some(text => patterns.some(pattern => text.includes(pattern))),
+    };
+}
+"""
+
+if PROMETHEUS_AVAILABLE:
+    AGENT_STOPS = Counter(
+        'browser_agent_stops_total',
+        'Browser agent runs ended early by the progress guard',
+        ['ats', 'reason']
+    )
+else:
+    AGENT_STOPS = None
+
+
+def action_signature(item: Any) -> Optional[str]:
+    """Actions of a history step with their arguments, as a comparable string (None for no actions)"""
+    actions: List[Dict[str, Any]] = []
+    for action in getattr(getattr(item, 'model_output', None), 'action', None) or []:
+        if hasattr(action, 'model_dump'):
+            actions.append(action.model_dump(exclude_none=True))
+        elif isinstance(action, dict):
+            actions.append({name: value for name, value in action.items() if value is not None})
+    if not actions:
+        return None
+    return json.dumps(actions, sort_keys=True, default=str)
+
+
+def agent_tokens(agent: Any) -> Optional[int]:
+    """
+    Prompt plus completion tokens of every LLM call the agent made so far,
+    as later summarized into its history's usage (None when not tracked).
+    """
+    entries = getattr(getattr(agent, 'token_cost_service', None), 'usage_history', None)
+    if not isinstance(entries, list):
+        return None
+    total = 0
+    for entry in entries:
+        usage = getattr(entry, 'usage', None)
+        total += int(getattr(usage, 'prompt_tokens', 0) or 0) + int(getattr(usage, 'completion_tokens', 0) or 0)
+    return total
+
+
+def agent_history(agent: Any) -> List[Any]:
+    """Steps a browser-use agent has taken so far"""
+    history = getattr(agent, 'history', None)
+    if history is None:
+        history = getattr(getattr(agent, 'state', None), 'history', None)
+    return list(getattr(history, 'history', None) or [])
+
+
+class ProgressGuard:
+    """
+    browser-use ``on_step_end`` hook enforcing AgentLimits.
+
+    After every step it counts steps and the agent's tokens (prompt plus
+    completion, as charged to the application's TokenMeter), and compares
+    the page (URL, element count and form values, read through ``page``
+    when the browser is attached) and the step's actions with the previous
+    steps. When a rule trips it records ``stop_reason`` and asks the agent
+    to stop; browser-use then returns its history before the next step.
+    ``history`` holds the steps seen so far, for runs that fail or are
+    cancelled before returning theirs.
+
+    Stop reasons: ``review_reached`` (the task's goal), ``max_steps``,
+    ``max_tokens``, ``repeated_action`` and ``stalled``.
+    """
+
+    def __init__(self, limits: AgentLimits, ats: str = 'other', page: Any = None):
+        """
+        Initialize progress guard.
+
+        Args:
+            limits: Caps and early-termination rules of the run
+            ats: ATS label for metrics
+            page: Optional Playwright page of the agent's browser
+        """
+        self.limits = limits
+        self.ats = ats
+        self.page = page
+        self.stop_reason: Optional[str] = None
+        self.steps = 0
+        self.tokens = 0
+        self.last_url: Optional[str] = None
+        self._signature: Optional[str] = None
+        self._unchanged = 0
+        self._action: Optional[str] = None
+        self._repeats = 0
+        self.history: List[Any] = []
+
+    async def __call__(self, agent: Any) -> None:
+        # Kept for the step timeline of a run that never returns its history
+        self.history = agent_history(agent)
+        if self.stop_reason is not None:
+            return
+        history = self.history
+        if not history:
+            return
+        reason = self.observe(history[-1], await self._probe(), steps=len(history), tokens=agent_tokens(agent))
+        if reason is not None:
+            self.stop(agent, reason)
+
+    def observe(
+        self,
+        item: Any,
+        probe: Optional[Dict[str, Any]] = None,
+        steps: Optional[int] = None,
+        tokens: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Account for one finished step.
+
+        Args:
+            item: browser-use AgentHistory of the step
+            probe: PROGRESS_JS result for the page after the step, if attached
+            steps: Steps taken so far (default: one more than before)
+            tokens: Tokens used so far (default: add the step's prompt
+                tokens, when the agent's usage is not tracked)
+
+        Returns:
+            Stop reason, or None to keep going
+        """
+        limits = self.limits
+        self.steps = steps if steps is not None else self.steps + 1
+        if tokens is not None:
+            self.tokens = tokens
+        else:
+            self.tokens += int(getattr(getattr(item, 'metadata', None), 'input_tokens', 0) or 0)
+        state = getattr(item, 'state', None)
+        self.last_url = getattr(state, 'url', None) or self.last_url
+
+        if probe is not None:
+            review = bool(probe.get('review'))
+            signature = probe.get('signature')
+            if signature is not None and signature == self._signature:
+                self._unchanged += 1
+            else:
+                self._signature, self._unchanged = signature, 0
+        else:
+            # Without the page only the title can show the review step, and
+            # stalls are not measurable: filling a long form keeps the URL
+            title = str(getattr(state, 'title', '') or '').lower()
+            review = any(pattern in title for pattern in limits.review_patterns)
+
+        action = action_signature(item)
+        if action is not None and action == self._action:
+            self._repeats += 1
+        else:
+            self._action, self._repeats = action, 1 if action is not None else 0
+
+        if limits.stop_at_review and review:
+            return 'review_reached'
+        if limits.max_tokens is not None and self.tokens >= limits.max_tokens:
+            return 'max_tokens'
+        if limits.max_steps and self.steps >= limits.max_steps:
+            return 'max_steps'
+        if limits.repeat_actions and self._repeats >= limits.repeat_actions:
+            return 'repeated_action'
+        if limits.stall_steps and probe is not None and self._unchanged >= limits.stall_steps:
+            return 'stalled'
+        return None
+
+    def stop(self, agent: Any, reason: str) -> None:
+        """Record ``reason`` and ask the agent to stop after the current step"""
+        self.stop_reason = reason
+        logger.warning(f"Stopping browser agent after {self.steps} steps ({self.tokens} tokens): {reason}")
+        if AGENT_STOPS is not None:
+            AGENT_STOPS.labels(ats=self.ats, reason=reason).inc()
+        try:
+            agent.stop()
+        except Exception as e:
+            logger.warning(f"Could not stop browser agent: {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'stop_reason': self.stop_reason, 'steps': self.steps, 'tokens': self.tokens, 'last_url': self.last_url}
+
+    async def _probe(self) -> Optional[Dict[str, Any]]:
+        if self.page is None:
+            return None
+        try:
+            return await self.page.evaluate(PROGRESS_JS, list(self.limits.review_patterns))
+        except Exception as e:
+            logger.debug(f"Progress probe failed: {e}")
+            return None
@@ -0,0 +1,192 @@
+"""
+Resource Blocking
+Request interception for application browsers: media, fonts and third-party
+analytics/chat domains the form filler never needs are aborted on the
+Playwright context, per ATS, with page-load and transfer-size metrics to
+compare runs with and without blocking
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..agents.adapters import HostTrie
+
+try:
+    from prometheus_client import Counter, Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Navigation timing of the open page plus the transfer size of everything it loaded
+PAGE_LOAD_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const end = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || performance.now()) : 0;
+    return {
+        load_ms: nav ? end - nav.startTime : null,
+        bytes: (nav ? nav.transferSize : 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+        requests: resources.length + (nav ? 1 : 0)
+    };
+}
+"""
+
+if PROMETHEUS_AVAILABLE:
+    BROWSER_REQUESTS_BLOCKED = Counter(
+        'browser_requests_blocked_total',
+        'Requests aborted by the resource blocking profile',
+        ['ats', 'reason']
+    )
+    PAGE_LOAD_SECONDS = Histogram(
+        'browser_page_load_seconds',
+        'Load time of application pages, with and without resource blocking',
+        ['ats', 'blocking'],
+        buckets=(0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+    )
+    PAGE_TRANSFER_BYTES = Histogram(
+        'browser_page_transfer_bytes',
+        'Bytes transferred by application pages, with and without resource blocking',
+        ['ats', 'blocking'],
+        buckets=(5e4, 1e5, 2.5e5, 5e5, 1e6, 2e6, 4e6, 8e6, 16e6, 32e6)
+    )
+else:
+    BROWSER_REQUESTS_BLOCKED = None
+    PAGE_LOAD_SECONDS = None
+    PAGE_TRANSFER_BYTES = None
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """What to abort on one ATS's pages"""
+
+    ats: str
+    resource_types: FrozenSet[str] = frozenset()
+    block_domains: Tuple[str, ...] = ()
+    allow_domains: Tuple[str, ...] = ()
+
+
+@dataclass
+class PageLoad:
+    """Load time and transfer size of one page"""
+
+    seconds: Optional[float]
+    bytes: int
+    requests: int
+
+
+class BlockingPolicy:
+    """
+    Blocking profiles built from the ``resource_blocking`` section of stealth.yml.
+
+    The top-level resource types, block and allow domains apply to every
+    ATS; an ``ats.<name>`` entry adds to them (``block_domains``,
+    ``allow_domains``), exempts resource types a form needs
+    (``allow_resource_types``) or turns blocking off (``enabled: false``).
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize blocking policy.
+
+        Args:
+            config: ``resource_blocking`` section of stealth.yml
+        """
+        self.config = config or {}
+        self.enabled = bool(self.config.get('enabled', True))
+        self._profiles: Dict[str, Optional[BlockingProfile]] = {}
+
+    def profile_for(self, ats: str) -> Optional[BlockingProfile]:
+        """The profile for an ATS label (see stage_metrics.ats_label), or None when disabled"""
+        if ats not in self._profiles:
+            self._profiles[ats] = self._build(ats)
+        return self._profiles[ats]
+
+    def _build(self, ats: str) -> Optional[BlockingProfile]:
+        override = (self.config.get('ats') or {}).get(ats) or {}
+        if not self.enabled or not override.get('enabled', True):
+            return None
+        exempt = set(override.get('allow_resource_types') or [])
+        return BlockingProfile(
+            ats=ats,
+            resource_types=frozenset(set(self.config.get('resource_types') or []) - exempt),
+            block_domains=tuple(self.config.get('block_domains') or []) + tuple(override.get('block_domains') or []),
+            allow_domains=tuple(self.config.get('allow_domains') or []) + tuple(override.get('allow_domains') or [])
+        )
+
+
+class RequestBlocker:
+    """
+    Aborts one application's requests matching a BlockingProfile.
+
+    Allowed domains always load (CAPTCHA challenges must render); otherwise
+    requests to blocked domains and of blocked resource types are aborted.
+    Domains match as suffixes, so ``hotjar.com`` covers ``script.hotjar.com``.
+    """
+
+    def __init__(self, profile: BlockingProfile):
+        self.profile = profile
+        self._block = HostTrie()
+        self._allow = HostTrie()
+        for domain in profile.block_domains:
+            self._block.insert(domain, True)
+        for domain in profile.allow_domains:
+            self._allow.insert(domain, True)
+        self.blocked: Dict[str, int] = {}
+
+    @property
+    def total_blocked(self) -> int:
+        return sum(self.blocked.values())
+
+    def reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Why a request would be blocked ('domain' or 'resource_type'), or None"""
+        host = urlparse(url).hostname or ''
+        if self._allow.longest_match(host) is not None:
+            return None
+        if self._block.longest_match(host) is not None:
+            return 'domain'
+        if resource_type in self.profile.resource_types:
+            return 'resource_type'
+        return None
+
+    async def install(self, context: Any) -> None:
+        """Intercept every request of a Playwright browser context"""
+        await context.route('**/*', self._route)
+
+    async def _route(self, route: Any) -> None:
+        request = route.request
+        reason = self.reason(request.url, request.resource_type)
+        if reason is None:
+            await route.continue_()
+            return
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+        if BROWSER_REQUESTS_BLOCKED is not None:
+            BROWSER_REQUESTS_BLOCKED.labels(ats=self.profile.ats, reason=reason).inc()
+        await route.abort('blockedbyclient')
+
+
+async def measure_page(page: Any) -> Optional[PageLoad]:
+    """Load time and bytes transferred of the page open in a Playwright page"""
+    try:
+        stats = await page.evaluate(PAGE_LOAD_JS)
+        load_ms = stats.get('load_ms')
+        return PageLoad(
+            seconds=load_ms / 1000 if load_ms is not None and load_ms > 0 else None,
+            bytes=int(stats.get('bytes') or 0),
+            requests=int(stats.get('requests') or 0)
+        )
+    except Exception as e:
+        logger.debug(f"Could not measure page load: {e}")
+        return None
+
+
+def record_page_load(load: PageLoad, ats: str, blocking: bool) -> None:
+    """Export a page measurement under the blocking on/off label"""
+    label = 'on' if blocking else 'off'
+    if PAGE_LOAD_SECONDS is not None and load.seconds is not None:
+        PAGE_LOAD_SECONDS.labels(ats=ats, blocking=label).observe(load.seconds)
+    if PAGE_TRANSFER_BYTES is not None and load.bytes:
+        PAGE_TRANSFER_BYTES.labels(ats=ats, blocking=label).observe(load.bytes)
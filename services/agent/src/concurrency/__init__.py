@@ -1,5 +1,13 @@
 """Concurrency module for Ray-based multi-agent processing"""
 
-from .ray_worker_pool import RayWorkerPool, ApplicationWorker
+from .pipeline import PipelinedRunner
+from .retry_scheduler import RetryPolicy, RetryScheduler
 
-__all__ = ['RayWorkerPool', 'ApplicationWorker']
+try:
+    from .ray_worker_pool import RayWorkerPool, ApplicationWorker
+except ImportError:
+    # Ray is optional; the orchestrator falls back to a single process
+    RayWorkerPool = None
+    ApplicationWorker = None
+
+__all__ = ['RayWorkerPool', 'ApplicationWorker', 'PipelinedRunner', 'RetryPolicy', 'RetryScheduler']
@@ -0,0 +1,170 @@
+"""
+Pipelined Application Runner
+Prepares upcoming applications while browsers are busy with the current ones
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .retry_scheduler import RetryScheduler
+from ..planning.budget import BudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class PipelinedRunner:
+    """
+    Two-stage pipeline on top of ApplicationRunner.
+
+    Stage 1 (prepare): match score, effort decision, cover letter and
+    screening-answer drafts for the next ``prefetch_depth`` queued jobs run
+    ahead concurrently.
+
+    Stage 2 (browser): ``browser_slots`` workers take ApplicationPlans as
+    soon as they are ready, so a browser slot never waits for an embedding
+    or an LLM generation that could have happened earlier.
+
+    Failed attempts go to a RetryScheduler instead of sleeping in the
+    worker; the slot serves other ready work until the backoff expires.
+    Retry counts and backoff follow ``runner.retry_policy`` per application.
+    """
+
+    def __init__(
+        self,
+        runner,
+        browser_slots: int = 1,
+        prefetch_depth: Optional[int] = None
+    ):
+        """
+        Initialize pipelined runner.
+
+        Args:
+            runner: ApplicationRunner instance
+            browser_slots: Number of concurrent browser executions
+            prefetch_depth: Max applications prepared (or preparing) but not
+                yet picked up by a browser slot
+        """
+        self.runner = runner
+        self.browser_slots = max(browser_slots, 1)
+        if prefetch_depth is None:
+            prefetch_depth = int(os.getenv('PIPELINE_PREFETCH_DEPTH', 2))
+        self.prefetch_depth = max(prefetch_depth, 1)
+
+        logger.info(f"PipelinedRunner initialized (browser_slots={self.browser_slots}, prefetch_depth={self.prefetch_depth})")
+
+    async def run(self, applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run applications through the pipeline.
+
+        Args:
+            applications: List of ApplicationRunner.run_application kwargs
+
+        Returns:
+            Results in the same order as ``applications``
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(applications)
+        ready: asyncio.Queue = asyncio.Queue()
+        ahead = asyncio.Semaphore(self.prefetch_depth)
+        retries = RetryScheduler()
+        wakeup = asyncio.Event()
+        remaining = len(applications)
+        backoff_started: Dict[int, float] = {}
+
+        def complete(index: int, result: Dict[str, Any]):
+            nonlocal remaining
+            results[index] = result
+            remaining -= 1
+            wakeup.set()
+
+        async def prepare(index: int, app_config: Dict[str, Any]):
+            try:
+                plan = await self.runner.prepare_application(**app_config)
+            except Exception as e:
+                logger.error(f"Preparation failed for application {app_config.get('application_id')}: {e}")
+                plan = e
+            await ready.put((index, plan))
+            wakeup.set()
+
+        async def feed():
+            prepare_tasks = []
+            for index, app_config in enumerate(applications):
+                # Wait until a browser slot picks up an earlier plan
+                await ahead.acquire()
+                prepare_tasks.append(asyncio.create_task(prepare(index, app_config)))
+            await asyncio.gather(*prepare_tasks)
+
+        async def next_job() -> Optional[Tuple[int, Any, int]]:
+            while True:
+                # Due retries first: they hold the oldest applications
+                due = retries.pop_due()
+                if due is not None:
+                    index, plan, _ = due
+                    plan.stage_timer.record('retry_wait', time.monotonic() - backoff_started.pop(index))
+                    return due
+                if not ready.empty():
+                    index, plan = ready.get_nowait()
+                    ahead.release()
+                    return index, plan, 0
+                if remaining == 0:
+                    return None
+
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=retries.seconds_until_next())
+                except asyncio.TimeoutError:
+                    pass
+
+        async def browser_worker(slot: int):
+            while True:
+                job = await next_job()
+                if job is None:
+                    return
+                index, plan, attempt = job
+
+                if isinstance(plan, Exception):
+                    complete(index, {
+                        'status': 'error',
+                        'error': str(plan),
+                        'application_id': applications[index].get('application_id')
+                    })
+                    continue
+
+                try:
+                    if not plan.runnable:
+                        complete(index, await self.runner.execute_plan(plan))
+                        continue
+
+                    logger.info(f"Browser slot {slot} running application {plan.application_id} (attempt {attempt + 1})")
+                    form_result = await self.runner.attempt_plan(plan, attempt)
+                    delay = await self.runner.plan_retry(plan, attempt, form_result)
+                    if delay is not None:
+                        # Hand the application back; this slot moves on meanwhile
+                        backoff_started[index] = time.monotonic()
+                        retries.schedule((index, plan, attempt + 1), delay)
+                        wakeup.set()
+                        continue
+
+                    complete(index, await self.runner.finalize_plan(plan, form_result))
+                except BudgetExceeded as e:
+                    # Cancelled cleanly; the slot moves on to the next application
+                    complete(index, await self.runner.record_budget_exceeded(plan, e))
+                except Exception as e:
+                    logger.error(f"Browser slot {slot} failed application {plan.application_id}: {e}", exc_info=True)
+                    complete(index, {
+                        'status': 'error',
+                        'error': str(e),
+                        'application_id': plan.application_id
+                    })
+
+        try:
+            await asyncio.gather(
+                feed(),
+                *(browser_worker(slot) for slot in range(self.browser_slots))
+            )
+        finally:
+            await self.runner.event_sink.flush()
+
+        return results
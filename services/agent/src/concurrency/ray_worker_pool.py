@@ -20,13 +20,17 @@ class ApplicationWorker:
     Each worker is isolated and runs independently.
     """
 
-    def __init__(self, worker_id: int):
+    def __init__(self, worker_id: int, worker_count: int = 1):
         """
         Initialize worker.
 
         Args:
             worker_id: Worker number (0-4)
+            worker_count: Workers in the pool, for this worker's share of the browser farm
         """
+        from ..browser.farm import assign_worker
+
+        assign_worker(worker_id, worker_count)
         self.worker_id = worker_id
         self.applications_completed = 0
         self.applications_failed = 0
@@ -52,6 +56,7 @@ class ApplicationWorker:
         """
         logger.info(f"Worker {self.worker_id}: Starting application {application_id}")
 
+        runner = None
         try:
             # Import here to avoid serialization issues
             from application_runner import ApplicationRunner
@@ -125,6 +130,12 @@ class ApplicationWorker:
                 'worker_id': self.worker_id
             }
 
+        finally:
+            # The runner's event sink is per application: drain it and stop its
+            # flusher, or every application leaves a task on the actor's loop
+            if runner is not None:
+                await runner.event_sink.close()
+
     def get_stats(self) -> Dict[str, int]:
         """Get worker statistics"""
         return {
@@ -166,8 +177,12 @@ class RayWorkerPool:
             )
             logger.info(f"Ray initialized with {max_workers} CPUs")
 
+        # Every worker needs its own remote browsers (raises when too few)
+        from ..browser.farm import farm_specs
+        farm_specs(0, max_workers)
+
         # Create workers
-        self.workers = [ApplicationWorker.remote(i) for i in range(max_workers)]
+        self.workers = [ApplicationWorker.remote(i, max_workers) for i in range(max_workers)]
         logger.info(f"Created {max_workers} Ray workers")
 
     async def process_applications(
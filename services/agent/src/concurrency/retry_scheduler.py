@@ -0,0 +1,68 @@
+"""
+Retry Scheduler
+Timer heap that holds failed attempts until their backoff expires, so the
+worker that ran them can pick up other ready work in the meantime
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Per-application retry budget and exponential backoff"""
+
+    max_attempts: int = 3
+    base_delay: float = 5.0  # seconds
+    multiplier: float = 2.0
+
+    def should_retry(self, attempt: int) -> bool:
+        """Whether a failed attempt (0-based) may be retried"""
+        return attempt < self.max_attempts - 1
+
+    def delay_for(self, attempt: int) -> float:
+        """Backoff before the attempt following ``attempt`` (0-based)"""
+        return self.base_delay * (self.multiplier ** attempt)
+
+
+class RetryScheduler:
+    """
+    Delay queue keyed by the next eligible time.
+
+    Items are opaque to the scheduler; callers usually store
+    ``(index, plan, next_attempt)`` so retry counts stay with the application.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._sequence = itertools.count()
+
+    def schedule(self, item: Any, delay: float) -> float:
+        """
+        Hold ``item`` until ``delay`` seconds from now.
+
+        Returns:
+            Eligible time on the scheduler clock
+        """
+        eligible_at = self._clock() + max(delay, 0.0)
+        heapq.heappush(self._heap, (eligible_at, next(self._sequence), item))
+        return eligible_at
+
+    def pop_due(self) -> Optional[Any]:
+        """Remove and return the earliest item whose delay has expired"""
+        if self._heap and self._heap[0][0] <= self._clock():
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Time until the earliest item becomes eligible (None if empty)"""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - self._clock(), 0.0)
+
+    def __len__(self) -> int:
+        return len(self._heap)
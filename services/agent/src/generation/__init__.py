@@ -1,5 +1,22 @@
 """Generation module for answer and content generation"""
 
 from .answer_generator import AnswerGenerator
+from .answer_bank import AnswerBank, BankHit, normalize_question, profile_version
+from .generation_planner import GenerationPlanner, GenerationResult
+from .llm_governor import LLMGovernor, get_governor
+from .llm_router import LLMRouter
+from .templates import TemplateEngine
 
-__all__ = ['AnswerGenerator']
+__all__ = [
+    'AnswerGenerator',
+    'AnswerBank',
+    'BankHit',
+    'normalize_question',
+    'profile_version',
+    'GenerationPlanner',
+    'GenerationResult',
+    'LLMGovernor',
+    'get_governor',
+    'LLMRouter',
+    'TemplateEngine',
+]
@@ -0,0 +1,255 @@
+"""
+Screening Answer Bank
+Serves repeated screening questions from previously accepted answers, by
+normalized text and by embedding similarity, before falling back to the LLM
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from persistence.src.async_repository import AsyncRepository
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[List[float]]]
+
+# "Do you require sponsorship? *" -> "do you require sponsorship"
+_REQUIRED_MARKERS = re.compile(r'\((?:required|optional)\)|\*', re.IGNORECASE)
+_NON_WORD = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop required markers and punctuation, collapse whitespace"""
+    text = _REQUIRED_MARKERS.sub(' ', question or '')
+    text = _NON_WORD.sub(' ', text.lower())
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def profile_version(user_profile) -> str:
+    """Stable short hash of the profile an answer was written for"""
+    encoded = json.dumps(user_profile, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:12]
+
+
+@dataclass
+class BankHit:
+    """Answer served from the bank"""
+
+    answer: str
+    matched_question: str
+    similarity: float
+    match_type: str  # 'exact' or 'semantic'
+
+
+class AnswerBank:
+    """
+    In-memory index over accepted screening answers.
+
+    Answers are scoped by profile version and effort level, so a changed CV
+    or a different effort tier never reuses an answer written for another.
+    Exact matches on normalized text are dictionary lookups; near-duplicates
+    are found by cosine similarity over question embeddings (numpy), when an
+    embedder is configured. The index loads lazily per profile version from
+    application_questions and accepted answers are written back.
+    """
+
+    def __init__(
+        self,
+        repository=None,
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: Optional[float] = None,
+        embedding_model: str = "text-embedding-3-small"
+    ):
+        """
+        Initialize answer bank.
+
+        Args:
+            repository: AnswerBankRepository (None keeps the bank in memory only)
+            embedder: Async text -> embedding function (None disables semantic lookup)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+                (default ANSWER_BANK_SIMILARITY or 0.92)
+            embedding_model: Model name stored with embeddings
+        """
+        self.repository = AsyncRepository.wrap(repository)
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold or float(os.getenv('ANSWER_BANK_SIMILARITY', 0.92))
+        self.embedding_model = embedding_model
+
+        # (profile_version, effort_level) -> normalized question -> answer
+        self._answers: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # normalized question -> unit-length embedding
+        self._vectors: Dict[str, np.ndarray] = {}
+        # Questions whose embedding is stored in the repository; lookups
+        # cache query vectors in _vectors without saving them
+        self._saved_vectors: Set[str] = set()
+        # (profile_version, effort_level) -> (questions, matrix) for semantic search
+        self._matrices: Dict[Tuple[str, str], Tuple[List[str], np.ndarray]] = {}
+        self._loaded: Dict[str, asyncio.Future] = {}
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    async def lookup(self, question: str, effort_level: str, version: str) -> Optional[BankHit]:
+        """
+        Find a reusable answer.
+
+        Args:
+            question: Screening question as shown on the form
+            effort_level: low/medium/high
+            version: profile_version() of the user profile
+
+        Returns:
+            BankHit, or None when the question is novel (or the bank failed)
+        """
+        try:
+            await self._ensure_loaded(version)
+            scope = (version, effort_level.lower())
+            answers = self._answers.get(scope, {})
+            normalized = normalize_question(question)
+
+            if normalized in answers:
+                self.exact_hits += 1
+                return BankHit(answers[normalized], normalized, 1.0, 'exact')
+
+            hit = await self._semantic_lookup(scope, normalized)
+            if hit:
+                self.semantic_hits += 1
+                return hit
+        except Exception as e:
+            logger.warning(f"Answer bank lookup failed: {e}")
+
+        self.misses += 1
+        return None
+
+    async def remember(
+        self,
+        application_id: UUID,
+        question: str,
+        answer: str,
+        effort_level: str,
+        version: str,
+        step_index: int = 0
+    ) -> None:
+        """Add an accepted answer to the bank and write it back"""
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+        scope = (version, effort_level.lower())
+        self._answers.setdefault(scope, {})[normalized] = answer
+        self._matrices.pop(scope, None)
+
+        try:
+            if self.repository is not None:
+                await self.repository.save_answer(
+                    application_id, question, normalized, answer,
+                    effort_level.lower(), version, step_index=step_index
+                )
+            if self.embedder is not None:
+                # Usually cached by the lookup that missed
+                vector = await self._embed(normalized)
+                if self.repository is not None and normalized not in self._saved_vectors:
+                    await self.repository.save_embedding(normalized, vector.tolist(), self.embedding_model)
+                    self._saved_vectors.add(normalized)
+        except Exception as e:
+            logger.warning(f"Failed to write answer back to the bank: {e}")
+
+    async def _semantic_lookup(self, scope: Tuple[str, str], normalized: str) -> Optional[BankHit]:
+        if self.embedder is None or not self._answers.get(scope):
+            return None
+        questions, matrix = self._matrix(scope)
+        if not questions:
+            return None
+
+        query = await self._embed(normalized)
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+        if similarity < self.similarity_threshold:
+            return None
+        matched = questions[best]
+        return BankHit(self._answers[scope][matched], matched, similarity, 'semantic')
+
+    def _matrix(self, scope: Tuple[str, str]) -> Tuple[List[str], np.ndarray]:
+        cached = self._matrices.get(scope)
+        if cached is None:
+            questions = [q for q in self._answers[scope] if q in self._vectors]
+            matrix = np.vstack([self._vectors[q] for q in questions]) if questions else np.empty((0, 0))
+            cached = (questions, matrix)
+            self._matrices[scope] = cached
+        return cached
+
+    async def _embed(self, normalized: str) -> np.ndarray:
+        vector = self._vectors.get(normalized)
+        if vector is None:
+            vector = self._unit(await self.embedder(normalized))
+            self._vectors[normalized] = vector
+            # A new vector may belong to questions already in the bank
+            self._matrices.clear()
+        return vector
+
+    async def _ensure_loaded(self, version: str) -> None:
+        """Load a profile version's answers and embeddings once"""
+        if self.repository is None:
+            return
+        pending = self._loaded.get(version)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(version))
+            self._loaded[version] = pending
+        try:
+            await asyncio.shield(pending)
+        except Exception:
+            # Retry on the next lookup
+            self._loaded.pop(version, None)
+            raise
+
+    async def _load(self, version: str) -> None:
+        rows = await self.repository.load_answers(version)
+        for row in rows:
+            scope = (version, (row['effort_level_at_time'] or 'medium').lower())
+            self._answers.setdefault(scope, {}).setdefault(row['field_label_normalized'], row['answer'])
+
+        if self.embedder is not None and rows:
+            missing = {row['field_label_normalized'] for row in rows} - set(self._vectors)
+            stored = await self.repository.load_embeddings(sorted(missing))
+            for normalized, embedding in stored.items():
+                self._vectors[normalized] = self._unit(embedding)
+                self._saved_vectors.add(normalized)
+
+        self._matrices.clear()
+        logger.info(f"Answer bank loaded {len(rows)} answers for profile version {version}")
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def openai_embedder(model: str = "text-embedding-3-small") -> Embedder:
+    """Async embedder using the OpenAI embeddings API under the LLM governor"""
+    from ..planning.budget import record_usage
+    from ..utils.llm_clients import get_client_registry
+    from .llm_governor import get_governor
+
+    clients = get_client_registry()
+    governor = get_governor('openai')
+
+    async def embed(text: str) -> List[float]:
+        async with governor.slot(len(text) // 4 + 1) as call:
+            response = await clients.async_openai_client('openai').embeddings.create(model=model, input=text)
+            call.used_tokens = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+        record_usage(getattr(response, 'usage', None), model, call_type='embedding', purpose='answer_bank')
+        return response.data[0].embedding
+
+    return embed
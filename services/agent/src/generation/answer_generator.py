@@ -3,10 +3,12 @@ Answer Generation Service
 Generates cover letters and screening question answers based on effort level
 """
 
-import os
 import logging
-from typing import Dict, Optional, List
-from openai import OpenAI
+from typing import Dict, Optional, List, Tuple
+
+from ..planning.budget import record_usage
+from ..utils.llm_clients import get_client_registry, provider_for_model
+from .llm_router import LLMRouter
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +21,13 @@ class AnswerGenerator:
     - LOW: Generic templates, minimal customization
     - MEDIUM: Tailored to JD, professional quality
     - HIGH: Highly customized, researched, QA-approved
+
+    Every call goes through an LLMRouter: admitted by the provider's
+    LLMGovernor, hedged and failed over to the alternate provider.
     """
 
+    FALLBACK_ANSWER = "I am interested in this position and believe my skills align well with your requirements."
+
     def __init__(self, model: str = "grok-beta"):
         """
         Initialize answer generator.
@@ -30,18 +37,20 @@ class AnswerGenerator:
         """
         self.model = model
 
-        # Determine which client to use
-        if "grok" in model.lower():
-            self.client = OpenAI(
-                api_key=os.getenv('GROK_API_KEY'),
-                base_url="https://api.x.ai/v1"
-            )
-        else:
-            self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        # Clients share the process-wide connection pool for the provider
+        self.provider = provider_for_model(model)
+        self.clients = get_client_registry()
+        # Calls may be hedged to / fail over to the other provider
+        self.router = LLMRouter.for_model(model)
 
         logger.info(f"AnswerGenerator initialized with model: {model}")
 
-    def generate_cover_letter(
+    @property
+    def async_client(self):
+        """AsyncOpenAI on the running loop's pool; 429s are left to the governor (no SDK retries)"""
+        return self.clients.async_openai_client(self.provider)
+
+    async def generate_cover_letter_async(
         self,
         job_title: str,
         company_name: str,
@@ -63,54 +72,31 @@ class AnswerGenerator:
             Cover letter text
         """
         logger.info(f"Generating {effort_level} effort cover letter for {job_title} at {company_name}")
+        messages, max_tokens, profile_summary = self._cover_letter_request(
+            job_title, company_name, job_description, user_profile, effort_level
+        )
 
-        # Build profile summary
-        profile_summary = self._build_profile_summary(user_profile)
-
-        # Build prompt based on effort level
-        if effort_level.lower() == "low":
-            prompt = self._low_effort_cover_letter_prompt(
-                job_title, company_name, profile_summary
-            )
-            max_tokens = 300
-        elif effort_level.lower() == "high":
-            prompt = self._high_effort_cover_letter_prompt(
-                job_title, company_name, job_description, profile_summary
-            )
-            max_tokens = 500
-        else:  # medium
-            prompt = self._medium_effort_cover_letter_prompt(
-                job_title, company_name, job_description, profile_summary
-            )
-            max_tokens = 400
-
-        # Generate
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional cover letter writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
-
+            response, served_by = await self._complete_async(messages, max_tokens)
             cover_letter = response.choices[0].message.content.strip()
             logger.info(f"Generated cover letter ({len(cover_letter)} chars)")
-            return cover_letter
 
         except Exception as e:
             logger.error(f"Cover letter generation failed: {e}")
             return self._fallback_cover_letter(job_title, company_name, profile_summary)
 
-    def answer_screening_question(
+        # Charge the application's token budget (raises BudgetExceeded)
+        record_usage(getattr(response, 'usage', None), served_by, purpose='cover_letter')
+        return cover_letter
+
+    async def answer_screening_question_async(
         self,
         question: str,
         job_context: str,
         user_profile: Dict,
         effort_level: str = "medium",
-        is_required: bool = False
+        is_required: bool = False,
+        fallback: bool = True
     ) -> str:
         """
         Answer a screening question.
@@ -121,12 +107,78 @@ class AnswerGenerator:
             user_profile: User profile
             effort_level: low/medium/high
             is_required: Whether question is required
+            fallback: Return FALLBACK_ANSWER when the LLM call fails; with
+                False the error is raised, so callers can tell the
+                boilerplate from a real answer
 
         Returns:
             Answer text
         """
         logger.info(f"Answering screening question (effort: {effort_level})")
+        messages, max_tokens = self._screening_request(question, job_context, user_profile, effort_level)
+
+        try:
+            response, served_by = await self._complete_async(messages, max_tokens)
+            answer = response.choices[0].message.content.strip()
+            logger.info(f"Generated answer ({len(answer)} chars)")
+
+        except Exception as e:
+            logger.error(f"Answer generation failed: {e}")
+            if not fallback:
+                raise
+            return self.FALLBACK_ANSWER
+
+        # Charge the application's token budget (raises BudgetExceeded)
+        record_usage(getattr(response, 'usage', None), served_by, purpose='screening_answer')
+        return answer
+
+    async def _complete_async(self, messages: List[Dict[str, str]], max_tokens: int):
+        """Chat completion via the router (governed, hedged, with failover); returns (response, model)"""
+        return await self.router.complete(messages, max_tokens)
 
+    def _cover_letter_request(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        user_profile: Dict,
+        effort_level: str
+    ) -> Tuple[List[Dict[str, str]], int, str]:
+        """Build (messages, max_tokens, profile_summary) for a cover letter"""
+        # Build profile summary
+        profile_summary = self._build_profile_summary(user_profile)
+
+        # Build prompt based on effort level
+        if effort_level.lower() == "low":
+            prompt = self._low_effort_cover_letter_prompt(
+                job_title, company_name, profile_summary
+            )
+            max_tokens = 300
+        elif effort_level.lower() == "high":
+            prompt = self._high_effort_cover_letter_prompt(
+                job_title, company_name, job_description, profile_summary
+            )
+            max_tokens = 500
+        else:  # medium
+            prompt = self._medium_effort_cover_letter_prompt(
+                job_title, company_name, job_description, profile_summary
+            )
+            max_tokens = 400
+
+        messages = [
+            {"role": "system", "content": "You are a professional cover letter writer."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, max_tokens, profile_summary
+
+    def _screening_request(
+        self,
+        question: str,
+        job_context: str,
+        user_profile: Dict,
+        effort_level: str
+    ) -> Tuple[List[Dict[str, str]], int]:
+        """Build (messages, max_tokens) for a screening question"""
         # Build profile summary
         profile_summary = self._build_profile_summary(user_profile)
 
@@ -165,24 +217,11 @@ Your background:
 Provide a professional 2-3 sentence answer."""
             max_tokens = 150
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are helping complete a job application. Answer questions based on the user's profile. Be truthful and concise."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
-
-            answer = response.choices[0].message.content.strip()
-            logger.info(f"Generated answer ({len(answer)} chars)")
-            return answer
-
-        except Exception as e:
-            logger.error(f"Answer generation failed: {e}")
-            return "I am interested in this position and believe my skills align well with your requirements."
+        messages = [
+            {"role": "system", "content": "You are helping complete a job application. Answer questions based on the user's profile. Be truthful and concise."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, max_tokens
 
     def _build_profile_summary(self, user_profile: Dict) -> str:
         """Build a concise profile summary from user data"""
@@ -0,0 +1,174 @@
+"""
+Generation Planner
+Issues the cover letter and every known screening answer concurrently, so
+preparation takes as long as the slowest LLM call instead of their sum
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from ..planning.budget import BudgetExceeded
+from .answer_bank import AnswerBank, normalize_question, profile_version
+from .templates import TemplateEngine
+
+logger = logging.getLogger(__name__)
+
+# (question, answer, source) -> awaitable; source is 'template', 'bank', 'llm' or
+# 'fallback' (the generator's boilerplate after a failed LLM call)
+AnswerCallback = Callable[[str, str, str], Awaitable[None]]
+CoverLetterCallback = Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class GenerationResult:
+    """Output of one fan-out"""
+
+    cover_letter: Optional[str] = None
+    answers: Dict[str, str] = field(default_factory=dict)
+    sources: Dict[str, str] = field(default_factory=dict)
+    cover_letter_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+
+class GenerationPlanner:
+    """
+    Fans out content generation for one application.
+
+    Every call goes through AnswerGenerator's async methods, so the
+    provider's LLMGovernor still bounds concurrency and RPM/TPM; the planner
+    only removes the artificial serialization. Questions that normalize to
+    the same text are generated once, and banked answers skip the LLM.
+    LOW effort content is rendered from templates when a TemplateEngine is
+    configured; only questions no template covers reach the LLM.
+    """
+
+    def __init__(
+        self,
+        answer_generator,
+        answer_bank: Optional[AnswerBank] = None,
+        templates: Optional[TemplateEngine] = None
+    ):
+        """
+        Initialize generation planner.
+
+        Args:
+            answer_generator: AnswerGenerator instance
+            answer_bank: Reusable screening answers (optional)
+            templates: Zero-LLM renderer for LOW effort (optional)
+        """
+        self.answer_gen = answer_generator
+        self.answer_bank = answer_bank
+        self.templates = templates
+
+    def uses_templates(self, effort_level: str) -> bool:
+        """Whether content for ``effort_level`` is rendered from templates"""
+        return self.templates is not None and effort_level.lower() == 'low'
+
+    def wants_cover_letter(self, effort_level: str) -> bool:
+        """Medium/high effort always; LOW only when a template renders it for free"""
+        return effort_level.lower() in ['medium', 'high'] or self.uses_templates(effort_level)
+
+    async def generate(
+        self,
+        job_title: str,
+        company_name: str,
+        job_description: str,
+        user_profile: Dict,
+        effort_level: str,
+        questions: Sequence[str] = (),
+        include_cover_letter: Optional[bool] = None,
+        on_answer: Optional[AnswerCallback] = None,
+        on_cover_letter: Optional[CoverLetterCallback] = None
+    ) -> GenerationResult:
+        """
+        Generate the cover letter and answers concurrently.
+
+        Args:
+            job_title: Job position title
+            company_name: Company name
+            job_description: Full job description
+            user_profile: User profile dict
+            effort_level: low/medium/high
+            questions: Screening questions known before the browser starts
+            include_cover_letter: Generate a cover letter (default: wants_cover_letter)
+            on_answer: Awaited as each answer completes (e.g. to checkpoint it)
+            on_cover_letter: Awaited when the cover letter completes
+
+        Returns:
+            GenerationResult; cancelling the call cancels every pending generation
+        """
+        if include_cover_letter is None:
+            include_cover_letter = self.wants_cover_letter(effort_level)
+
+        result = GenerationResult()
+        started = time.perf_counter()
+        version = profile_version(user_profile) if self.answer_bank is not None else None
+        templated = self.uses_templates(effort_level)
+        if templated:
+            await self.templates.prepare(user_profile)
+
+        # Same question under different punctuation is asked once
+        groups: Dict[str, List[str]] = {}
+        for question in questions:
+            groups.setdefault(normalize_question(question) or question, []).append(question)
+
+        async def cover_letter() -> None:
+            call_started = time.perf_counter()
+            if templated:
+                result.cover_letter = self.templates.cover_letter(job_title, company_name, user_profile)
+            if result.cover_letter is None:
+                result.cover_letter = await self.answer_gen.generate_cover_letter_async(
+                    job_title=job_title,
+                    company_name=company_name,
+                    job_description=job_description,
+                    user_profile=user_profile,
+                    effort_level=effort_level
+                )
+            result.cover_letter_seconds = time.perf_counter() - call_started
+            if on_cover_letter is not None:
+                await on_cover_letter(result.cover_letter)
+
+        async def answer(variants: List[str]) -> None:
+            question = variants[0]
+            text = self.templates.answer(question, user_profile, job_title, company_name) if templated else None
+            source = 'template'
+            if text is None and self.answer_bank is not None:
+                hit = await self.answer_bank.lookup(question, effort_level, version)
+                if hit:
+                    text, source = hit.answer, 'bank'
+            if text is None:
+                try:
+                    text, source = await self.answer_gen.answer_screening_question_async(
+                        question=question,
+                        job_context=job_description,
+                        user_profile=user_profile,
+                        effort_level=effort_level,
+                        fallback=False
+                    ), 'llm'
+                except BudgetExceeded:
+                    raise
+                except Exception:
+                    # Submitted as a placeholder but never banked or resumed
+                    text, source = self.answer_gen.FALLBACK_ANSWER, 'fallback'
+            for variant in variants:
+                result.answers[variant] = text
+                result.sources[variant] = source
+                if on_answer is not None:
+                    await on_answer(variant, text, source)
+
+        tasks = [answer(variants) for variants in groups.values()]
+        if include_cover_letter:
+            tasks.insert(0, cover_letter())
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+        result.wall_seconds = time.perf_counter() - started
+        logger.info(
+            f"Generated {'cover letter and ' if include_cover_letter else ''}{len(result.answers)} answers "
+            f"in {result.wall_seconds:.2f}s ({len(tasks)} concurrent calls)"
+        )
+        return result
@@ -0,0 +1,335 @@
+"""
+LLM Governor
+Process-wide (optionally cluster-wide) concurrency and RPM/TPM rate limiting
+for LLM calls, with queueing-delay and 429 metrics
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+try:
+    from prometheus_client import Counter, Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+try:
+    import ray
+    RAY_AVAILABLE = True
+except ImportError:
+    RAY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITER_ACTOR_NAME = 'llm_rate_limiter'
+
+if PROMETHEUS_AVAILABLE:
+    LLM_QUEUE_WAIT = Histogram(
+        'llm_queue_wait_seconds',
+        'Time an LLM call waited for a concurrency slot and rate budget',
+        ['provider'],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+    )
+    LLM_REQUESTS = Counter('llm_requests_total', 'LLM calls by outcome', ['provider', 'status'])
+    LLM_RATE_LIMITED = Counter('llm_rate_limited_total', 'LLM calls rejected with HTTP 429', ['provider'])
+else:
+    LLM_QUEUE_WAIT = None
+    LLM_REQUESTS = None
+    LLM_RATE_LIMITED = None
+
+
+def _env_number(provider: str, name: str, fallback: float) -> float:
+    """LLM_<PROVIDER>_<NAME>, then LLM_<NAME>, then ``fallback``"""
+    for key in (f"LLM_{provider.upper()}_{name}", f"LLM_{name}"):
+        value = os.getenv(key)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {key}={value!r}")
+    return fallback
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket refilled continuously at ``per_minute``.
+
+    reserve() never blocks: it takes the amount (the balance may go
+    negative) and returns how long the caller must wait before its share is
+    actually available. Waiting callers are therefore served in FIFO order.
+    Thread-safe, so the same class backs the cluster-wide Ray actor.
+    """
+
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.rate = per_minute / 60.0  # per second
+        self.capacity = per_minute
+        self._clock = clock
+        self._level = per_minute
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` and return the wait in seconds (0 if available now)"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._refill()
+            self._level -= amount
+            delay = -self._level / self.rate if self._level < 0 else 0.0
+            return max(delay, self._paused_until - now, 0.0)
+
+    def refund(self, amount: float) -> None:
+        """Give back over-estimated usage (negative ``amount`` charges extra)"""
+        with self._lock:
+            self._refill()
+            self._level = min(self._level + amount, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every reservation for ``seconds`` (provider sent Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._level = min(self._level + (now - self._updated) * self.rate, self.capacity)
+        self._updated = now
+        return now
+
+
+class ProviderLimits:
+    """Request and token buckets for one provider"""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    def reserve(self, tokens: float) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def refund(self, tokens: float) -> None:
+        self.tokens.refund(tokens)
+
+    def pause(self, seconds: float) -> None:
+        self.requests.pause(seconds)
+        self.tokens.pause(seconds)
+
+
+if RAY_AVAILABLE:
+    @ray.remote
+    class RateLimiterActor:
+        """Named Ray actor sharing provider rate budgets across workers"""
+
+        def __init__(self):
+            self.providers: Dict[str, ProviderLimits] = {}
+
+        def configure(self, provider: str, rpm: float, tpm: float) -> None:
+            if provider not in self.providers:
+                self.providers[provider] = ProviderLimits(rpm, tpm)
+
+        def reserve(self, provider: str, tokens: float) -> float:
+            return self.providers[provider].reserve(tokens)
+
+        def refund(self, provider: str, tokens: float) -> None:
+            self.providers[provider].refund(tokens)
+
+        def pause(self, provider: str, seconds: float) -> None:
+            self.providers[provider].pause(seconds)
+else:
+    RateLimiterActor = None
+
+
+class LLMGovernor:
+    """
+    Admission control for one LLM provider.
+
+    - ``max_concurrency`` in-flight calls per process (asyncio.Semaphore)
+    - ``rpm`` / ``tpm`` budgets shared by the process, or by the whole Ray
+      cluster when a RateLimiterActor handle is given
+    - a 429 pauses every caller for the provider's Retry-After
+
+    Usage::
+
+        async with governor.slot(estimated_tokens) as call:
+            response = await client.chat.completions.create(...)
+            call.used_tokens = response.usage.total_tokens
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int = 8,
+        rpm: float = 60,
+        tpm: float = 100_000,
+        remote: Any = None
+    ):
+        """
+        Initialize governor.
+
+        Args:
+            provider: Provider label ('xai', 'openai')
+            max_concurrency: Max in-flight calls in this process
+            rpm: Requests per minute (0 disables)
+            tpm: Tokens per minute (0 disables)
+            remote: RateLimiterActor handle for cluster-wide budgets
+        """
+        self.provider = provider
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.remote = remote
+        self.limits = ProviderLimits(rpm, tpm)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+        self.calls = 0
+        self.rate_limited = 0
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator['GovernedCall']:
+        """
+        Wait for a concurrency slot and rate budget, then run the call.
+
+        Args:
+            estimated_tokens: Prompt + max completion tokens, charged up front
+                and corrected from ``call.used_tokens`` afterwards
+        """
+        call = GovernedCall(estimated_tokens)
+        queued_at = time.perf_counter()
+
+        semaphore = self._get_semaphore()
+        async with semaphore:
+            delay = await self._reserve(estimated_tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            waited = time.perf_counter() - queued_at
+            call.queue_wait = waited
+            if LLM_QUEUE_WAIT is not None:
+                LLM_QUEUE_WAIT.labels(provider=self.provider).observe(waited)
+
+            self.calls += 1
+            try:
+                yield call
+            except Exception as e:
+                status = 'rate_limited' if is_rate_limit_error(e) else 'error'
+                if status == 'rate_limited':
+                    await self.on_rate_limited(retry_after_seconds(e))
+                self._count(status)
+                raise
+
+            self._count('success')
+            if call.used_tokens is not None:
+                await self._refund(estimated_tokens - call.used_tokens)
+
+    async def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Back off every caller after a 429"""
+        self.rate_limited += 1
+        if LLM_RATE_LIMITED is not None:
+            LLM_RATE_LIMITED.labels(provider=self.provider).inc()
+        seconds = retry_after if retry_after is not None else 5.0
+        logger.warning(f"LLM provider {self.provider} rate limited; pausing {seconds:.1f}s")
+        if self.remote is not None:
+            await self.remote.pause.remote(self.provider, seconds)
+        else:
+            self.limits.pause(seconds)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to a loop; tests and scripts may run several loops
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _reserve(self, tokens: float) -> float:
+        if self.remote is not None:
+            return await self.remote.reserve.remote(self.provider, tokens)
+        return self.limits.reserve(tokens)
+
+    async def _refund(self, tokens: float) -> None:
+        if not tokens:
+            return
+        if self.remote is not None:
+            await self.remote.refund.remote(self.provider, tokens)
+        else:
+            self.limits.refund(tokens)
+
+    def _count(self, status: str) -> None:
+        if LLM_REQUESTS is not None:
+            LLM_REQUESTS.labels(provider=self.provider, status=status).inc()
+
+
+class GovernedCall:
+    """Per-call handle yielded by LLMGovernor.slot"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: Optional[int] = None
+        self.queue_wait = 0.0
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an OpenAI-compatible client error is an HTTP 429"""
+    return getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError'
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Retry-After header of a 429 response, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        value = headers.get('retry-after')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+_governors: Dict[str, LLMGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(provider: str) -> LLMGovernor:
+    """
+    Shared governor for ``provider``, configured from the environment.
+
+    LLM_<PROVIDER>_MAX_CONCURRENCY / _RPM / _TPM override the LLM_* defaults.
+    With LLM_GOVERNOR_SCOPE=cluster and Ray initialized, the RPM/TPM budgets
+    live in a named RateLimiterActor shared by every worker.
+    """
+    with _governors_lock:
+        governor = _governors.get(provider)
+        if governor is None:
+            rpm = _env_number(provider, 'RPM', 60)
+            tpm = _env_number(provider, 'TPM', 100_000)
+            governor = LLMGovernor(
+                provider,
+                max_concurrency=int(_env_number(provider, 'MAX_CONCURRENCY', 8)),
+                rpm=rpm,
+                tpm=tpm,
+                remote=_cluster_rate_limiter(provider, rpm, tpm)
+            )
+            _governors[provider] = governor
+            logger.info(
+                f"LLM governor for {provider}: concurrency={governor.max_concurrency}, rpm={rpm:g}, tpm={tpm:g}"
+                f"{' (cluster-wide)' if governor.remote is not None else ''}"
+            )
+        return governor
+
+
+def _cluster_rate_limiter(provider: str, rpm: float, tpm: float) -> Any:
+    if os.getenv('LLM_GOVERNOR_SCOPE', 'process') != 'cluster':
+        return None
+    if not RAY_AVAILABLE or not ray.is_initialized():
+        logger.warning("LLM_GOVERNOR_SCOPE=cluster but Ray is not initialized; using process-wide limits")
+        return None
+    actor = RateLimiterActor.options(
+        name=RATE_LIMITER_ACTOR_NAME,
+        lifetime='detached',
+        get_if_exists=True
+    ).remote()
+    ray.get(actor.configure.remote(provider, rpm, tpm))
+    return actor
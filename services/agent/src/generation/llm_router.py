@@ -0,0 +1,298 @@
+"""
+LLM Router
+Routes chat completions across the OpenAI-compatible providers: tracks
+per-provider latency percentiles and error rates, hedges slow requests to
+the alternate provider and fails over during outages
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+from ..planning.budget import record_usage
+from ..utils.llm_clients import PROVIDERS, get_client_registry, provider_for_model
+from .llm_governor import get_governor, is_rate_limit_error
+
+logger = logging.getLogger(__name__)
+
+# Model used when a provider serves as the alternate (LLM_<PROVIDER>_MODEL overrides)
+ALTERNATE_MODELS = {
+    'xai': 'grok-beta',
+    'openai': 'gpt-4o-mini',
+}
+
+if PROMETHEUS_AVAILABLE:
+    LLM_HEDGES = Counter('llm_hedged_requests_total', 'Hedged LLM requests by winner', ['provider', 'winner'])
+    LLM_FAILOVERS = Counter('llm_failovers_total', 'LLM requests failed over to the alternate provider', ['from_provider', 'to_provider'])
+else:
+    LLM_HEDGES = None
+    LLM_FAILOVERS = None
+
+Route = Tuple[str, str]  # (provider, model)
+
+
+class ProviderStats:
+    """
+    Rolling latency and error statistics for one provider.
+
+    Latencies of the last ``window`` successful calls give the p95 hedge
+    threshold. ``failure_threshold`` consecutive errors open the circuit for
+    ``cooldown`` seconds, during which the provider is tried last.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        default_hedge_delay: float = 10.0,
+        min_hedge_delay: float = 0.5,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        clock=time.monotonic
+    ):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes.append(True)
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.outcomes.append(False)
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.open_until = self._clock() + self.cooldown
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile (0-100), or None with too few samples"""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def healthy(self) -> bool:
+        """False while the circuit is open after repeated failures"""
+        return self._clock() >= self.open_until
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before hedging: the p95 latency, once known"""
+        p95 = self.percentile(95)
+        return max(p95 if p95 is not None else self.default_hedge_delay, self.min_hedge_delay)
+
+
+_stats: Dict[str, ProviderStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_provider_stats(provider: str) -> ProviderStats:
+    """Process-wide statistics for ``provider``"""
+    with _stats_lock:
+        stats = _stats.get(provider)
+        if stats is None:
+            stats = ProviderStats(default_hedge_delay=float(os.getenv('LLM_HEDGE_DEFAULT_SECONDS', 10)))
+            _stats[provider] = stats
+        return stats
+
+
+class LLMRouter:
+    """
+    Sends a chat completion to the preferred provider and, when configured
+    with an alternate:
+
+    - hedges: if the preferred provider has not answered within its p95
+      latency, the same request goes to the alternate; the first successful
+      response wins and the other request is cancelled. The caller charges
+      the winner's usage; the router charges the loser's to the current
+      application (its usage if it also finished, else the estimated prompt
+      the provider already received), without enforcing the budget
+    - fails over: an error from one provider retries on the other, and a
+      provider whose circuit is open (repeated failures) is tried last
+
+    Every attempt is admitted by its provider's LLMGovernor.
+    """
+
+    RATE_LIMIT_RETRIES = 2
+
+    def __init__(self, primary: Route, alternate: Optional[Route] = None, hedging: bool = True):
+        """
+        Initialize router.
+
+        Args:
+            primary: (provider, model) preferred for requests
+            alternate: (provider, model) for hedging and failover (optional)
+            hedging: Send hedged duplicates for slow requests
+        """
+        self.primary = primary
+        self.alternate = alternate
+        self.hedging = hedging
+        self.clients = get_client_registry()
+
+    @classmethod
+    def for_model(cls, model: str) -> 'LLMRouter':
+        """
+        Router preferring ``model``'s provider.
+
+        The other provider is the alternate when its API key is set, unless
+        LLM_FAILOVER=false. LLM_HEDGING=false keeps failover but disables hedging.
+        """
+        provider = provider_for_model(model)
+        alternate = None
+        if os.getenv('LLM_FAILOVER', 'true').lower() == 'true':
+            for other in PROVIDERS:
+                if other != provider and os.getenv(PROVIDERS[other][1]):
+                    alternate = (other, os.getenv(f"LLM_{other.upper()}_MODEL", ALTERNATE_MODELS[other]))
+                    break
+        hedging = os.getenv('LLM_HEDGING', 'true').lower() == 'true'
+        return cls((provider, model), alternate, hedging=hedging)
+
+    async def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float = 0.7) -> Tuple[Any, str]:
+        """
+        Chat completion with hedging and failover.
+
+        Args:
+            messages: Chat messages
+            max_tokens: Completion token cap
+            temperature: Sampling temperature
+
+        Returns:
+            (response, model that produced it)
+        """
+        routes = self._routes()
+        request = (messages, max_tokens, temperature)
+        if len(routes) == 1:
+            return await self._attempt(routes[0], *request)
+
+        first, second = routes
+        if not self.hedging:
+            try:
+                return await self._attempt(first, *request)
+            except Exception as e:
+                self._failover(first, second, e)
+                return await self._attempt(second, *request)
+
+        return await self._hedged(first, second, request)
+
+    async def _hedged(self, first: Route, second: Route, request: Tuple) -> Tuple[Any, str]:
+        primary = asyncio.ensure_future(self._attempt(first, *request))
+        tasks = [primary]
+        winner: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=get_provider_stats(first[0]).hedge_delay())
+            if done:
+                if primary.exception() is None:
+                    winner = primary
+                    return primary.result()
+                self._failover(first, second, primary.exception())
+                return await self._attempt(second, *request)
+
+            logger.info(f"LLM request to {first[0]} exceeded its p95; hedging to {second[0]}")
+            hedge = asyncio.ensure_future(self._attempt(second, *request))
+            tasks.append(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if LLM_HEDGES is not None:
+                            LLM_HEDGES.labels(
+                                provider=first[0], winner='hedge' if task is hedge else 'primary'
+                            ).inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The loser (or both, if the caller was cancelled) must not keep
+            # running; cancelled attempts charge their own estimated prompt,
+            # and only a finished loser of a hedge race is charged here
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif winner is not None and task is not winner and not task.cancelled() and task.exception() is None:
+                    response, model = task.result()
+                    record_usage(getattr(response, 'usage', None), model, purpose='hedged_duplicate', enforce=False)
+
+    async def _attempt(self, route: Route, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> Tuple[Any, str]:
+        """One provider call through its governor, retrying after 429 back-offs"""
+        provider, model = route
+        stats = get_provider_stats(provider)
+        governor = get_governor(provider)
+        # Rough prompt size (~4 chars/token) plus the completion cap
+        prompt_tokens = sum(len(m['content']) for m in messages) // 4
+        estimated_tokens = prompt_tokens + max_tokens
+
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            started = time.perf_counter()
+            sent = False
+            try:
+                async with governor.slot(estimated_tokens) as call:
+                    # Queueing in the governor is not provider latency
+                    started = time.perf_counter()
+                    sent = True
+                    response = await self.clients.async_openai_client(provider).chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                    call.used_tokens = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+            except asyncio.CancelledError:
+                if sent:
+                    # Cancelled in flight (a hedge loser): the provider bills the prompt anyway
+                    record_usage({'prompt_tokens': prompt_tokens}, model, purpose='hedged_duplicate', enforce=False)
+                raise
+            except Exception as e:
+                # The governor has already paused the provider for Retry-After
+                if is_rate_limit_error(e) and attempt < self.RATE_LIMIT_RETRIES:
+                    continue
+                stats.record_failure()
+                raise
+            stats.record_success(time.perf_counter() - started)
+            return response, model
+
+    def _routes(self) -> List[Route]:
+        if self.alternate is None:
+            return [self.primary]
+        if not get_provider_stats(self.primary[0]).healthy and get_provider_stats(self.alternate[0]).healthy:
+            return [self.alternate, self.primary]
+        return [self.primary, self.alternate]
+
+    @staticmethod
+    def _failover(source: Route, target: Route, error: BaseException) -> None:
+        logger.warning(f"LLM provider {source[0]} failed ({error}); failing over to {target[0]}")
+        if LLM_FAILOVERS is not None:
+            LLM_FAILOVERS.labels(from_provider=source[0], to_provider=target[0]).inc()
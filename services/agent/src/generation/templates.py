@@ -0,0 +1,179 @@
+"""
+Template Engine
+Zero-LLM cover letters and screening answers for LOW effort applications,
+rendered locally from profile fields
+"""
+
+import logging
+import re
+import string
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+import yaml
+
+from persistence.src.async_repository import AsyncRepository
+from .answer_bank import normalize_question
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateEngine:
+    """
+    Renders LOW effort content without calling an LLM.
+
+    The cover letter comes from the profile's LOW cover_letter_templates row
+    when one exists, otherwise from config/answer_templates.yml. Screening
+    questions are mapped to a category by regex and answered from profile
+    fields; a question that maps to no category, or whose template needs a
+    field the profile lacks, returns None so the caller can fall back to
+    the LLM.
+    """
+
+    def __init__(self, config_path: Optional[str] = None, template_repository=None):
+        """
+        Initialize template engine.
+
+        Args:
+            config_path: Path to answer_templates.yml
+            template_repository: UserRepository for stored cover letter
+                templates (optional)
+        """
+        if config_path is None:
+            project_root = Path(__file__).parents[4]
+            config_path = project_root / 'config' / 'answer_templates.yml'
+
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+
+        self.default_cover_letter: str = config.get('cover_letter', '')
+        self.categories: List[Tuple[str, List[Pattern], str]] = [
+            (name, [re.compile(p) for p in spec.get('patterns', [])], spec['answer'])
+            for name, spec in (config.get('categories') or {}).items()
+        ]
+        self.repository = AsyncRepository.wrap(template_repository)
+        self._stored: Dict[str, Optional[str]] = {}
+
+        logger.info(f"TemplateEngine initialized with {len(self.categories)} answer categories")
+
+    async def prepare(self, user_profile: Dict) -> None:
+        """Load the profile's stored LOW cover letter template (cached per profile)"""
+        profile_id = str(user_profile.get('id') or '') if isinstance(user_profile, dict) else ''
+        if not profile_id or self.repository is None or profile_id in self._stored:
+            return
+        try:
+            row = await self.repository.get_cover_letter_template(profile_id, 'low')
+            self._stored[profile_id] = row['base_text'] if row else None
+        except Exception as e:
+            logger.warning(f"Failed to load cover letter template for profile {profile_id}: {e}")
+
+    def category(self, question: str) -> Optional[str]:
+        """Category a question maps to, or None"""
+        normalized = normalize_question(question)
+        for name, patterns, _ in self.categories:
+            if any(p.search(normalized) for p in patterns):
+                return name
+        return None
+
+    def answer(self, question: str, user_profile: Dict, job_title: str = '', company_name: str = '') -> Optional[str]:
+        """
+        Canned answer for a screening question.
+
+        Args:
+            question: Screening question
+            user_profile: User profile dict
+            job_title: Job position title
+            company_name: Company name
+
+        Returns:
+            Rendered answer, or None when the question cannot be mapped
+        """
+        name = self.category(question)
+        if name is None:
+            return None
+        template = next(answer for category, _, answer in self.categories if category == name)
+        return self._render(template, self._context(user_profile, job_title, company_name))
+
+    def cover_letter(self, job_title: str, company_name: str, user_profile: Dict) -> Optional[str]:
+        """Rendered cover letter (stored template first, then the config default)"""
+        context = self._context(user_profile, job_title, company_name)
+        profile_id = str(user_profile.get('id') or '') if isinstance(user_profile, dict) else ''
+        stored = self._stored.get(profile_id)
+        if stored:
+            rendered = self._render(stored, context)
+            if rendered:
+                return rendered
+            logger.warning(f"Stored cover letter template for profile {profile_id} does not render; using default")
+        return self._render(self.default_cover_letter, context)
+
+    @staticmethod
+    def _render(template: str, context: Dict[str, str]) -> Optional[str]:
+        """Fill ``template``; None if any placeholder is unknown or empty"""
+        try:
+            fields = [f for _, f, _, _ in string.Formatter().parse(template) if f]
+        except ValueError:
+            return None
+        if any(not context.get(f) for f in fields):
+            return None
+        return template.format_map(context).strip()
+
+    @staticmethod
+    def _context(user_profile: Dict, job_title: str, company_name: str) -> Dict[str, str]:
+        """Flatten the profile into template fields (missing fields are omitted)"""
+        profile = user_profile if isinstance(user_profile, dict) else {}
+        context: Dict[str, Any] = {'job_title': job_title, 'company_name': company_name}
+
+        context['name'] = profile.get('name')
+        location = profile.get('location') or {}
+        if isinstance(location, dict):
+            context['city'] = location.get('city')
+            context['country'] = location.get('country')
+            context['location'] = ', '.join(p for p in (location.get('city'), location.get('country')) if p)
+        elif location:
+            context['location'] = str(location)
+
+        experience = profile.get('experience_summary') or {}
+        context['current_role'] = experience.get('current_role') or profile.get('headline')
+        years = experience.get('years_of_experience')
+        context['years_of_experience'] = str(years) if years is not None else None
+        context['domains'] = ', '.join(experience.get('domains', [])[:3])
+        context['top_skills'] = ', '.join(profile.get('skills_true', [])[:3])
+
+        languages = profile.get('languages') or []
+        context['languages'] = ', '.join(
+            f"{lang.get('language')} ({lang.get('level')})" if isinstance(lang, dict) else str(lang)
+            for lang in languages
+        )
+
+        education = (profile.get('education') or [{}])[0]
+        if isinstance(education, dict):
+            context['degree'] = education.get('degree')
+            context['field'] = education.get('field')
+            context['institution'] = education.get('institution')
+
+        availability = profile.get('availability') or {}
+        weeks = availability.get('notice_period_weeks')
+        context['notice_period_weeks'] = str(weeks) if weeks is not None else None
+        context['available_from'] = availability.get('available_from')
+
+        salary = profile.get('salary_expectations') or {}
+        context['currency'] = salary.get('currency')
+        for key, source in (('salary_target', 'target_annual'), ('salary_minimum', 'minimum_annual')):
+            if salary.get(source) is not None:
+                context[key] = f"{salary[source]:,}"
+
+        work = profile.get('work_preferences') or {}
+        if 'visa_sponsorship_needed' in work:
+            needed = bool(work['visa_sponsorship_needed'])
+            context['visa_sponsorship'] = 'Yes' if needed else 'No'
+            context['work_authorization'] = 'No' if needed else 'Yes'
+        if 'relocation_willing' in work:
+            context['relocation'] = 'Yes' if work['relocation_willing'] else 'No'
+        if work.get('remote'):
+            context['remote'] = (
+                f"Remote: {work['remote']}; hybrid: {work.get('hybrid', 'n/a')}; on-site: {work.get('onsite', 'n/a')}"
+            )
+
+        context['contact'] = ', '.join(p for p in (profile.get('email'), profile.get('phone')) if p)
+
+        return {key: str(value) for key, value in context.items() if value}
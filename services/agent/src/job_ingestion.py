@@ -7,6 +7,7 @@ import logging
 from typing import Optional, Dict, Any, Tuple
 from uuid import UUID
 
+from .agents.adapters import get_adapter_registry
 from .matching.profile_matcher import ProfileMatcher
 from .planning.effort_planner import EffortPlanner
 
@@ -37,6 +38,7 @@ class JobIngestionService:
         """
         self.matcher = profile_matcher
         self.planner = effort_planner
+        self.adapters = get_adapter_registry()
         logger.info("JobIngestionService initialized")
 
     def process_job_url(
@@ -56,7 +58,8 @@ class JobIngestionService:
             job_metadata: Optional pre-scraped metadata
 
         Returns:
-            Dict with ingestion results including effort level and match score
+            Dict with ingestion results including effort level, match score,
+            the ATS adapter handling the URL and its rate-limit domain
         """
         logger.info(f"Processing job URL: {url}")
 
@@ -106,6 +109,8 @@ class JobIngestionService:
         result = {
             'url': url,
             'status': 'processed',
+            'ats': self.adapters.ats_name(url),
+            'rate_limit_domain': self.adapters.rate_limit_domain(url),
             'match_score': match_score,
             'effort_level': effort_level,
             'effort_reason': reason,
@@ -13,14 +13,26 @@ from .planning import EffortPlanner
 from .job_ingestion import JobIngestionService
 from .application_runner import ApplicationRunner
 from .generation import AnswerGenerator
+from .generation.answer_bank import AnswerBank, openai_embedder
+from .generation.templates import TemplateEngine
+from .utils.llm_clients import mock_llm_url
+from .agents.adapters import get_adapter_registry
 from .agents.enhanced_form_filler import EnhancedFormFiller
+from .browser.auth_state import AuthStateStore
+from .browser.farm import BrowserFarm
+from .browser.form_schema import FormSchemaCache
+from .browser.pool import get_browser_pool
 from .qa import QAAgent
 from .notifications.digest_email import DigestEmailSender
 
 # Persistence imports
 from persistence.src.applications import ApplicationRepository
 from persistence.src.events import EventRepository
+from persistence.src.model_usage import ModelUsageRepository
 from persistence.src.sessions import SessionRepository
+from persistence.src.answer_bank import AnswerBankRepository
+from persistence.src.form_schemas import FormSchemaRepository
+from persistence.src.users import UserRepository
 
 from .utils.logger import setup_logger
 
@@ -31,8 +43,6 @@ app = FastAPI(title="Nyx Venatrix Agent API")
 # Metrics
 AGENT_RUNS = Counter('agent_runs_total', 'Total number of agent runs')
 AGENT_ERRORS = Counter('agent_errors_total', 'Total number of agent errors')
-AGENT_TOKENS = Counter('agent_tokens_total', 'Total tokens used', ['type'])
-AGENT_COST = Counter('agent_cost_usd_total', 'Total cost in USD')
 AGENT_DURATION = Histogram('agent_duration_seconds', 'Time spent running the agent')
 MATCH_SCORES = Histogram('match_scores', 'Context match scores')
 
@@ -44,6 +54,7 @@ kb: Optional[KnowledgeBase] = None
 orchestrator = None
 application_runner: Optional[ApplicationRunner] = None
 qa_agent: Optional[QAAgent] = None
+session_manager: Optional[SessionManager] = None
 
 
 class JobRequest(BaseModel):
@@ -142,7 +153,10 @@ async def startup_event():
     logger.info("Initializing Application Runner...")
     try:
         answer_gen = AnswerGenerator(model=os.getenv('AGENT_MODEL', 'grok-beta'))
-        form_filler = EnhancedFormFiller(answer_gen)
+        answer_bank_repo = None
+        form_schema_repo = None
+        user_repo = None
+        usage_repo = None
 
         # Persistence Repos
         # Persistence Repos
@@ -152,6 +166,10 @@ async def startup_event():
             app_repo = ApplicationRepository()
             event_repo = EventRepository()
             session_repo = SessionRepository()
+            answer_bank_repo = AnswerBankRepository()
+            form_schema_repo = FormSchemaRepository()
+            user_repo = UserRepository()
+            usage_repo = ModelUsageRepository()
             logger.info("Persistence repositories initialized")
         except Exception as db_err:
             logger.warning(f"Database connection failed: {db_err}. Using MOCK repositories.")
@@ -160,6 +178,35 @@ async def startup_event():
             event_repo = MockEventRepository()
             session_repo = MockSessionRepository()
 
+        # Reuse accepted screening answers; semantic lookup needs OpenAI (or mock) embeddings
+        answer_bank = AnswerBank(
+            repository=answer_bank_repo,
+            embedder=openai_embedder() if os.getenv('OPENAI_API_KEY') or mock_llm_url() else None
+        )
+        # LOW effort content from templates; stored per-profile cover letters need the DB
+        template_engine = TemplateEngine(template_repository=user_repo)
+        # Forms seen before are pre-planned instead of explored
+        form_schemas = None
+        if os.getenv('FORM_SCHEMA_CACHE', 'true').lower() == 'true':
+            form_schemas = FormSchemaCache(repository=form_schema_repo)
+        # ATS tenants signed in to before (Workday) skip the login flow
+        auth_states = None
+        if os.getenv('AUTH_STATE_KEY'):
+            try:
+                auth_states = AuthStateStore()
+            except Exception as e:
+                logger.warning(f"Auth state store disabled: {e}")
+        form_filler = EnhancedFormFiller(
+            answer_gen,
+            answer_bank=answer_bank,
+            template_engine=template_engine,
+            form_schemas=form_schemas,
+            auth_states=auth_states
+        )
+        if form_filler.browser_pool is not None:
+            # First application should not pay for a browser launch
+            await form_filler.browser_pool.start(warm=int(os.getenv('BROWSER_POOL_WARM', 1)))
+
         if profile_matcher and effort_planner:
             application_runner = ApplicationRunner(
                 profile_matcher=profile_matcher,
@@ -168,9 +215,20 @@ async def startup_event():
                 form_filler=form_filler,
                 application_repo=app_repo,
                 event_repo=event_repo,
-                session_repo=session_repo
+                session_repo=session_repo,
+                answer_bank=answer_bank,
+                template_engine=template_engine,
+                usage_repo=usage_repo
             )
             logger.info("Application Runner initialized")
+
+            # Checkpoints of applications that were never re-run
+            pruned = await application_runner.checkpoints.prune(float(os.getenv('CHECKPOINT_TTL_HOURS', 72)))
+            if pruned:
+                logger.info(f"Pruned {pruned} stale application checkpoints")
+            pruned = await application_runner.timelines.prune(float(os.getenv('TIMELINE_TTL_HOURS', 24 * 14)))
+            if pruned:
+                logger.info(f"Pruned {pruned} old step timelines")
         else:
             logger.warning("Application Runner skipped (dependencies missing)")
 
@@ -205,7 +263,23 @@ async def shutdown_event():
     """Cleanup resources on shutdown"""
     logger.info("Shutting down agent...")
     try:
+        if application_runner:
+            await application_runner.event_sink.close()
+        if session_manager:
+            await session_manager.event_sink.close()
+    except Exception as e:
+        logger.error(f"Error flushing event sinks: {e}")
+
+    try:
+        if application_runner and application_runner.form_filler.browser_pool is not None:
+            await application_runner.form_filler.browser_pool.close()
+    except Exception as e:
+        logger.error(f"Error closing browser pool: {e}")
+
+    try:
+        from persistence.src.async_repository import shutdown_db_executor
         from persistence.src.database import close_db
+        shutdown_db_executor()
         close_db()
         logger.info("Database connection closed")
     except Exception as e:
@@ -389,6 +463,21 @@ def metrics():
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
+@app.get("/adapters/stats")
+def adapter_stats():
+    """Per-ATS-adapter throughput and success rates of this worker"""
+    return {"adapters": get_adapter_registry().stats_table()}
+
+
+@app.get("/browsers/farm")
+def browser_farm():
+    """Sessions, limits and health of this worker's browser farm endpoints"""
+    pool = get_browser_pool()
+    if pool is None or not isinstance(pool.launcher, BrowserFarm):
+        return {"endpoints": []}
+    return {"endpoints": pool.launcher.stats()}
+
+
 @app.get("/health")
 def health():
     """Health check endpoint"""
@@ -3,11 +3,12 @@ Profile Matching Service
 Embedding-based job description vs profile matching using OpenAI embeddings
 """
 
-import os
 import logging
 from typing import Optional, List
 import numpy as np
-from openai import OpenAI
+
+from ..planning.budget import record_usage
+from ..utils.llm_clients import get_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,7 @@ class ProfileMatcher:
     """
 
     def __init__(self, embedding_model: str = "text-embedding-3-small"):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.client = get_client_registry().openai_client('openai')
         self.embedding_model = embedding_model
         self.profile_embedding: Optional[np.ndarray] = None
         self.profile_text: Optional[str] = None
@@ -77,12 +78,14 @@ class ProfileMatcher:
             )
 
             embedding = np.array(response.data[0].embedding)
-            return embedding
 
         except Exception as e:
             logger.error(f"Embedding failed: {e}")
             raise
 
+        record_usage(getattr(response, 'usage', None), self.embedding_model, call_type='embedding', purpose='match_score')
+        return embedding
+
     @staticmethod
     def _cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
         """
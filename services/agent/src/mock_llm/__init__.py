@@ -0,0 +1,10 @@
+"""Offline OpenAI-compatible mock LLM for load and capacity tests"""
+
+from .engine import MockLLM, MockResponse, count_tokens
+
+try:
+    from .server import create_app
+except ImportError:
+    create_app = None
+
+__all__ = ['MockLLM', 'MockResponse', 'count_tokens', 'create_app']
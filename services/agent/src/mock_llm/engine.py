@@ -0,0 +1,341 @@
+"""
+Mock LLM Engine
+Deterministic chat-completion and embedding responses in the OpenAI wire
+format, with configurable latency, error injection and token usage
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Filler vocabulary for generated completions
+WORDS = (
+    'experience', 'team', 'delivered', 'platform', 'customers', 'reliable', 'scaled', 'design',
+    'impact', 'ownership', 'systems', 'improved', 'latency', 'product', 'collaborated', 'built',
+    'results', 'growth', 'data', 'quality', 'mentored', 'roadmap', 'launch', 'shipped',
+)
+
+DEFAULTS: Dict[str, Any] = {
+    'seed': 42,
+    'chat': {
+        'latency_ms': {'distribution': 'lognormal', 'median': 600, 'sigma': 0.4},
+        'ms_per_output_token': 2,
+        'completion_tokens': {'min': 40, 'max': 200},
+    },
+    'embeddings': {
+        'latency_ms': {'distribution': 'normal', 'mean': 60, 'stddev': 15},
+        'dimensions': 1536,
+    },
+    'errors': {
+        'rate_limit_rate': 0.0,
+        'server_error_rate': 0.0,
+        'retry_after_seconds': 1,
+    },
+    'models': {},
+    'fixtures': [],
+}
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token, the estimate the governor uses)"""
+    return max(1, math.ceil(len(text or '') / 4)) if text else 0
+
+
+def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """``base`` with ``override`` merged in recursively (neither is modified)"""
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _digest(*parts: Any) -> int:
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return int.from_bytes(hashlib.sha256(payload).digest()[:8], 'big')
+
+
+@dataclass
+class MockResponse:
+    """HTTP status, JSON body and headers of one mock call"""
+
+    status: int
+    body: Dict[str, Any]
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class MockLLM:
+    """
+    Serves OpenAI-compatible responses without a provider.
+
+    - outputs are a pure function of the request: a fixture whose regex
+      matches the prompt, otherwise filler text seeded by the request hash;
+      embeddings are unit vectors seeded by the input text
+    - usage reports prompt, completion and cached tokens; a system prompt
+      seen before counts as cached, like provider prefix caching
+    - latency is sampled per call from the configured distribution
+      (fixed, uniform, normal or lognormal) plus a per-output-token delay
+    - 429 (with Retry-After) and 500 responses are injected at the
+      configured rates, from a seeded RNG so a run can be replayed
+
+    Settings can be overridden per model and patched at runtime.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, sleep=asyncio.sleep):
+        """
+        Initialize mock engine.
+
+        Args:
+            config: Settings merged over DEFAULTS (see config/mock_llm.yml)
+            sleep: Coroutine used to simulate latency (tests pass a no-op)
+        """
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.configure(config or {}, replace=True)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None, **kwargs) -> 'MockLLM':
+        """Engine configured from a YAML file (default: config/mock_llm.yml)"""
+        if path is None:
+            path = Path(__file__).parents[4] / 'config' / 'mock_llm.yml'
+        with open(path, 'r') as f:
+            return cls(yaml.safe_load(f) or {}, **kwargs)
+
+    def configure(self, patch: Dict[str, Any], replace: bool = False) -> Dict[str, Any]:
+        """
+        Merge ``patch`` into the settings (or start over from DEFAULTS).
+
+        Returns:
+            The effective settings
+        """
+        with self._lock:
+            base = DEFAULTS if replace else self.config
+            self.config = deep_merge(base, patch)
+            self._fixtures = [
+                (re.compile(f['match'], re.IGNORECASE), f)
+                for f in self.config.get('fixtures') or [] if f.get('match')
+            ]
+            if replace or 'seed' in (patch or {}):
+                self._reset()
+            return copy.deepcopy(self.config)
+
+    def reset(self) -> None:
+        """Clear statistics, the prompt cache and the fault RNG"""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._rng = random.Random(self.config.get('seed'))
+        self._seen_prefixes: set = set()
+        self.stats: Counter = Counter()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    async def chat_completion(self, request: Dict[str, Any]) -> MockResponse:
+        """POST /v1/chat/completions"""
+        model = request.get('model') or 'mock'
+        settings = self._settings('chat', model)
+        fault = self._fault(model)
+        if fault is not None:
+            # Rejections come back without generating
+            await self._sleep(self._latency(settings))
+            return fault
+        messages = request.get('messages') or []
+
+        text, fixture = self._completion_text(model, messages, request, settings)
+        prompt_tokens = sum(count_tokens(self._content(m)) for m in messages)
+        completion_tokens = count_tokens(text)
+        cached_tokens = self._cached_tokens(messages)
+
+        await self._sleep(self._latency(settings) + completion_tokens * settings.get('ms_per_output_token', 0) / 1000)
+
+        with self._lock:
+            self.stats['chat_requests'] += 1
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += completion_tokens
+            self.stats['cached_tokens'] += cached_tokens
+            if fixture:
+                self.stats[f"fixture:{fixture}"] += 1
+
+        return MockResponse(200, {
+            'id': f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+                'prompt_tokens_details': {'cached_tokens': cached_tokens},
+            },
+        })
+
+    async def embeddings(self, request: Dict[str, Any]) -> MockResponse:
+        """POST /v1/embeddings"""
+        model = request.get('model') or 'mock-embedding'
+        settings = self._settings('embeddings', model)
+        fault = self._fault(model)
+        inputs = request.get('input')
+        if isinstance(inputs, str) or not isinstance(inputs, list):
+            inputs = [inputs]
+        dimensions = int(request.get('dimensions') or settings.get('dimensions', 1536))
+
+        await self._sleep(self._latency(settings))
+        if fault is not None:
+            return fault
+
+        data = [
+            {'object': 'embedding', 'index': i, 'embedding': self._vector(str(text), dimensions)}
+            for i, text in enumerate(inputs)
+        ]
+        prompt_tokens = sum(count_tokens(str(text)) for text in inputs)
+        with self._lock:
+            self.stats['embedding_requests'] += 1
+            self.stats['embedding_tokens'] += prompt_tokens
+
+        return MockResponse(200, {
+            'object': 'list',
+            'data': data,
+            'model': model,
+            'usage': {'prompt_tokens': prompt_tokens, 'total_tokens': prompt_tokens},
+        })
+
+    def models(self) -> Dict[str, Any]:
+        """GET /v1/models"""
+        names = sorted(set(self.config.get('models') or {}) | {'mock'})
+        return {'object': 'list', 'data': [{'id': name, 'object': 'model', 'owned_by': 'mock'} for name in names]}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _settings(self, endpoint: str, model: str) -> Dict[str, Any]:
+        with self._lock:
+            base = self.config.get(endpoint) or {}
+            override = ((self.config.get('models') or {}).get(model) or {}).get(endpoint) or {}
+        return deep_merge(base, override)
+
+    def _fault(self, model: str) -> Optional[MockResponse]:
+        """Injected error response for this call, or None"""
+        with self._lock:
+            errors = deep_merge(
+                self.config.get('errors') or {},
+                ((self.config.get('models') or {}).get(model) or {}).get('errors') or {}
+            )
+            roll = self._rng.random()
+            rate_limited = roll < errors.get('rate_limit_rate', 0)
+            failed = not rate_limited and roll < errors.get('rate_limit_rate', 0) + errors.get('server_error_rate', 0)
+            if rate_limited:
+                self.stats['rate_limited'] += 1
+            elif failed:
+                self.stats['server_errors'] += 1
+
+        if rate_limited:
+            retry_after = errors.get('retry_after_seconds', 1)
+            return MockResponse(429, self._error('Rate limit reached (mock)', 'rate_limit_exceeded'), {
+                'retry-after': str(retry_after),
+            })
+        if failed:
+            return MockResponse(500, self._error('Internal server error (mock)', 'server_error'))
+        return None
+
+    @staticmethod
+    def _error(message: str, code: str) -> Dict[str, Any]:
+        return {'error': {'message': message, 'type': code, 'code': code, 'param': None}}
+
+    def _latency(self, settings: Dict[str, Any]) -> float:
+        """Seconds sampled from the endpoint's latency distribution"""
+        spec = settings.get('latency_ms') or {}
+        kind = spec.get('distribution', 'fixed')
+        with self._lock:
+            rng = self._rng
+            if kind == 'uniform':
+                value = rng.uniform(spec.get('min', 0), spec.get('max', 0))
+            elif kind == 'normal':
+                value = rng.gauss(spec.get('mean', 0), spec.get('stddev', 0))
+            elif kind == 'lognormal':
+                value = rng.lognormvariate(math.log(max(spec.get('median', 1), 1e-3)), spec.get('sigma', 0))
+            else:
+                value = spec.get('value', 0)
+        return max(value, 0) / 1000
+
+    def _completion_text(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        request: Dict[str, Any],
+        settings: Dict[str, Any]
+    ) -> Tuple[str, Optional[str]]:
+        """(completion, fixture name) for a chat request"""
+        prompt = '\n'.join(self._content(m) for m in messages if m.get('role') != 'system')
+        for pattern, fixture in self._fixtures:
+            if fixture.get('model') and fixture['model'] != model:
+                continue
+            if pattern.search(prompt):
+                if 'json' in fixture:
+                    return json.dumps(fixture['json']), fixture.get('name', pattern.pattern)
+                return str(fixture.get('response', '')).strip(), fixture.get('name', pattern.pattern)
+
+        rng = random.Random(_digest(model, messages))
+        limits = settings.get('completion_tokens') or {}
+        target = rng.randint(int(limits.get('min', 40)), int(limits.get('max', 200)))
+        if request.get('max_tokens'):
+            target = min(target, int(request['max_tokens']))
+        words: List[str] = []
+        while count_tokens(' '.join(words)) < target:
+            words.append(rng.choice(WORDS))
+        return (' '.join(words).capitalize() + '.') if words else '', None
+
+    def _cached_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """Tokens of a leading system prompt already seen (provider prefix cache)"""
+        if not messages or messages[0].get('role') != 'system':
+            return 0
+        prefix = self._content(messages[0])
+        key = hashlib.sha256(prefix.encode()).hexdigest()
+        with self._lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+        return count_tokens(prefix) if seen else 0
+
+    @staticmethod
+    def _vector(text: str, dimensions: int) -> List[float]:
+        """Deterministic unit vector for ``text``"""
+        rng = random.Random(_digest('embedding', text))
+        vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    @staticmethod
+    def _content(message: Dict[str, Any]) -> str:
+        """Message text (multi-part content keeps its text parts)"""
+        content = message.get('content') or ''
+        if isinstance(content, list):
+            return ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+        return str(content)
@@ -0,0 +1,67 @@
+"""
+Mock LLM Server
+OpenAI-compatible HTTP front end for MockLLM, for offline load and capacity
+tests (point MOCK_LLM_URL at it and set USE_MOCK_LLM=true)
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .engine import MockLLM, MockResponse
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(engine: Optional[MockLLM] = None) -> FastAPI:
+    """
+    Build the mock server.
+
+    Routes:
+        POST /v1/chat/completions, POST /v1/embeddings, GET /v1/models
+        GET /_mock/stats: request, token and fault counters
+        POST /_mock/config: merge a settings patch (e.g. raise the 429 rate mid-test)
+        POST /_mock/reset: clear counters, prompt cache and fault RNG
+
+    Args:
+        engine: MockLLM to serve (default: config/mock_llm.yml)
+    """
+    engine = engine or MockLLM.from_file()
+    app = FastAPI(title="Nyx Venatrix Mock LLM")
+    app.state.engine = engine
+
+    def respond(response: MockResponse) -> JSONResponse:
+        return JSONResponse(response.body, status_code=response.status, headers=response.headers)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        return respond(await engine.chat_completion(await request.json()))
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        return respond(await engine.embeddings(await request.json()))
+
+    @app.get("/v1/models")
+    async def models():
+        return engine.models()
+
+    @app.get("/_mock/stats")
+    async def stats():
+        return engine.snapshot()
+
+    @app.post("/_mock/config")
+    async def configure(patch: Dict[str, Any]):
+        return engine.configure(patch)
+
+    @app.post("/_mock/reset")
+    async def reset():
+        engine.reset()
+        return {'status': 'reset'}
+
+    @app.get("/health")
+    async def health():
+        return {'status': 'ok'}
+
+    return app
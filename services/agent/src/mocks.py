@@ -18,9 +18,15 @@ class MockEventRepository:
     def append_event(self, event_type: str, application_id: Optional[UUID] = None, session_id: Optional[UUID] = None, event_detail: Optional[str] = None, payload: Optional[Dict] = None):
         logger.info(f"[MOCK DB] Event: {event_type} | App: {application_id} | Detail: {event_detail}")
 
+    def append_events(self, rows):
+        logger.info(f"[MOCK DB] Bulk events: {len(rows)}")
+
 class MockSessionRepository:
     def increment_session_counts(self, session_id: UUID, effort_level: str):
         logger.info(f"[MOCK DB] Session {session_id} incremented count for {effort_level}")
 
     def mark_application_successful(self, session_id: UUID):
         logger.info(f"[MOCK DB] Session {session_id} marked application successful")
+
+    def add_session_events(self, rows):
+        logger.info(f"[MOCK DB] Bulk session events: {len(rows)}")
@@ -1,6 +1,17 @@
-"""Observability module for MLflow and Langfuse tracking"""
+"""Observability module for MLflow and Langfuse tracking, stage, step and token metrics"""
 
-from .mlflow_tracker import MLflowTracker
-from .langfuse_tracker import LangfuseTracker
+from .stage_metrics import StageTimer, ats_label
+from .step_timeline import StepTimeline
+from .token_usage import export_usage
 
-__all__ = ['MLflowTracker', 'LangfuseTracker']
+try:
+    from .mlflow_tracker import MLflowTracker
+except ImportError:
+    MLflowTracker = None
+
+try:
+    from .langfuse_tracker import LangfuseTracker
+except ImportError:
+    LangfuseTracker = None
+
+__all__ = ['MLflowTracker', 'LangfuseTracker', 'StageTimer', 'StepTimeline', 'ats_label', 'export_usage']
@@ -0,0 +1,123 @@
+"""
+Stage Metrics
+Per-stage wall-clock timing for the application pipeline, exported as a
+labelled Prometheus histogram and attached to results and event payloads
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from ..agents.adapters import UNKNOWN_ATS, get_adapter_registry
+
+try:
+    from prometheus_client import Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Stages in pipeline order
+STAGES = (
+    'match',
+    'plan',
+    'cover_letter',
+    'screening_answers',
+    'stealth_delay',
+    'browser_launch',
+    'navigation',
+    'prefill',
+    'form_fill',
+    'retry_wait',
+    'persistence',
+)
+
+if PROMETHEUS_AVAILABLE:
+    APPLICATION_STAGE_SECONDS = Histogram(
+        'application_stage_seconds',
+        'Wall-clock time spent per application pipeline stage',
+        ['stage', 'effort_level', 'ats'],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+    )
+else:
+    APPLICATION_STAGE_SECONDS = None
+
+
+def ats_label(url: Optional[str]) -> str:
+    """
+    Map a job URL to a bounded ATS/domain label.
+
+    Labels come from the adapter registry (adapters and KNOWN_BOARDS);
+    anything else is 'other' to bound label cardinality.
+
+    Args:
+        url: Job posting or application form URL
+
+    Returns:
+        ATS name (e.g. 'greenhouse'), or 'other'
+    """
+    if not url:
+        return UNKNOWN_ATS
+    return get_adapter_registry().ats_name(url)
+
+
+class StageTimer:
+    """
+    Accumulates stage durations for one application.
+
+    Durations of a repeated stage (e.g. form_fill across retries) are summed.
+    Histogram observations are deferred to observe(), because the effort
+    level label is only known after the planning stage.
+    """
+
+    def __init__(self, ats: str = 'other'):
+        """
+        Initialize stage timer.
+
+        Args:
+            ats: ATS/domain label (see ats_label)
+        """
+        self.ats = ats
+        self.durations: Dict[str, float] = {}
+        self._observed = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as ``name`` (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to stage ``name``"""
+        self.durations[name] = self.durations.get(name, 0.0) + max(seconds, 0.0)
+
+    def merge(self, timings: Optional[Dict[str, float]]) -> None:
+        """Add timings reported by another component (e.g. the form filler)"""
+        for name, seconds in (timings or {}).items():
+            try:
+                self.record(name, float(seconds))
+            except (TypeError, ValueError):
+                logger.debug(f"Ignoring non-numeric stage timing {name}={seconds!r}")
+
+    @property
+    def elapsed(self) -> float:
+        """Total recorded seconds across stages"""
+        return sum(self.durations.values())
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in seconds, rounded for payloads"""
+        return {name: round(seconds, 3) for name, seconds in self.durations.items()}
+
+    def observe(self, effort_level: Optional[str]) -> None:
+        """Export every recorded stage to the histogram (once per application)"""
+        if self._observed or APPLICATION_STAGE_SECONDS is None:
+            return
+        self._observed = True
+        level = (effort_level or 'unknown').lower()
+        for name, seconds in self.durations.items():
+            APPLICATION_STAGE_SECONDS.labels(stage=name, effort_level=level, ats=self.ats).observe(seconds)
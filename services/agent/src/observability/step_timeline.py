@@ -0,0 +1,181 @@
+"""
+Step Timeline
+Per-step record of a browser-use run (timestamps, action and step type,
+tokens, page URL), exported as a labelled histogram and kept as a compact
+per-application artifact for the slow-step report
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+try:
+    from prometheus_client import Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# browser-use action name -> step type, highest-priority type first
+STEP_TYPES = {
+    'upload': ('upload_file', 'upload_file_to_element'),
+    'navigation': ('navigate', 'go_to_url', 'go_back', 'search', 'search_google', 'switch', 'switch_tab',
+                   'open_tab', 'close', 'close_tab'),
+    'input': ('input', 'input_text', 'send_keys', 'select_dropdown', 'select_dropdown_option'),
+    'click': ('click', 'click_element_by_index'),
+    'extraction': ('extract', 'extract_content', 'extract_structured_data', 'scroll', 'scroll_to_text',
+                   'find_text', 'dropdown_options', 'get_dropdown_options', 'screenshot'),
+    'wait': ('wait',),
+    'done': ('done',),
+}
+_ACTION_TYPES = {action: step_type for step_type, actions in STEP_TYPES.items() for action in actions}
+_PRIORITY = {step_type: rank for rank, step_type in enumerate(STEP_TYPES)}
+
+if PROMETHEUS_AVAILABLE:
+    BROWSER_STEP_SECONDS = Histogram(
+        'browser_agent_step_seconds',
+        'Duration of browser-use agent steps by step type',
+        ['ats', 'step_type'],
+        buckets=(0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60, 120)
+    )
+else:
+    BROWSER_STEP_SECONDS = None
+
+
+def step_type(actions: List[str]) -> str:
+    """
+    Classify a step by its actions.
+
+    A step running several actions counts as its slowest kind (an upload
+    beats a click); a step without actions is the LLM producing no usable
+    output ('planning').
+    """
+    if not actions:
+        return 'planning'
+    types = [_ACTION_TYPES.get(action, 'other') for action in actions]
+    return min(types, key=lambda t: _PRIORITY.get(t, len(_PRIORITY)))
+
+
+def action_names(model_output: Any) -> List[str]:
+    """Names of the actions a browser-use step ran"""
+    names: List[str] = []
+    for action in getattr(model_output, 'action', None) or []:
+        if isinstance(action, dict):
+            data = action
+        else:
+            try:
+                data = action.model_dump(exclude_none=True)
+            except AttributeError:
+                continue
+        names.extend(name for name, params in data.items() if params is not None)
+    return names
+
+
+@dataclass
+class TimelineStep:
+    """One agent step"""
+
+    number: int
+    started_at: float
+    ended_at: float
+    step_type: str
+    actions: List[str] = field(default_factory=list)
+    tokens: int = 0
+    url: Optional[str] = None
+    error: bool = False
+
+    @property
+    def seconds(self) -> float:
+        return max(self.ended_at - self.started_at, 0.0)
+
+
+@dataclass
+class StepTimeline:
+    """Steps of one browser-use run"""
+
+    url: str
+    ats: str
+    steps: List[TimelineStep] = field(default_factory=list)
+
+    @property
+    def domain(self) -> str:
+        host = (urlparse(self.url or '').hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+
+    @classmethod
+    def from_history(cls, history: Any, url: str, ats: str) -> 'StepTimeline':
+        """
+        Build a timeline from a browser-use AgentHistoryList.
+
+        Steps without timing metadata are skipped.
+        """
+        return cls.from_steps(getattr(history, 'history', None) or [], url, ats)
+
+    @classmethod
+    def from_steps(cls, items: List[Any], url: str, ats: str) -> 'StepTimeline':
+        """
+        Build a timeline from browser-use AgentHistory steps, e.g. those of
+        a run that failed or was cancelled before returning its history.
+        """
+        timeline = cls(url=url, ats=ats)
+        for index, item in enumerate(items):
+            metadata = getattr(item, 'metadata', None)
+            try:
+                started = float(metadata.step_start_time)
+                ended = float(metadata.step_end_time)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            actions = action_names(getattr(item, 'model_output', None))
+            results = getattr(item, 'result', None) or []
+            timeline.steps.append(TimelineStep(
+                number=int(getattr(metadata, 'step_number', None) or index + 1),
+                started_at=started,
+                ended_at=ended,
+                step_type=step_type(actions),
+                actions=actions,
+                tokens=int(getattr(metadata, 'input_tokens', None) or 0),
+                url=getattr(getattr(item, 'state', None), 'url', None),
+                error=any(getattr(result, 'error', None) for result in results)
+            ))
+        return timeline
+
+    def export(self) -> None:
+        """Observe every step in browser_agent_step_seconds"""
+        if BROWSER_STEP_SECONDS is None:
+            return
+        for step in self.steps:
+            BROWSER_STEP_SECONDS.labels(ats=self.ats, step_type=step.step_type).observe(step.seconds)
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per step type, slowest first"""
+        totals: Dict[str, float] = {}
+        for step in self.steps:
+            totals[step.step_type] = totals.get(step.step_type, 0.0) + step.seconds
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Compact JSON form: step offsets relative to the first step, and a
+        URL only where it changed.
+        """
+        origin = self.steps[0].started_at if self.steps else 0.0
+        steps = []
+        last_url = None
+        for step in self.steps:
+            entry = {
+                'n': step.number,
+                'at': round(step.started_at - origin, 3),
+                's': round(step.seconds, 3),
+                'type': step.step_type,
+                'actions': step.actions,
+            }
+            if step.tokens:
+                entry['tokens'] = step.tokens
+            if step.url and step.url != last_url:
+                entry['url'] = last_url = step.url
+            if step.error:
+                entry['error'] = True
+            steps.append(entry)
+        return {'url': self.url, 'ats': self.ats, 'domain': self.domain, 'started_at': origin, 'steps': steps}
@@ -0,0 +1,45 @@
+"""
+Token Usage Metrics
+Prometheus export of the per-call usage records collected by TokenMeter
+"""
+
+import logging
+from typing import Iterable
+
+try:
+    from prometheus_client import Counter
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+from ..planning.budget import UsageRecord
+
+logger = logging.getLogger(__name__)
+
+if PROMETHEUS_AVAILABLE:
+    AGENT_TOKENS = Counter('agent_tokens_total', 'Total tokens used', ['type', 'stage', 'call_type'])
+    AGENT_COST = Counter('agent_cost_usd_total', 'Total cost in USD')
+else:
+    AGENT_TOKENS = None
+    AGENT_COST = None
+
+
+def export_usage(records: Iterable[UsageRecord]) -> None:
+    """
+    Add ``records`` to the token and cost counters.
+
+    ``type`` is input, output or cached; cached tokens are a subset of input.
+    """
+    if AGENT_TOKENS is None:
+        return
+    for record in records:
+        stage = record.stage or 'other'
+        for kind, count in (
+            ('input', record.tokens_input),
+            ('output', record.tokens_output),
+            ('cached', record.tokens_cached),
+        ):
+            if count:
+                AGENT_TOKENS.labels(type=kind, stage=stage, call_type=record.call_type).inc(count)
+        if record.cost_usd:
+            AGENT_COST.inc(record.cost_usd)
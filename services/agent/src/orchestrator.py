@@ -20,6 +20,8 @@ from .matching import ProfileMatcher
 from .planning import EffortPlanner
 from .generation import AnswerGenerator
 from .agents.enhanced_form_filler import EnhancedFormFiller
+from .browser.farm import assign_worker, farm_specs
+from .concurrency.pipeline import PipelinedRunner
 from .utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,7 +31,9 @@ logger = get_logger(__name__)
 class ApplicationWorker:
     """Ray actor for running a single application"""
 
-    def __init__(self, worker_id: int):
+    def __init__(self, worker_id: int, worker_count: int = 1):
+        # The browser pool built below takes this worker's share of the farm
+        assign_worker(worker_id, worker_count)
         self.worker_id = worker_id
         logger.info(f"Worker {worker_id} initialized")
 
@@ -92,8 +96,9 @@ class RayOrchestrator:
             if not ray.is_initialized():
                 ray.init(ignore_reinit_error=True, logging_level=logging.INFO)
 
-            # Create worker pool
-            self.workers = [ApplicationWorker.remote(i) for i in range(self.max_workers)]
+            # Create worker pool; every worker needs its own remote browsers
+            farm_specs(0, self.max_workers)
+            self.workers = [ApplicationWorker.remote(i, self.max_workers) for i in range(self.max_workers)]
             self.initialized = True
             logger.info(f"Ray runtime initialized with {len(self.workers)} workers")
 
@@ -191,22 +196,20 @@ class SingleThreadOrchestrator:
             application_repo=self.app_repo,
             event_repo=self.event_repo
         )
+        self.pipeline = PipelinedRunner(self.runner, browser_slots=1)
 
     async def run_session(
         self,
         session_id: UUID,
         applications: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Run applications sequentially"""
+        """Run applications through one browser, preparing upcoming ones ahead of it"""
         logger.info(f"Starting single-threaded session {session_id} with {len(applications)} applications")
 
-        results = []
         for app_config in applications:
             app_config['session_id'] = session_id
-            result = await self.runner.run_application(**app_config)
-            results.append(result)
 
-        return results
+        return await self.pipeline.run(applications)
 
 
 def get_orchestrator(max_concurrent_workers: int = 5):
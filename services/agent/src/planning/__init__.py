@@ -1,5 +1,29 @@
 """Planning module for effort level decisions"""
 
 from .effort_planner import EffortPlanner
+from .application_plan import ApplicationPlan
+from .budget import (
+    AgentLimits,
+    ApplicationBudget,
+    BudgetExceeded,
+    TokenMeter,
+    UsageRecord,
+    current_meter,
+    metering,
+    record_usage,
+    usage_stage,
+)
 
-__all__ = ['EffortPlanner']
+__all__ = [
+    'EffortPlanner',
+    'ApplicationPlan',
+    'AgentLimits',
+    'ApplicationBudget',
+    'BudgetExceeded',
+    'TokenMeter',
+    'UsageRecord',
+    'current_meter',
+    'metering',
+    'record_usage',
+    'usage_stage',
+]
@@ -0,0 +1,65 @@
+"""
+Application Plan
+Output of the preparation stages (match, effort, generation) handed to the browser stage
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from ..observability.stage_metrics import StageTimer
+from .budget import ApplicationBudget, TokenMeter
+
+
+@dataclass
+class ApplicationPlan:
+    """
+    Everything the browser stage needs for one application.
+
+    Built by ApplicationRunner.prepare_application, which runs the CPU/API
+    bound stages, and consumed by ApplicationRunner.execute_plan, which only
+    drives the browser and records the outcome.
+    """
+
+    application_id: UUID
+    job_url: str
+    job_title: str
+    company_name: str
+    job_description: str
+    user_profile: Dict
+    user_effort_hint: str = "medium"
+    company_tier: str = "normal"
+    session_id: Optional[UUID] = None
+    resume_path: Optional[str] = None
+    known_questions: List[str] = field(default_factory=list)
+
+    # Stage outputs
+    match_score: Optional[float] = None
+    effort_level: Optional[str] = None
+    effort_reason: str = ""
+    should_skip: bool = False
+    cover_letter: Optional[str] = None
+    screening_answers: Dict[str, str] = field(default_factory=dict)
+    # Question -> 'template', 'bank' (reused), 'llm' (generated for this
+    # application) or 'fallback' (boilerplate after a failed LLM call)
+    answer_sources: Dict[str, str] = field(default_factory=dict)
+
+    # Set when a preparation stage raised; execute_plan records the failure
+    error: Optional[str] = None
+    failure_code: str = 'runner_exception'
+
+    # Checkpointing: hash of the inputs, and stages restored instead of recomputed
+    input_fingerprint: Optional[str] = None
+    resumed_stages: List[str] = field(default_factory=list)
+
+    # Limits derived from the effort level, and the tokens spent against them
+    budget: Optional[ApplicationBudget] = None
+    token_meter: TokenMeter = field(default_factory=TokenMeter)
+
+    # Wall-clock time per stage, carried across pipeline stages and retries
+    stage_timer: StageTimer = field(default_factory=StageTimer)
+
+    @property
+    def runnable(self) -> bool:
+        """Whether the plan needs the browser stage at all"""
+        return self.error is None and not self.should_skip
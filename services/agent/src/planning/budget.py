@@ -0,0 +1,413 @@
+"""
+Application Budgets
+Wall-clock, token and USD limits per application, and step caps per browser
+agent run, derived from the effort level in effort_policy.yml
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(Exception):
+    """Raised when an application runs out of time, tokens or money"""
+
+    def __init__(self, kind: str, limit: float, used: float, stage: Optional[str] = None):
+        self.kind = kind  # 'time', 'tokens' or 'cost'
+        self.limit = limit
+        self.used = used
+        self.stage = stage
+        where = f" in stage '{stage}'" if stage else ""
+        super().__init__(f"{kind} budget exceeded{where}: used {used:.4g} of {limit:.4g}")
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'limit': self.limit, 'used': self.used, 'stage': self.stage}
+
+
+@dataclass
+class ApplicationBudget:
+    """Limits for one application; None means unlimited"""
+
+    effort_level: str
+    total_seconds: Optional[float] = None
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    max_tokens: Optional[int] = None
+    max_cost_usd: Optional[float] = None
+    enforce_cost: bool = False
+    token_prices: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_policy(cls, policy: Dict[str, Any], effort_level: str) -> 'ApplicationBudget':
+        """
+        Build a budget from the effort policy.
+
+        Args:
+            policy: Parsed effort_policy.yml
+            effort_level: low/medium/high
+
+        Returns:
+            ApplicationBudget (unlimited where the policy sets nothing)
+        """
+        level = (effort_level or 'medium').lower()
+        budgets = policy.get('budgets', {}) or {}
+        cost_limits = policy.get('cost_limits', {}) or {}
+
+        wall_clock = dict((budgets.get('wall_clock', {}) or {}).get(level, {}) or {})
+        total = wall_clock.pop('total', None)
+
+        return cls(
+            effort_level=level,
+            total_seconds=float(total) if total else None,
+            stage_seconds={stage: float(limit) for stage, limit in wall_clock.items() if limit},
+            max_tokens=(budgets.get('max_tokens', {}) or {}).get(level),
+            max_cost_usd=(cost_limits.get('max_cost_per_application', {}) or {}).get(level),
+            enforce_cost=bool(cost_limits.get('abort_if_exceeded', False)),
+            token_prices=budgets.get('token_prices', {}) or {},
+        )
+
+    def timeout_for(self, stage: str, elapsed: float = 0.0) -> Optional[float]:
+        """
+        Seconds the next ``stage`` call may take.
+
+        Args:
+            stage: Budget stage ('match', 'generation', 'browser')
+            elapsed: Active seconds already spent on the application
+
+        Returns:
+            Timeout for asyncio.wait_for, or None when unlimited
+
+        Raises:
+            BudgetExceeded: When the overall budget is already spent
+        """
+        limits = []
+        if stage in self.stage_seconds:
+            limits.append(self.stage_seconds[stage])
+        if self.total_seconds is not None:
+            remaining = self.total_seconds - elapsed
+            if remaining <= 0:
+                raise BudgetExceeded('time', self.total_seconds, elapsed, stage=stage)
+            limits.append(remaining)
+        return min(limits) if limits else None
+
+    def cost_of(self, tokens_input: int, tokens_output: int, model: Optional[str] = None) -> float:
+        """Estimated USD cost of a call"""
+        prices = self.token_prices.get(model or '', self.token_prices.get('default', {}))
+        return tokens_input * prices.get('input', 0.0) + tokens_output * prices.get('output', 0.0)
+
+
+DEFAULT_REVIEW_PATTERNS = ('review your application', 'review and submit', 'review & submit')
+
+
+@dataclass
+class AgentLimits:
+    """Caps and early-termination rules for one browser agent run; None disables a rule"""
+
+    max_steps: Optional[int] = None
+    max_tokens: Optional[int] = None
+    stall_steps: Optional[int] = None
+    repeat_actions: Optional[int] = None
+    stop_at_review: bool = False
+    review_patterns: Tuple[str, ...] = DEFAULT_REVIEW_PATTERNS
+
+    @classmethod
+    def from_policy(
+        cls,
+        policy: Dict[str, Any],
+        effort_level: str,
+        ats: Optional[str] = None,
+        remaining_tokens: Optional[int] = None
+    ) -> 'AgentLimits':
+        """
+        Build the limits of a browser run from the effort policy.
+
+        The token cap is a share (``agent_limits.<level>.token_share``) of
+        the application's ``budgets.max_tokens``, counted the same way
+        (prompt + completion), and never more than the application has left.
+
+        Args:
+            policy: Parsed effort_policy.yml
+            effort_level: low/medium/high
+            ats: ATS label of the job URL; ``agent_limits.ats.<ats>.multiplier``
+                scales the step and token caps
+            remaining_tokens: Tokens left in the application's budget
+                (TokenMeter.remaining_tokens), if metered
+
+        Returns:
+            AgentLimits (unlimited where the policy sets nothing)
+        """
+        level = (effort_level or 'medium').lower()
+        budgets = policy.get('budgets', {}) or {}
+        agent_limits = budgets.get('agent_limits', {}) or {}
+        caps = agent_limits.get(level, {}) or {}
+        multiplier = float(((agent_limits.get('ats', {}) or {}).get(ats or '', {}) or {}).get('multiplier', 1.0))
+        progress = budgets.get('progress', {}) or {}
+
+        def scaled(value: Any) -> Optional[int]:
+            return max(int(round(float(value) * multiplier)), 1) if value else None
+
+        application_tokens = (budgets.get('max_tokens', {}) or {}).get(level)
+        max_tokens = None
+        if application_tokens and caps.get('token_share'):
+            max_tokens = min(scaled(application_tokens * float(caps['token_share'])), int(application_tokens))
+        if remaining_tokens is not None:
+            max_tokens = remaining_tokens if max_tokens is None else min(max_tokens, remaining_tokens)
+
+        return cls(
+            max_steps=scaled(caps.get('max_steps')),
+            max_tokens=max_tokens,
+            stall_steps=progress.get('stall_steps') or None,
+            repeat_actions=progress.get('repeat_actions') or None,
+            stop_at_review=bool(progress.get('stop_at_review', False)),
+            review_patterns=tuple(
+                pattern.lower() for pattern in progress.get('review_patterns') or DEFAULT_REVIEW_PATTERNS
+            ),
+        )
+
+
+@dataclass
+class UsageRecord:
+    """One LLM call (or a browser run's aggregate) as charged to an application"""
+
+    model: str
+    call_type: str  # model_usage.call_type: 'chat_completion', 'embedding', ...
+    tokens_input: int = 0
+    tokens_output: int = 0
+    tokens_cached: int = 0
+    cost_usd: float = 0.0
+    stage: Optional[str] = None
+    purpose: Optional[str] = None
+    recorded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class TokenMeter:
+    """
+    Token and cost accounting for one application.
+
+    LLM wrappers report usage through record_usage(); the meter bound to the
+    current context (see metering) raises BudgetExceeded once a token or
+    enforced cost limit is crossed, which cancels the calling stage.
+
+    Every call is also kept as a UsageRecord, tagged with the stage bound by
+    usage_stage(), until the runner drains them into model_usage.
+    """
+
+    def __init__(self, budget: Optional[ApplicationBudget] = None):
+        self.budget = budget
+        self.tokens_input = 0
+        self.tokens_output = 0
+        self.tokens_cached = 0
+        self.cost_usd = 0.0
+        self.records: List[UsageRecord] = []
+        self._drained = 0
+        self._cost_warned = False
+        # Generation calls report from worker threads
+        self._lock = threading.Lock()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.tokens_input + self.tokens_output
+
+    @property
+    def remaining_tokens(self) -> Optional[int]:
+        """Tokens left before the token limit, or None when unlimited"""
+        if self.budget is None or self.budget.max_tokens is None:
+            return None
+        return max(int(self.budget.max_tokens) - self.total_tokens, 0)
+
+    def add(
+        self,
+        tokens_input: int,
+        tokens_output: int,
+        model: Optional[str] = None,
+        enforce: bool = True,
+        tokens_cached: int = 0,
+        call_type: str = 'chat_completion',
+        purpose: Optional[str] = None,
+        stage: Optional[str] = None
+    ) -> None:
+        """
+        Record a call's usage.
+
+        Args:
+            tokens_input: Prompt tokens (including cached ones)
+            tokens_output: Completion tokens
+            model: Model name for pricing
+            enforce: Raise BudgetExceeded when over budget (False only records)
+            tokens_cached: Prompt tokens served from the provider's cache
+            call_type: model_usage call type
+            purpose: What the call was for ('cover_letter', 'match_score', ...)
+            stage: Budget stage (default: the one bound by usage_stage)
+        """
+        tokens_input = max(int(tokens_input or 0), 0)
+        tokens_output = max(int(tokens_output or 0), 0)
+        tokens_cached = min(max(int(tokens_cached or 0), 0), tokens_input)
+        record = UsageRecord(
+            model=model or 'unknown',
+            call_type=call_type,
+            tokens_input=tokens_input,
+            tokens_output=tokens_output,
+            tokens_cached=tokens_cached,
+            stage=stage or _current_stage.get(),
+            purpose=purpose,
+        )
+        with self._lock:
+            self.tokens_input += tokens_input
+            self.tokens_output += tokens_output
+            self.tokens_cached += tokens_cached
+            if self.budget:
+                record.cost_usd = self.budget.cost_of(tokens_input, tokens_output, model)
+                self.cost_usd += record.cost_usd
+            self.records.append(record)
+        if enforce:
+            self.check()
+
+    def by_stage(self) -> Dict[str, Dict[str, int]]:
+        """Token totals per stage: {stage: {'input': ..., 'output': ..., 'cached': ...}}"""
+        totals: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            stage = totals.setdefault(record.stage or 'other', {'input': 0, 'output': 0, 'cached': 0})
+            stage['input'] += record.tokens_input
+            stage['output'] += record.tokens_output
+            stage['cached'] += record.tokens_cached
+        return totals
+
+    def drain(self) -> List[UsageRecord]:
+        """Records added since the last drain (each record is returned once)"""
+        with self._lock:
+            records = self.records[self._drained:]
+            self._drained = len(self.records)
+        return records
+
+    def check(self) -> None:
+        """
+        Raise if the budget is spent.
+
+        Raises:
+            BudgetExceeded: Token limit, or cost limit when enforced
+        """
+        budget = self.budget
+        if budget is None:
+            return
+        if budget.max_tokens is not None and self.total_tokens > budget.max_tokens:
+            raise BudgetExceeded('tokens', budget.max_tokens, self.total_tokens)
+        if budget.max_cost_usd is not None and self.cost_usd > budget.max_cost_usd:
+            if budget.enforce_cost:
+                raise BudgetExceeded('cost', budget.max_cost_usd, self.cost_usd)
+            if not self._cost_warned:
+                self._cost_warned = True
+                logger.warning(f"Application cost ${self.cost_usd:.4f} exceeds limit ${budget.max_cost_usd:.2f}")
+
+
+_current_meter: ContextVar[Optional[TokenMeter]] = ContextVar('token_meter', default=None)
+_current_stage: ContextVar[Optional[str]] = ContextVar('usage_stage', default=None)
+
+
+@contextmanager
+def metering(meter: TokenMeter) -> Iterator[TokenMeter]:
+    """
+    Bind ``meter`` to the current context.
+
+    asyncio tasks and asyncio.to_thread copy the context, so LLM calls made
+    from inside the block are charged to this application.
+    """
+    token = _current_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        _current_meter.reset(token)
+
+
+def current_meter() -> Optional[TokenMeter]:
+    """The meter bound by metering() in this context, if any"""
+    return _current_meter.get()
+
+
+@contextmanager
+def usage_stage(stage: str) -> Iterator[None]:
+    """Tag usage recorded inside the block with ``stage``"""
+    token = _current_stage.set(stage)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def usage_tokens(usage: Any) -> Tuple[int, int, int]:
+    """
+    Token counts of an OpenAI-style ``usage`` object or dict.
+
+    Handles chat (prompt/completion), embedding (prompt only) and
+    browser-use summaries (total_prompt_* fields).
+
+    Returns:
+        (input tokens, output tokens, cached input tokens)
+    """
+    if usage is None:
+        return 0, 0, 0
+
+    def read(source: Any, *names: str) -> Any:
+        for name in names:
+            value = source.get(name) if isinstance(source, dict) else getattr(source, name, None)
+            if value:
+                return value
+        return None
+
+    details = read(usage, 'prompt_tokens_details', 'input_tokens_details')
+    cached = read(usage, 'cached_tokens', 'total_prompt_cached_tokens', 'prompt_cached_tokens')
+    if cached is None and details is not None:
+        cached = read(details, 'cached_tokens')
+
+    counts = []
+    for value in (
+        read(usage, 'prompt_tokens', 'input_tokens', 'total_prompt_tokens'),
+        read(usage, 'completion_tokens', 'output_tokens', 'total_completion_tokens'),
+        cached,
+    ):
+        try:
+            counts.append(max(int(value or 0), 0))
+        except (TypeError, ValueError):
+            counts.append(0)
+    return counts[0], counts[1], counts[2]
+
+
+def record_usage(
+    usage: Any,
+    model: Optional[str] = None,
+    call_type: str = 'chat_completion',
+    purpose: Optional[str] = None,
+    enforce: bool = True
+) -> None:
+    """
+    Charge an OpenAI-style ``usage`` object to the current application.
+
+    No-op outside a metering() block or when usage is missing.
+
+    Args:
+        usage: ``response.usage`` of a chat completion or embedding call
+        model: Model that served the call
+        call_type: model_usage call type ('chat_completion', 'embedding')
+        purpose: What the call was for
+        enforce: Raise BudgetExceeded when over budget (False only records)
+
+    Raises:
+        BudgetExceeded: When the call pushes the application over budget
+    """
+    meter = _current_meter.get()
+    if meter is None or usage is None:
+        return
+    tokens_input, tokens_output, tokens_cached = usage_tokens(usage)
+    meter.add(
+        tokens_input, tokens_output, model,
+        enforce=enforce,
+        tokens_cached=tokens_cached,
+        call_type=call_type,
+        purpose=purpose
+    )
@@ -8,6 +8,8 @@ import logging
 from typing import Optional, Dict, Any, Tuple
 import yaml
 
+from .budget import ApplicationBudget
+
 logger = logging.getLogger(__name__)
 
 
@@ -214,3 +216,7 @@ class EffortPlanner:
         """Get cost limit for effort level"""
         limits = self.policy.get('cost_limits', {}).get('max_cost_per_application', {})
         return limits.get(effort_level.lower(), 0.10)
+
+    def get_budget(self, effort_level: str) -> ApplicationBudget:
+        """Get wall-clock, token and cost budget for effort level"""
+        return ApplicationBudget.from_policy(self.policy, effort_level)
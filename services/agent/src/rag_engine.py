@@ -1,4 +1,5 @@
-from openai import OpenAI
+from .planning.budget import record_usage
+from .utils.llm_clients import get_client_registry
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct, VectorParams, Distance, Filter, FieldCondition, MatchValue
 import os
@@ -7,7 +8,7 @@ import uuid
 class KnowledgeBase:
     def __init__(self):
         # Use OpenAI embeddings (text-embedding-3-small)
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai_client = get_client_registry().openai_client('openai')
         self.client = QdrantClient(url=os.getenv("QDRANT_URI", "http://localhost:6333"))
         self.collection_name = "profile_data"
 
@@ -24,6 +25,7 @@ class KnowledgeBase:
             input=text,
             model="text-embedding-3-small"
         )
+        record_usage(getattr(response, 'usage', None), "text-embedding-3-small", call_type='embedding', purpose='knowledge_search')
         return response.data[0].embedding
 
     def search_relevant_info(self, query: str, limit: int = 5):
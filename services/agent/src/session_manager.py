@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 from uuid import UUID
 
+from persistence.src.async_repository import run_db
+from persistence.src.event_sink import EventSink
 from persistence.src.sessions import SessionRepository
 
 from .notifications.digest_email import DigestEmailSender, SessionStats
@@ -52,6 +54,7 @@ class SessionManager:
         self.default_max_applications = _read_positive_int(env_max_apps, max_applications)
         self.daily_cap = _read_positive_int(os.getenv('MAX_DAILY_APPLICATIONS'), 300)
         self.digest_sender = digest_sender or DigestEmailSender()
+        self.event_sink = EventSink(session_repo=self.session_repo)
         self._reset_runtime_state()
 
     def _reset_runtime_state(self) -> None:
@@ -180,6 +183,50 @@ class SessionManager:
             logger.debug("Skipping session metrics - runtime session not attached")
             return
 
+        metrics = self._apply_runtime_stats(effort_level, status, tokens_input, tokens_output, error_message)
+        self._persist_session_metrics(session_id=session_id, **metrics)
+        self._enforce_runtime_limits()
+
+    async def register_application_async(
+        self,
+        session_id: Optional[UUID],
+        effort_level: Optional[str],
+        status: str,
+        tokens_input: int = 0,
+        tokens_output: int = 0,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """Coroutine variant of register_application; database work runs on the DB executor."""
+        if not session_id:
+            return
+
+        if not self.session_id or session_id != self.session_id:
+            await run_db(self._ensure_runtime_session, session_id)
+
+        if not self.session_id or session_id != self.session_id:
+            logger.debug("Skipping session metrics - runtime session not attached")
+            return
+
+        metrics = self._apply_runtime_stats(effort_level, status, tokens_input, tokens_output, error_message)
+        await run_db(self._persist_session_metrics, session_id=session_id, log_failure_event=False, **metrics)
+        if metrics['normalized_status'] == 'failed' and error_message:
+            await self.event_sink.add_session_event(
+                session_id,
+                'application_failed',
+                f"Application failure: {error_message[:240]}",
+                payload={'error': error_message},
+            )
+        await run_db(self._enforce_runtime_limits)
+
+    def _apply_runtime_stats(
+        self,
+        effort_level: Optional[str],
+        status: str,
+        tokens_input: int,
+        tokens_output: int,
+        error_message: Optional[str],
+    ) -> Dict[str, Any]:
+        """Fold one application outcome into the in-memory stats; returns persistence kwargs."""
         self.application_count += 1
         level = (effort_level or 'medium').lower()
         if level == 'high':
@@ -208,15 +255,13 @@ class SessionManager:
         if self.stats.total_applications:
             self.stats.avg_tokens_per_app = tokens_total // self.stats.total_applications
 
-        self._persist_session_metrics(
-            session_id=session_id,
-            effort_level=level,
-            normalized_status=normalized_status,
-            tokens_input=safe_tokens_in,
-            tokens_output=safe_tokens_out,
-            error_message=error_message,
-        )
-        self._enforce_runtime_limits()
+        return {
+            'effort_level': level,
+            'normalized_status': normalized_status,
+            'tokens_input': safe_tokens_in,
+            'tokens_output': safe_tokens_out,
+            'error_message': error_message,
+        }
 
     def current_runtime_snapshot(self) -> Dict[str, Any]:
         """Return a serializable snapshot of the live session state."""
@@ -239,13 +284,14 @@ class SessionManager:
         tokens_input: int,
         tokens_output: int,
         error_message: Optional[str],
+        log_failure_event: bool = True,
     ) -> None:
         try:
             self.session_repo.increment_session_counts(session_id, effort_level)
             if normalized_status == 'submitted':
                 self.session_repo.mark_application_successful(session_id)
             self.session_repo.add_token_usage(session_id, tokens_input, tokens_output)
-            if normalized_status == 'failed' and error_message:
+            if log_failure_event and normalized_status == 'failed' and error_message:
                 self.session_repo.add_session_event(
                     session_id,
                     'application_failed',
@@ -288,8 +334,8 @@ class SessionManager:
         if not self.session_id:
             return None
         session_id = self.session_id
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.stop_session, session_id, reason)
+        await self.event_sink.flush()
+        return await run_db(self.stop_session, session_id, reason)
 
     def _ensure_runtime_session(self, session_id: UUID) -> None:
         record = self.session_repo.get_session(session_id)
@@ -4,7 +4,7 @@ Configures browser-use to work in different environments (WSL, Docker, IDE)
 """
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ class BrowserConfig:
     Manages browser configuration for different environments.
 
     Supports:
-    - CDP connection to existing Chrome
+    - CDP connection to existing Chrome (one or a farm of endpoints)
     - Local browser launch
     - Headless mode for CI/CD
     """
@@ -23,6 +23,7 @@ class BrowserConfig:
     def __init__(self):
         self.mode = os.getenv('BROWSER_MODE', 'auto')
         self.cdp_url = os.getenv('CHROME_CDP_URL')
+        self.cdp_urls = [url.strip() for url in os.getenv('CHROME_CDP_URLS', '').split(',') if url.strip()]
         self.headless = os.getenv('HEADLESS', 'true').lower() == 'true'
 
     def get_playwright_config(self) -> Dict[str, Any]:
@@ -53,12 +54,24 @@ class BrowserConfig:
 
     def should_use_cdp(self) -> bool:
         """Check if CDP connection should be used"""
-        return self.cdp_url is not None and self.mode in ['cdp', 'auto']
+        return bool(self.cdp_url or self.cdp_urls) and self.mode in ['cdp', 'auto']
 
     def get_cdp_url(self) -> Optional[str]:
         """Get CDP endpoint URL"""
         return self.cdp_url
 
+    def get_cdp_urls(self) -> List[str]:
+        """
+        Get the browser farm's endpoint specs.
+
+        Returns:
+            CHROME_CDP_URLS entries, else CHROME_CDP_URL; empty when CDP is
+            not used
+        """
+        if not self.should_use_cdp():
+            return []
+        return list(self.cdp_urls) or [self.cdp_url]
+
     def detect_environment(self) -> str:
         """
         Detect the current environment.
@@ -125,6 +138,8 @@ class BrowserConfig:
         logger.info(f"Mode: {self.mode}")
         logger.info(f"Headless: {self.headless}")
         logger.info(f"CDP URL: {self.cdp_url or 'Not set'}")
+        if self.cdp_urls:
+            logger.info(f"CDP farm: {len(self.cdp_urls)} endpoints")
         logger.info("")
         logger.info("Recommendation:")
         logger.info(f"  Mode: {recommendation['mode']}")
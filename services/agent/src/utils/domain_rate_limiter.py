@@ -16,6 +16,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
 
 from database import get_db
 
+from ..agents.adapters import get_adapter_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +26,9 @@ class DomainRateLimiter:
     Enforces rate limits per domain using:
     1. Static policies from stealth.yml
     2. Dynamic tracking in domain_rate_limits table
+
+    Methods accept a domain or a full URL; URLs are resolved to the policy
+    domain they fall under (see domain_for).
     """
 
     def __init__(self, stealth_config_path: Optional[str] = None):
@@ -46,21 +51,46 @@ class DomainRateLimiter:
 
         self.domain_policies = self.stealth_config.get('domains', {})
         self.global_config = self.stealth_config.get('global', {})
+        self.adapters = get_adapter_registry()
+        for policy_domain in self.domain_policies:
+            # Policies apply to the registry's rate-limit domains; one the
+            # registry does not know would only cover its exact host
+            if '.' in policy_domain and self.adapters.rate_limit_domain(f"https://sub.{policy_domain}") != policy_domain:
+                logger.warning(f"stealth.yml domain {policy_domain} is not a registered board; subdomains are not covered")
 
         self.db = get_db()
 
         logger.info(f"DomainRateLimiter initialized with {len(self.domain_policies)} domain policies")
 
+    def domain_for(self, url: str) -> str:
+        """
+        Domain whose limits cover a URL.
+
+        Args:
+            url: Job or application URL (a bare domain is returned as is)
+
+        Returns:
+            The adapter registry's rate-limit domain, the same one job
+            ingestion tags jobs with: the registered board suffix the host
+            falls under (de.indeed.com -> indeed.com, every
+            boards.greenhouse.io company -> greenhouse.io), else the host
+            without www.
+        """
+        if '://' not in url:
+            return url
+        return self.adapters.rate_limit_domain(url)
+
     async def check_can_apply(self, domain: str) -> tuple[bool, Optional[str]]:
         """
         Check if we can apply to a domain right now.
 
         Args:
-            domain: Domain name (e.g., 'linkedin.com')
+            domain: Domain name (e.g., 'linkedin.com') or job URL
 
         Returns:
             Tuple of (can_apply, reason_if_blocked)
         """
+        domain = self.domain_for(domain)
         # Get domain stats from database
         stats = self._get_domain_stats(domain)
 
@@ -112,10 +142,11 @@ class DomainRateLimiter:
         Record an application attempt for rate limiting.
 
         Args:
-            domain: Domain name
+            domain: Domain name or job URL
             success: Whether application succeeded
             blocked: Whether we got blocked/rate limited
         """
+        domain = self.domain_for(domain)
         today = date.today()
 
         # Update or insert domain stats
@@ -196,13 +227,15 @@ class DomainRateLimiter:
         Get recommended delay before next application to domain.
 
         Args:
-            domain: Domain name
+            domain: Domain name or job URL
 
         Returns:
             Delay in seconds
         """
         import random
 
+        domain = self.domain_for(domain)
+
         policy = self.domain_policies.get(domain) or self.domain_policies.get('company_site', {})
 
         min_delay = policy.get('min_delay_sec', self.global_config.get('min_delay_between_apps_sec', 30))
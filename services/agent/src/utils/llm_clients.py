@@ -0,0 +1,253 @@
+"""
+LLM Client Registry
+One keep-alive, connection-pooled HTTP client per provider and process,
+shared by every OpenAI-compatible SDK client, with pool utilization metrics.
+USE_MOCK_LLM=true points every provider at the offline mock server.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from prometheus_client import Counter, Gauge
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Provider -> (base URL, API key variable)
+PROVIDERS: Dict[str, Tuple[Optional[str], str]] = {
+    'xai': ('https://api.x.ai/v1', 'GROK_API_KEY'),
+    'openai': (None, 'OPENAI_API_KEY'),
+}
+
+if PROMETHEUS_AVAILABLE:
+    LLM_HTTP_CONNECTIONS = Gauge(
+        'llm_http_pool_connections',
+        'Pooled connections to LLM providers by state',
+        ['provider', 'mode', 'state']
+    )
+    LLM_HTTP_POOL_LIMIT = Gauge('llm_http_pool_max_connections', 'Connection pool size per provider', ['provider'])
+    LLM_HTTP_REQUESTS = Counter('llm_http_requests_total', 'HTTP requests sent to LLM providers', ['provider'])
+else:
+    LLM_HTTP_CONNECTIONS = None
+    LLM_HTTP_POOL_LIMIT = None
+    LLM_HTTP_REQUESTS = None
+
+
+# Default address of scripts/mock_llm_server.py
+DEFAULT_MOCK_LLM_URL = 'http://localhost:8100/v1'
+
+
+def mock_llm_url() -> Optional[str]:
+    """Mock server base URL when USE_MOCK_LLM=true, else None"""
+    if os.getenv('USE_MOCK_LLM', 'false').lower() != 'true':
+        return None
+    return os.getenv('MOCK_LLM_URL', DEFAULT_MOCK_LLM_URL)
+
+
+def provider_for_model(model: str) -> str:
+    """Provider serving ``model`` ('grok-*' -> xai, anything else -> openai)"""
+    return 'xai' if 'grok' in (model or '').lower() else 'openai'
+
+
+def pool_stats(client: Any) -> Dict[str, int]:
+    """
+    Connection counts of an httpx client's pool.
+
+    httpx does not expose pool state publicly; this reads httpcore's
+    connection list and returns zeros if the internals change.
+
+    Returns:
+        {'active': ..., 'idle': ..., 'total': ...}
+    """
+    try:
+        connections = list(client._transport._pool.connections)
+    except AttributeError:
+        return {'active': 0, 'idle': 0, 'total': 0}
+    idle = sum(1 for c in connections if c.is_idle())
+    return {'active': len(connections) - idle, 'idle': idle, 'total': len(connections)}
+
+
+class LLMClientRegistry:
+    """
+    Process-wide cache of provider HTTP and SDK clients.
+
+    - one ``httpx.Client`` and one ``httpx.AsyncClient`` per provider, with
+      keep-alive pooling and HTTP/2 when ``h2`` is installed
+    - OpenAI / AsyncOpenAI SDK clients built on those pools, so matchers,
+      generators, embedders and browser agents share connections and TLS
+      sessions instead of each opening their own
+
+    Async clients are bound to the event loop that first used them and are
+    rebuilt if a different loop asks (tests and scripts run several loops).
+    """
+
+    def __init__(self):
+        self.max_connections = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', 100))
+        self.max_keepalive = int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', 20))
+        self.keepalive_expiry = float(os.getenv('LLM_HTTP_KEEPALIVE_SECONDS', 30))
+        self.http2 = HTTP2_AVAILABLE and os.getenv('LLM_HTTP2', 'true').lower() == 'true'
+        self.timeout = httpx.Timeout(float(os.getenv('LLM_HTTP_TIMEOUT_SECONDS', 60)), connect=10.0)
+
+        self._lock = threading.Lock()
+        self._http: Dict[str, httpx.Client] = {}
+        self._async_http: Dict[str, Tuple[Any, httpx.AsyncClient]] = {}
+        self._sdk: Dict[Tuple[str, str, Any], Any] = {}
+
+    def http_client(self, provider: str) -> httpx.Client:
+        """Shared synchronous pooled client for ``provider``"""
+        with self._lock:
+            client = self._http.get(provider)
+            if client is None:
+                client = httpx.Client(**self._client_kwargs(provider, asynchronous=False))
+                self._http[provider] = client
+                self._export_pool_metrics(provider, 'sync', client)
+            return client
+
+    def async_http_client(self, provider: str) -> httpx.AsyncClient:
+        """Shared async pooled client for ``provider`` on the running loop"""
+        loop = _running_loop()
+        with self._lock:
+            cached = self._async_http.get(provider)
+            if cached is not None and cached[0] is loop:
+                return cached[1]
+            if cached is not None:
+                # SDK clients wrap the old loop's pool; drop them with it
+                stale = id(cached[1])
+                self._sdk = {key: sdk for key, sdk in self._sdk.items() if key[2] != stale}
+            client = httpx.AsyncClient(**self._client_kwargs(provider, asynchronous=True))
+            self._async_http[provider] = (loop, client)
+            self._export_pool_metrics(provider, 'async', client)
+            return client
+
+    def openai_client(self, provider: str):
+        """Shared ``openai.OpenAI`` for ``provider``"""
+        from openai import OpenAI
+        http_client = self.http_client(provider)
+        return self._sdk_client(provider, 'sync', http_client, lambda: OpenAI(
+            http_client=http_client, **self.credentials(provider)
+        ))
+
+    def async_openai_client(self, provider: str, max_retries: int = 0):
+        """
+        Shared ``openai.AsyncOpenAI`` for ``provider`` on the running loop.
+
+        ``max_retries`` defaults to 0 so 429s reach the LLM governor instead
+        of being retried inside the SDK.
+        """
+        from openai import AsyncOpenAI
+        http_client = self.async_http_client(provider)
+        return self._sdk_client(provider, f'async:{max_retries}', http_client, lambda: AsyncOpenAI(
+            http_client=http_client, max_retries=max_retries, **self.credentials(provider)
+        ))
+
+    @staticmethod
+    def credentials(provider: str) -> Dict[str, Any]:
+        """
+        ``api_key`` / ``base_url`` keyword arguments for an OpenAI-compatible client.
+
+        In mock mode every provider resolves to the mock server, and a
+        placeholder key stands in for a missing one.
+        """
+        base_url, key_var = PROVIDERS[provider]
+        mock_url = mock_llm_url()
+        if mock_url:
+            return {'api_key': os.getenv(key_var) or 'mock', 'base_url': mock_url}
+        kwargs = {'api_key': os.getenv(key_var)}
+        if base_url:
+            kwargs['base_url'] = base_url
+        return kwargs
+
+    def close(self) -> None:
+        """Close synchronous pools (async pools close with their loop)"""
+        with self._lock:
+            for client in self._http.values():
+                client.close()
+            self._http.clear()
+            self._sdk.clear()
+
+    def _sdk_client(self, provider: str, kind: str, http_client: Any, factory):
+        # Callers resolve http_client first: the lock is not re-entrant
+        key = (provider, kind, id(http_client))
+        with self._lock:
+            client = self._sdk.get(key)
+            if client is None:
+                client = factory()
+                self._sdk[key] = client
+            return client
+
+    def _client_kwargs(self, provider: str, asynchronous: bool) -> Dict[str, Any]:
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        kwargs: Dict[str, Any] = {
+            'limits': httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            'timeout': self.timeout,
+            'http2': self.http2,
+        }
+        if LLM_HTTP_REQUESTS is not None:
+            counter = LLM_HTTP_REQUESTS.labels(provider=provider)
+            kwargs['event_hooks'] = {'request': [_request_hook(counter, asynchronous)]}
+        return kwargs
+
+    def _export_pool_metrics(self, provider: str, mode: str, client: Any) -> None:
+        if LLM_HTTP_CONNECTIONS is None:
+            return
+        LLM_HTTP_POOL_LIMIT.labels(provider=provider).set(self.max_connections)
+        for state in ('active', 'idle'):
+            LLM_HTTP_CONNECTIONS.labels(provider=provider, mode=mode, state=state).set_function(
+                lambda state=state: pool_stats(client)[state]
+            )
+
+
+def _request_hook(counter, asynchronous: bool):
+    """httpx request hook counting requests (async clients need a coroutine)"""
+    if asynchronous:
+        async def hook(request):
+            counter.inc()
+    else:
+        def hook(request):
+            counter.inc()
+    return hook
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> LLMClientRegistry:
+    """Process-wide LLMClientRegistry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry()
+            logger.info(
+                f"LLM client registry: max_connections={_registry.max_connections}, "
+                f"keepalive={_registry.max_keepalive}, http2={_registry.http2}"
+            )
+            if mock_llm_url():
+                logger.warning(f"USE_MOCK_LLM is set: all LLM calls go to {mock_llm_url()}")
+        return _registry
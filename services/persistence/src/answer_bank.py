@@ -0,0 +1,93 @@
+"""
+Answer Bank Repository
+Reads reusable screening answers from application_questions and stores the
+question embedding index
+"""
+import logging
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from .database import get_db
+
+logger = logging.getLogger(__name__)
+
+# Answers that were accepted into a form (LLM drafts, templates, corrections)
+BANKABLE_SOURCES = ('llm', 'template', 'manual_correction')
+
+
+class AnswerBankRepository:
+    """Handles the screening-answer bank"""
+
+    def __init__(self):
+        self.db = get_db()
+
+    def load_answers(self, profile_version: str) -> List[Dict[str, Any]]:
+        """
+        Latest answer per (normalized question, effort level) for a profile.
+
+        QA/user corrections win over the originally filled value.
+        """
+        query = """
+            SELECT DISTINCT ON (field_label_normalized, effort_level_at_time)
+                field_label_normalized,
+                field_label_raw,
+                effort_level_at_time,
+                COALESCE(corrected_value, value_filled) AS answer
+            FROM application_questions
+            WHERE profile_version = %s
+              AND field_label_normalized IS NOT NULL
+              AND value_source IN %s
+              AND COALESCE(corrected_value, value_filled) IS NOT NULL
+            ORDER BY field_label_normalized, effort_level_at_time, updated_at DESC
+        """
+        return self.db.execute_query(query, (profile_version, BANKABLE_SOURCES))
+
+    def save_answer(
+        self,
+        application_id: UUID,
+        question: str,
+        normalized_question: str,
+        answer: str,
+        effort_level: str,
+        profile_version: str,
+        step_index: int = 0,
+        field_type: str = 'textarea',
+        value_source: str = 'llm'
+    ) -> UUID:
+        """Record an accepted answer so later applications can reuse it"""
+        query = """
+            INSERT INTO application_questions (
+                application_id, step_index, field_type, field_label_raw,
+                field_label_normalized, value_filled, value_source,
+                effort_level_at_time, profile_version
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
+        """
+        result = self.db.execute_query(
+            query,
+            (application_id, step_index, field_type, question, normalized_question,
+             answer, value_source, effort_level, profile_version)
+        )
+        return result[0]['id']
+
+    def load_embeddings(self, normalized_questions: Sequence[str]) -> Dict[str, List[float]]:
+        """Embeddings for the given normalized questions (missing ones omitted)"""
+        if not normalized_questions:
+            return {}
+        query = """
+            SELECT field_label_normalized, embedding
+            FROM question_embeddings
+            WHERE field_label_normalized = ANY(%s)
+        """
+        rows = self.db.execute_query(query, (list(normalized_questions),))
+        return {row['field_label_normalized']: list(row['embedding']) for row in rows}
+
+    def save_embedding(self, normalized_question: str, embedding: List[float], embedding_model: str):
+        """Store a question embedding (first writer wins)"""
+        query = """
+            INSERT INTO question_embeddings (field_label_normalized, embedding_model, embedding)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (field_label_normalized) DO NOTHING
+        """
+        self.db.execute_query(query, (normalized_question, embedding_model, list(embedding)), fetch=False)
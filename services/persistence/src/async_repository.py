@@ -0,0 +1,102 @@
+"""
+Async Repository Adapter
+Runs synchronous repository calls on a dedicated, bounded thread pool so that
+coroutine callers never block the event loop on a database round trip.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Kept below DatabaseConnection's maxconn (20) so executor threads never
+# queue on pool.getconn() while holding a worker slot.
+DEFAULT_DB_EXECUTOR_WORKERS = 8
+
+
+# Global executor instance
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get or create the process-wide executor used for database I/O"""
+    global _executor
+    if _executor is None:
+        try:
+            workers = int(os.getenv('DB_EXECUTOR_WORKERS', DEFAULT_DB_EXECUTOR_WORKERS))
+        except ValueError:
+            workers = DEFAULT_DB_EXECUTOR_WORKERS
+        _executor = ThreadPoolExecutor(
+            max_workers=max(workers, 1),
+            thread_name_prefix='db-io'
+        )
+        logger.info(f"Database executor initialized ({max(workers, 1)} workers)")
+    return _executor
+
+
+def shutdown_db_executor(wait: bool = True):
+    """Shut down the global database executor"""
+    global _executor
+    if _executor:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking database callable on the database executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_db_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+class AsyncRepository:
+    """
+    Awaitable facade over a synchronous repository.
+
+    Every callable attribute of the wrapped repository is exposed as a
+    coroutine function that executes on the bounded database executor:
+
+        app_repo = AsyncRepository(ApplicationRepository())
+        await app_repo.mark_started(application_id)
+
+    Non-callable attributes are passed through unchanged. The wrapped
+    repository stays reachable via ``.sync`` for code that is already
+    running off the event loop.
+    """
+
+    def __init__(self, repo: Any, executor: Optional[ThreadPoolExecutor] = None):
+        self._repo = repo
+        self._executor = executor
+
+    @classmethod
+    def wrap(cls, repo: Any) -> Optional['AsyncRepository']:
+        """Wrap a repository unless it is None or already wrapped"""
+        if repo is None or isinstance(repo, AsyncRepository):
+            return repo
+        return cls(repo)
+
+    @property
+    def sync(self) -> Any:
+        """The underlying synchronous repository"""
+        return self._repo
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repo, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor or get_db_executor(),
+                functools.partial(attr, *args, **kwargs)
+            )
+
+        return _call
@@ -0,0 +1,143 @@
+"""
+Stage Checkpoints
+Local artifact store for per-application stage outputs (match score, effort
+decision, cover letter, drafted answers), so a retried or recovered
+application resumes from its last completed stage.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of the inputs a checkpoint was computed from"""
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    One JSON document per application under ``CHECKPOINT_DIR``.
+
+    Document layout::
+
+        {"fingerprint": "...", "updated_at": 1700000000.0,
+         "stages": {"match": {...}, "effort": {...}, ...}}
+
+    A checkpoint is only returned when its fingerprint matches the caller's,
+    so edited job descriptions or profiles are recomputed. Writes go to a
+    temp file and are renamed into place, so a crash never leaves a
+    half-written document. Methods are synchronous; wrap the store in
+    AsyncRepository to keep file I/O off the event loop.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            base_dir: Directory for checkpoint files (default: CHECKPOINT_DIR
+                or ./checkpoints)
+        """
+        self.base_dir = base_dir or os.getenv('CHECKPOINT_DIR', os.path.join(os.getcwd(), 'checkpoints'))
+
+    def load(self, application_id: UUID, expected_fingerprint: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Load completed stages for an application.
+
+        Args:
+            application_id: Application ID
+            expected_fingerprint: Inputs fingerprint; mismatching checkpoints are ignored
+
+        Returns:
+            Stage name -> stage output (empty when nothing usable is stored)
+        """
+        document = self._read(application_id)
+        if not document:
+            return {}
+        if expected_fingerprint and document.get('fingerprint') != expected_fingerprint:
+            logger.info(f"Ignoring stale checkpoint for application {application_id}")
+            return {}
+        return document.get('stages', {})
+
+    def save_stage(
+        self,
+        application_id: UUID,
+        stage: str,
+        output: Dict[str, Any],
+        stage_fingerprint: Optional[str] = None
+    ) -> None:
+        """
+        Record a completed stage.
+
+        Args:
+            application_id: Application ID
+            stage: Stage name ('match', 'effort', 'cover_letter', 'screening_answers')
+            output: JSON-serializable stage output
+            stage_fingerprint: Inputs fingerprint; a change discards earlier stages
+        """
+        document = self._read(application_id) or {}
+        if stage_fingerprint and document.get('fingerprint') != stage_fingerprint:
+            document = {'fingerprint': stage_fingerprint, 'stages': {}}
+
+        document.setdefault('stages', {})[stage] = output
+        document['updated_at'] = time.time()
+        self._write(application_id, document)
+
+    def clear(self, application_id: UUID) -> None:
+        """Drop an application's checkpoints (after a terminal outcome)"""
+        try:
+            os.remove(self._path(application_id))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, max_age_hours: float) -> int:
+        """
+        Delete checkpoints not updated within ``max_age_hours``.
+
+        Returns:
+            Number of files removed
+        """
+        if not os.path.isdir(self.base_dir):
+            return 0
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for name in os.listdir(self.base_dir):
+            path = os.path.join(self.base_dir, name)
+            if name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def _path(self, application_id: UUID) -> str:
+        return os.path.join(self.base_dir, f"{application_id}.json")
+
+    def _read(self, application_id: UUID) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(application_id), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable checkpoint for application {application_id}: {e}")
+            return None
+
+    def _write(self, application_id: UUID, document: Dict[str, Any]) -> None:
+        os.makedirs(self.base_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(document, f, default=str)
+            os.replace(tmp_path, self._path(application_id))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
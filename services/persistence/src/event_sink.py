@@ -0,0 +1,290 @@
+"""
+Write-Behind Event Sink
+Buffers application_events, session_events and model_usage rows in memory
+and flushes them in bulk, so logging an event on the hot path costs a deque
+append instead of a database round trip.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from .async_repository import AsyncRepository, run_db
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_STREAM = 'application'
+SESSION_STREAM = 'session'
+USAGE_STREAM = 'usage'
+
+
+def _read_int(name: str, fallback: int) -> int:
+    try:
+        value = int(os.getenv(name, fallback))
+        return value if value > 0 else fallback
+    except (TypeError, ValueError):
+        return fallback
+
+
+class EventSink:
+    """
+    Bounded, write-behind buffer in front of EventRepository,
+    SessionRepository and ModelUsageRepository.
+
+    - append_event / add_session_event / log_model_usage enqueue and return
+      immediately
+    - a background task flushes every ``flush_interval_ms`` or as soon as
+      ``max_batch_size`` events are waiting, using one multi-row INSERT per
+      stream (execute_values)
+    - when ``capacity`` events are buffered, producers wait for the next
+      flush (backpressure) instead of growing memory without bound
+    - flush() drains synchronously (application completion), close()
+      drains and stops the flusher (shutdown)
+
+    Repositories without bulk methods fall back to per-row inserts.
+    """
+
+    def __init__(
+        self,
+        event_repo: Any = None,
+        session_repo: Any = None,
+        usage_repo: Any = None,
+        capacity: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        """
+        Initialize event sink.
+
+        Args:
+            event_repo: EventRepository for application_events
+            session_repo: SessionRepository for session_events
+            usage_repo: ModelUsageRepository for model_usage
+            capacity: Max buffered events before producers block
+            flush_interval_ms: Max time an event waits in the buffer
+            max_batch_size: Buffered events that trigger an early flush
+        """
+        self.event_repo = self._unwrap(event_repo)
+        self.session_repo = self._unwrap(session_repo)
+        self.usage_repo = self._unwrap(usage_repo)
+        self.capacity = capacity or _read_int('EVENT_SINK_CAPACITY', 5000)
+        self.flush_interval = (flush_interval_ms or _read_int('EVENT_SINK_FLUSH_MS', 250)) / 1000.0
+        self.max_batch_size = max_batch_size or _read_int('EVENT_SINK_BATCH_SIZE', 200)
+
+        self._buffer: Deque[Tuple[str, tuple]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.events_written = 0
+        self.events_failed = 0
+        self.flushes = 0
+
+    # ------------------------------------------------------------------
+    # Producer API (mirrors the repository signatures)
+    # ------------------------------------------------------------------
+    async def append_event(
+        self,
+        event_type: str,
+        application_id: Optional[UUID] = None,
+        session_id: Optional[UUID] = None,
+        event_detail: Optional[str] = None,
+        payload: Optional[Dict] = None
+    ) -> None:
+        """Buffer an application_events row"""
+        await self._enqueue(
+            APPLICATION_STREAM,
+            (application_id, session_id, event_type, event_detail, payload or {}, self._now())
+        )
+
+    async def add_session_event(
+        self,
+        session_id: UUID,
+        event_type: str,
+        message: Optional[str] = None,
+        payload: Optional[Dict] = None
+    ) -> None:
+        """Buffer a session_events row"""
+        await self._enqueue(
+            SESSION_STREAM,
+            (session_id, event_type, message, payload or {}, self._now())
+        )
+
+    async def log_model_usage(
+        self,
+        model_name: str,
+        call_type: str,
+        tokens_input: int,
+        tokens_output: int,
+        tokens_cached: int = 0,
+        cost_estimated: float = 0.0,
+        purpose: Optional[str] = None,
+        stage: Optional[str] = None,
+        application_id: Optional[UUID] = None,
+        session_id: Optional[UUID] = None,
+        started_at: Optional[datetime] = None,
+        ended_at: Optional[datetime] = None
+    ) -> None:
+        """Buffer a model_usage row"""
+        now = self._now()
+        await self._enqueue(
+            USAGE_STREAM,
+            (
+                application_id, session_id, model_name, call_type,
+                tokens_input, tokens_output, tokens_cached, cost_estimated,
+                purpose, stage, started_at or now, ended_at or now
+            )
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered, unflushed events"""
+        return len(self._buffer)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+    async def flush(self) -> int:
+        """Write every buffered event now; returns the number written"""
+        self._ensure_started()
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                written += await self._write_batch(self._take_batch())
+            self._drained.set()
+        return written
+
+    async def close(self):
+        """Flush remaining events and stop the background flusher"""
+        self._closed = True
+        if self._flusher:
+            self._wakeup.set()
+            await self._flusher
+            self._flusher = None
+        if self._buffer:
+            await self.flush()
+        logger.info(
+            f"EventSink closed ({self.events_written} written, {self.events_failed} failed, {self.flushes} flushes)"
+        )
+
+    async def _enqueue(self, stream: str, row: tuple):
+        self._ensure_started()
+
+        while len(self._buffer) >= self.capacity:
+            # Backpressure: wait for the flusher to make room
+            self._drained.clear()
+            self._wakeup.set()
+            await self._drained.wait()
+
+        self._buffer.append((stream, row))
+        if len(self._buffer) >= self.max_batch_size:
+            self._wakeup.set()
+
+    def _ensure_started(self):
+        if self._flush_lock is None:
+            self._wakeup = asyncio.Event()
+            self._drained = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+        if self._flusher is None and not self._closed:
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            if not self._buffer:
+                continue
+            async with self._flush_lock:
+                await self._write_batch(self._take_batch())
+                if len(self._buffer) < self.capacity:
+                    self._drained.set()
+                if len(self._buffer) >= self.max_batch_size:
+                    self._wakeup.set()
+
+    def _take_batch(self) -> List[Tuple[str, tuple]]:
+        batch = []
+        while self._buffer and len(batch) < self.max_batch_size:
+            batch.append(self._buffer.popleft())
+        return batch
+
+    async def _write_batch(self, batch: List[Tuple[str, tuple]]) -> int:
+        app_rows = [row for stream, row in batch if stream == APPLICATION_STREAM]
+        session_rows = [row for stream, row in batch if stream == SESSION_STREAM]
+        usage_rows = [row for stream, row in batch if stream == USAGE_STREAM]
+        written = 0
+
+        if app_rows:
+            written += await self._write_stream(self.event_repo, 'append_events', app_rows, self._append_rows)
+        if session_rows:
+            written += await self._write_stream(self.session_repo, 'add_session_events', session_rows, self._session_rows)
+        if usage_rows:
+            written += await self._write_stream(self.usage_repo, 'log_model_calls', usage_rows, self._usage_rows)
+
+        self.flushes += 1
+        return written
+
+    async def _write_stream(self, repo: Any, bulk_method: str, rows: List[tuple], fallback) -> int:
+        if repo is None:
+            logger.warning(f"EventSink dropping {len(rows)} events: no repository for {bulk_method}")
+            self.events_failed += len(rows)
+            return 0
+        try:
+            bulk = getattr(repo, bulk_method, None)
+            if bulk is not None:
+                await run_db(bulk, rows)
+            else:
+                await run_db(fallback, repo, rows)
+            self.events_written += len(rows)
+            return len(rows)
+        except Exception as e:
+            logger.error(f"EventSink failed to write {len(rows)} events: {e}")
+            self.events_failed += len(rows)
+            return 0
+
+    @staticmethod
+    def _append_rows(repo: Any, rows: List[tuple]):
+        for application_id, session_id, event_type, event_detail, payload, _ in rows:
+            repo.append_event(
+                event_type,
+                application_id=application_id,
+                session_id=session_id,
+                event_detail=event_detail,
+                payload=payload
+            )
+
+    @staticmethod
+    def _session_rows(repo: Any, rows: List[tuple]):
+        for session_id, event_type, message, payload, _ in rows:
+            repo.add_session_event(session_id, event_type, message, payload=payload)
+
+    @staticmethod
+    def _usage_rows(repo: Any, rows: List[tuple]):
+        for (application_id, session_id, model_name, call_type, tokens_input, tokens_output,
+             tokens_cached, cost_estimated, purpose, stage, _, _) in rows:
+            repo.log_model_call(
+                model_name, call_type, tokens_input, tokens_output, cost_estimated, purpose,
+                application_id=application_id,
+                session_id=session_id,
+                tokens_cached=tokens_cached,
+                stage=stage
+            )
+
+    @staticmethod
+    def _unwrap(repo: Any) -> Any:
+        # Bulk writes already run on the DB executor; use the sync repository
+        return repo.sync if isinstance(repo, AsyncRepository) else repo
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
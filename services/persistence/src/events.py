@@ -47,6 +47,30 @@ class EventRepository:
         logger.info(f"Logged event: {event_type} (app: {application_id}, session: {session_id})")
         return event_id
 
+    def append_events(self, rows: List[tuple]):
+        """
+        Bulk insert application_events in a single statement.
+
+        Args:
+            rows: Tuples of (application_id, session_id, event_type,
+                  event_detail, payload, created_at)
+        """
+        import json
+
+        query = """
+            INSERT INTO application_events (
+                application_id, session_id, event_type, event_detail, payload, created_at
+            )
+            VALUES %s
+        """
+
+        values = [
+            (application_id, session_id, event_type, event_detail, json.dumps(payload or {}), created_at)
+            for application_id, session_id, event_type, event_detail, payload, created_at in rows
+        ]
+        self.db.execute_values(query, values, page_size=len(values) or 100)
+        logger.info(f"Logged {len(values)} events (bulk)")
+
     def get_events(
         self,
         application_id: Optional[UUID] = None,
@@ -0,0 +1,63 @@
+"""
+Form Schema Repository
+Stores the normalized application-form layouts learned per domain and form
+fingerprint
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from .database import get_db
+
+logger = logging.getLogger(__name__)
+
+
+class FormSchemaRepository:
+    """Handles the form schema cache"""
+
+    def __init__(self):
+        self.db = get_db()
+
+    def load_schemas(self, domain: str) -> List[Dict[str, Any]]:
+        """All learned form schemas of a domain"""
+        query = """
+            SELECT domain, fingerprint, ats, schema, baseline_agent_steps, visits, hits
+            FROM form_schemas
+            WHERE domain = %s
+        """
+        return self.db.execute_query(query, (domain,))
+
+    def save_schema(
+        self,
+        domain: str,
+        fingerprint: str,
+        schema: Dict[str, Any],
+        ats: Optional[str] = None,
+        agent_steps: Optional[int] = None,
+        hit: bool = False
+    ) -> None:
+        """
+        Insert or refresh a form schema after a visit.
+
+        The first visit's agent steps stay the baseline; later visits update
+        the schema, the visit and hit counts and the last step count.
+        """
+        query = """
+            INSERT INTO form_schemas (
+                domain, fingerprint, ats, schema, baseline_agent_steps, last_agent_steps, hits
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (domain, fingerprint) DO UPDATE SET
+                schema = EXCLUDED.schema,
+                ats = COALESCE(EXCLUDED.ats, form_schemas.ats),
+                baseline_agent_steps = COALESCE(form_schemas.baseline_agent_steps, EXCLUDED.baseline_agent_steps),
+                last_agent_steps = EXCLUDED.last_agent_steps,
+                visits = form_schemas.visits + 1,
+                hits = form_schemas.hits + EXCLUDED.hits,
+                updated_at = now()
+        """
+        self.db.execute_query(
+            query,
+            (domain, fingerprint, ats, json.dumps(schema), agent_steps, agent_steps, int(hit)),
+            fetch=False
+        )
@@ -3,7 +3,7 @@ Model Usage Tracking
 Tracks LLM usage, tokens, and costs for observability
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -30,16 +30,18 @@ class ModelUsageRepository:
         session_id: Optional[UUID] = None,
         provider_id: Optional[UUID] = None,
         status: str = 'success',
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        tokens_cached: int = 0,
+        stage: Optional[str] = None
     ) -> UUID:
         """Log a model API call"""
         query = """
             INSERT INTO model_usage (
                 application_id, session_id, provider_id, model_name, call_type,
                 tokens_input, tokens_output, cost_estimated, purpose, status,
-                error_message, started_at, ended_at
+                error_message, tokens_cached, stage, started_at, ended_at
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())
             RETURNING id
         """
 
@@ -48,12 +50,32 @@ class ModelUsageRepository:
             (
                 application_id, session_id, provider_id, model_name, call_type,
                 tokens_input, tokens_output, cost_estimated, purpose, status,
-                error_message, datetime.now()
+                error_message, tokens_cached, stage, datetime.now()
             )
         )
 
         return result[0]['id']
 
+    def log_model_calls(self, rows: List[tuple]):
+        """
+        Bulk insert model_usage rows in a single statement.
+
+        Args:
+            rows: Tuples of (application_id, session_id, model_name, call_type,
+                tokens_input, tokens_output, tokens_cached, cost_estimated,
+                purpose, stage, started_at, ended_at)
+        """
+        query = """
+            INSERT INTO model_usage (
+                application_id, session_id, model_name, call_type,
+                tokens_input, tokens_output, tokens_cached, cost_estimated,
+                purpose, stage, started_at, ended_at
+            )
+            VALUES %s
+        """
+
+        self.db.execute_values(query, list(rows), page_size=len(rows) or 100)
+
     def get_session_usage(self, session_id: UUID) -> Dict[str, Any]:
         """Get aggregated usage stats for a session"""
         query = """
@@ -61,6 +83,7 @@ class ModelUsageRepository:
                 COUNT(*) as total_calls,
                 SUM(tokens_input) as total_input_tokens,
                 SUM(tokens_output) as total_output_tokens,
+                SUM(tokens_cached) as total_cached_tokens,
                 SUM(cost_estimated) as total_cost,
                 model_name,
                 purpose
@@ -78,6 +101,7 @@ class ModelUsageRepository:
             SELECT
                 SUM(tokens_input) as total_input_tokens,
                 SUM(tokens_output) as total_output_tokens,
+                SUM(tokens_cached) as total_cached_tokens,
                 SUM(cost_estimated) as total_cost
             FROM model_usage
             WHERE application_id = %s
@@ -87,5 +111,6 @@ class ModelUsageRepository:
         return result[0] if result else {
             'total_input_tokens': 0,
             'total_output_tokens': 0,
+            'total_cached_tokens': 0,
             'total_cost': 0.0
         }
@@ -191,6 +191,26 @@ class SessionRepository:
 
         return result[0]['id']
 
+    def add_session_events(self, rows: List[tuple]):
+        """
+        Bulk insert session_events in a single statement.
+
+        Args:
+            rows: Tuples of (session_id, event_type, message, payload, created_at)
+        """
+        import json
+
+        query = """
+            INSERT INTO session_events (session_id, event_type, message, payload, created_at)
+            VALUES %s
+        """
+
+        values = [
+            (session_id, event_type, message, json.dumps(payload or {}), created_at)
+            for session_id, event_type, message, payload, created_at in rows
+        ]
+        self.db.execute_values(query, values, page_size=len(values) or 100)
+
     def get_session_events(self, session_id: UUID) -> List[Dict[str, Any]]:
         """Get all events for a session"""
         query = """
@@ -0,0 +1,106 @@
+"""
+Step Timelines
+Local artifact store for browser-agent step timelines, one JSON document per
+application attempt, read back by scripts/slow_step_report.py
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineStore:
+    """
+    Step timelines under ``TIMELINE_DIR``, named ``<application_id>-<attempt>.json``.
+
+    Document layout (see observability.step_timeline.StepTimeline.to_dict)::
+
+        {"application_id": "...", "attempt": 0, "status": "filled",
+         "url": "...", "ats": "greenhouse", "domain": "boards.greenhouse.io",
+         "started_at": 1700000000.0,
+         "steps": [{"n": 1, "at": 0.0, "s": 4.2, "type": "navigation", ...}]}
+
+    Writes go to a temp file and are renamed into place. Methods are
+    synchronous; wrap the store in AsyncRepository to keep file I/O off the
+    event loop.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Initialize timeline store.
+
+        Args:
+            base_dir: Directory for timeline files (default: TIMELINE_DIR
+                or ./timelines)
+        """
+        self.base_dir = base_dir or os.getenv('TIMELINE_DIR', os.path.join(os.getcwd(), 'timelines'))
+
+    def save(self, application_id: UUID, attempt: int, timeline: Dict[str, Any], status: Optional[str] = None) -> str:
+        """
+        Store the timeline of one attempt.
+
+        Args:
+            application_id: Application ID
+            attempt: 0-based attempt number
+            timeline: StepTimeline.to_dict() output
+            status: Outcome of the attempt
+
+        Returns:
+            Path of the stored document
+        """
+        document = {'application_id': str(application_id), 'attempt': attempt, 'status': status, **timeline}
+        path = os.path.join(self.base_dir, f"{application_id}-{attempt}.json")
+        os.makedirs(self.base_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(document, f, default=str, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def iter_timelines(self, max_age_hours: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stored timelines, optionally only those written in the last ``max_age_hours``.
+
+        Unreadable files are skipped.
+        """
+        if not os.path.isdir(self.base_dir):
+            return
+        cutoff = time.time() - max_age_hours * 3600 if max_age_hours else None
+        for name in sorted(os.listdir(self.base_dir)):
+            path = os.path.join(self.base_dir, name)
+            if not name.endswith('.json') or (cutoff and os.path.getmtime(path) < cutoff):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    yield json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable timeline {name}: {e}")
+
+    def prune(self, max_age_hours: float) -> int:
+        """
+        Delete timelines older than ``max_age_hours``.
+
+        Returns:
+            Number of files removed
+        """
+        if not os.path.isdir(self.base_dir):
+            return 0
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for name in os.listdir(self.base_dir):
+            path = os.path.join(self.base_dir, name)
+            if name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
@@ -1,6 +1,7 @@
 """
 User & Profile Persistence Operations
-CRUD operations for users, user_profiles, resumes, resume_versions
+CRUD operations for users, user_profiles, resumes, resume_versions,
+cover_letter_templates
 """
 
 from typing import Optional, Dict, Any, List
@@ -179,3 +180,14 @@ class UserRepository:
             ORDER BY version_number DESC
         """
         return self.db.execute_query(query, (resume_id,))
+
+    def get_cover_letter_template(self, profile_id: UUID, effort_level: str = 'low') -> Optional[Dict[str, Any]]:
+        """Most recent cover letter template for a profile and effort level"""
+        query = """
+            SELECT * FROM cover_letter_templates
+            WHERE user_profile_id = %s AND intended_effort_level = %s
+            ORDER BY updated_at DESC
+            LIMIT 1
+        """
+        result = self.db.execute_query(query, (profile_id, effort_level))
+        return result[0] if result else None
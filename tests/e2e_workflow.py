@@ -77,9 +77,9 @@ async def run_e2e_test(mock_db=True, headless=True):
         def compute_match_score(self, text): return 0.88
 
     class MockAnswerGenerator:
-        def generate_cover_letter(self, **kwargs):
+        async def generate_cover_letter_async(self, **kwargs):
             return "Dear Hiring Manager,\n\nI am excited to submit my application..."
-        def answer_screening_question(self, **kwargs):
+        async def answer_screening_question_async(self, **kwargs):
             return "I have extensive experience with Python and AI agents."
 
     matcher = MockMatcher()
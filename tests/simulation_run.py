@@ -47,9 +47,9 @@ class MockMatcher:
     def compute_match_score(self, text): return 0.95
 
 class MockAnswerGenerator:
-    def generate_cover_letter(self, **kwargs):
+    async def generate_cover_letter_async(self, **kwargs):
         return "I am a highly qualified automation engineer with extensive experience in Python and AI agents."
-    def answer_screening_question(self, **kwargs):
+    async def answer_screening_question_async(self, **kwargs):
         return "I have solved complex automation problems using Playwright and LLMs."
 
 # Server setup
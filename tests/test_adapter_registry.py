@@ -0,0 +1,110 @@
+"""
+Test suite for the ATS adapter registry
+Host-suffix trie dispatch, path-pattern fallback and per-adapter stats
+"""
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.agents.adapters import (
+    AdapterRegistry, ATSAdapter, GreenhouseAdapter, HostTrie, KNOWN_BOARDS, WorkdayAdapter
+)
+
+
+class LeverAdapter(ATSAdapter):
+    name = 'lever'
+    host_suffixes = ('lever.co',)
+
+    def get_instructions(self, effort_level):
+        return ''
+
+    def get_stealth_config(self):
+        return {}
+
+
+class TestHostTrie(unittest.TestCase):
+    """Test longest-suffix lookup"""
+
+    def test_longest_suffix_wins(self):
+        trie = HostTrie()
+        trie.insert('lever.co', 'global')
+        trie.insert('eu.lever.co', 'eu')
+
+        self.assertEqual(trie.longest_match('jobs.eu.lever.co'), ('eu.lever.co', 'eu'))
+        self.assertEqual(trie.longest_match('jobs.lever.co'), ('lever.co', 'global'))
+        self.assertEqual(trie.longest_match('LEVER.CO'), ('lever.co', 'global'))
+
+    def test_labels_not_substrings(self):
+        """notlever.co shares the string suffix but not the labels"""
+        trie = HostTrie()
+        trie.insert('lever.co', 'global')
+
+        self.assertIsNone(trie.longest_match('notlever.co'))
+        self.assertIsNone(trie.longest_match('co'))
+        self.assertIsNone(trie.longest_match(''))
+
+
+class TestAdapterRegistry(unittest.TestCase):
+    """Test URL dispatch and stats"""
+
+    def setUp(self):
+        self.registry = AdapterRegistry([GreenhouseAdapter(), WorkdayAdapter(), LeverAdapter()])
+
+    def test_resolve_by_host(self):
+        self.assertIsInstance(self.registry.resolve('https://boards.greenhouse.io/acme/jobs/1'), GreenhouseAdapter)
+        self.assertIsInstance(self.registry.resolve('https://acme.wd5.myworkdayjobs.com/job/1'), WorkdayAdapter)
+        self.assertEqual(self.registry.ats_name('https://jobs.eu.lever.co/acme/1'), 'lever')
+
+    def test_path_pattern_fallback(self):
+        """Boards embedded on company domains match by path or query"""
+        self.assertEqual(self.registry.ats_name('https://careers.acme.com/apply?gh_jid=42'), 'greenhouse')
+        self.assertEqual(self.registry.ats_name('https://careers.acme.com/wday/cxs/acme/jobs'), 'workday')
+
+    def test_unknown_board(self):
+        self.assertIsNone(self.registry.resolve('https://careers.acme.com/jobs/1'))
+        self.assertEqual(self.registry.ats_name('https://careers.acme.com/jobs/1'), 'other')
+        self.assertEqual(self.registry.ats_name(None), 'other')
+
+    def test_rate_limit_domain(self):
+        """Boards on an ATS share its domain; others use their host"""
+        self.assertEqual(self.registry.rate_limit_domain('https://boards.greenhouse.io/acme/jobs/1'), 'greenhouse.io')
+        self.assertEqual(self.registry.rate_limit_domain('https://job-boards.greenhouse.io/beta/jobs/2'), 'greenhouse.io')
+        self.assertEqual(self.registry.rate_limit_domain('https://www.acme.com/careers'), 'acme.com')
+
+    def test_boards_without_adapter(self):
+        """Known boards get a label and a shared domain but no adapter"""
+        registry = AdapterRegistry([GreenhouseAdapter()], boards=KNOWN_BOARDS)
+
+        self.assertIsNone(registry.resolve('https://jobs.ashbyhq.com/acme/1'))
+        self.assertEqual(registry.ats_name('https://jobs.ashbyhq.com/acme/1'), 'ashby')
+        self.assertEqual(registry.lookup('https://de.indeed.com/viewjob?jk=1'), ('indeed', None))
+        self.assertEqual(registry.rate_limit_domain('https://de.indeed.com/viewjob?jk=1'), 'indeed.com')
+        self.assertEqual(registry.ats_name('https://careers.acme.com/apply?gh_jid=42'), 'greenhouse')
+
+    def test_can_handle_matches_registry(self):
+        adapter = GreenhouseAdapter()
+
+        self.assertTrue(adapter.can_handle('https://boards.greenhouse.io/acme/jobs/1'))
+        self.assertTrue(adapter.can_handle('https://careers.acme.com/apply?gh_jid=42'))
+        self.assertFalse(adapter.can_handle('https://acme.myworkdayjobs.com/job/1'))
+
+    def test_stats_table(self):
+        """Rows per adapter, busiest first"""
+        self.registry.record('https://boards.greenhouse.io/acme/jobs/1', True, 40.0)
+        self.registry.record('https://boards.greenhouse.io/acme/jobs/2', False, 20.0)
+        self.registry.record('https://acme.myworkdayjobs.com/job/1', True, 90.0)
+
+        rows = self.registry.stats_table()
+
+        self.assertEqual([row['ats'] for row in rows], ['greenhouse', 'workday'])
+        self.assertEqual(rows[0]['applications'], 2)
+        self.assertEqual(rows[0]['failed'], 1)
+        self.assertEqual(rows[0]['success_rate'], 0.5)
+        self.assertEqual(rows[0]['avg_seconds'], 30.0)
+        self.assertIn('greenhouse', self.registry.format_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Test suite for the screening-answer bank
+Normalization, exact reuse, scoping and write-back
+"""
+import unittest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx', 'psycopg2', 'psycopg2.extras', 'psycopg2.pool', 'dbutils', 'dbutils.pooled_db']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.generation.answer_bank import AnswerBank, normalize_question, profile_version
+
+
+class TestNormalization(unittest.TestCase):
+    """Test question normalization and profile versions"""
+
+    def test_normalize_question(self):
+        """Case, punctuation and required markers do not matter"""
+        self.assertEqual(
+            normalize_question("Do you require visa sponsorship? *"),
+            normalize_question("do you require  visa sponsorship (Required)")
+        )
+        self.assertEqual(normalize_question("Notice period?"), "notice period")
+
+    def test_profile_version_is_stable(self):
+        """Same profile gives the same version regardless of key order"""
+        self.assertEqual(profile_version({'a': 1, 'b': 2}), profile_version({'b': 2, 'a': 1}))
+        self.assertNotEqual(profile_version({'a': 1}), profile_version({'a': 2}))
+
+
+class TestAnswerBank(unittest.TestCase):
+    """Test lookup and write-back"""
+
+    def setUp(self):
+        self.repo = MagicMock()
+        self.repo.load_answers.return_value = [{
+            'field_label_normalized': 'do you require visa sponsorship',
+            'field_label_raw': 'Do you require visa sponsorship?',
+            'effort_level_at_time': 'medium',
+            'answer': 'No',
+        }]
+        self.bank = AnswerBank(repository=self.repo)
+
+    def test_exact_hit_from_history(self):
+        """A previously accepted answer is served for the same question"""
+        hit = asyncio.run(self.bank.lookup("Do you require visa sponsorship? *", 'MEDIUM', 'v1'))
+
+        self.assertEqual(hit.answer, 'No')
+        self.assertEqual(hit.match_type, 'exact')
+        self.repo.load_answers.assert_called_once_with('v1')
+
+    def test_scoped_by_effort_and_profile(self):
+        """Answers are not shared across effort levels"""
+        self.assertIsNone(asyncio.run(self.bank.lookup("Do you require visa sponsorship?", 'high', 'v1')))
+        self.assertEqual(self.bank.misses, 1)
+
+    def test_remember_writes_back(self):
+        """Remembered answers are served and persisted"""
+        async def scenario():
+            await self.bank.remember('app-1', "Notice period?", "Two weeks", 'medium', 'v1', step_index=2)
+            return await self.bank.lookup("notice period", 'medium', 'v1')
+
+        hit = asyncio.run(scenario())
+
+        self.assertEqual(hit.answer, "Two weeks")
+        self.repo.save_answer.assert_called_once_with(
+            'app-1', "Notice period?", "notice period", "Two weeks", 'medium', 'v1', step_index=2
+        )
+
+    def test_new_answer_embedding_is_saved(self):
+        """The vector a missed lookup cached is still persisted once the answer is banked"""
+        self.repo.load_embeddings.return_value = {'do you require visa sponsorship': [1.0, 0.0]}
+        embedder = AsyncMock(return_value=[0.0, 1.0])
+        bank = AnswerBank(repository=self.repo, embedder=embedder)
+
+        async def scenario():
+            await bank.lookup("Notice period?", 'medium', 'v1')
+            await bank.remember('app-1', "Notice period?", "Two weeks", 'medium', 'v1')
+            await bank.remember('app-2', "Notice period?", "Two weeks", 'medium', 'v1')
+
+        asyncio.run(scenario())
+
+        embedder.assert_awaited_once_with('notice period')
+        self.repo.save_embedding.assert_called_once()
+        self.assertEqual(self.repo.save_embedding.call_args.args[0], 'notice period')
+
+    def test_lookup_failure_falls_back(self):
+        """A failing repository is a miss, not an error"""
+        self.repo.load_answers.side_effect = RuntimeError("db down")
+
+        self.assertIsNone(asyncio.run(self.bank.lookup("Notice period?", 'medium', 'v1')))
+
+
+if __name__ == '__main__':
+    unittest.main()
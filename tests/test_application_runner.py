@@ -0,0 +1,206 @@
+"""
+Test suite for ApplicationRunner stage handling
+Checkpoint resume, budget cancellation and stage timings
+"""
+import unittest
+import asyncio
+import tempfile
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in [
+    'numpy', 'openai', 'httpx', 'ray', 'qdrant_client', 'langchain_openai',
+    'browser_use', 'browser_use.llm', 'browser_use.llm.openai', 'browser_use.llm.openai.chat',
+    'psycopg2', 'psycopg2.extras', 'psycopg2.pool', 'psycopg2.extensions',
+    'dbutils', 'dbutils.pooled_db',
+]:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.application_runner import ApplicationRunner
+from agent.src.concurrency import RetryPolicy
+from agent.src.planning import EffortPlanner, ApplicationBudget
+from persistence.src.checkpoints import CheckpointStore
+from persistence.src.timelines import TimelineStore
+
+
+class TestApplicationRunner(unittest.TestCase):
+    """Test preparation resume and budget enforcement"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.matcher = MagicMock()
+        self.matcher.compute_match_score.return_value = 0.7
+        self.answer_gen = MagicMock()
+        self.answer_gen.generate_cover_letter_async = AsyncMock(return_value="Dear hiring team")
+        self.form_filler = MagicMock()
+        self.form_filler.fill_application = AsyncMock(return_value={
+            'status': 'filled', 'summary': 'ok', 'stage_timings': {'navigation': 1.0, 'form_fill': 2.0}
+        })
+        self.app_repo = MagicMock()
+        self.runner = ApplicationRunner(
+            profile_matcher=self.matcher,
+            effort_planner=EffortPlanner(),
+            answer_generator=self.answer_gen,
+            form_filler=self.form_filler,
+            application_repo=self.app_repo,
+            event_repo=MagicMock(),
+            event_sink=MagicMock(
+                append_event=AsyncMock(), add_session_event=AsyncMock(), log_model_usage=AsyncMock(), flush=AsyncMock()
+            ),
+            checkpoint_store=CheckpointStore(base_dir=self.tmp.name),
+            timeline_store=TimelineStore(base_dir=os.path.join(self.tmp.name, 'timelines')),
+        )
+        self.job = {
+            'application_id': 'app-1',
+            'job_url': 'https://boards.greenhouse.io/acme/jobs/1',
+            'job_title': 'Engineer',
+            'company_name': 'Acme',
+            'job_description': 'Build things',
+            'user_profile': {'name': 'Test'},
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_prepare_resumes_from_checkpoint(self):
+        """A second preparation reuses match, effort and cover letter"""
+        first = asyncio.run(self.runner.prepare_application(**self.job))
+        second = asyncio.run(self.runner.prepare_application(**self.job))
+
+        self.assertEqual(self.matcher.compute_match_score.call_count, 1)
+        self.assertEqual(self.answer_gen.generate_cover_letter_async.await_count, 1)
+        self.assertEqual(second.cover_letter, first.cover_letter)
+        self.assertEqual(second.resumed_stages, ['match', 'effort', 'cover_letter'])
+
+    def test_success_clears_checkpoint_and_reports_timings(self):
+        """A submitted application drops its checkpoint and returns stage timings"""
+        result = asyncio.run(self.runner.run_application(**self.job))
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['stage_timings']['navigation'], 1.0)
+        self.assertIn('match', result['stage_timings'])
+        self.assertEqual(self.runner.checkpoints.sync.load('app-1'), {})
+
+    def test_step_timeline_is_stored(self):
+        """The browser agent's step timeline is kept per attempt"""
+        self.form_filler.fill_application.return_value = {
+            'status': 'filled', 'summary': 'ok', 'step_timeline': {
+                'url': self.job['job_url'], 'ats': 'greenhouse', 'domain': 'boards.greenhouse.io',
+                'started_at': 1700000000.0, 'steps': [{'n': 1, 'at': 0.0, 's': 3.5, 'type': 'navigation'}]
+            }
+        }
+
+        asyncio.run(self.runner.run_application(**self.job))
+
+        timelines = list(self.runner.timelines.sync.iter_timelines())
+        self.assertEqual(len(timelines), 1)
+        self.assertEqual(timelines[0]['application_id'], 'app-1')
+        self.assertEqual(timelines[0]['status'], 'filled')
+        self.assertEqual(timelines[0]['steps'][0]['type'], 'navigation')
+
+    def test_token_usage_is_recorded_per_stage(self):
+        """Generation and browser-agent tokens reach model_usage and the session totals"""
+        from agent.src.planning import record_usage
+
+        async def cover_letter(**kwargs):
+            record_usage({'prompt_tokens': 300, 'completion_tokens': 120}, 'grok-beta', purpose='cover_letter')
+            return "Dear hiring team"
+
+        self.answer_gen.generate_cover_letter_async = AsyncMock(side_effect=cover_letter)
+        self.form_filler.fill_application.return_value = {
+            'status': 'filled', 'summary': 'ok',
+            'token_usage': {'prompt_tokens': 5000, 'completion_tokens': 400, 'cached_tokens': 3000, 'model': 'grok-4'}
+        }
+        self.runner.session_repo = AsyncMock()
+
+        asyncio.run(self.runner.run_application(**self.job, session_id='session-1'))
+
+        calls = self.runner.event_sink.log_model_usage.await_args_list
+        self.assertEqual([c.kwargs['stage'] for c in calls], ['generation', 'browser'])
+        self.assertEqual(calls[1].kwargs['tokens_cached'], 3000)
+        self.runner.session_repo.add_token_usage.assert_awaited_once_with('session-1', 5300, 520)
+
+    def test_generated_answers_are_reused(self):
+        """Answers from a submitted application are served from the bank next time"""
+        self.answer_gen.answer_screening_question_async = AsyncMock(return_value="Two weeks")
+        job = {**self.job, 'known_questions': ["Notice period?"]}
+
+        asyncio.run(self.runner.run_application(**job))
+        plan = asyncio.run(self.runner.prepare_application(**{**job, 'application_id': 'app-2'}))
+
+        self.assertEqual(self.answer_gen.answer_screening_question_async.await_count, 1)
+        self.assertEqual(plan.screening_answers["Notice period?"], "Two weeks")
+        self.assertEqual(plan.answer_sources["Notice period?"], 'bank')
+
+    def test_failed_browser_run_is_retried_within_budget(self):
+        """A failed attempt with a real browser-use run's usage leaves budget for a retry"""
+        self.runner.retry_policy = RetryPolicy(max_attempts=2, base_delay=0)
+        usage = {'prompt_tokens': 25000, 'completion_tokens': 1500, 'model': 'grok-4-1-fast-reasoning'}
+        self.form_filler.fill_application.side_effect = [
+            {'status': 'error', 'summary': 'Element not found', 'token_usage': usage},
+            {'status': 'filled', 'summary': 'ok', 'token_usage': usage},
+        ]
+
+        result = asyncio.run(self.runner.run_application(**self.job))
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(self.form_filler.fill_application.await_count, 2)
+        self.app_repo.mark_failed.assert_not_called()
+
+    def test_stopped_agent_is_not_retried(self):
+        """A run the progress guard ended is final and recorded as agent_stopped"""
+        self.form_filler.fill_application.return_value = {
+            'status': 'partial', 'stop_reason': 'repeated_action', 'summary': 'Browser agent stopped after 3 steps'
+        }
+
+        result = asyncio.run(self.runner.run_application(**self.job))
+
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(self.form_filler.fill_application.await_count, 1)
+        self.assertEqual(self.app_repo.mark_failed.call_args.kwargs['failure_reason_code'], 'agent_stopped')
+
+    def test_browser_timeout_records_budget_exceeded(self):
+        """A stuck browser run is cancelled and recorded without retries"""
+        async def stuck(**kwargs):
+            await asyncio.sleep(10)
+
+        self.form_filler.fill_application = stuck
+        self.runner.planner.get_budget = lambda level: ApplicationBudget(level, stage_seconds={'browser': 0.05})
+
+        result = asyncio.run(self.runner.run_application(**self.job))
+
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(result['failure_code'], 'budget_exceeded')
+        self.assertEqual(
+            self.app_repo.mark_failed.call_args.kwargs['failure_reason_code'], 'budget_exceeded'
+        )
+
+    def test_browser_timeout_keeps_partial_timeline(self):
+        """The steps a cancelled browser run took are stored"""
+        async def stuck(on_timeline=None, **kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                on_timeline({
+                    'url': self.job['job_url'], 'ats': 'greenhouse', 'domain': 'boards.greenhouse.io',
+                    'started_at': 1700000000.0, 'steps': [{'n': 1, 'at': 0.0, 's': 3.5, 'type': 'upload'}]
+                })
+                raise
+
+        self.form_filler.fill_application = stuck
+        self.runner.planner.get_budget = lambda level: ApplicationBudget(level, stage_seconds={'browser': 0.05})
+
+        asyncio.run(self.runner.run_application(**self.job))
+
+        timelines = list(self.runner.timelines.sync.iter_timelines())
+        self.assertEqual(len(timelines), 1)
+        self.assertEqual(timelines[0]['status'], 'budget_exceeded')
+        self.assertEqual(timelines[0]['steps'][0]['type'], 'upload')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Tests for non-blocking persistence helpers
+"""
+import unittest
+import asyncio
+import tempfile
+import threading
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add services to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from persistence.src.async_repository import AsyncRepository, run_db
+from persistence.src.event_sink import EventSink
+from persistence.src.checkpoints import CheckpointStore, fingerprint
+
+
+class TestAsyncRepository(unittest.TestCase):
+    """Test the executor-backed repository facade"""
+
+    def test_calls_run_off_event_loop_thread(self):
+        """Repository methods execute on a DB executor thread"""
+        seen_threads = []
+
+        class Repo:
+            def mark_started(self, application_id):
+                seen_threads.append(threading.current_thread().name)
+                return application_id
+
+        async def scenario():
+            repo = AsyncRepository(Repo())
+            return await repo.mark_started('app-1')
+
+        result = asyncio.run(scenario())
+
+        self.assertEqual(result, 'app-1')
+        self.assertTrue(seen_threads[0].startswith('db-io'))
+
+    def test_wrap_is_idempotent(self):
+        """Wrapping twice or wrapping None is a no-op"""
+        wrapped = AsyncRepository.wrap(MagicMock())
+        self.assertIs(AsyncRepository.wrap(wrapped), wrapped)
+        self.assertIsNone(AsyncRepository.wrap(None))
+
+    def test_run_db_passes_kwargs(self):
+        """run_db forwards positional and keyword arguments"""
+        result = asyncio.run(run_db(lambda a, b=0: a + b, 2, b=3))
+        self.assertEqual(result, 5)
+
+
+class TestEventSink(unittest.TestCase):
+    """Test the write-behind event buffer"""
+
+    def test_events_are_flushed_in_bulk(self):
+        """Buffered events reach the repository in one bulk call"""
+        event_repo = MagicMock()
+        session_repo = MagicMock()
+
+        async def scenario():
+            sink = EventSink(event_repo=event_repo, session_repo=session_repo, flush_interval_ms=10_000)
+            for i in range(5):
+                await sink.append_event('step', application_id=f'app-{i}', payload={'i': i})
+            await sink.add_session_event('session-1', 'application_failed', 'boom')
+            self.assertEqual(sink.pending, 6)
+            written = await sink.flush()
+            await sink.close()
+            return written
+
+        written = asyncio.run(scenario())
+
+        self.assertEqual(written, 6)
+        event_repo.append_events.assert_called_once()
+        self.assertEqual(len(event_repo.append_events.call_args[0][0]), 5)
+        session_repo.add_session_events.assert_called_once()
+        event_repo.append_event.assert_not_called()
+
+    def test_model_usage_is_written_in_bulk(self):
+        """Usage rows go to ModelUsageRepository.log_model_calls in one call"""
+        usage_repo = MagicMock()
+
+        async def scenario():
+            sink = EventSink(usage_repo=usage_repo, flush_interval_ms=10_000)
+            for stage in ('match', 'generation', 'browser'):
+                await sink.log_model_usage('grok-beta', 'chat_completion', 100, 20, tokens_cached=50, stage=stage)
+            written = await sink.flush()
+            await sink.close()
+            return written
+
+        self.assertEqual(asyncio.run(scenario()), 3)
+        usage_repo.log_model_calls.assert_called_once()
+        rows = usage_repo.log_model_calls.call_args[0][0]
+        self.assertEqual([row[9] for row in rows], ['match', 'generation', 'browser'])
+        self.assertEqual(rows[0][4:7], (100, 20, 50))
+
+    def test_backpressure_when_full(self):
+        """Producers wait for a flush instead of exceeding capacity"""
+        written_batches = []
+
+        class Repo:
+            def append_events(self, rows):
+                written_batches.append(len(rows))
+
+        async def scenario():
+            sink = EventSink(event_repo=Repo(), capacity=3, max_batch_size=3, flush_interval_ms=10_000)
+            for i in range(10):
+                await sink.append_event('step', payload={'i': i})
+                self.assertLessEqual(sink.pending, 3)
+            await sink.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(sum(written_batches), 10)
+
+    def test_falls_back_to_per_row_inserts(self):
+        """Repositories without bulk methods still receive every event"""
+        class Repo:
+            def __init__(self):
+                self.calls = []
+
+            def append_event(self, event_type, **kwargs):
+                self.calls.append(event_type)
+
+        repo = Repo()
+
+        async def scenario():
+            sink = EventSink(event_repo=repo)
+            await sink.append_event('a')
+            await sink.append_event('b')
+            await sink.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(repo.calls, ['a', 'b'])
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """Test the stage checkpoint store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(base_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stages_accumulate_and_clear(self):
+        """Completed stages are returned until the checkpoint is cleared"""
+        key = fingerprint('https://jobs.example/1', 'JD', {'name': 'A'})
+        self.store.save_stage('app-1', 'match', {'match_score': 0.8}, key)
+        self.store.save_stage('app-1', 'cover_letter', {'cover_letter': 'Dear team'}, key)
+
+        stages = self.store.load('app-1', key)
+        self.assertEqual(stages['match']['match_score'], 0.8)
+        self.assertEqual(stages['cover_letter']['cover_letter'], 'Dear team')
+
+        self.store.clear('app-1')
+        self.assertEqual(self.store.load('app-1', key), {})
+
+    def test_changed_inputs_invalidate_checkpoint(self):
+        """A different fingerprint ignores, then replaces, the old stages"""
+        self.store.save_stage('app-1', 'match', {'match_score': 0.8}, fingerprint('old JD'))
+
+        self.assertEqual(self.store.load('app-1', fingerprint('new JD')), {})
+        self.store.save_stage('app-1', 'effort', {'effort_level': 'low'}, fingerprint('new JD'))
+        self.assertEqual(list(self.store.load('app-1', fingerprint('new JD'))), ['effort'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Test suite for stored ATS sign-in state
+Encrypted per-tenant storage, expiry and restoring into a browser context
+"""
+import unittest
+import asyncio
+import base64
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.browser import auth_state
+from agent.src.browser.auth_state import AuthStateStore, drop_expired, restore_state, scope_state
+
+
+class ReversingCipher:
+    """Stands in for Fernet: output differs from input and round-trips"""
+
+    def encrypt(self, data):
+        return base64.b64encode(data[::-1])
+
+    def decrypt(self, token):
+        return base64.b64decode(token)[::-1]
+
+
+STATE = {
+    'cookies': [
+        {'name': 'wd-session', 'value': 's3cret', 'domain': 'acme.wd5.myworkdayjobs.com', 'path': '/',
+         'expires': -1},
+        {'name': 'PLAY_SESSION', 'value': 'abc', 'domain': '.myworkdayjobs.com', 'path': '/',
+         'expires': time.time() + 3600},
+        {'name': '_ga', 'value': 'GA1.2', 'domain': '.google-analytics.com', 'path': '/', 'expires': -1},
+    ],
+    'origins': [
+        {'origin': 'https://acme.wd5.myworkdayjobs.com', 'localStorage': [{'name': 'token', 'value': 't'}]},
+        {'origin': 'https://other.example.com', 'localStorage': [{'name': 'x', 'value': 'y'}]},
+    ],
+}
+
+
+class TestAuthStateStore(unittest.TestCase):
+    """Test the encrypted store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = AuthStateStore(base_dir=self.tmp.name, cipher=ReversingCipher())
+        self.tenant = 'acme.wd5.myworkdayjobs.com'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_is_encrypted_on_disk(self):
+        self.store.save(self.tenant, 'jan@example.com', STATE)
+
+        self.assertEqual(self.store.load(self.tenant, 'JAN@example.com')['origins'], STATE['origins'])
+        self.assertIsNone(self.store.load(self.tenant, 'other@example.com'))
+        [name] = os.listdir(self.tmp.name)
+        with open(os.path.join(self.tmp.name, name), 'rb') as f:
+            raw = f.read()
+        self.assertNotIn(b's3cret', raw)
+        self.assertNotIn(b'jan@example.com', raw)
+        self.assertNotIn('jan', name)
+
+    def test_expired_state_is_not_returned(self):
+        self.store.save(self.tenant, 'jan@example.com', STATE)
+        self.store.ttl_hours = 0
+
+        self.assertIsNone(self.store.load(self.tenant, 'jan@example.com'))
+
+    def test_unreadable_state(self):
+        """A state written with another key is treated as missing"""
+        self.store.save(self.tenant, 'jan@example.com', STATE)
+        other = AuthStateStore(base_dir=self.tmp.name, cipher=MagicMock(decrypt=MagicMock(side_effect=ValueError)))
+
+        self.assertIsNone(other.load(self.tenant, 'jan@example.com'))
+
+    def test_invalidate(self):
+        self.store.save(self.tenant, 'jan@example.com', STATE)
+        self.store.invalidate(self.tenant, 'jan@example.com')
+        self.store.invalidate(self.tenant, 'jan@example.com')
+
+        self.assertIsNone(self.store.load(self.tenant, 'jan@example.com'))
+
+    @unittest.skipUnless(auth_state.CRYPTOGRAPHY_AVAILABLE, "cryptography not installed")
+    def test_fernet_key(self):
+        from cryptography.fernet import Fernet
+        store = AuthStateStore(key=Fernet.generate_key().decode(), base_dir=self.tmp.name)
+        store.save(self.tenant, 'jan@example.com', STATE)
+
+        self.assertIsNotNone(store.load(self.tenant, 'jan@example.com'))
+
+
+class TestStorageState(unittest.TestCase):
+    """Test scoping, expiry and restoring"""
+
+    def test_scope_state_keeps_tenant_only(self):
+        scoped = scope_state(STATE, 'acme.wd5.myworkdayjobs.com')
+
+        self.assertEqual([c['name'] for c in scoped['cookies']], ['wd-session', 'PLAY_SESSION'])
+        self.assertEqual([o['origin'] for o in scoped['origins']], ['https://acme.wd5.myworkdayjobs.com'])
+
+    def test_drop_expired(self):
+        state = {'cookies': [{'name': 'old', 'expires': 100.0}, {'name': 'session', 'expires': -1}]}
+
+        self.assertEqual([c['name'] for c in drop_expired(state)['cookies']], ['session'])
+        self.assertIsNone(drop_expired({'cookies': [{'name': 'old', 'expires': 100.0}]}))
+
+    def test_restore_state(self):
+        context = MagicMock(add_cookies=AsyncMock(), add_init_script=AsyncMock())
+
+        asyncio.run(restore_state(context, scope_state(STATE, 'acme.wd5.myworkdayjobs.com')))
+
+        self.assertEqual(len(context.add_cookies.await_args.args[0]), 2)
+        script = context.add_init_script.await_args.args[0]
+        self.assertIn('"https://acme.wd5.myworkdayjobs.com"', script)
+        self.assertIn('{"token": "t"}', script)
+
+
+if __name__ == '__main__':
+    unittest.main()
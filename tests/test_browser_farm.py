@@ -0,0 +1,195 @@
+"""
+Test suite for the browser farm
+Least-loaded assignment, per-endpoint limits, probing, ejection and endpoint specs
+"""
+import unittest
+import asyncio
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.browser import pool as pool_module
+from agent.src.browser.farm import BrowserFarm, FarmEndpoint, farm_from_env, parse_endpoints, partition_endpoints
+from agent.src.browser.pool import BrowserPool
+from agent.src.utils.browser_config import BrowserConfig
+
+
+class Session:
+    def __init__(self, host):
+        self.host = host
+
+
+class FakeLauncher:
+    """Sessions on one endpoint"""
+
+    def __init__(self, host):
+        self.host = host
+        self.dead = False
+        self.closed = []
+
+    async def launch(self):
+        if self.dead:
+            raise ConnectionRefusedError(self.host)
+        return Session(self.host)
+
+    async def healthy(self, session):
+        return not self.dead
+
+    async def clean(self, session, origins):
+        pass
+
+    async def close(self, session):
+        self.closed.append(session)
+
+
+class TestBrowserFarm(unittest.TestCase):
+    """Test assignment and ejection"""
+
+    def setUp(self):
+        self.launchers = {host: FakeLauncher(host) for host in ('a', 'b')}
+        self.endpoints = [
+            FarmEndpoint('local', self.launchers['a'], max_sessions=2),
+            FarmEndpoint('http://b:9222', self.launchers['b']),
+        ]
+        self.down = set()
+
+        async def probe(endpoint):
+            return endpoint.launcher.host not in self.down
+        self.farm = BrowserFarm(self.endpoints, probe=probe, probe_interval=0, eject_seconds=60, wait_timeout=0.3)
+
+    def test_least_loaded_within_limits(self):
+        async def scenario():
+            return [await self.farm.launch() for _ in range(3)]
+
+        sessions = asyncio.run(scenario())
+
+        self.assertEqual(sorted(session.host for session in sessions), ['a', 'a', 'b'])
+        self.assertEqual([endpoint.sessions for endpoint in self.endpoints], [2, 1])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.farm.launch())
+
+    def test_launch_waits_for_a_closed_session(self):
+        async def scenario():
+            sessions = [await self.farm.launch() for _ in range(3)]
+            asyncio.get_running_loop().call_later(0.05, asyncio.ensure_future, self.farm.close(sessions[0]))
+            return await self.farm.launch()
+
+        session = asyncio.run(scenario())
+
+        self.assertEqual(session.host, 'a')
+        self.assertEqual(self.launchers['a'].closed[0].host, 'a')
+
+    def test_dead_endpoint_is_ejected_and_readmitted(self):
+        """Failed probes eject an endpoint; it returns once it answers again"""
+        self.down.add('a')
+
+        async def scenario():
+            await self.farm._probe_due()
+            await self.farm._probe_due()
+            return await self.farm.launch()
+
+        self.assertEqual(asyncio.run(scenario()).host, 'b')
+        a = self.endpoints[0]
+        self.assertFalse(a.up)
+        self.assertEqual(self.farm.stats()[0]['ejected_seconds_left'], 60.0)
+
+        self.down.clear()
+        a.ejected_until = 0.0
+        self.assertEqual(asyncio.run(self.farm.launch()).host, 'a')
+        self.assertTrue(a.up)
+
+    def test_failed_health_checks_eject_and_pool_relaunches(self):
+        """A farm behind the pool: browsers on a dead host are replaced on a live one"""
+        pool = BrowserPool(size=1, launcher=self.farm)
+
+        async def scenario():
+            async with pool.lease() as lease:
+                first = lease.session
+            self.launchers[first.host].dead = True
+            async with pool.lease() as lease:
+                return first, lease.session
+
+        first, second = asyncio.run(scenario())
+
+        self.assertNotEqual(first.host, second.host)
+        self.assertEqual(self.launchers[first.host].closed, [first])
+        self.assertEqual(sum(endpoint.sessions for endpoint in self.endpoints), 1)
+
+    def test_all_ejected_fails_fast(self):
+        for launcher in self.launchers.values():
+            launcher.dead = True
+        self.farm.wait_timeout = 30
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(asyncio.wait_for(self.farm.launch(), timeout=2))
+
+
+class TestFarmConfig(unittest.TestCase):
+    """Test endpoint specs from the environment"""
+
+    def test_parse_endpoints(self):
+        specs = parse_endpoints(['http://chrome-1:9222', ' ws://user:pw@grid:3000/chrome ', 'local*2', ''])
+
+        self.assertEqual(specs, [('http://chrome-1:9222', 1), ('ws://user:pw@grid:3000/chrome', 1), ('local', 2)])
+        self.assertEqual(FarmEndpoint(specs[1][0], None).label, 'ws://grid:3000')
+
+    def test_cdp_endpoint_takes_one_session(self):
+        """Sessions on one remote browser would share its context"""
+        with self.assertRaises(ValueError):
+            parse_endpoints(['http://chrome-1:9222*4'])
+        with self.assertRaises(ValueError):
+            FarmEndpoint('http://chrome-1:9222', None, max_sessions=2)
+
+    def test_farm_from_env(self):
+        env = {'CHROME_CDP_URLS': 'http://chrome-1:9222,http://chrome-1:9223,local*2'}
+        with patch.dict(os.environ, env), \
+                patch('agent.src.utils.browser_config.get_browser_config', BrowserConfig):
+            farm = farm_from_env()
+
+        self.assertEqual([endpoint.max_sessions for endpoint in farm.endpoints], [1, 1, 2])
+        self.assertEqual(farm.endpoints[1].launcher.cdp_url, 'http://chrome-1:9223')
+        self.assertIsNone(farm.endpoints[2].launcher.cdp_url)
+
+    def test_workers_get_disjoint_cdp_endpoints(self):
+        """Each remote browser belongs to one worker; local launches stay with every worker"""
+        specs = parse_endpoints(['http://c:9222', 'http://c:9223', 'http://c:9224', 'local*2'])
+
+        shares = [partition_endpoints(specs, index, 2) for index in range(2)]
+
+        self.assertEqual(shares[0], [('local', 2), ('http://c:9222', 1), ('http://c:9224', 1)])
+        self.assertEqual(shares[1], [('local', 2), ('http://c:9223', 1)])
+        with self.assertRaises(ValueError):
+            partition_endpoints(specs, 0, 4)
+        self.assertEqual(partition_endpoints([('local', 2)], 3, 4), [('local', 2)])
+
+    def test_farm_from_env_takes_worker_share(self):
+        env = {'CHROME_CDP_URLS': 'http://c:9222,http://c:9223', 'BROWSER_FARM_WORKER_INDEX': '1',
+               'BROWSER_FARM_WORKER_COUNT': '2'}
+        with patch.dict(os.environ, env), \
+                patch('agent.src.utils.browser_config.get_browser_config', BrowserConfig):
+            farm = farm_from_env()
+
+        self.assertEqual([endpoint.url for endpoint in farm.endpoints], ['http://c:9223'])
+
+    def test_pool_size_capped_at_farm_capacity(self):
+        """A single CDP browser cannot back a pool of two"""
+        env = {'CHROME_CDP_URLS': 'http://c:9222', 'BROWSER_POOL_SIZE': '2'}
+        with patch.dict(os.environ, env), \
+                patch('agent.src.utils.browser_config.get_browser_config', BrowserConfig), \
+                patch.object(pool_module, '_pool', None):
+            pool = pool_module.get_browser_pool()
+
+        self.assertEqual(pool.size, 1)
+
+    def test_single_cdp_url_fallback(self):
+        with patch.dict(os.environ, {'CHROME_CDP_URL': 'http://localhost:9222', 'CHROME_CDP_URLS': '',
+                                     'BROWSER_MODE': 'auto'}):
+            self.assertEqual(BrowserConfig().get_cdp_urls(), ['http://localhost:9222'])
+        with patch.dict(os.environ, {'CHROME_CDP_URL': 'http://localhost:9222', 'BROWSER_MODE': 'local'}):
+            self.assertEqual(BrowserConfig().get_cdp_urls(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Test suite for the warm browser pool
+Reuse, cleanup, recycling, health checks and lease limits
+"""
+import unittest
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.browser.pool import BrowserPool
+
+
+class FakeLauncher:
+    """Records what the pool does to its browsers"""
+
+    def __init__(self):
+        self.launched = []
+        self.closed = []
+        self.cleaned = []
+        self.unhealthy = set()
+        self.fail_clean = False
+
+    async def launch(self):
+        session = f"browser-{len(self.launched) + 1}"
+        self.launched.append(session)
+        return session
+
+    async def healthy(self, session):
+        return session not in self.unhealthy
+
+    async def clean(self, session, origins):
+        if self.fail_clean:
+            raise RuntimeError("CDP gone")
+        self.cleaned.append((session, list(origins)))
+
+    async def close(self, session):
+        self.closed.append(session)
+
+
+class TestBrowserPool(unittest.TestCase):
+    """Test browser reuse across applications"""
+
+    def setUp(self):
+        self.launcher = FakeLauncher()
+        self.pool = BrowserPool(size=2, max_uses=3, launcher=self.launcher)
+
+    async def lease_once(self, url='https://boards.greenhouse.io/acme/jobs/1'):
+        async with self.pool.lease(url) as lease:
+            return lease
+
+    def test_browser_is_reused_and_cleaned(self):
+        """Sequential applications share one browser, cleaned in between"""
+        async def scenario():
+            first = await self.lease_once()
+            second = await self.lease_once()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(self.launcher.launched, ['browser-1'])
+        self.assertFalse(first.reused)
+        self.assertTrue(second.reused)
+        self.assertEqual(self.pool.reuses, 1)
+        self.assertEqual(self.launcher.cleaned[0], ('browser-1', ['https://boards.greenhouse.io']))
+
+    def test_recycled_after_max_uses(self):
+        """A browser is shut down after max_uses leases"""
+        async def scenario():
+            for _ in range(4):
+                await self.lease_once()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(self.launcher.launched, ['browser-1', 'browser-2'])
+        self.assertEqual(self.launcher.closed, ['browser-1'])
+        self.assertEqual(self.pool.retired, {'max_uses': 1})
+
+    def test_unhealthy_or_failed_browsers_are_replaced(self):
+        """Failed health checks, failed cleanups and crashed runs retire the browser"""
+        async def scenario():
+            await self.lease_once()
+            self.launcher.unhealthy.add('browser-1')
+            await self.lease_once()
+            self.launcher.fail_clean = True
+            await self.lease_once()
+            self.launcher.fail_clean = False
+            with self.assertRaises(ValueError):
+                async with self.pool.lease() as lease:
+                    raise ValueError("browser crashed")
+            return lease
+
+        crashed = asyncio.run(scenario())
+
+        self.assertTrue(crashed.discarded)
+        self.assertEqual(self.pool.retired, {'unhealthy': 1, 'cleanup_failed': 1, 'discarded': 1})
+        self.assertEqual(self.pool.idle, 0)
+
+    def test_leases_wait_when_pool_is_full(self):
+        """No more than ``size`` browsers run at once"""
+        async def scenario():
+            active = 0
+            peak = 0
+
+            async def application():
+                nonlocal active, peak
+                async with self.pool.lease():
+                    active += 1
+                    peak = max(peak, active)
+                    await asyncio.sleep(0.01)
+                    active -= 1
+
+            await self.pool.start(warm=2)
+            await asyncio.gather(*(application() for _ in range(6)))
+            await self.pool.close()
+            return peak
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+        self.assertEqual(len(self.launcher.launched), 2)
+        self.assertEqual(self.pool.reuses, 6)
+        self.assertEqual(sorted(self.launcher.closed), ['browser-1', 'browser-2'])
+
+
+    def test_new_loop_retires_previous_idle_browsers(self):
+        """Idle browsers of a finished loop are shut down, not orphaned"""
+        asyncio.run(self.lease_once())
+        asyncio.run(self.lease_once())
+
+        self.assertEqual(self.launcher.launched, ['browser-1', 'browser-2'])
+        self.assertEqual(self.launcher.closed, ['browser-1'])
+        self.assertEqual(self.pool.retired, {'loop_changed': 1})
+        self.assertEqual(self.pool.idle, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
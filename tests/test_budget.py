@@ -0,0 +1,140 @@
+"""
+Tests for per-application budgets and token metering
+"""
+import unittest
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+sys.modules.setdefault('ray', MagicMock())
+
+from agent.src.planning.effort_planner import EffortPlanner
+from agent.src.planning.budget import (
+    ApplicationBudget, BudgetExceeded, TokenMeter, metering, record_usage, usage_stage, usage_tokens
+)
+from agent.src.concurrency.pipeline import PipelinedRunner
+
+
+class TestApplicationBudget(unittest.TestCase):
+    """Test budget derivation and wall-clock limits"""
+
+    def test_budget_follows_effort_level(self):
+        """Higher effort gets more time, tokens and money"""
+        planner = EffortPlanner()
+        low = planner.get_budget('low')
+        high = planner.get_budget('HIGH')
+
+        self.assertLess(low.total_seconds, high.total_seconds)
+        self.assertLess(low.max_tokens, high.max_tokens)
+        self.assertEqual(low.max_cost_usd, planner.get_cost_limit('low'))
+        self.assertIn('browser', high.stage_seconds)
+
+    def test_timeout_is_bounded_by_remaining_total(self):
+        """A stage never gets more than what is left of the overall budget"""
+        budget = ApplicationBudget('medium', total_seconds=100, stage_seconds={'browser': 60})
+
+        self.assertEqual(budget.timeout_for('browser', elapsed=10), 60)
+        self.assertEqual(budget.timeout_for('browser', elapsed=70), 30)
+        self.assertIsNone(ApplicationBudget('medium').timeout_for('browser'))
+        with self.assertRaises(BudgetExceeded):
+            budget.timeout_for('browser', elapsed=100)
+
+
+class TestTokenMeter(unittest.TestCase):
+    """Test token and cost enforcement"""
+
+    def test_token_limit_raises(self):
+        meter = TokenMeter(ApplicationBudget('low', max_tokens=100))
+        meter.add(40, 40)
+        with self.assertRaises(BudgetExceeded) as ctx:
+            meter.add(20, 10)
+        self.assertEqual(ctx.exception.kind, 'tokens')
+
+    def test_cost_limit_only_warns_unless_enforced(self):
+        prices = {'default': {'input': 0.01, 'output': 0.01}}
+        TokenMeter(ApplicationBudget('low', max_cost_usd=0.05, token_prices=prices)).add(10, 0)
+
+        enforced = TokenMeter(ApplicationBudget('low', max_cost_usd=0.05, enforce_cost=True, token_prices=prices))
+        with self.assertRaises(BudgetExceeded):
+            enforced.add(10, 0)
+
+    def test_usage_from_worker_thread_is_charged(self):
+        """record_usage reaches the meter bound by the calling task"""
+        meter = TokenMeter()
+
+        async def scenario():
+            with metering(meter):
+                await asyncio.to_thread(record_usage, SimpleNamespace(prompt_tokens=12, completion_tokens=3))
+            record_usage({'prompt_tokens': 100})  # outside metering: ignored
+
+        asyncio.run(scenario())
+        self.assertEqual((meter.tokens_input, meter.tokens_output), (12, 3))
+
+    def test_cached_tokens_are_parsed(self):
+        """Cached prompt tokens come from chat details and browser-use summaries"""
+        chat = SimpleNamespace(
+            prompt_tokens=100, completion_tokens=20, prompt_tokens_details=SimpleNamespace(cached_tokens=64)
+        )
+        browser = SimpleNamespace(total_prompt_tokens=900, total_completion_tokens=50, total_prompt_cached_tokens=300)
+
+        self.assertEqual(usage_tokens(chat), (100, 20, 64))
+        self.assertEqual(usage_tokens(browser), (900, 50, 300))
+        self.assertEqual(usage_tokens({'prompt_tokens': 8, 'total_tokens': 8}), (8, 0, 0))
+
+    def test_records_are_tagged_by_stage_and_drained_once(self):
+        """Each call is kept with its stage until the runner drains it"""
+        meter = TokenMeter()
+        with metering(meter):
+            with usage_stage('match'):
+                record_usage({'prompt_tokens': 8}, 'text-embedding-3-small', call_type='embedding')
+            with usage_stage('generation'):
+                record_usage({'prompt_tokens': 50, 'completion_tokens': 10}, 'grok-beta', purpose='cover_letter')
+        meter.add(200, 40, 'grok-beta', enforce=False, tokens_cached=120, stage='browser')
+
+        self.assertEqual(meter.by_stage()['browser'], {'input': 200, 'output': 40, 'cached': 120})
+        self.assertEqual(meter.tokens_cached, 120)
+        records = meter.drain()
+        self.assertEqual([r.stage for r in records], ['match', 'generation', 'browser'])
+        self.assertEqual(records[0].call_type, 'embedding')
+        self.assertEqual(meter.drain(), [])
+
+
+class TestBudgetCancellation(unittest.TestCase):
+    """Test that an exceeded budget frees the browser slot"""
+
+    def test_pipeline_records_budget_exceeded_and_moves_on(self):
+        class Runner:
+            retry_policy = SimpleNamespace(max_attempts=1)
+            event_sink = MagicMock(flush=AsyncMock())
+
+            async def prepare_application(self, application_id, **kwargs):
+                return MagicMock(application_id=application_id, runnable=True)
+
+            async def attempt_plan(self, plan, attempt):
+                if plan.application_id == 'stuck':
+                    raise BudgetExceeded('time', 1.0, 1.0, stage='browser')
+                return {'status': 'filled'}
+
+            async def plan_retry(self, plan, attempt, form_result):
+                return None
+
+            async def finalize_plan(self, plan, form_result):
+                return {'status': 'success', 'application_id': plan.application_id}
+
+            async def record_budget_exceeded(self, plan, exc):
+                return {'status': 'failed', 'failure_code': 'budget_exceeded', 'stage': exc.stage}
+
+        pipeline = PipelinedRunner(Runner(), browser_slots=1, prefetch_depth=2)
+        results = asyncio.run(pipeline.run([{'application_id': 'stuck'}, {'application_id': 'next'}]))
+
+        self.assertEqual(results[0]['failure_code'], 'budget_exceeded')
+        self.assertEqual(results[1]['status'], 'success')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,390 @@
+"""
+Test suite for EnhancedFormFiller
+Cover-letter generation overlapping browser launch and first navigation,
+adapter-mapped fields filled and cached form schemas used before the agent runs,
+resource blocking and stored sign-ins on the leased browser, and runs
+ended early by the progress guard
+"""
+import unittest
+import asyncio
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx', 'psycopg2', 'psycopg2.extras', 'psycopg2.pool', 'dbutils',
+               'dbutils.pooled_db', 'browser_use', 'browser_use.llm', 'browser_use.llm.openai',
+               'browser_use.llm.openai.chat']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.agents.base import BaseAgent
+from agent.src.agents.enhanced_form_filler import EnhancedFormFiller
+from agent.src.browser.auth_state import AuthStateStore
+from agent.src.browser.form_schema import FormSchemaCache
+from agent.src.browser.resource_blocking import PAGE_LOAD_JS, BlockingPolicy
+from persistence.src.async_repository import AsyncRepository
+
+
+class FakePool:
+    """Leases a browser whose launch and navigation take ``seconds`` each"""
+
+    def __init__(self, events, seconds=0.1):
+        self.events = events
+        self.seconds = seconds
+        self.session = MagicMock()
+        self.session.navigate_to = AsyncMock(side_effect=self.navigate)
+
+    async def navigate(self, url):
+        await asyncio.sleep(self.seconds)
+        self.events.append('navigated')
+
+    @asynccontextmanager
+    async def lease(self, url=None):
+        await asyncio.sleep(self.seconds)
+        self.events.append('launched')
+        lease = MagicMock(session=self.session, reused=False, wait_seconds=self.seconds)
+        yield lease
+
+
+class TestEnhancedFormFiller(unittest.TestCase):
+    """Test that content generation runs alongside the browser"""
+
+    def setUp(self):
+        self.events = []
+        self.pool = FakePool(self.events)
+        self.field_filler = MagicMock()
+        self.field_filler.fill_page = AsyncMock(return_value=SimpleNamespace(filled=['First Name', 'Email']))
+        self.form_schemas = FormSchemaCache()
+        with patch.object(BaseAgent, '__init__', return_value=None):
+            self.filler = EnhancedFormFiller(
+                answer_generator=MagicMock(),
+                browser_pool=self.pool,
+                field_filler=self.field_filler,
+                form_schemas=self.form_schemas
+            )
+        self.filler.llm = MagicMock(model='test-model')
+        self.filler._random_delay = AsyncMock()
+
+        async def generate(**kwargs):
+            await asyncio.sleep(0.3)
+            self.events.append('generated')
+            answers = {q: f"Answer to {q}" for q in kwargs['questions']}
+            return MagicMock(cover_letter='Dear Acme team', answers=answers, wall_seconds=0.3)
+        self.filler.generation = MagicMock()
+        self.filler.generation.wants_cover_letter.return_value = True
+        self.filler.generation.generate = AsyncMock(side_effect=generate)
+
+        self.agents = []
+
+        def browser_agent(**kwargs):
+            self.agents.append(kwargs)
+            self.events.append('agent')
+            agent = MagicMock()
+            history = MagicMock(usage=None)
+            history.final_result.return_value = '{"status": "filled", "summary": "done"}'
+            agent.run = AsyncMock(return_value=history)
+            return agent
+        patcher = patch('agent.src.agents.enhanced_form_filler.BrowserAgent', side_effect=browser_agent)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # The open form, as read over CDP
+        self.page = MagicMock()
+        self.page.context.route = AsyncMock()
+
+        async def evaluate(script):
+            if script == PAGE_LOAD_JS:
+                return {'load_ms': 1200, 'bytes': 350000, 'requests': 40}
+            return [
+                {'label': 'First Name *', 'type': 'text', 'required': True, 'selector': '#first_name'},
+                {'label': 'Why Acme?', 'type': 'textarea', 'required': False, 'selector': '#why'},
+            ]
+        self.page.evaluate = AsyncMock(side_effect=evaluate)
+
+        @asynccontextmanager
+        async def connect_page(session, url):
+            yield self.page
+        patcher = patch('agent.src.agents.enhanced_form_filler.connect_page', connect_page)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fill(self, **kwargs):
+        return asyncio.run(self.filler.fill_application(
+            url='https://boards.greenhouse.io/acme/jobs/1',
+            job_title='Engineer',
+            company_name='Acme',
+            job_description='Build things',
+            user_profile={'name': 'Test'},
+            effort_level='high',
+            **kwargs
+        ))
+
+    def test_generation_overlaps_launch_and_navigation(self):
+        """The browser is launched and on the form while the letter is written"""
+        started = time.perf_counter()
+        result = self.fill()
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(result['status'], 'filled')
+        self.assertTrue(result['cover_letter_generated'])
+        self.assertEqual(self.events, ['launched', 'navigated', 'generated', 'agent'])
+        self.assertLess(elapsed, 0.45)
+
+        # The letter reaches the task; the page is not opened twice
+        self.assertIn('Dear Acme team', self.agents[0]['task'])
+        self.assertFalse(self.agents[0]['directly_open_url'])
+        self.pool.session.navigate_to.assert_awaited_once()
+
+        # Only the generation time not hidden behind the browser is counted
+        timings = result['stage_timings']
+        self.assertLess(timings['cover_letter'], 0.15)
+        self.assertIn('browser_launch', timings)
+        self.assertIn('navigation', timings)
+
+    def test_mapped_fields_filled_before_agent(self):
+        """The agent is told which fields the adapter already filled"""
+        result = self.fill(cover_letter='Prepared letter', resume_path='/tmp/cv.pdf')
+
+        page, adapter, values = self.field_filler.fill_page.await_args.args
+        self.assertIs(page, self.page)
+        self.assertEqual(adapter.name, 'greenhouse')
+        self.assertEqual(values['first_name'], 'Test')
+        self.assertEqual(values['resume'], '/tmp/cv.pdf')
+
+        task = self.agents[0]['task']
+        self.assertIn('ALREADY FILLED', task)
+        self.assertIn('- First Name', task)
+        self.assertEqual(result['prefilled_fields'], ['First Name', 'Email'])
+        self.assertIn('prefill', result['stage_timings'])
+
+    def test_unknown_board_is_left_to_agent(self):
+        """Boards without an adapter skip the deterministic fill"""
+        result = asyncio.run(self.filler.fill_application(
+            url='https://jobs.example.com/apply/1',
+            job_title='Engineer',
+            company_name='Acme',
+            job_description='Build things',
+            user_profile={'name': 'Test'},
+            cover_letter='Prepared letter'
+        ))
+
+        self.field_filler.fill_page.assert_not_called()
+        self.assertNotIn('ALREADY FILLED', self.agents[0]['task'])
+        self.assertEqual(result['prefilled_fields'], [])
+
+    def test_form_schema_learned_then_reused(self):
+        """A second visit to the same form pre-plans its questions"""
+        first = self.fill(cover_letter='Prepared letter')
+        self.assertFalse(first['form_schema_hit'])
+        self.assertEqual(self.form_schemas.misses, 1)
+        self.filler.generation.generate.assert_not_called()
+
+        second = self.fill(cover_letter='Prepared letter')
+
+        self.assertTrue(second['form_schema_hit'])
+        self.assertEqual(self.form_schemas.hit_rate, 0.5)
+        self.assertEqual(self.filler.generation.generate.await_args.kwargs['questions'], ['Why Acme?'])
+        task = self.agents[1]['task']
+        self.assertIn('KNOWN FORM LAYOUT', task)
+        self.assertIn('- Why Acme? (textarea) [#why]', task)
+        self.assertIn('A: Answer to Why Acme?', task)
+
+    def test_resource_blocking_installed_for_run(self):
+        """The ATS's blocking profile intercepts requests; pages are measured"""
+        result = self.fill(cover_letter='Prepared letter')
+
+        pattern, handler = self.page.context.route.await_args.args
+        self.assertEqual(pattern, '**/*')
+        self.assertIn('image', handler.__self__.profile.resource_types)
+        # First page after navigation and the last page after the run
+        self.assertEqual(result['page_bytes'], 700000)
+        self.assertEqual(result['blocked_requests'], 0)
+
+    def test_resource_blocking_disabled(self):
+        self.filler.blocking = BlockingPolicy({'enabled': False})
+
+        result = self.fill(cover_letter='Prepared letter')
+
+        self.page.context.route.assert_not_called()
+        self.assertEqual(result['page_bytes'], 700000)
+
+    def test_sign_in_state_saved_then_restored(self):
+        """A Workday tenant signed in to once is signed in on the next run"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cipher = MagicMock(encrypt=lambda data: data[::-1], decrypt=lambda token: token[::-1])
+        self.filler.auth_states = AsyncRepository.wrap(AuthStateStore(base_dir=tmp.name, cipher=cipher))
+        session_cookie = {'name': 'wd-session', 'value': 's', 'domain': 'acme.wd5.myworkdayjobs.com', 'expires': -1}
+        self.page.context.storage_state = AsyncMock(return_value={'cookies': [session_cookie], 'origins': []})
+        self.page.context.add_cookies = AsyncMock()
+
+        def apply():
+            return asyncio.run(self.filler.fill_application(
+                url='https://acme.wd5.myworkdayjobs.com/en-US/careers/job/1',
+                job_title='Engineer',
+                company_name='Acme',
+                job_description='Build things',
+                user_profile={'name': 'Test', 'email': 'test@example.com'},
+                cover_letter='Prepared letter'
+            ))
+
+        apply()
+        self.page.context.add_cookies.assert_not_called()
+        self.assertNotIn('SIGN-IN', self.agents[0]['task'])
+
+        apply()
+        self.page.context.add_cookies.assert_awaited_once_with([session_cookie])
+        self.assertIn('already signed in to this portal as test@example.com', self.agents[1]['task'])
+
+        # A failed run with the restored state drops it
+        failed = MagicMock(usage=None)
+        failed.final_result.return_value = '{"status": "failed", "summary": "login required"}'
+        with patch('agent.src.agents.enhanced_form_filler.BrowserAgent') as agent:
+            agent.return_value.run = AsyncMock(return_value=failed)
+            apply()
+        self.assertEqual(os.listdir(tmp.name), [])
+
+    def stopped_run(self, steps):
+        """An agent that takes ``steps`` through its on_step_end hook and never reports back"""
+        def browser_agent(**kwargs):
+            agent = MagicMock(history=SimpleNamespace(history=[]))
+            history = MagicMock(usage=None)
+            history.final_result.return_value = None
+
+            async def run(max_steps=100, on_step_end=None):
+                self.run_kwargs = {'max_steps': max_steps}
+                for item in steps:
+                    if agent.stop.called:
+                        break
+                    agent.history.history.append(item)
+                    await on_step_end(agent)
+                return history
+            agent.run = run
+            return agent
+        return patch('agent.src.agents.enhanced_form_filler.BrowserAgent', side_effect=browser_agent)
+
+    def test_review_page_ends_run(self):
+        """Reaching the review page is a clean, filled result"""
+        def item(title, index):
+            return SimpleNamespace(
+                metadata=SimpleNamespace(input_tokens=2000), state=SimpleNamespace(url='https://x', title=title),
+                model_output=SimpleNamespace(action=[{'click': {'index': index}}])
+            )
+        steps = [item('Apply', 1), item('Review and Submit', 2), item('Submitted', 3)]
+
+        with self.stopped_run(steps):
+            result = self.fill(cover_letter='Prepared letter')
+
+        self.assertEqual(result['status'], 'filled')
+        self.assertEqual(result['stop_reason'], 'review_reached')
+        self.assertEqual(result['details']['steps'], 2)
+        self.assertEqual(self.run_kwargs['max_steps'], 60)
+
+    def test_repeated_action_returns_partial(self):
+        """A looping agent is stopped with a partial result instead of running to its cap"""
+        looping = SimpleNamespace(
+            metadata=SimpleNamespace(input_tokens=2000), state=SimpleNamespace(url='https://x', title='Apply'),
+            model_output=SimpleNamespace(action=[{'click': {'index': 7}}])
+        )
+
+        with self.stopped_run([looping] * 20):
+            result = self.fill(cover_letter='Prepared letter')
+
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual(result['stop_reason'], 'repeated_action')
+        self.assertEqual(result['details']['steps'], 3)
+        self.assertIn('repeated the same action', result['summary'])
+        self.assertIn('step_timeline', result)
+
+    def test_failed_run_keeps_steps_taken(self):
+        """A run that raises still reports the steps it finished"""
+        def timed(number):
+            return SimpleNamespace(
+                metadata=SimpleNamespace(step_number=number, step_start_time=100.0 + number, step_end_time=101.5 + number,
+                                         input_tokens=2000),
+                state=SimpleNamespace(url='https://x', title='Apply'),
+                model_output=SimpleNamespace(action=[{'input_text': {'index': number}}])
+            )
+
+        def browser_agent(**kwargs):
+            agent = MagicMock(history=SimpleNamespace(history=[]))
+
+            async def run(max_steps=100, on_step_end=None):
+                for item in [timed(1), timed(2)]:
+                    agent.history.history.append(item)
+                    await on_step_end(agent)
+                if self.hang:
+                    await asyncio.sleep(10)
+                raise RuntimeError("CDP connection lost")
+            agent.run = run
+            return agent
+
+        self.hang = False
+        with patch('agent.src.agents.enhanced_form_filler.BrowserAgent', side_effect=browser_agent):
+            result = self.fill(cover_letter='Prepared letter')
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual([step['type'] for step in result['step_timeline']['steps']], ['input', 'input'])
+
+        # Cancelled by the caller's budget: the steps go to on_timeline
+        self.hang = True
+        timelines = []
+        with patch('agent.src.agents.enhanced_form_filler.BrowserAgent', side_effect=browser_agent):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(asyncio.wait_for(self.filler.fill_application(
+                    url='https://boards.greenhouse.io/acme/jobs/1', job_title='Engineer', company_name='Acme',
+                    job_description='Build things', user_profile={'name': 'Test'}, effort_level='high',
+                    cover_letter='Prepared letter', on_timeline=timelines.append
+                ), 0.5))
+
+        self.assertEqual(len(timelines), 1)
+        self.assertEqual(len(timelines[0]['steps']), 2)
+
+    def test_token_cap_bounded_by_application_budget(self):
+        """A run only gets the tokens its application has left"""
+        from agent.src.planning.budget import ApplicationBudget, TokenMeter, metering
+        meter = TokenMeter(ApplicationBudget('high', max_tokens=5000))
+        meter.add(4000, 0, enforce=False)
+        looping = SimpleNamespace(
+            metadata=SimpleNamespace(input_tokens=2000), state=SimpleNamespace(url='https://x', title='Apply'),
+            model_output=None
+        )
+
+        with self.stopped_run([looping] * 5), metering(meter):
+            result = self.fill(cover_letter='Prepared letter')
+
+        self.assertEqual(result['stop_reason'], 'max_tokens')
+        self.assertEqual(result['details']['steps'], 1)
+
+    def test_prepared_letter_skips_generation(self):
+        """A pre-generated letter goes straight into the task"""
+        result = self.fill(cover_letter='Prepared letter')
+
+        self.filler.generation.generate.assert_not_called()
+        self.assertNotIn('cover_letter', result['stage_timings'])
+        self.assertIn('Prepared letter', self.agents[0]['task'])
+
+    def test_failed_launch_cancels_generation(self):
+        """Generation does not outlive a browser that never came up"""
+        @asynccontextmanager
+        async def broken_lease(url=None):
+            raise RuntimeError("browser crashed")
+            yield
+        self.pool.lease = broken_lease
+
+        result = self.fill()
+
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('browser crashed', result['summary'])
+        self.assertNotIn('generated', self.events)
+        self.assertEqual(self.agents, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Test suite for adapter-driven deterministic field filling
+Profile flattening, dropdown matching and filling a page without the LLM
+"""
+import unittest
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.agents.adapters import (
+    FieldFiller, GreenhouseAdapter, WorkdayAdapter, adapter_for, match_option, profile_values
+)
+
+
+class FakeLocator:
+    """Records Playwright actions on one element"""
+
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+        self.element = page.elements.get(selector)
+
+    @property
+    def first(self):
+        return self
+
+    async def count(self):
+        return 1 if self.element is not None else 0
+
+    async def is_visible(self):
+        return self.element.get('visible', True)
+
+    async def fill(self, value, timeout=None):
+        self.page.actions.append(('fill', self.selector, value))
+
+    async def press_sequentially(self, value, delay=None, timeout=None):
+        self.page.actions.append(('type', self.selector, value))
+
+    async def set_input_files(self, path, timeout=None):
+        self.page.actions.append(('upload', self.selector, path))
+
+    async def evaluate(self, script):
+        return self.element['options']
+
+    async def select_option(self, label=None, timeout=None):
+        self.page.actions.append(('select', self.selector, label))
+
+    async def click(self, timeout=None):
+        self.page.actions.append(('click', self.selector, None))
+
+
+class FakePage:
+    def __init__(self, elements):
+        self.elements = elements
+        self.actions = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+class TestFieldFiller(unittest.TestCase):
+    """Test filling mapped fields directly"""
+
+    def setUp(self):
+        self.profile = {
+            'name': 'Jan Kruszynski',
+            'email': 'jan@example.com',
+            'phone': '+49 30 1234567',
+            'location': {'city': 'Berlin', 'country': 'Germany'},
+        }
+        self.resume = os.path.abspath(__file__)
+
+    def test_profile_values(self):
+        """Names are split and empty values dropped"""
+        values = profile_values(self.profile, self.resume)
+
+        self.assertEqual(values['first_name'], 'Jan')
+        self.assertEqual(values['last_name'], 'Kruszynski')
+        self.assertEqual(values['location'], 'Berlin, Germany')
+        self.assertEqual(values['resume'], self.resume)
+        self.assertNotIn('linkedin', values)
+
+    def test_match_option(self):
+        """Exact, then prefix, then substring; placeholders never match"""
+        options = ['Please select', 'Male', 'Female', 'Decline To Self Identify']
+
+        self.assertEqual(match_option(options, 'female'), 'Female')
+        self.assertEqual(match_option(options, 'Decline'), 'Decline To Self Identify')
+        self.assertIsNone(match_option(options, 'Please'))
+        self.assertIsNone(match_option(['Yes', 'No'], 'Maybe'))
+
+    def test_adapter_for(self):
+        self.assertIsInstance(adapter_for('https://boards.greenhouse.io/acme/jobs/1'), GreenhouseAdapter)
+        self.assertIsInstance(adapter_for('https://acme.wd5.myworkdayjobs.com/careers/job/1'), WorkdayAdapter)
+        self.assertIsNone(adapter_for('https://jobs.example.com/apply'))
+
+    def test_fills_mapped_fields_on_page(self):
+        """Fields on the page are filled; absent ones are left to the agent"""
+        page = FakePage({
+            '#first_name': {},
+            '#last_name': {},
+            '#email': {},
+            '#phone': {'visible': False},
+            'input[name="job_application[phone]"]': {},
+            '#resume': {'visible': False},
+            '#job_application_gender': {'options': ['Please select', 'Male', 'Female', 'Decline To Self Identify']},
+            '#job_application_race': {'options': ['Please select', 'Asian']},
+        })
+        filler = FieldFiller()
+
+        report = asyncio.run(filler.fill_page(page, GreenhouseAdapter(), profile_values(self.profile, self.resume)))
+
+        self.assertEqual(report.filled, ['First Name', 'Last Name', 'Email', 'Phone', 'Resume/CV', 'Gender'])
+        self.assertIn('LinkedIn Profile', report.missing)
+        self.assertIn('Race', report.failed)
+        self.assertIn(('fill', '#email', 'jan@example.com'), page.actions)
+        # A hidden text input falls through to the next selector
+        self.assertIn(('fill', 'input[name="job_application[phone]"]', '+49 30 1234567'), page.actions)
+        self.assertIn(('upload', '#resume', self.resume), page.actions)
+        self.assertIn(('select', '#job_application_gender', 'Decline To Self Identify'), page.actions)
+
+    def test_stealth_typing(self):
+        """Keystroke settings switch text inputs to human-paced typing"""
+        page = FakePage({'#email': {}})
+        filler = FieldFiller({'keystroke_delay_ms': {'mean': 5, 'stddev': 0, 'min': 1, 'max': 10}})
+
+        asyncio.run(filler.fill_page(page, GreenhouseAdapter(), {'email': 'jan@example.com'}))
+
+        self.assertIn(('type', '#email', 'jan@example.com'), page.actions)
+
+    def test_missing_resume_file_is_not_uploaded(self):
+        page = FakePage({'#resume': {}})
+
+        report = asyncio.run(FieldFiller().fill_page(page, GreenhouseAdapter(), {'resume': '/no/such/cv.pdf'}))
+
+        self.assertIn('Resume/CV', report.failed)
+        self.assertEqual(page.actions, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test suite for the form schema cache
+Fingerprinting, learning from agent history, reuse and steps saved
+"""
+import unittest
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx', 'psycopg2', 'psycopg2.extras', 'psycopg2.pool', 'dbutils',
+               'dbutils.pooled_db']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.browser.form_schema import (
+    FormSchemaCache, form_fingerprint, history_fields, normalize_fields
+)
+
+URL = 'https://boards.greenhouse.io/acme/jobs/1'
+
+
+def step(url, *elements):
+    """One browser-use history item that interacted with ``elements``"""
+    interacted = [SimpleNamespace(node_name=tag, attributes=attributes) for tag, attributes in elements]
+    return SimpleNamespace(state=SimpleNamespace(url=url, interacted_element=interacted))
+
+
+def history(steps):
+    return SimpleNamespace(history=steps)
+
+
+class FakeSchemaRepository:
+    """In-memory form_schemas table"""
+
+    def __init__(self, rows=None):
+        self.rows = list(rows or [])
+        self.saved = []
+
+    def load_schemas(self, domain):
+        return [row for row in self.rows if row['domain'] == domain]
+
+    def save_schema(self, domain, fingerprint, schema, ats=None, agent_steps=None, hit=False):
+        self.saved.append({'domain': domain, 'fingerprint': fingerprint, 'schema': schema,
+                           'agent_steps': agent_steps, 'hit': hit})
+
+
+class TestFormSchemaCache(unittest.TestCase):
+    """Test learning and reusing form layouts"""
+
+    def setUp(self):
+        self.first_page = normalize_fields([
+            {'label': 'First Name *', 'type': 'text', 'required': True, 'selector': '#first_name'},
+            {'label': 'Email', 'type': 'email', 'required': True, 'selector': '#email'},
+            {'label': 'Email', 'type': 'email', 'required': True, 'selector': '#email'},
+            {'label': '', 'type': 'text'},
+        ])
+        self.run = history([
+            step(URL, ('input', {'id': 'first_name', 'aria-label': 'First Name'})),
+            step(URL, ('div', {'id': 'not-a-field'})),
+            step('https://boards.greenhouse.io/acme/jobs/1/questions',
+                 ('textarea', {'name': 'why_acme', 'placeholder': 'Why Acme?', 'required': ''})),
+            step('https://boards.greenhouse.io/acme/jobs/1/questions'),
+        ])
+
+    def test_fingerprint_ignores_order_and_markers(self):
+        """Fields are deduplicated; the fingerprint is order-independent"""
+        self.assertEqual([f.type for f in self.first_page], ['text', 'text'])
+        reordered = normalize_fields([
+            {'label': 'Email', 'type': 'email'},
+            {'label': 'First name', 'type': 'text'},
+        ])
+        self.assertEqual(form_fingerprint(reordered), form_fingerprint(self.first_page))
+
+    def test_history_fields(self):
+        """URL changes are step boundaries; only form controls count"""
+        fields, steps, agent_steps = history_fields(self.run)
+
+        self.assertEqual(steps, 2)
+        self.assertEqual(agent_steps, 4)
+        self.assertEqual([(f.label, f.type, f.step) for f in fields],
+                         [('First Name', 'text', 0), ('Why Acme?', 'textarea', 1)])
+        self.assertTrue(fields[1].required)
+        self.assertEqual(fields[1].selector, 'textarea[name="why_acme"]')
+
+    def test_learn_then_hit(self):
+        """A learned form is found again and reports steps saved"""
+        repo = FakeSchemaRepository()
+        cache = FormSchemaCache(repository=repo)
+
+        async def visits():
+            fingerprint, schema = await cache.lookup(URL, self.first_page)
+            self.assertIsNone(schema)
+            learned = await cache.learn(URL, fingerprint, self.first_page, self.run, 'greenhouse')
+
+            fingerprint, schema = await cache.lookup('https://boards.greenhouse.io/acme/jobs/2', self.first_page)
+            shorter = history(self.run.history[:2])
+            await cache.learn(URL, fingerprint, self.first_page, shorter, 'greenhouse')
+            return learned, schema
+
+        learned, schema = asyncio.run(visits())
+
+        self.assertEqual(learned.steps, 2)
+        self.assertEqual(learned.baseline_agent_steps, 4)
+        self.assertEqual(schema.questions(), ['Why Acme?'])
+        self.assertIn('Step 2:\n- Why Acme? (textarea, required)', schema.describe())
+        self.assertEqual((cache.hits, cache.misses, cache.hit_rate), (1, 1, 0.5))
+        self.assertEqual(cache.steps_saved, 2)
+        self.assertEqual([row['hit'] for row in repo.saved], [False, True])
+        # The learned later steps survive a shorter visit
+        self.assertEqual(cache._schemas[('boards.greenhouse.io', schema.fingerprint)].steps, 2)
+
+    def test_loads_domain_from_repository(self):
+        """Schemas learned by other workers are read once per domain"""
+        fingerprint = form_fingerprint(self.first_page)
+        repo = FakeSchemaRepository([{
+            'domain': 'boards.greenhouse.io',
+            'fingerprint': fingerprint,
+            'ats': 'greenhouse',
+            'schema': {'steps': 1, 'fields': [{'label': 'Why Acme?', 'type': 'textarea',
+                                               'required': False, 'selector': None, 'step': 0}]},
+            'baseline_agent_steps': 9,
+        }])
+        cache = FormSchemaCache(repository=repo)
+
+        _, schema = asyncio.run(cache.lookup(URL, self.first_page))
+
+        self.assertEqual(schema.baseline_agent_steps, 9)
+        self.assertEqual(schema.questions(), ['Why Acme?'])
+
+    def test_repository_failure_is_a_miss(self):
+        repo = FakeSchemaRepository()
+        repo.load_schemas = MagicMock(side_effect=RuntimeError("db down"))
+        cache = FormSchemaCache(repository=repo)
+
+        _, schema = asyncio.run(cache.lookup(URL, self.first_page))
+
+        self.assertIsNone(schema)
+        self.assertEqual(cache.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
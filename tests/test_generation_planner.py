@@ -0,0 +1,103 @@
+"""
+Test suite for GenerationPlanner
+Concurrent fan-out, de-duplication and answer-bank reuse
+"""
+import unittest
+import asyncio
+import time
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx', 'psycopg2', 'psycopg2.extras', 'psycopg2.pool', 'dbutils', 'dbutils.pooled_db']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.generation.generation_planner import GenerationPlanner
+from agent.src.generation.answer_bank import AnswerBank, profile_version
+
+
+def slow(result, seconds=0.1):
+    async def call(**kwargs):
+        await asyncio.sleep(seconds)
+        return result
+    return AsyncMock(side_effect=call)
+
+
+class TestGenerationPlanner(unittest.TestCase):
+    """Test concurrent generation"""
+
+    def setUp(self):
+        self.answer_gen = MagicMock()
+        self.answer_gen.generate_cover_letter_async = slow("Dear hiring team")
+        self.answer_gen.answer_screening_question_async = slow("Yes")
+        self.job = {
+            'job_title': 'Engineer',
+            'company_name': 'Acme',
+            'job_description': 'Build things',
+            'user_profile': {'name': 'Test'},
+            'effort_level': 'high',
+        }
+
+    def test_calls_run_concurrently(self):
+        """Wall time is bounded by the slowest call, not the sum"""
+        planner = GenerationPlanner(self.answer_gen)
+        started = time.perf_counter()
+        result = asyncio.run(planner.generate(**self.job, questions=["Q1?", "Q2?", "Q3?"]))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(result.cover_letter, "Dear hiring team")
+        self.assertEqual(result.answers, {"Q1?": "Yes", "Q2?": "Yes", "Q3?": "Yes"})
+        self.assertLess(elapsed, 0.3)
+
+    def test_duplicate_questions_generated_once(self):
+        """Questions that normalize the same share one generation"""
+        planner = GenerationPlanner(self.answer_gen)
+        result = asyncio.run(planner.generate(
+            **self.job, questions=["Notice period?", "notice period *"], include_cover_letter=False
+        ))
+
+        self.assertEqual(self.answer_gen.answer_screening_question_async.await_count, 1)
+        self.assertEqual(set(result.answers), {"Notice period?", "notice period *"})
+        self.assertEqual(self.answer_gen.generate_cover_letter_async.await_count, 0)
+
+    def test_banked_answers_skip_llm(self):
+        """Answer-bank hits are reported with their source"""
+        bank = AnswerBank()
+        version = profile_version(self.job['user_profile'])
+        answered = []
+
+        async def on_answer(question, answer, source):
+            answered.append((question, source))
+
+        async def scenario():
+            await bank.remember('app-0', "Notice period?", "Two weeks", 'high', version)
+            planner = GenerationPlanner(self.answer_gen, bank)
+            return await planner.generate(
+                **self.job, questions=["Notice period?", "Salary?"], on_answer=on_answer
+            )
+
+        result = asyncio.run(scenario())
+
+        self.assertEqual(result.answers["Notice period?"], "Two weeks")
+        self.assertEqual(result.sources, {"Notice period?": 'bank', "Salary?": 'llm'})
+        self.assertEqual(sorted(answered), [("Notice period?", 'bank'), ("Salary?", 'llm')])
+
+
+    def test_failed_llm_call_is_a_fallback(self):
+        """The generator's boilerplate is tagged so it is never banked"""
+        self.answer_gen.FALLBACK_ANSWER = "Interested."
+        self.answer_gen.answer_screening_question_async = AsyncMock(side_effect=RuntimeError("502"))
+        planner = GenerationPlanner(self.answer_gen)
+
+        result = asyncio.run(planner.generate(**self.job, questions=["Salary?"], include_cover_letter=False))
+
+        self.assertEqual(result.answers, {"Salary?": "Interested."})
+        self.assertEqual(result.sources, {"Salary?": 'fallback'})
+        self.assertFalse(self.answer_gen.answer_screening_question_async.await_args.kwargs['fallback'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test suite for the shared LLM client registry
+Pool reuse per provider, per-loop async clients and pool stats
+"""
+import unittest
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['openai', 'httpx', 'browser_use', 'browser_use.llm', 'browser_use.llm.openai',
+               'browser_use.llm.openai.chat']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.agents.base import BaseAgent
+from agent.src.utils.llm_clients import LLMClientRegistry, pool_stats, provider_for_model
+
+
+class TestLLMClientRegistry(unittest.TestCase):
+    """Test client sharing"""
+
+    def setUp(self):
+        httpx = sys.modules['httpx']
+        httpx.Client.side_effect = lambda **kwargs: MagicMock(name='Client')
+        httpx.AsyncClient.side_effect = lambda **kwargs: MagicMock(name='AsyncClient')
+        self.registry = LLMClientRegistry()
+
+    def tearDown(self):
+        httpx = sys.modules['httpx']
+        httpx.Client.side_effect = None
+        httpx.AsyncClient.side_effect = None
+
+    def test_one_pool_per_provider(self):
+        """Components asking for the same provider share one pool"""
+        self.assertIs(self.registry.http_client('openai'), self.registry.http_client('openai'))
+        self.assertIsNot(self.registry.http_client('openai'), self.registry.http_client('xai'))
+        self.assertIs(self.registry.openai_client('openai'), self.registry.openai_client('openai'))
+
+    def test_async_client_per_loop(self):
+        """Async pools are reused within a loop and rebuilt for a new one"""
+        async def twice():
+            return self.registry.async_http_client('xai'), self.registry.async_http_client('xai')
+
+        first, again = asyncio.run(twice())
+        other, _ = asyncio.run(twice())
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+
+    def test_credentials(self):
+        """xAI gets its base URL, OpenAI the SDK default"""
+        self.assertEqual(self.registry.credentials('xai')['base_url'], 'https://api.x.ai/v1')
+        self.assertNotIn('base_url', self.registry.credentials('openai'))
+        self.assertEqual(provider_for_model('grok-beta'), 'xai')
+        self.assertEqual(provider_for_model('gpt-4o'), 'openai')
+
+    def test_mock_mode_routes_every_provider_to_mock_server(self):
+        """USE_MOCK_LLM swaps base URLs and fills in a placeholder key"""
+        env = {'USE_MOCK_LLM': 'true', 'MOCK_LLM_URL': 'http://mock:8100/v1', 'GROK_API_KEY': '', 'OPENAI_API_KEY': ''}
+        with patch.dict(os.environ, env):
+            for provider in ('xai', 'openai'):
+                credentials = self.registry.credentials(provider)
+                self.assertEqual(credentials['base_url'], 'http://mock:8100/v1')
+                self.assertEqual(credentials['api_key'], 'mock')
+
+    def test_pool_stats(self):
+        """Active and idle connections are counted from the pool"""
+        client = MagicMock()
+        client._transport._pool.connections = [
+            MagicMock(is_idle=lambda: True), MagicMock(is_idle=lambda: False), MagicMock(is_idle=lambda: True)
+        ]
+
+        self.assertEqual(pool_stats(client), {'active': 1, 'idle': 2, 'total': 3})
+        self.assertEqual(pool_stats(object()), {'active': 0, 'idle': 0, 'total': 0})
+
+    def test_agent_llm_follows_running_loop(self):
+        """An agent built outside the worker loop uses the pool of the loop running it"""
+        with patch.dict(os.environ, {'GROK_API_KEY': 'key', 'USE_MOCK_LLM': 'false'}), \
+                patch('agent.src.agents.base.get_client_registry', return_value=self.registry), \
+                patch('agent.src.agents.base.ChatOpenAI', side_effect=lambda **kwargs: SimpleNamespace(**kwargs)):
+            agent = BaseAgent()
+
+            async def llms():
+                return agent.llm, agent.llm
+
+            first, again = asyncio.run(llms())
+            other, _ = asyncio.run(llms())
+
+        self.assertIs(first, again)
+        self.assertIsNot(first.http_client, other.http_client)
+        self.assertEqual(first.model, 'grok-4-1-fast-reasoning')
+
+
+if __name__ == '__main__':
+    unittest.main()
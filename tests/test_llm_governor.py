@@ -0,0 +1,92 @@
+"""
+Tests for the LLM concurrency and rate governor
+"""
+import unittest
+import asyncio
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.generation.llm_governor import LLMGovernor, TokenBucket, retry_after_seconds
+
+
+class RateLimitError(Exception):
+    """Stand-in for openai.RateLimitError"""
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__('rate limited')
+        self.response = MagicMock(headers={'retry-after': str(retry_after)})
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test reservation-based rate limiting"""
+
+    def test_reservations_queue_behind_each_other(self):
+        """Once the burst is spent, each reservation waits one refill interval more"""
+        now = [0.0]
+        bucket = TokenBucket(per_minute=60, clock=lambda: now[0])  # 1 per second
+
+        delays = [bucket.reserve(1) for _ in range(62)]
+
+        self.assertEqual(delays[:60], [0.0] * 60)
+        self.assertAlmostEqual(delays[60], 1.0)
+        self.assertAlmostEqual(delays[61], 2.0)
+
+    def test_refund_and_pause(self):
+        now = [0.0]
+        bucket = TokenBucket(per_minute=60, clock=lambda: now[0])
+        bucket.reserve(60)
+        bucket.refund(30)
+        self.assertEqual(bucket.reserve(30), 0.0)
+
+        bucket.pause(5)
+        self.assertEqual(bucket.reserve(0), 5.0)
+
+
+class TestLLMGovernor(unittest.TestCase):
+    """Test admission control"""
+
+    def test_concurrency_is_capped(self):
+        governor = LLMGovernor('test', max_concurrency=2, rpm=0, tpm=0)
+        in_flight = []
+        peak = []
+
+        async def call():
+            async with governor.slot(10):
+                in_flight.append(1)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.pop()
+
+        async def scenario():
+            await asyncio.gather(*(call() for _ in range(6)))
+
+        asyncio.run(scenario())
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(governor.calls, 6)
+
+    def test_rate_limit_pauses_provider(self):
+        """A 429 is counted and holds later calls for Retry-After"""
+        governor = LLMGovernor('test', max_concurrency=1, rpm=600, tpm=0)
+
+        async def scenario():
+            with self.assertRaises(RateLimitError):
+                async with governor.slot(10):
+                    raise RateLimitError(retry_after=30)
+            return governor.limits.requests.reserve(1)
+
+        delay = asyncio.run(scenario())
+        self.assertEqual(governor.rate_limited, 1)
+        self.assertGreater(delay, 29)
+        self.assertEqual(retry_after_seconds(RateLimitError(7)), 7.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Test suite for LLMRouter
+Hedging slow requests, failover on errors and circuit breaking
+"""
+import unittest
+import asyncio
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.generation import llm_router
+from agent.src.generation.llm_router import LLMRouter, ProviderStats
+from agent.src.planning.budget import ApplicationBudget, TokenMeter, metering, record_usage
+
+MESSAGES = [{'role': 'user', 'content': 'Hello there, please answer this screening question.'}]
+
+
+class FakeProvider:
+    """OpenAI-compatible client answering after ``delay`` (or raising)"""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+        self.chat = MagicMock()
+        self.chat.completions.create = self.create
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return MagicMock(usage=MagicMock(total_tokens=10), name=self.name)
+
+
+class TestLLMRouter(unittest.TestCase):
+    """Test routing across providers"""
+
+    def setUp(self):
+        llm_router._stats.clear()
+        for provider in ('xai', 'openai'):
+            llm_router._stats[provider] = ProviderStats(default_hedge_delay=0.05, min_hedge_delay=0.01)
+
+    def run_router(self, xai, openai, hedging=True):
+        router = LLMRouter(('xai', 'grok-beta'), ('openai', 'gpt-4o-mini'), hedging=hedging)
+        router.clients = MagicMock()
+        router.clients.async_openai_client.side_effect = lambda provider: {'xai': xai, 'openai': openai}[provider]
+        return asyncio.run(router.complete(MESSAGES, 50))
+
+    def test_fast_primary_is_not_hedged(self):
+        """A response within the p95 never touches the alternate"""
+        xai, openai = FakeProvider('xai'), FakeProvider('openai')
+
+        _, model = self.run_router(xai, openai)
+
+        self.assertEqual(model, 'grok-beta')
+        self.assertEqual(openai.calls, 0)
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        """The alternate answers first and the slow request is cancelled"""
+        xai, openai = FakeProvider('xai', delay=5), FakeProvider('openai', delay=0.01)
+
+        _, model = self.run_router(xai, openai)
+
+        self.assertEqual(model, 'gpt-4o-mini')
+        self.assertTrue(xai.cancelled)
+
+    def test_unhedged_call_is_not_charged_by_router(self):
+        """A primary answering before the hedge delay is charged once, by the caller"""
+        xai, openai = FakeProvider('xai'), FakeProvider('openai')
+        meter = TokenMeter()
+
+        with metering(meter):
+            response, model = self.run_router(xai, openai)
+            record_usage(response.usage, model, purpose='screening_answer')
+
+        self.assertEqual([record.purpose for record in meter.records], ['screening_answer'])
+
+    def test_answer_generator_calls_are_governed(self):
+        """Every AnswerGenerator call is admitted by the provider's governor"""
+        from agent.src.generation.answer_generator import AnswerGenerator
+        from agent.src.generation.llm_governor import get_governor
+        xai, openai = FakeProvider('xai'), FakeProvider('openai')
+        generator = AnswerGenerator('grok-beta')
+        generator.router.clients = MagicMock()
+        generator.router.clients.async_openai_client.side_effect = lambda provider: {'xai': xai, 'openai': openai}[provider]
+        governed = get_governor('xai').calls
+
+        asyncio.run(generator.answer_screening_question_async("Why us?", "Build", {'name': 'Test'}))
+
+        self.assertEqual(get_governor('xai').calls, governed + 1)
+        self.assertFalse(hasattr(generator, 'answer_screening_question'))
+
+    def test_cancelled_hedge_loser_is_charged(self):
+        """The slow request's prompt was sent, so it counts without tripping the budget"""
+        xai, openai = FakeProvider('xai', delay=5), FakeProvider('openai', delay=0.01)
+        meter = TokenMeter(ApplicationBudget('low', max_tokens=1))
+
+        with metering(meter):
+            self.run_router(xai, openai)
+
+        self.assertEqual(len(meter.records), 1)
+        record = meter.records[0]
+        self.assertEqual((record.model, record.purpose), ('grok-beta', 'hedged_duplicate'))
+        self.assertEqual(record.tokens_input, len(MESSAGES[0]['content']) // 4)
+        self.assertEqual(record.tokens_output, 0)
+
+    def test_error_fails_over(self):
+        """A failing provider is retried on the alternate"""
+        xai, openai = FakeProvider('xai', error=RuntimeError("502")), FakeProvider('openai')
+
+        _, model = self.run_router(xai, openai, hedging=False)
+
+        self.assertEqual(model, 'gpt-4o-mini')
+        self.assertEqual(llm_router._stats['xai'].consecutive_failures, 1)
+
+    def test_open_circuit_routes_to_alternate_first(self):
+        """After repeated failures the alternate becomes the first choice"""
+        for _ in range(3):
+            llm_router._stats['xai'].record_failure()
+        xai, openai = FakeProvider('xai'), FakeProvider('openai')
+
+        _, model = self.run_router(xai, openai)
+
+        self.assertEqual(model, 'gpt-4o-mini')
+        self.assertEqual(xai.calls, 0)
+
+
+class TestProviderStats(unittest.TestCase):
+    """Test latency percentiles"""
+
+    def test_p95_after_enough_samples(self):
+        """The hedge delay follows the observed p95"""
+        stats = ProviderStats(min_samples=20, default_hedge_delay=10, min_hedge_delay=0.1)
+        self.assertEqual(stats.hedge_delay(), 10)
+
+        for i in range(1, 101):
+            stats.record_success(i / 100)
+
+        self.assertAlmostEqual(stats.percentile(95), 0.95, places=2)
+        self.assertAlmostEqual(stats.hedge_delay(), 0.95, places=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Test suite for the offline mock LLM
+Wire format, deterministic outputs, token usage and fault injection
+"""
+import unittest
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.mock_llm.engine import MockLLM
+
+
+async def no_sleep(seconds):
+    no_sleep.calls.append(seconds)
+
+
+class TestMockLLM(unittest.TestCase):
+    """Test the engine behind the mock server"""
+
+    def setUp(self):
+        no_sleep.calls = []
+        self.engine = MockLLM.from_file(sleep=no_sleep)
+        self.request = {
+            'model': 'grok-beta',
+            'max_tokens': 300,
+            'messages': [
+                {'role': 'system', 'content': 'You are helping complete a job application.'},
+                {'role': 'user', 'content': 'Question: Why do you want to join us?'},
+            ],
+        }
+
+    def test_chat_completion_is_deterministic(self):
+        """Same request, same completion and usage; cached tokens appear on reuse"""
+        first = asyncio.run(self.engine.chat_completion(self.request))
+        second = asyncio.run(self.engine.chat_completion(self.request))
+
+        self.assertEqual(first.status, 200)
+        text = first.body['choices'][0]['message']['content']
+        self.assertEqual(text, second.body['choices'][0]['message']['content'])
+        usage = first.body['usage']
+        self.assertEqual(usage['total_tokens'], usage['prompt_tokens'] + usage['completion_tokens'])
+        self.assertLessEqual(usage['completion_tokens'], 300)
+        self.assertEqual(usage['prompt_tokens_details']['cached_tokens'], 0)
+        self.assertGreater(second.body['usage']['prompt_tokens_details']['cached_tokens'], 0)
+
+    def test_fixture_matches_prompt(self):
+        """Fixtures answer matching prompts verbatim"""
+        request = {**self.request, 'messages': [{'role': 'user', 'content': 'What is your notice period?'}]}
+        response = asyncio.run(self.engine.chat_completion(request))
+
+        self.assertEqual(response.body['choices'][0]['message']['content'], 'My notice period is four weeks.')
+        self.assertEqual(self.engine.snapshot()['fixture:notice_period'], 1)
+
+    def test_embeddings_are_stable_unit_vectors(self):
+        """Embeddings depend only on the text"""
+        body = {'model': 'text-embedding-3-small', 'input': ['a', 'b', 'a'], 'dimensions': 8}
+        data = asyncio.run(self.engine.embeddings(body)).body['data']
+
+        self.assertEqual(data[0]['embedding'], data[2]['embedding'])
+        self.assertNotEqual(data[0]['embedding'], data[1]['embedding'])
+        self.assertAlmostEqual(sum(v * v for v in data[0]['embedding']), 1.0)
+
+    def test_fault_injection_is_seeded(self):
+        """429s carry Retry-After and the same seed reproduces the same sequence"""
+        def statuses():
+            engine = MockLLM({'seed': 7, 'errors': {'rate_limit_rate': 0.3, 'server_error_rate': 0.2}}, sleep=no_sleep)
+            responses = [asyncio.run(engine.chat_completion(self.request)) for _ in range(40)]
+            return responses, engine.snapshot()
+
+        responses, stats = statuses()
+        codes = [r.status for r in responses]
+
+        self.assertEqual(codes, [r.status for r in statuses()[0]])
+        self.assertEqual({200, 429, 500}, set(codes))
+        self.assertEqual(stats['rate_limited'], codes.count(429))
+        rate_limited = next(r for r in responses if r.status == 429)
+        self.assertEqual(rate_limited.headers['retry-after'], '1')
+        self.assertEqual(rate_limited.body['error']['code'], 'rate_limit_exceeded')
+
+    def test_latency_follows_model_override(self):
+        """Per-model settings replace the defaults; runtime patches apply immediately"""
+        self.engine.configure({'models': {'grok-beta': {'chat': {
+            'latency_ms': {'distribution': 'fixed', 'value': 250}, 'ms_per_output_token': 0
+        }}}})
+        asyncio.run(self.engine.chat_completion(self.request))
+
+        self.assertEqual(no_sleep.calls, [0.25])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Test suite for the pipelined application runner
+"""
+import unittest
+import asyncio
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+sys.modules.setdefault('ray', MagicMock())
+
+from agent.src.concurrency.pipeline import PipelinedRunner
+from agent.src.concurrency.retry_scheduler import RetryPolicy, RetryScheduler
+
+
+class FakeRunner:
+    """Runner stub recording stage ordering"""
+
+    def __init__(self, prepare_delay=0.01, execute_delay=0.05, failures=None, retry_delay=0.2):
+        self.prepare_delay = prepare_delay
+        self.execute_delay = execute_delay
+        self.failures = dict(failures or {})
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=retry_delay)
+        self.timeline = []
+        self.event_sink = MagicMock(flush=AsyncMock())
+
+    async def prepare_application(self, application_id, **kwargs):
+        self.timeline.append(('prepare_start', application_id))
+        await asyncio.sleep(self.prepare_delay)
+        if application_id == 'bad':
+            raise RuntimeError('embedding failed')
+        plan = MagicMock(application_id=application_id, runnable=True)
+        return plan
+
+    async def attempt_plan(self, plan, attempt):
+        self.timeline.append(('execute_start', plan.application_id))
+        await asyncio.sleep(self.execute_delay)
+        if self.failures.get(plan.application_id, 0) > attempt:
+            return {'status': 'failed'}
+        return {'status': 'filled'}
+
+    async def plan_retry(self, plan, attempt, form_result):
+        if form_result['status'] == 'filled' or not self.retry_policy.should_retry(attempt):
+            return None
+        return self.retry_policy.delay_for(attempt)
+
+    async def finalize_plan(self, plan, form_result):
+        status = 'success' if form_result['status'] == 'filled' else 'failed'
+        return {'status': status, 'application_id': plan.application_id}
+
+
+class TestPipelinedRunner(unittest.TestCase):
+    """Test prefetching and result ordering"""
+
+    def test_results_keep_input_order(self):
+        """Results line up with the input list, errors included"""
+        runner = FakeRunner()
+        pipeline = PipelinedRunner(runner, browser_slots=2, prefetch_depth=2)
+        apps = [{'application_id': i} for i in ['a', 'bad', 'c', 'd']]
+
+        results = asyncio.run(pipeline.run(apps))
+
+        self.assertEqual([r['application_id'] for r in results], ['a', 'bad', 'c', 'd'])
+        self.assertEqual(results[1]['status'], 'error')
+        runner.event_sink.flush.assert_awaited()
+
+    def test_next_job_prepares_while_browser_busy(self):
+        """Preparation of job 2 starts before job 1 finishes in the browser"""
+        runner = FakeRunner()
+        pipeline = PipelinedRunner(runner, browser_slots=1, prefetch_depth=1)
+        apps = [{'application_id': i} for i in ['a', 'b', 'c']]
+
+        asyncio.run(pipeline.run(apps))
+
+        timeline = runner.timeline
+        self.assertLess(timeline.index(('prepare_start', 'b')), timeline.index(('execute_start', 'b')))
+        self.assertLess(timeline.index(('execute_start', 'a')), timeline.index(('prepare_start', 'b')))
+
+    def test_backoff_does_not_hold_browser_slot(self):
+        """Other applications run while a failed one waits for its retry"""
+        runner = FakeRunner(execute_delay=0.01, failures={'a': 1}, retry_delay=0.2)
+        pipeline = PipelinedRunner(runner, browser_slots=1, prefetch_depth=3)
+        apps = [{'application_id': i} for i in ['a', 'b', 'c']]
+
+        results = asyncio.run(pipeline.run(apps))
+
+        self.assertEqual([r['status'] for r in results], ['success', 'success', 'success'])
+        executions = [app_id for stage, app_id in runner.timeline if stage == 'execute_start']
+        self.assertEqual(executions, ['a', 'b', 'c', 'a'])
+
+    def test_retry_budget_is_per_application(self):
+        """An application that keeps failing stops after max_attempts"""
+        runner = FakeRunner(execute_delay=0.01, failures={'a': 10}, retry_delay=0.01)
+        pipeline = PipelinedRunner(runner, browser_slots=2, prefetch_depth=2)
+
+        results = asyncio.run(pipeline.run([{'application_id': 'a'}, {'application_id': 'b'}]))
+
+        self.assertEqual([r['status'] for r in results], ['failed', 'success'])
+        executions = [app_id for stage, app_id in runner.timeline if stage == 'execute_start']
+        self.assertEqual(executions.count('a'), 3)
+
+
+class TestRetryScheduler(unittest.TestCase):
+    """Test the delay queue"""
+
+    def test_items_become_due_in_eligible_order(self):
+        """Items are held until their delay expires, earliest first"""
+        now = [100.0]
+        scheduler = RetryScheduler(clock=lambda: now[0])
+        scheduler.schedule('late', 10)
+        scheduler.schedule('early', 5)
+
+        self.assertIsNone(scheduler.pop_due())
+        self.assertEqual(scheduler.seconds_until_next(), 5)
+        now[0] = 111.0
+        self.assertEqual(scheduler.pop_due(), 'early')
+        self.assertEqual(scheduler.pop_due(), 'late')
+        self.assertIsNone(scheduler.seconds_until_next())
+
+
+if __name__ == '__main__':
+    unittest.main()
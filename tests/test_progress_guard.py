@@ -0,0 +1,163 @@
+"""
+Test suite for the browser agent progress guard
+Step and token caps per effort level and ATS, and early stops on stalls,
+repeated actions and the review page
+"""
+import unittest
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.browser.progress_guard import PROGRESS_JS, ProgressGuard, action_signature
+from agent.src.planning.budget import AgentLimits
+from agent.src.planning.effort_planner import EffortPlanner
+
+
+def step(actions=None, url='https://acme.wd5.myworkdayjobs.com/apply', tokens=1000, title=''):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(input_tokens=tokens),
+        model_output=SimpleNamespace(action=actions) if actions is not None else None,
+        state=SimpleNamespace(url=url, title=title),
+    )
+
+
+def probe(signature, review=False):
+    return {'signature': signature, 'review': review}
+
+
+class TestAgentLimits(unittest.TestCase):
+    """Test limits derived from effort_policy.yml"""
+
+    def setUp(self):
+        self.policy = EffortPlanner().policy
+
+    def test_caps_follow_effort_level(self):
+        low = AgentLimits.from_policy(self.policy, 'low')
+        high = AgentLimits.from_policy(self.policy, 'HIGH')
+
+        self.assertLess(low.max_steps, high.max_steps)
+        self.assertLess(low.max_tokens, high.max_tokens)
+        self.assertTrue(low.stop_at_review)
+        self.assertIn('review and submit', low.review_patterns)
+
+    def test_token_cap_is_a_share_of_the_application_budget(self):
+        """A run never gets more than its share, nor more than the application has left"""
+        budget = self.policy['budgets']['max_tokens']['medium']
+        limits = AgentLimits.from_policy(self.policy, 'medium')
+
+        self.assertLess(limits.max_tokens, budget)
+        self.assertEqual(AgentLimits.from_policy(self.policy, 'medium', remaining_tokens=1000).max_tokens, 1000)
+        self.assertEqual(AgentLimits.from_policy(self.policy, 'medium', remaining_tokens=0).max_tokens, 0)
+        self.assertLessEqual(AgentLimits.from_policy(self.policy, 'high', 'workday').max_tokens,
+                             self.policy['budgets']['max_tokens']['high'])
+
+    def test_ats_multiplier(self):
+        medium = AgentLimits.from_policy(self.policy, 'medium', 'greenhouse')
+        workday = AgentLimits.from_policy(self.policy, 'medium', 'workday')
+
+        self.assertGreater(workday.max_steps, medium.max_steps)
+
+    def test_empty_policy_is_unlimited(self):
+        limits = AgentLimits.from_policy({}, 'medium')
+
+        self.assertIsNone(limits.max_steps)
+        self.assertIsNone(limits.stall_steps)
+        self.assertFalse(limits.stop_at_review)
+
+
+class TestProgressGuard(unittest.TestCase):
+    """Test the stop rules"""
+
+    def test_review_page_reached(self):
+        guard = ProgressGuard(AgentLimits(stop_at_review=True))
+
+        self.assertIsNone(guard.observe(step([{'click': {'index': 3}}]), probe('a')))
+        self.assertEqual(guard.observe(step([{'click': {'index': 9}}]), probe('b', review=True)), 'review_reached')
+
+    def test_review_title_without_page(self):
+        guard = ProgressGuard(AgentLimits(stop_at_review=True))
+
+        self.assertEqual(guard.observe(step(title='Review and Submit - Workday')), 'review_reached')
+
+    def test_step_and_token_caps(self):
+        guard = ProgressGuard(AgentLimits(max_steps=3))
+        reasons = [guard.observe(step([{'input': {'index': n}}])) for n in range(3)]
+        self.assertEqual(reasons, [None, None, 'max_steps'])
+
+        guard = ProgressGuard(AgentLimits(max_tokens=2500))
+        reasons = [guard.observe(step([{'input': {'index': n}}], tokens=1000)) for n in range(3)]
+        self.assertEqual(reasons, [None, None, 'max_tokens'])
+
+    def test_repeated_action(self):
+        """Only the same action with the same arguments counts"""
+        guard = ProgressGuard(AgentLimits(repeat_actions=3))
+        click = [{'click': {'index': 12}}]
+
+        self.assertIsNone(guard.observe(step(click)))
+        self.assertIsNone(guard.observe(step([{'click': {'index': 13}}])))
+        self.assertIsNone(guard.observe(step(click)))
+        self.assertIsNone(guard.observe(step(click)))
+        self.assertEqual(guard.observe(step(click)), 'repeated_action')
+
+    def test_stalled_page(self):
+        """Form values changing is progress; an unchanged page for N steps is not"""
+        guard = ProgressGuard(AgentLimits(stall_steps=2))
+
+        self.assertIsNone(guard.observe(step([{'input': {'index': 1}}]), probe('url|40|')))
+        self.assertIsNone(guard.observe(step([{'input': {'index': 2}}]), probe('url|40|Jan')))
+        self.assertIsNone(guard.observe(step([{'scroll': {'down': True}}]), probe('url|40|Jan')))
+        self.assertEqual(guard.observe(step([{'click': {'index': 5}}]), probe('url|40|Jan')), 'stalled')
+
+    def test_no_stall_without_page(self):
+        guard = ProgressGuard(AgentLimits(stall_steps=1))
+
+        for n in range(3):
+            self.assertIsNone(guard.observe(step([{'input': {'index': n}}])))
+
+    def test_tokens_from_agent_usage(self):
+        """Prompt and completion tokens of every call count, as the meter charges them"""
+        usage = [SimpleNamespace(usage=SimpleNamespace(prompt_tokens=9000, completion_tokens=600))] * 2
+        agent = MagicMock(
+            history=SimpleNamespace(history=[step([{'click': {'index': 1}}], tokens=9000)]),
+            token_cost_service=SimpleNamespace(usage_history=usage)
+        )
+        guard = ProgressGuard(AgentLimits(max_tokens=19000))
+
+        asyncio.run(guard(agent))
+
+        self.assertEqual(guard.tokens, 19200)
+        self.assertEqual(guard.stop_reason, 'max_tokens')
+
+    def test_exhausted_budget_stops_after_first_step(self):
+        guard = ProgressGuard(AgentLimits(max_tokens=0))
+
+        self.assertEqual(guard.observe(step([{'click': {'index': 1}}])), 'max_tokens')
+
+    def test_hook_stops_agent(self):
+        """As an on_step_end hook it probes the page and stops the agent once"""
+        page = MagicMock(evaluate=AsyncMock(return_value=probe('x', review=True)))
+        guard = ProgressGuard(AgentLimits(stop_at_review=True, max_steps=10), ats='workday', page=page)
+        agent = MagicMock(history=SimpleNamespace(history=[step([{'click': {'index': 1}}])]))
+
+        asyncio.run(guard(agent))
+        asyncio.run(guard(agent))
+
+        agent.stop.assert_called_once()
+        self.assertEqual(guard.stop_reason, 'review_reached')
+        self.assertEqual(page.evaluate.await_args.args[0], PROGRESS_JS)
+        self.assertEqual(guard.to_dict()['steps'], 1)
+
+    def test_action_signature(self):
+        self.assertIsNone(action_signature(step(None)))
+        self.assertEqual(
+            action_signature(step([{'click': {'index': 1}, 'input': None}])),
+            action_signature(step([{'click': {'index': 1}}]))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
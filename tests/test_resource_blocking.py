@@ -0,0 +1,113 @@
+"""
+Test suite for resource blocking on application browsers
+Per-ATS profiles from stealth.yml, request decisions and page measurements
+"""
+import unittest
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.browser.resource_blocking import BlockingPolicy, RequestBlocker, measure_page
+
+STEALTH_CONFIG = os.path.join(os.path.dirname(__file__), '../config/stealth.yml')
+
+
+def fake_route(url, resource_type):
+    route = MagicMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.continue_ = AsyncMock()
+    route.abort = AsyncMock()
+    return route
+
+
+class TestBlockingPolicy(unittest.TestCase):
+    """Test profile construction"""
+
+    def setUp(self):
+        self.config = {
+            'resource_types': ['image', 'media', 'font'],
+            'block_domains': ['hotjar.com'],
+            'allow_domains': ['recaptcha.net'],
+            'ats': {
+                'workday': {'allow_resource_types': ['font'], 'allow_domains': ['wd5.myworkdaycdn.com']},
+                'linkedin': {'enabled': False},
+            },
+        }
+
+    def test_ats_override(self):
+        profile = BlockingPolicy(self.config).profile_for('workday')
+
+        self.assertEqual(profile.resource_types, frozenset({'image', 'media'}))
+        self.assertEqual(profile.allow_domains, ('recaptcha.net', 'wd5.myworkdaycdn.com'))
+        self.assertEqual(profile.block_domains, ('hotjar.com',))
+
+    def test_disabled(self):
+        self.assertIsNone(BlockingPolicy(self.config).profile_for('linkedin'))
+        self.assertIsNone(BlockingPolicy({**self.config, 'enabled': False}).profile_for('greenhouse'))
+
+    def test_shipped_config(self):
+        with open(STEALTH_CONFIG) as f:
+            config = yaml.safe_load(f)['resource_blocking']
+
+        profile = BlockingPolicy(config).profile_for('greenhouse')
+
+        self.assertIn('image', profile.resource_types)
+        self.assertIn('google-analytics.com', profile.block_domains)
+
+
+class TestRequestBlocker(unittest.TestCase):
+    """Test which requests are aborted"""
+
+    def setUp(self):
+        self.blocker = RequestBlocker(BlockingPolicy({
+            'resource_types': ['image', 'font'],
+            'block_domains': ['hotjar.com'],
+            'allow_domains': ['recaptcha.net'],
+        }).profile_for('greenhouse'))
+
+    def test_reason(self):
+        self.assertEqual(self.blocker.reason('https://static.hotjar.com/c/hotjar.js', 'script'), 'domain')
+        self.assertEqual(self.blocker.reason('https://boards.greenhouse.io/logo.png', 'image'), 'resource_type')
+        self.assertIsNone(self.blocker.reason('https://boards.greenhouse.io/app.js', 'script'))
+        # CAPTCHA images load even though images are blocked
+        self.assertIsNone(self.blocker.reason('https://www.recaptcha.net/payload.jpg', 'image'))
+
+    def test_route_aborts_and_counts(self):
+        blocked = fake_route('https://boards.greenhouse.io/font.woff2', 'font')
+        allowed = fake_route('https://boards.greenhouse.io/apply', 'document')
+
+        asyncio.run(self.blocker._route(blocked))
+        asyncio.run(self.blocker._route(allowed))
+
+        blocked.abort.assert_awaited_once_with('blockedbyclient')
+        blocked.continue_.assert_not_called()
+        allowed.continue_.assert_awaited_once()
+        self.assertEqual(self.blocker.blocked, {'resource_type': 1})
+        self.assertEqual(self.blocker.total_blocked, 1)
+
+
+class TestMeasurePage(unittest.TestCase):
+    def test_measure(self):
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value={'load_ms': 1500, 'bytes': 420000, 'requests': 31})
+
+        load = asyncio.run(measure_page(page))
+
+        self.assertEqual(load.seconds, 1.5)
+        self.assertEqual(load.bytes, 420000)
+
+    def test_unmeasurable_page(self):
+        page = MagicMock()
+        page.evaluate = AsyncMock(side_effect=RuntimeError("Target closed"))
+
+        self.assertIsNone(asyncio.run(measure_page(page)))
+
+
+if __name__ == '__main__':
+    unittest.main()
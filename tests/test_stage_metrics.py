@@ -0,0 +1,65 @@
+"""
+Tests for per-stage application timing
+"""
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.observability import stage_metrics
+from agent.src.observability.stage_metrics import StageTimer, ats_label
+
+
+class TestStageTimer(unittest.TestCase):
+    """Test stage accumulation and export"""
+
+    def test_repeated_stages_accumulate(self):
+        """Retries add to the same stage instead of overwriting it"""
+        timer = StageTimer()
+        timer.record('form_fill', 1.5)
+        timer.merge({'form_fill': 2.0, 'navigation': '0.25'})
+
+        self.assertEqual(timer.as_dict(), {'form_fill': 3.5, 'navigation': 0.25})
+
+    def test_stage_is_recorded_when_block_raises(self):
+        """A failing stage still contributes its wall-clock time"""
+        timer = StageTimer()
+        with self.assertRaises(RuntimeError):
+            with timer.stage('match'):
+                raise RuntimeError('embedding failed')
+
+        self.assertIn('match', timer.durations)
+
+    def test_observe_exports_once_with_labels(self):
+        """Histogram gets one observation per stage, labelled by effort and ATS"""
+        histogram = MagicMock()
+        original = stage_metrics.APPLICATION_STAGE_SECONDS
+        stage_metrics.APPLICATION_STAGE_SECONDS = histogram
+        try:
+            timer = StageTimer(ats='greenhouse')
+            timer.record('match', 0.2)
+            timer.observe('HIGH')
+            timer.observe('HIGH')
+        finally:
+            stage_metrics.APPLICATION_STAGE_SECONDS = original
+
+        histogram.labels.assert_called_once_with(stage='match', effort_level='high', ats='greenhouse')
+        histogram.labels.return_value.observe.assert_called_once_with(0.2)
+
+
+class TestAtsLabel(unittest.TestCase):
+    """Test URL to ATS label mapping"""
+
+    def test_known_and_unknown_hosts(self):
+        self.assertEqual(ats_label('https://boards.greenhouse.io/acme/jobs/1'), 'greenhouse')
+        self.assertEqual(ats_label('https://acme.wd5.myworkdayjobs.com/en-US/job/1'), 'workday')
+        self.assertEqual(ats_label('https://careers.acme.com/apply?gh_jid=42'), 'greenhouse')
+        self.assertEqual(ats_label('https://careers.acme.com/jobs/1'), 'other')
+        self.assertEqual(ats_label('https://jobs.lever.co/acme/1'), 'lever')
+        self.assertEqual(ats_label(None), 'other')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Test suite for browser agent step timelines
+Step classification, building from browser-use history and the compact artifact
+"""
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+from agent.src.observability.step_timeline import StepTimeline, action_names, step_type
+
+
+class FakeAction:
+    """browser-use ActionModel: one set field, the others None"""
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def model_dump(self, exclude_none=False):
+        return {name: value for name, value in self.fields.items() if not exclude_none or value is not None}
+
+
+def history_item(number, start, end, actions, url, tokens=0, error=None):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(step_start_time=start, step_end_time=end, step_number=number, input_tokens=tokens),
+        model_output=SimpleNamespace(action=actions) if actions is not None else None,
+        state=SimpleNamespace(url=url),
+        result=[SimpleNamespace(error=error)]
+    )
+
+
+class TestStepType(unittest.TestCase):
+    def test_slowest_kind_wins(self):
+        self.assertEqual(step_type(['click', 'upload_file']), 'upload')
+        self.assertEqual(step_type(['input', 'click']), 'input')
+        self.assertEqual(step_type(['navigate']), 'navigation')
+        self.assertEqual(step_type(['mystery_action']), 'other')
+
+    def test_no_actions_is_planning(self):
+        self.assertEqual(step_type([]), 'planning')
+
+    def test_action_names(self):
+        output = SimpleNamespace(action=[
+            FakeAction(click={'index': 3}, input=None),
+            {'upload_file': {'index': 7, 'path': '/tmp/cv.pdf'}},
+        ])
+
+        self.assertEqual(action_names(output), ['click', 'upload_file'])
+        self.assertEqual(action_names(None), [])
+
+
+class TestStepTimeline(unittest.TestCase):
+    def setUp(self):
+        url = 'https://boards.greenhouse.io/acme/jobs/1'
+        history = SimpleNamespace(history=[
+            history_item(1, 100.0, 104.0, [FakeAction(navigate={'url': url})], url, tokens=3000),
+            history_item(2, 104.0, 110.5, [FakeAction(input={'index': 1}), FakeAction(input={'index': 2})], url),
+            history_item(3, 110.5, 125.0, [FakeAction(upload_file={'index': 9})], url, error='File input not found'),
+            history_item(4, 125.0, 128.0, None, url + '#review'),
+            SimpleNamespace(metadata=None, model_output=None, state=None, result=[]),
+        ])
+        self.timeline = StepTimeline.from_history(history, url, 'greenhouse')
+
+    def test_from_history(self):
+        steps = self.timeline.steps
+
+        self.assertEqual([step.step_type for step in steps], ['navigation', 'input', 'upload', 'planning'])
+        self.assertEqual(steps[1].actions, ['input', 'input'])
+        self.assertEqual(steps[0].tokens, 3000)
+        self.assertEqual(steps[2].seconds, 14.5)
+        self.assertTrue(steps[2].error)
+        self.assertEqual(self.timeline.domain, 'boards.greenhouse.io')
+
+    def test_totals_slowest_first(self):
+        self.assertEqual(list(self.timeline.totals()), ['upload', 'input', 'navigation', 'planning'])
+
+    def test_compact_dict(self):
+        """Offsets from the first step; URLs only where they change"""
+        document = self.timeline.to_dict()
+        steps = document['steps']
+
+        self.assertEqual(document['started_at'], 100.0)
+        self.assertEqual([step['at'] for step in steps], [0.0, 4.0, 10.5, 25.0])
+        self.assertIn('url', steps[0])
+        self.assertNotIn('url', steps[1])
+        self.assertEqual(steps[3]['url'], 'https://boards.greenhouse.io/acme/jobs/1#review')
+        self.assertTrue(steps[2]['error'])
+        self.assertNotIn('tokens', steps[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Test suite for the LOW effort template engine
+Category mapping, rendering from profile fields and the zero-LLM planner path
+"""
+import unittest
+import asyncio
+import json
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../services')))
+
+# Mock heavy dependencies
+for module in ['numpy', 'openai', 'httpx', 'psycopg2', 'psycopg2.extras', 'psycopg2.pool', 'dbutils', 'dbutils.pooled_db']:
+    sys.modules.setdefault(module, MagicMock())
+
+from agent.src.generation.templates import TemplateEngine
+from agent.src.generation.generation_planner import GenerationPlanner
+
+PROFILE_PATH = os.path.join(os.path.dirname(__file__), '../config/profile.json')
+
+
+class TestTemplateEngine(unittest.TestCase):
+    """Test template rendering"""
+
+    def setUp(self):
+        self.engine = TemplateEngine()
+        with open(PROFILE_PATH) as f:
+            self.profile = json.load(f)
+
+    def test_maps_common_questions(self):
+        """Frequent screening questions map to categories"""
+        self.assertEqual(self.engine.category("Will you now or in the future require visa sponsorship?"), 'visa_sponsorship')
+        self.assertEqual(self.engine.category("What is your notice period? *"), 'notice_period')
+        self.assertEqual(self.engine.category("Salary expectations (EUR)"), 'salary')
+        self.assertIsNone(self.engine.category("Describe a project you are proud of"))
+
+    def test_patterns_match_whole_phrases(self):
+        """Words inside other words or other phrases do not map"""
+        for question in [
+            "What is your ethnicity?",
+            "May we contact your current employer?",
+            "Which programming languages do you use?",
+            "Do you have a valid German driving licence?",
+            "Describe your experience working with remote teams",
+            "Do you hold a valid work visa?",
+            "How many years of Rust experience do you have?",
+            "How many years of experience do you have with Python?",
+            "How long have you lived in Berlin?",
+        ]:
+            self.assertIsNone(self.engine.category(question), question)
+
+        self.assertEqual(
+            self.engine.category("Are you authorized to work in the US without visa sponsorship?"), 'work_authorization'
+        )
+        self.assertEqual(self.engine.category("How many years of experience do you have?"), 'years_experience')
+        self.assertEqual(self.engine.category("Which city are you based in?"), 'location')
+        self.assertEqual(self.engine.category("Which languages do you speak?"), 'languages')
+        self.assertEqual(self.engine.category("Are you fluent in German?"), 'languages')
+        self.assertEqual(self.engine.category("Are you open to remote work?"), 'remote')
+        self.assertEqual(self.engine.category("E-mail address"), 'contact')
+
+    def test_renders_from_profile(self):
+        """Answers are filled from profile fields"""
+        self.assertEqual(self.engine.answer("Do you require sponsorship?", self.profile), 'No')
+        self.assertIn('4 weeks', self.engine.answer("Notice period", self.profile))
+        self.assertIn('80,000 EUR', self.engine.answer("Expected salary?", self.profile))
+
+    def test_missing_field_does_not_map(self):
+        """A template needing an absent profile field is not used"""
+        self.assertIsNone(self.engine.answer("What is your notice period?", {'name': 'Test'}))
+
+    def test_cover_letter(self):
+        """Default cover letter names the job and the candidate"""
+        letter = self.engine.cover_letter("ML Engineer", "Acme", self.profile)
+
+        self.assertIn("ML Engineer position at Acme", letter)
+        self.assertTrue(letter.endswith(self.profile['name']))
+
+    def test_stored_template_preferred(self):
+        """A profile's LOW cover letter template overrides the default"""
+        repo = MagicMock()
+        repo.get_cover_letter_template.return_value = {'base_text': "Hi {company_name}, {name} here."}
+        engine = TemplateEngine(template_repository=repo)
+        profile = {**self.profile, 'id': 'profile-1'}
+
+        asyncio.run(engine.prepare(profile))
+
+        self.assertEqual(engine.cover_letter("Engineer", "Acme", profile), f"Hi Acme, {self.profile['name']} here.")
+        repo.get_cover_letter_template.assert_called_once_with('profile-1', 'low')
+
+
+class TestLowEffortPlanner(unittest.TestCase):
+    """Test the zero-LLM generation path"""
+
+    def test_low_effort_only_calls_llm_for_unmapped(self):
+        """Mapped questions and the cover letter never reach the LLM"""
+        with open(PROFILE_PATH) as f:
+            profile = json.load(f)
+        answer_gen = MagicMock()
+        answer_gen.generate_cover_letter_async = AsyncMock()
+        answer_gen.answer_screening_question_async = AsyncMock(return_value="A project")
+        planner = GenerationPlanner(answer_gen, templates=TemplateEngine())
+
+        result = asyncio.run(planner.generate(
+            job_title="Engineer", company_name="Acme", job_description="Build", user_profile=profile,
+            effort_level='low', questions=["Do you need visa sponsorship?", "Describe a project"]
+        ))
+
+        answer_gen.generate_cover_letter_async.assert_not_awaited()
+        self.assertEqual(answer_gen.answer_screening_question_async.await_count, 1)
+        self.assertIn("Acme", result.cover_letter)
+        self.assertEqual(result.sources, {"Do you need visa sponsorship?": 'template', "Describe a project": 'llm'})
+
+
+if __name__ == '__main__':
+    unittest.main()